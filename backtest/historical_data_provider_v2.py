@@ -3,14 +3,28 @@ Historical Data Provider - ارائه‌دهنده داده‌های تاریخ
 این ماژول جایگزین ExchangeClient در حالت Backtest می‌شود
 """
 
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 from backtest.csv_data_loader import CSVDataLoader
 
 logger = logging.getLogger(__name__)
 
+# ستون‌های خروجی (فرمت API صرافی)
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+def _copy_on_write() -> bool:
+    """
+    آیا برش‌های DataFrame با Copy-on-Write برگردانده می‌شوند
+    (همیشه از pandas 3؛ در pandas 2 فقط با pd.options.mode.copy_on_write = True)
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
 
 class HistoricalDataProvider:
     """
@@ -36,6 +50,11 @@ class HistoricalDataProvider:
         self.symbols = config.get('backtest', {}).get('symbols', [])
         self.timeframes = config.get('data_fetching', {}).get('timeframes', ['5m', '15m', '1h', '4h'])
 
+        # آرایه‌های پیوسته هر (نماد، تایم‌فریم):
+        # (timestamps میلی‌ثانیه int64 مرتب، مقادیر (n, 5) به ترتیب OHLCV_COLUMNS[1:]، DataFrame پایه)
+        # همه فقط-خواندنی هستند؛ هر گام با searchsorted فقط برش limit کندل آخر را برمی‌گرداند
+        self._series: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray, pd.DataFrame]] = {}
+
         # پیش‌بارگذاری داده‌ها اگر فعال باشد
         if config.get('backtest', {}).get('preload_all_data', True):
             self.preload_data()
@@ -48,6 +67,9 @@ class HistoricalDataProvider:
         """
         logger.info("Preloading historical data...")
         success = self.csv_loader.preload_all_data(self.symbols, self.timeframes)
+        for symbol in self.symbols:
+            for timeframe in self.timeframes:
+                self._get_series(symbol, timeframe)
         if success:
             logger.info("All historical data preloaded successfully")
         else:
@@ -79,34 +101,24 @@ class HistoricalDataProvider:
             لیستی از لیست‌ها به فرمت: [timestamp, open, high, low, close, volume]
         """
         try:
-            # بارگذاری داده‌های کامل از CSV
-            df = self.csv_loader.load_symbol_data(symbol, timeframe)
+            series = self._get_series(symbol, timeframe)
 
-            if df is None or df.empty:
+            if series is None:
                 logger.error(f"No data available for {symbol} {timeframe}")
                 return None
 
-            # محدود کردن به زمان فعلی شبیه‌سازی
-            if self.current_time:
-                timestamp_col = self.csv_loader.columns['timestamp']
-                df = df[df[timestamp_col] <= self.current_time]
-
-            # اگر since داده شده، فیلتر از آن زمان به بعد
-            if since:
-                since_dt = datetime.fromtimestamp(since / 1000)
-                timestamp_col = self.csv_loader.columns['timestamp']
-                df = df[df[timestamp_col] >= since_dt]
-
-            # محدود کردن به تعداد limit
-            if len(df) > limit:
-                df = df.tail(limit)
+            timestamps, values, _ = series
+            start, end = self._window(timestamps, limit, since)
 
-            if df.empty:
+            if start >= end:
                 logger.warning(f"No data found for {symbol} {timeframe} up to {self.current_time}")
                 return []
 
-            # تبدیل DataFrame به فرمت API صرافی
-            result = self._dataframe_to_ohlcv_list(df)
+            # تبدیل به فرمت API صرافی
+            result = [
+                [timestamp_ms, *candle]
+                for timestamp_ms, candle in zip(timestamps[start:end].tolist(), values[start:end].tolist())
+            ]
 
             logger.debug(
                 f"Fetched {len(result)} candles for {symbol} {timeframe} "
@@ -119,34 +131,109 @@ class HistoricalDataProvider:
             logger.error(f"Error fetching OHLCV for {symbol} {timeframe}: {e}")
             return None
 
-    def _dataframe_to_ohlcv_list(self, df: pd.DataFrame) -> List[List]:
+    def get_ohlcv_frame(self, symbol: str, timeframe: str,
+                        limit: int = 500,
+                        since: Optional[int] = None) -> Optional[pd.DataFrame]:
         """
-        تبدیل DataFrame به فرمت لیست OHLCV
+        دریافت limit کندل آخر تا زمان فعلی شبیه‌سازی به صورت DataFrame بدون کپی
+
+        با Copy-on-Write (pandas 3) DataFrame برگشتی برشی از داده‌های پایه است و تغییر آن
+        داده‌های provider را تغییر نمی‌دهد؛ بدون آن (pandas 2) یک کپی برگردانده می‌شود.
 
         Args:
-            df: DataFrame حاوی داده‌های کندل
+            symbol: نام نماد
+            timeframe: تایم‌فریم
+            limit: تعداد کندل درخواستی
+            since: timestamp شروع (milliseconds)
+
+        Returns:
+            DataFrame حاوی ستون‌های OHLCV_COLUMNS یا None
+        """
+        series = self._get_series(symbol, timeframe)
+        if series is None:
+            logger.error(f"No data available for {symbol} {timeframe}")
+            return None
+
+        timestamps, _, frame = series
+        start, end = self._window(timestamps, limit, since)
+        window = frame.iloc[start:end].set_axis(pd.RangeIndex(end - start), axis=0)
+
+        # بدون Copy-on-Write برش یک view از آرایه‌های فقط-خواندنی است و تغییر آن خطا می‌دهد
+        if not _copy_on_write():
+            window = window.copy()
+
+        return window
+
+    def _get_series(self, symbol: str, timeframe: str) -> Optional[Tuple[np.ndarray, np.ndarray, pd.DataFrame]]:
+        """
+        آرایه‌های پیوسته یک نماد/تایم‌فریم (یک بار از CSVDataLoader ساخته می‌شوند)
+
+        Args:
+            symbol: نام نماد
+            timeframe: تایم‌فریم
 
         Returns:
-            لیستی از [timestamp_ms, open, high, low, close, volume]
+            (timestamps میلی‌ثانیه، مقادیر OHLCV، DataFrame پایه) یا None
         """
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        if series is not None:
+            return series
+
+        df = self.csv_loader.load_symbol_data(symbol, timeframe)
+        if df is None or df.empty:
+            return None
+
         cols = self.csv_loader.columns
+        timestamps = df[cols['timestamp']].to_numpy(dtype='datetime64[ms]').view(np.int64)
+        values = df[[cols[column] for column in OHLCV_COLUMNS[1:]]].to_numpy(dtype=np.float64)
 
-        result = []
-        for _, row in df.iterrows():
-            # تبدیل timestamp به milliseconds
-            timestamp_ms = int(row[cols['timestamp']].timestamp() * 1000)
-
-            candle = [
-                timestamp_ms,
-                float(row[cols['open']]),
-                float(row[cols['high']]),
-                float(row[cols['low']]),
-                float(row[cols['close']]),
-                float(row[cols['volume']])
-            ]
-            result.append(candle)
+        # searchsorted به timestamps مرتب نیاز دارد
+        if len(timestamps) > 1 and (np.diff(timestamps) < 0).any():
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, values = timestamps[order], values[order]
 
-        return result
+        timestamps = np.ascontiguousarray(timestamps)
+        values = np.ascontiguousarray(values)
+        timestamps.flags.writeable = False
+        values.flags.writeable = False
+
+        frame = pd.DataFrame(values, columns=OHLCV_COLUMNS[1:], copy=False)
+        frame.insert(0, 'timestamp', timestamps.view('datetime64[ms]'))
+
+        series = self._series[key] = (timestamps, values, frame)
+        return series
+
+    @staticmethod
+    def _to_ms(dt: datetime) -> int:
+        """تبدیل datetime (هم‌مقیاس با ستون timestamp داده‌ها) به میلی‌ثانیه"""
+        timestamp = pd.Timestamp(dt)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert(None)
+        return timestamp.value // 1_000_000
+
+    def _window(self, timestamps: np.ndarray, limit: int, since: Optional[int] = None) -> Tuple[int, int]:
+        """
+        محدوده [start, end) کندل‌های تا زمان فعلی شبیه‌سازی (حداکثر limit کندل آخر)
+
+        Args:
+            timestamps: timestamps مرتب (میلی‌ثانیه)
+            limit: تعداد کندل درخواستی
+            since: timestamp شروع (milliseconds)
+
+        Returns:
+            (start, end)
+        """
+        end = len(timestamps)
+        if self.current_time:
+            end = int(np.searchsorted(timestamps, self._to_ms(self.current_time), side='right'))
+
+        start = max(0, end - limit)
+        if since:
+            since_ms = self._to_ms(datetime.fromtimestamp(since / 1000))
+            start = max(start, int(np.searchsorted(timestamps, since_ms, side='left')))
+
+        return start, max(start, end)
 
     async def get_ticker_price(self, symbol: str) -> Optional[float]:
         """
@@ -166,21 +253,20 @@ class HistoricalDataProvider:
             # استفاده از کوچک‌ترین تایم‌فریم برای دقت بیشتر
             smallest_tf = self._get_smallest_timeframe()
 
-            df = self.csv_loader.load_symbol_data(symbol, smallest_tf)
-            if df is None or df.empty:
+            series = self._get_series(symbol, smallest_tf)
+            if series is None:
                 return None
 
-            # فیلتر تا زمان فعلی
-            timestamp_col = self.csv_loader.columns['timestamp']
-            df = df[df[timestamp_col] <= self.current_time]
+            # آخرین کندل تا زمان فعلی
+            timestamps, values, _ = series
+            end = int(np.searchsorted(timestamps, self._to_ms(self.current_time), side='right'))
 
-            if df.empty:
+            if end == 0:
                 logger.warning(f"No price data for {symbol} at {self.current_time}")
                 return None
 
             # آخرین قیمت close
-            close_col = self.csv_loader.columns['close']
-            price = float(df[close_col].iloc[-1])
+            price = float(values[end - 1, OHLCV_COLUMNS.index('close') - 1])
 
             return price
 
@@ -355,30 +441,20 @@ class HistoricalDataProvider:
             دیکشنری حاوی اطلاعات کندل یا None
         """
         try:
-            df = self.csv_loader.load_symbol_data(symbol, timeframe)
-            if df is None or df.empty:
+            series = self._get_series(symbol, timeframe)
+            if series is None:
                 return None
 
-            timestamp_col = self.csv_loader.columns['timestamp']
-
             # پیدا کردن نزدیک‌ترین کندل قبل یا برابر با target_time
-            df = df[df[timestamp_col] <= target_time]
+            timestamps, values, frame = series
+            end = int(np.searchsorted(timestamps, self._to_ms(target_time), side='right'))
 
-            if df.empty:
+            if end == 0:
                 return None
 
             # آخرین ردیف
-            row = df.iloc[-1]
-            cols = self.csv_loader.columns
-
-            candle = {
-                'timestamp': row[cols['timestamp']],
-                'open': float(row[cols['open']]),
-                'high': float(row[cols['high']]),
-                'low': float(row[cols['low']]),
-                'close': float(row[cols['close']]),
-                'volume': float(row[cols['volume']])
-            }
+            candle = {'timestamp': frame['timestamp'].iloc[end - 1]}
+            candle.update(zip(OHLCV_COLUMNS[1:], values[end - 1].tolist()))
 
             return candle
 
@@ -447,6 +523,7 @@ class HistoricalDataProvider:
         بستن اتصالات (در Backtest نیازی نیست ولی برای سازگاری با API)
         """
         logger.info("HistoricalDataProvider closed")
+        self._series.clear()
         self.csv_loader.clear_cache()
 
 
@@ -510,18 +587,9 @@ class BacktestMarketDataFetcher:
         result = {}
 
         for tf in timeframes:
-            ohlcv_list = await self.provider.fetch_ohlcv(symbol, tf, limit=limit)
-
-            if ohlcv_list:
-                # تبدیل لیست به DataFrame
-                df = pd.DataFrame(
-                    ohlcv_list,
-                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                )
-
-                # تبدیل timestamp از milliseconds به datetime
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df = self.provider.get_ohlcv_frame(symbol, tf, limit=limit)
 
+            if df is not None and not df.empty:
                 result[tf] = df
             else:
                 logger.warning(f"No data for {symbol} {tf}")
@@ -561,26 +629,13 @@ class BacktestMarketDataFetcher:
             DataFrame حاوی ستون‌های: timestamp, open, high, low, close, volume
         """
         try:
-            # دریافت داده‌ها از provider
-            ohlcv_list = await self.provider.fetch_ohlcv(
-                symbol=symbol,
-                timeframe=timeframe,
-                limit=limit
-            )
+            # برش limit کندل آخر از آرایه‌های provider (بدون کپی)
+            df = self.provider.get_ohlcv_frame(symbol, timeframe, limit=limit)
 
-            if not ohlcv_list:
+            if df is None or df.empty:
                 logger.warning(f"No data available for {symbol} {timeframe}")
                 return None
 
-            # تبدیل لیست به DataFrame
-            df = pd.DataFrame(
-                ohlcv_list,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-
-            # تبدیل timestamp از milliseconds به datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-
             logger.debug(f"Fetched {len(df)} candles for {symbol} {timeframe}")
 
             return df
@@ -0,0 +1,233 @@
+"""
+ماژول cache_codec.py: سریال‌سازی باینری مقادیر کش Redis
+DataFrame ها به صورت بافرهای ستونی NumPy با یک هدر کوچک ذخیره می‌شوند
+(نوع داده‌ها، ایندکس زمانی و منطقه زمانی حفظ می‌شوند) و سایر داده‌ها به صورت JSON.
+هر مقدار با یک برچسب نوع شروع می‌شود و در صورت بزرگ بودن با zlib فشرده می‌شود.
+
+فرمت:
+    MAGIC (4 بایت) | tag (1 بایت: F=DataFrame، J=JSON) | flags (1 بایت: 1=zlib) | payload
+
+payload در DataFrame:
+    طول هدر (uint32) | هدر JSON | بافر ستون‌ها (هم‌تراز 8 بایتی)
+"""
+
+import json
+import struct
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'SCB\x01'
+TAG_FRAME = b'F'
+TAG_JSON = b'J'
+FLAG_ZLIB = 0x01
+
+_HEADER_LEN = struct.Struct('<I')
+_ALIGN = 8
+
+
+class CacheCodecError(ValueError):
+    """مقدار کش قابل رمزگشایی نیست (برچسب نامعتبر یا داده خراب)"""
+
+
+def _values(values: Any) -> Any:
+    """مقادیر Series/Index: آرایه NumPy برای انواع NumPy، در غیر این صورت آرایه pandas"""
+    return values.to_numpy() if isinstance(values.dtype, np.dtype) else values.array
+
+
+def _encode_array(
+        name: Any,
+        values: Any,
+        buffers: List[bytes],
+        offset: int
+) -> Tuple[Dict[str, Any], int]:
+    """
+    مشخصات و بافر یک ستون (یا ایندکس)
+
+    Returns:
+        (مشخصات ستون برای هدر، آفست بعدی)
+    """
+    dtype = values.dtype
+    spec: Dict[str, Any] = {'name': name, 'dtype': str(dtype)}
+
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        # تاریخ با منطقه زمانی: int64 (UTC) به همراه واحد و منطقه زمانی
+        spec.update(kind='datetime', dtype=f"datetime64[{dtype.unit}]", tz=str(dtype.tz))
+        array = np.asarray(values.asi8)
+    elif isinstance(dtype, np.dtype) and dtype.kind in 'mM':
+        # datetime64/timedelta64 بدون منطقه زمانی
+        spec.update(kind='datetime', tz=None)
+        array = np.asarray(values).view('<i8')
+    elif isinstance(dtype, np.dtype) and dtype.kind in 'biufc':
+        spec['kind'] = 'buffer'
+        array = np.asarray(values)
+    else:
+        # رشته، object و سایر انواع extension: لیست JSON در هدر
+        spec['kind'] = 'json'
+        spec['values'] = [None if pd.isna(v) else v for v in np.asarray(values, dtype=object).tolist()]
+        return spec, offset
+
+    data = np.ascontiguousarray(array).tobytes()
+    padding = -len(data) % _ALIGN
+    spec['offset'] = offset
+    spec['nbytes'] = len(data)
+    buffers.append(data + b'\x00' * padding)
+    return spec, offset + len(data) + padding
+
+
+def _decode_array(spec: Dict[str, Any], body: memoryview, rows: int) -> Any:
+    """بازسازی مقادیر یک ستون از مشخصات هدر"""
+    kind = spec['kind']
+
+    if kind == 'json':
+        return pd.array(spec['values'], dtype=spec['dtype'])
+
+    raw = body[spec['offset']:spec['offset'] + spec['nbytes']]
+    if kind == 'datetime':
+        array = np.frombuffer(raw, dtype='<i8', count=rows).view(spec['dtype'])
+        if spec.get('tz'):
+            return pd.DatetimeIndex(array).tz_localize('UTC').tz_convert(spec['tz'])
+        return array
+
+    return np.frombuffer(raw, dtype=spec['dtype'], count=rows)
+
+
+def encode_frame(df: pd.DataFrame) -> bytes:
+    """
+    سریال‌سازی DataFrame به payload باینری (بدون MAGIC و برچسب)
+
+    Args:
+        df: دیتافریم با ایندکس و ستون‌های تک‌سطحی
+
+    Returns:
+        payload
+    """
+    if isinstance(df.index, pd.MultiIndex) or isinstance(df.columns, pd.MultiIndex):
+        raise CacheCodecError("MultiIndex is not supported")
+
+    buffers: List[bytes] = []
+    offset = 0
+
+    if isinstance(df.index, pd.RangeIndex):
+        index_spec = {
+            'name': df.index.name, 'kind': 'range',
+            'start': df.index.start, 'step': df.index.step
+        }
+    else:
+        index_spec, offset = _encode_array(df.index.name, _values(df.index), buffers, offset)
+        if getattr(df.index, 'freqstr', None):
+            index_spec['freq'] = df.index.freqstr
+
+    column_specs = []
+    for position in range(df.shape[1]):
+        spec, offset = _encode_array(df.columns[position], _values(df.iloc[:, position]), buffers, offset)
+        column_specs.append(spec)
+
+    header = json.dumps(
+        {'rows': len(df), 'index': index_spec, 'columns': column_specs},
+        default=str
+    ).encode('utf-8')
+
+    return b''.join([_HEADER_LEN.pack(len(header)), header, *buffers])
+
+
+def decode_frame(payload: bytes) -> pd.DataFrame:
+    """
+    بازسازی DataFrame از payload تولید شده توسط encode_frame
+
+    Args:
+        payload: بایت‌های payload
+
+    Returns:
+        دیتافریم (ستون‌ها کپی می‌شوند و قابل نوشتن هستند)
+    """
+    view = memoryview(payload)
+    (header_len,) = _HEADER_LEN.unpack_from(view, 0)
+    header = json.loads(bytes(view[_HEADER_LEN.size:_HEADER_LEN.size + header_len]))
+    body = view[_HEADER_LEN.size + header_len:]
+    rows = header['rows']
+
+    index_spec = header['index']
+    if index_spec['kind'] == 'range':
+        index = pd.RangeIndex(
+            start=index_spec['start'],
+            stop=index_spec['start'] + rows * index_spec['step'],
+            step=index_spec['step'],
+            name=index_spec['name']
+        )
+    else:
+        index = pd.Index(_decode_array(index_spec, body, rows), name=index_spec['name'], copy=True)
+        if index_spec.get('freq'):
+            index.freq = index_spec['freq']
+
+    columns = [spec['name'] for spec in header['columns']]
+    data = {}
+    for position, spec in enumerate(header['columns']):
+        values = _decode_array(spec, body, rows)
+        # Series با dtype صریح: سازنده DataFrame نوع ستون‌های object را دوباره استنتاج می‌کند
+        data[position] = pd.Series(values, index=index, dtype=spec['dtype']) if spec['kind'] == 'json' else values
+    df = pd.DataFrame(data, index=index, copy=True)
+    if columns:
+        df.columns = pd.Index(columns)
+    return df
+
+
+def encode_value(data: Any, compress_min_bytes: Optional[int] = 16384, level: int = 1) -> bytes:
+    """
+    سریال‌سازی مقدار کش (DataFrame به صورت باینری، سایر مقادیر به صورت JSON)
+
+    Args:
+        data: مقدار
+        compress_min_bytes: فشرده‌سازی zlib برای payload های بزرگ‌تر از این اندازه (None = غیرفعال)
+        level: سطح فشرده‌سازی zlib
+
+    Returns:
+        بایت‌های قابل ذخیره در Redis
+    """
+    if isinstance(data, pd.DataFrame):
+        tag, payload = TAG_FRAME, encode_frame(data)
+    else:
+        tag, payload = TAG_JSON, json.dumps(data).encode('utf-8')
+
+    flags = 0
+    if compress_min_bytes is not None and len(payload) >= compress_min_bytes:
+        compressed = zlib.compress(payload, level)
+        if len(compressed) < len(payload):
+            payload, flags = compressed, FLAG_ZLIB
+
+    return b''.join([MAGIC, tag, bytes([flags]), payload])
+
+
+def decode_value(raw: bytes) -> Any:
+    """
+    رمزگشایی مقدار تولید شده توسط encode_value
+
+    Args:
+        raw: بایت‌های خوانده شده از Redis
+
+    Returns:
+        DataFrame یا داده JSON
+
+    Raises:
+        CacheCodecError: برچسب نامعتبر (مثلا مقادیر JSON قدیمی) یا داده خراب
+    """
+    if len(raw) < len(MAGIC) + 2 or raw[:len(MAGIC)] != MAGIC:
+        raise CacheCodecError("Unknown cache value format")
+
+    tag = raw[len(MAGIC):len(MAGIC) + 1]
+    flags = raw[len(MAGIC) + 1]
+    payload = raw[len(MAGIC) + 2:]
+
+    try:
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        if tag == TAG_FRAME:
+            return decode_frame(payload)
+        if tag == TAG_JSON:
+            return json.loads(payload)
+    except (zlib.error, ValueError, KeyError, struct.error) as e:
+        raise CacheCodecError(f"Corrupt cache value: {e}") from e
+
+    raise CacheCodecError(f"Unknown cache value tag: {tag!r}")
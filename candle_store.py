@@ -0,0 +1,367 @@
+"""
+ماژول candle_store.py: نگهداری کندل‌های دریافتی از وب‌سوکت در حافظه
+برای هر (نماد، تایم‌فریم) یک بافر حلقوی از آرایه‌های NumPy (OHLCV) نگه داشته می‌شود.
+کندل در حال تشکیل جداگانه نگه داشته می‌شود و با رسیدن اولین به‌روزرسانی کندل بعدی
+نهایی شده و به بافر اضافه می‌شود. تاریخچه اولیه و شکاف‌ها از داده‌های REST پر می‌شوند.
+
+MarketDataFetcher داده را تا زمانی که بافر «گرم» است (تاریخچه کافی، بدون شکاف و
+کندل جاری به‌روز) بدون درخواست REST از این ذخیره‌ساز برمی‌گرداند.
+"""
+
+import logging
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# تنظیم لاگر
+logger = logging.getLogger(__name__)
+
+# ترتیب ستون‌ها مطابق پاسخ REST (kline/query) و پیام کندل وب‌سوکت
+CANDLE_COLUMNS = ('open', 'close', 'high', 'low', 'volume', 'turnover')
+
+
+def _to_ms(timestamp: float) -> int:
+    """تبدیل timestamp (ثانیه، میلی‌ثانیه یا میکروثانیه) به میلی‌ثانیه"""
+    timestamp = int(float(timestamp))
+    if timestamp <= 9999999999:
+        return timestamp * 1000
+    if timestamp <= 9999999999999:
+        return timestamp
+    return timestamp // 1000
+
+
+def parse_candle_message(data: Dict[str, Any]) -> Optional[Tuple[int, List[float]]]:
+    """
+    استخراج کندل از داده پیام وب‌سوکت کندل
+
+    قالب داده: {'symbol': 'XBTUSDTM', 'candles': [time, open, close, high, low, volume, turnover], ...}
+
+    Args:
+        data: فیلد data پیام
+
+    Returns:
+        (زمان شروع کندل به میلی‌ثانیه، مقادیر به ترتیب CANDLE_COLUMNS) یا None
+    """
+    candle = data.get('candles') if isinstance(data, dict) else None
+    if not candle or len(candle) < 5:
+        return None
+
+    try:
+        values = [float(value) for value in candle[1:1 + len(CANDLE_COLUMNS)]]
+        values.extend([0.0] * (len(CANDLE_COLUMNS) - len(values)))
+        return _to_ms(candle[0]), values
+    except (TypeError, ValueError):
+        return None
+
+
+class CandleRingBuffer:
+    """بافر حلقوی کندل‌های بسته شده یک نماد/تایم‌فریم به همراه کندل در حال تشکیل"""
+
+    def __init__(self, timeframe_ms: int, capacity: int = 1000):
+        """
+        مقداردهی اولیه
+
+        Args:
+            timeframe_ms: طول کندل به میلی‌ثانیه
+            capacity: حداکثر کندل‌های بسته شده نگهداری شده
+        """
+        self.timeframe_ms = timeframe_ms
+        self.capacity = capacity
+
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros((capacity, len(CANDLE_COLUMNS)), dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+        # کندل در حال تشکیل (از وب‌سوکت یا آخرین ردیف REST)
+        self.live_timestamp: Optional[int] = None
+        self.live_values: Optional[np.ndarray] = None
+        # آیا کندل جاری توسط جریان وب‌سوکت به‌روز می‌شود
+        self.streaming = False
+
+        # زمان آخرین پیام وب‌سوکت
+        self.last_update = 0.0
+
+    def __len__(self) -> int:
+        return self._size + (1 if self.live_timestamp is not None else 0)
+
+    @property
+    def last_closed_timestamp(self) -> Optional[int]:
+        """زمان شروع آخرین کندل بسته شده"""
+        if self._size == 0:
+            return None
+        return int(self._timestamps[(self._start + self._size - 1) % self.capacity])
+
+    def _append(self, timestamp: int, values: np.ndarray) -> None:
+        """افزودن کندل بسته شده (قدیمی‌ترین کندل در صورت پر بودن بافر حذف می‌شود)"""
+        index = (self._start + self._size) % self.capacity
+        self._timestamps[index] = timestamp
+        self._values[index] = values
+        if self._size == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._size += 1
+
+    def _ordered(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """آخرین count کندل بسته شده به ترتیب زمان (کپی)"""
+        count = min(count, self._size)
+        indices = (self._start + np.arange(self._size - count, self._size)) % self.capacity
+        return self._timestamps[indices], self._values[indices]
+
+    def update(self, timestamp: int, values: Sequence[float]) -> bool:
+        """
+        اعمال به‌روزرسانی کندل از وب‌سوکت
+
+        Args:
+            timestamp: زمان شروع کندل (میلی‌ثانیه)
+            values: مقادیر به ترتیب CANDLE_COLUMNS
+
+        Returns:
+            True اگر کندل قبلی نهایی شد
+        """
+        self.last_update = time.time()
+        finalized = False
+
+        if self.live_timestamp is None:
+            last_closed = self.last_closed_timestamp
+            if last_closed is not None and timestamp <= last_closed:
+                # کندل قبلا بسته شده است
+                return False
+        else:
+            if timestamp < self.live_timestamp:
+                # پیام قدیمی (ترتیب نامنظم)
+                return False
+            if timestamp > self.live_timestamp:
+                # شروع کندل جدید: کندل قبلی بسته شده است
+                last_closed = self.last_closed_timestamp
+                if last_closed is None or self.live_timestamp > last_closed:
+                    self._append(self.live_timestamp, self.live_values)
+                    finalized = True
+
+        self.live_timestamp = timestamp
+        self.live_values = np.asarray(values, dtype=np.float64)
+        self.streaming = True
+        return finalized
+
+    def seed(self, df: pd.DataFrame, now_ms: Optional[int] = None) -> None:
+        """
+        ادغام کندل‌های REST (تاریخچه اولیه یا پر کردن شکاف)
+
+        کندل‌های بسته شده REST جایگزین کندل‌های هم‌زمان بافر می‌شوند. کندل در حال
+        تشکیل REST فقط در صورتی استفاده می‌شود که از کندل جاری وب‌سوکت جدیدتر باشد.
+
+        Args:
+            df: دیتافریم با ایندکس زمانی و ستون‌های open, close, high, low, volume (turnover اختیاری)
+            now_ms: زمان فعلی (میلی‌ثانیه) برای تشخیص کندل‌های بسته شده
+        """
+        if df is None or df.empty:
+            return
+
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        timestamps = np.asarray(df.index.as_unit('ms').asi8 if isinstance(df.index, pd.DatetimeIndex)
+                                else df.index, dtype=np.int64)
+        values = np.column_stack([
+            pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=0.0)
+            if column in df.columns else np.zeros(len(df))
+            for column in CANDLE_COLUMNS
+        ])
+
+        if self.live_timestamp is not None and timestamps.max() > self.live_timestamp:
+            # وب‌سوکت عقب مانده است: کندل‌های جدیدتر REST معتبرند
+            self.live_timestamp = None
+            self.live_values = None
+            self.streaming = False
+
+        closed = timestamps + self.timeframe_ms <= now_ms
+        if self.live_timestamp is not None:
+            closed &= timestamps < self.live_timestamp
+
+        # کندل در حال تشکیل REST
+        forming = np.flatnonzero(~closed)
+        if len(forming):
+            last = forming[-1]
+            if self.live_timestamp is None or timestamps[last] > self.live_timestamp:
+                self.live_timestamp = int(timestamps[last])
+                self.live_values = values[last].copy()
+
+        if not closed.any():
+            return
+
+        # ادغام: REST اول تا در np.unique اولویت داشته باشد
+        old_timestamps, old_values = self._ordered(self._size)
+        all_timestamps = np.concatenate([timestamps[closed], old_timestamps])
+        all_values = np.concatenate([values[closed], old_values])
+        if self.live_timestamp is not None:
+            keep = all_timestamps < self.live_timestamp
+            all_timestamps, all_values = all_timestamps[keep], all_values[keep]
+
+        unique_timestamps, first = np.unique(all_timestamps, return_index=True)
+        unique_timestamps = unique_timestamps[-self.capacity:]
+        first = first[-self.capacity:]
+
+        self._size = len(unique_timestamps)
+        self._start = 0
+        self._timestamps[:self._size] = unique_timestamps
+        self._values[:self._size] = all_values[first]
+
+    def is_warm(self, limit: int, now_ms: int, max_lag_ms: int) -> bool:
+        """
+        آیا limit کندل آخر (شامل کندل جاری) پیوسته و به‌روز هستند
+
+        Args:
+            limit: تعداد کندل مورد نیاز
+            now_ms: زمان فعلی (میلی‌ثانیه)
+            max_lag_ms: حداکثر تاخیر مجاز شروع کندل جاری پس از پایان کندل قبلی
+
+        Returns:
+            True اگر داده بدون درخواست REST قابل استفاده است
+        """
+        if not self.streaming or self.live_timestamp is None or len(self) < limit:
+            return False
+
+        # کندل جاری باید کندل دوره فعلی باشد (با تحمل تاخیر اولین معامله دوره)
+        if self.live_timestamp + self.timeframe_ms + max_lag_ms <= now_ms:
+            return False
+
+        timestamps, _ = self._ordered(limit - 1)
+        timestamps = np.append(timestamps, self.live_timestamp)
+        return bool(np.all(np.diff(timestamps) == self.timeframe_ms))
+
+    def to_frame(self, limit: int) -> pd.DataFrame:
+        """
+        limit کندل آخر (شامل کندل جاری) به صورت دیتافریم
+
+        Returns:
+            دیتافریم با ایندکس timestamp (UTC) و ستون‌های CANDLE_COLUMNS
+        """
+        has_live = self.live_timestamp is not None
+        timestamps, values = self._ordered(limit - 1 if has_live else limit)
+        if has_live:
+            timestamps = np.append(timestamps, self.live_timestamp)
+            values = np.vstack([values, self.live_values])
+
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps, unit='ms', utc=True), name='timestamp')
+        return pd.DataFrame(values, index=index, columns=list(CANDLE_COLUMNS))
+
+
+class CandleStore:
+    """
+    ذخیره‌ساز کندل‌ها به ازای (نماد، تایم‌فریم)
+
+    Usage:
+        store = CandleStore(capacity=1000)
+        store.register('BTCUSDT', '5m', 300000)
+        store.update('BTCUSDT', '5m', timestamp_ms, [open, close, high, low, volume, turnover])
+        df = store.get_frame('BTCUSDT', '5m', limit=200)  # None اگر بافر گرم نیست
+    """
+
+    def __init__(self, capacity: int = 1000, max_lag_seconds: float = 5.0):
+        """
+        مقداردهی اولیه
+
+        Args:
+            capacity: حداکثر کندل‌های بسته شده هر بافر
+            max_lag_seconds: تحمل تاخیر اولین پیام دوره جدید
+        """
+        self.capacity = capacity
+        self.max_lag_ms = int(max_lag_seconds * 1000)
+        self._buffers: Dict[Tuple[str, str], CandleRingBuffer] = {}
+
+        # آمار
+        self.stats = {
+            'updates': 0,
+            'finalized': 0,
+            'seeded': 0,
+            'hits': 0,
+            'misses': 0
+        }
+
+    def register(self, symbol: str, timeframe: str, timeframe_ms: int) -> CandleRingBuffer:
+        """ایجاد (یا دریافت) بافر نماد/تایم‌فریم"""
+        key = (symbol, timeframe)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = CandleRingBuffer(timeframe_ms, self.capacity)
+            self._buffers[key] = buffer
+        return buffer
+
+    def mark_stale(self) -> None:
+        """قطع جریان وب‌سوکت: تا پیام بعدی هر بافر، داده از REST دریافت می‌شود"""
+        for buffer in self._buffers.values():
+            buffer.streaming = False
+
+    def unregister(self, symbol: str, timeframe: str) -> None:
+        """حذف بافر نماد/تایم‌فریم"""
+        self._buffers.pop((symbol, timeframe), None)
+
+    def is_registered(self, symbol: str, timeframe: str) -> bool:
+        return (symbol, timeframe) in self._buffers
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def update(self, symbol: str, timeframe: str, timestamp: int, values: Sequence[float]) -> bool:
+        """
+        اعمال به‌روزرسانی کندل وب‌سوکت
+
+        Returns:
+            True اگر کندل قبلی نهایی شد (False برای نماد/تایم‌فریم ثبت نشده)
+        """
+        buffer = self._buffers.get((symbol, timeframe))
+        if buffer is None:
+            return False
+
+        self.stats['updates'] += 1
+        finalized = buffer.update(timestamp, values)
+        if finalized:
+            self.stats['finalized'] += 1
+        return finalized
+
+    def seed(self, symbol: str, timeframe: str, df: pd.DataFrame, now_ms: Optional[int] = None) -> None:
+        """ادغام کندل‌های REST در بافر ثبت شده (در غیر این صورت نادیده گرفته می‌شود)"""
+        buffer = self._buffers.get((symbol, timeframe))
+        if buffer is None:
+            return
+        buffer.seed(df, now_ms)
+        self.stats['seeded'] += 1
+
+    def get_frame(
+            self,
+            symbol: str,
+            timeframe: str,
+            limit: int,
+            now_ms: Optional[int] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        دریافت limit کندل آخر در صورت گرم بودن بافر
+
+        Returns:
+            دیتافریم یا None (بافر ثبت نشده، تاریخچه ناکافی، شکاف یا داده قدیمی)
+        """
+        buffer = self._buffers.get((symbol, timeframe))
+        if buffer is None:
+            return None
+
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        if not buffer.is_warm(limit, now_ms, self.max_lag_ms):
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return buffer.to_frame(limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        آمار ذخیره‌ساز کندل
+
+        Returns:
+            دیکشنری آمار
+        """
+        return dict(
+            self.stats,
+            buffers=len(self._buffers),
+            candles=sum(len(buffer) for buffer in self._buffers.values()),
+            capacity=self.capacity
+        )
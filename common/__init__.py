@@ -0,0 +1,5 @@
+"""
+پکیج common - ابزارهای مشترک بین ماژول‌های ربات
+کلاینت صرافی، دریافت داده، مدیریت معاملات و signal_generation همگی به این پکیج وابسته‌اند
+و این پکیج به هیچ‌کدام از آن‌ها وابسته نیست.
+"""
@@ -0,0 +1,111 @@
+"""
+LatencyHistogram - fixed-bucket latency histogram with percentiles.
+
+Constant memory per histogram (one counter per bucket), O(1) recording and
+mergeable, so it can be kept per pipeline stage and per symbol/timeframe and
+combined across worker processes. Percentiles are interpolated inside the
+bucket that contains them, so they are accurate to the bucket resolution.
+
+Usage:
+    histogram = LatencyHistogram()
+    histogram.record(0.012)                 # seconds
+    histogram.percentile(95)                # seconds
+    histogram.summary()                     # count, avg, p50, p95, p99, max
+"""
+
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence
+
+# Bucket upper bounds in seconds (a final overflow bucket catches the rest)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+class LatencyHistogram:
+    """Latency histogram over fixed buckets."""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds: Optional[Sequence[float]] = None):
+        """
+        Initialize LatencyHistogram.
+
+        Args:
+            bounds: Ascending bucket upper bounds in seconds (default: DEFAULT_BUCKETS)
+        """
+        self.bounds = tuple(bounds) if bounds is not None else DEFAULT_BUCKETS
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one observation."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add the observations of another histogram with the same buckets."""
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different buckets")
+
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile.
+
+        Args:
+            q: Percentile (0-100)
+
+        Returns:
+            Latency in seconds (0.0 if empty)
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q / 100.0 * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if i == len(self.bounds):
+                    return self.max
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = min(self.bounds[i], self.max)
+                fraction = (rank - cumulative) / count
+                return lower + (max(upper, lower) - lower) * fraction
+            cumulative += count
+
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Get count, average, p50/p95/p99 and maximum (seconds).
+
+        Returns:
+            Dictionary with the summary
+        """
+        return {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyHistogram(count={self.count}, "
+            f"p50={self.percentile(50) * 1000:.1f}ms, "
+            f"p99={self.percentile(99) * 1000:.1f}ms)"
+        )
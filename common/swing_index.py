@@ -0,0 +1,185 @@
+"""
+SwingIndex - shared swing-point (pivot) index of one DataFrame.
+
+Swing highs/lows are computed once per window size with vectorized rolling
+windows and reused by every consumer of the same candles: SRAnalyzer,
+HarmonicAnalyzer, the chart patterns (via PatternOrchestrator) and
+DynamicStopManager. AnalysisContext keeps one index per analysis
+(symbol, timeframe, candle).
+
+Usage:
+    swings = context.get_swing_index()
+    highs, lows = swings.pivots(5)                    # window pivots
+    peaks = swings.peaks('high', distance=5, prominence_factor=0.5)
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+
+class SwingIndex:
+    """
+    Swing highs and lows of a DataFrame, memoized per parameter set.
+
+    Positions are row positions (0 = first row). With `lookback`, results
+    match a scan of df.tail(lookback): positions are relative to the tail
+    and only pivots whose whole window lies inside the tail are returned.
+    Returned arrays are read-only and shared.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        high_col: str = 'high',
+        low_col: str = 'low'
+    ):
+        """
+        Initialize SwingIndex.
+
+        Args:
+            df: DataFrame with OHLC data
+            high_col: Name of high price column
+            low_col: Name of low price column
+        """
+        self.df = df
+        self.columns = (high_col, low_col)
+        self._series = {
+            'high': np.ascontiguousarray(df[high_col].values, dtype=float),
+            'low': np.ascontiguousarray(df[low_col].values, dtype=float)
+        }
+
+        self._pivots: Dict[Tuple, np.ndarray] = {}
+        self._peaks: Dict[Tuple, np.ndarray] = {}
+
+    def covers(self, df: pd.DataFrame, high_col: str = 'high', low_col: str = 'low') -> bool:
+        """Check if this index was built from df with the given columns."""
+        return df is self.df and (high_col, low_col) == self.columns
+
+    def values(self, kind: str, lookback: Optional[int] = None) -> np.ndarray:
+        """
+        Get the high or low series.
+
+        Args:
+            kind: 'high' or 'low'
+            lookback: Number of last candles (None = all)
+
+        Returns:
+            Series values
+        """
+        series = self._series[kind]
+        if lookback is not None and lookback < len(series):
+            return series[len(series) - lookback:]
+        return series
+
+    def _window_pivots(self, kind: str, window: int, strict: bool) -> np.ndarray:
+        """
+        Positions of window pivots over the full series (memoized).
+
+        A bar is a swing high when its high is the maximum of the 2*window+1
+        bars centred on it (strict: higher than every other bar of the window);
+        swing lows mirror this. Bars closer than `window` to either end are
+        never pivots.
+        """
+        key = (kind, window, strict)
+        positions = self._pivots.get(key)
+        if positions is not None:
+            return positions
+
+        series = self._series[kind] if kind == 'high' else -self._series['low']
+        n = len(series)
+
+        if window < 1 or n < 2 * window + 1:
+            positions = np.empty(0, dtype=np.intp)
+        else:
+            center = series[window:n - window]
+            if strict:
+                side_max = sliding_window_view(series, window).max(axis=1)
+                left = side_max[:n - 2 * window]
+                right = side_max[window + 1:]
+                mask = (center > left) & (center > right)
+            else:
+                mask = center == sliding_window_view(series, 2 * window + 1).max(axis=1)
+            positions = np.flatnonzero(mask) + window
+
+        positions.flags.writeable = False
+        self._pivots[key] = positions
+        return positions
+
+    def pivots(
+        self,
+        window: int,
+        strict: bool = False,
+        lookback: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get swing high and swing low positions for a window size.
+
+        Args:
+            window: Number of bars on each side of the pivot
+            strict: Require the pivot to beat every other bar (no ties)
+            lookback: Restrict to df.tail(lookback) (positions relative to the tail)
+
+        Returns:
+            (swing high positions, swing low positions), ascending
+        """
+        window = int(window)
+        highs = self._window_pivots('high', window, strict)
+        lows = self._window_pivots('low', window, strict)
+
+        n = len(self._series['high'])
+        if lookback is None or lookback >= n:
+            return highs, lows
+
+        offset = n - lookback
+        start = offset + window
+        return (
+            highs[np.searchsorted(highs, start):] - offset,
+            lows[np.searchsorted(lows, start):] - offset
+        )
+
+    def peaks(
+        self,
+        kind: str,
+        distance: int,
+        prominence_factor: float,
+        lookback: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Get prominent peaks (kind='high') or troughs (kind='low').
+
+        Runs scipy.signal.find_peaks with prominence = std(series) * prominence_factor,
+        memoized per parameter set.
+
+        Args:
+            kind: 'high' or 'low'
+            distance: Minimum distance between peaks
+            prominence_factor: Required prominence in standard deviations
+            lookback: Restrict to df.tail(lookback) (positions relative to the tail)
+
+        Returns:
+            Peak positions, ascending
+        """
+        key = (kind, distance, prominence_factor, lookback)
+        positions = self._peaks.get(key)
+        if positions is not None:
+            return positions
+
+        from scipy.signal import find_peaks
+
+        series = self.values(kind, lookback)
+        signal = series if kind == 'high' else -series
+        positions, _ = find_peaks(
+            signal,
+            distance=distance,
+            prominence=np.std(series) * prominence_factor
+        )
+
+        positions.flags.writeable = False
+        self._peaks[key] = positions
+        return positions
@@ -0,0 +1,319 @@
+"""
+TTLCache - bounded in-memory cache with LRU eviction and per-key TTL.
+
+One cache component for the bot's in-memory caches (SmartCache memory tier,
+ExchangeClient response cache, correlation caches, analysis contexts):
+- O(1) get / set / evict (OrderedDict in least recently used order)
+- per-key TTL (default_ttl when not given; None = no expiry)
+- entry and byte budgets (bytes measured by an optional size_of function)
+- async single-flight loading: concurrent get_or_load() calls for the same
+  missing key share one loader call
+- uniform statistics (get_stats)
+
+Expired entries are dropped when read, when they reach the LRU end, and by a
+full purge at most once per purge_interval during set().
+
+Usage:
+    cache = TTLCache(max_entries=1000, default_ttl=60)
+    cache.set('ticker:BTCUSDT', data, ttl=5)
+    data = cache.get('ticker:BTCUSDT')
+    data = await cache.get_or_load('ticker:BTCUSDT', fetch_ticker, ttl=5)
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Returned by get() for missing keys when no default is given
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache with per-key TTL, entry/byte budgets and single-flight loading."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1000,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        size_of: Optional[Callable[[Any], int]] = None,
+        purge_interval: float = 60.0,
+        name: str = 'cache'
+    ):
+        """
+        Initialize TTLCache.
+
+        Args:
+            max_entries: Maximum number of entries (None = unbounded)
+            max_bytes: Maximum total size of the entries (None = unbounded)
+            default_ttl: TTL in seconds for set() without ttl (None = no expiry)
+            size_of: Size of a value in bytes (default: every entry counts 0)
+            purge_interval: Minimum seconds between full expiry scans in set()
+            name: Name used in statistics and logs
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.size_of = size_of
+        self.purge_interval = purge_interval
+        self.name = name
+
+        # key -> (value, stored at, expires at or None, size), least recently used first
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, float, Optional[float], int]]' = OrderedDict()
+        self._bytes = 0
+        self._last_purge = time.monotonic()
+        self._lock = threading.Lock()
+
+        # key -> Future of the running single-flight load
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        # Statistics
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stale': 0,
+            'puts': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'rejected': 0,
+            'loads': 0,
+            'coalesced': 0
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry (lock held)."""
+        _, _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _remove_expired(self, now: float) -> int:
+        """Remove all expired entries (lock held)."""
+        expired = [
+            key for key, (_, _, expires_at, _) in self._entries.items()
+            if expires_at is not None and expires_at <= now
+        ]
+        for key in expired:
+            self._remove(key)
+        self.stats['expirations'] += len(expired)
+        self._last_purge = now
+        return len(expired)
+
+    def _evict(self, now: float) -> None:
+        """Remove least recently used entries while over a budget (lock held)."""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries) or
+            (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, (_, _, expires_at, _) = next(iter(self._entries.items()))
+            self._remove(key)
+            if expires_at is not None and expires_at <= now:
+                self.stats['expirations'] += 1
+            else:
+                self.stats['evictions'] += 1
+
+    def get(self, key: Hashable, default: Any = None, max_age: Optional[float] = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Returned when the key is missing, expired or too old
+            max_age: Only return the value if it was stored less than max_age
+                     seconds ago; older entries are kept for other callers
+
+        Returns:
+            Cached value or default
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+
+            value, stored_at, expires_at, _ = entry
+
+            if expires_at is not None and expires_at <= now:
+                self._remove(key)
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return default
+
+            if max_age is not None and now - stored_at >= max_age:
+                self.stats['stale'] += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires (default: default_ttl)
+
+        Returns:
+            False if the value alone exceeds max_bytes and was not stored
+        """
+        size = self.size_of(value) if self.size_of is not None else 0
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.monotonic()
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if self.max_bytes is not None and size > self.max_bytes:
+                self.stats['rejected'] += 1
+                return False
+
+            if now - self._last_purge >= self.purge_interval:
+                self._remove_expired(now)
+
+            self._entries[key] = (value, now, now + ttl if ttl is not None else None, size)
+            self._bytes += size
+            self.stats['puts'] += 1
+            self._evict(now)
+            return True
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        max_age: Optional[float] = None,
+        cache_none: bool = False
+    ) -> Any:
+        """
+        Get a cached value, or load it once for all concurrent callers.
+
+        While a load for key is running, other callers await the same result
+        instead of starting their own load. A loader exception is raised in
+        all waiting callers and nothing is cached. If the loading caller is
+        cancelled, the waiting callers are not: they retry (one of them
+        starts a new load).
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value
+            ttl: TTL of the loaded value (default: default_ttl)
+            max_age: See get()
+            cache_none: Also cache a None result
+
+        Returns:
+            Cached or loaded value
+        """
+        while True:
+            value = self.get(key, _MISSING, max_age=max_age)
+            if value is not _MISSING:
+                return value
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+
+            self.stats['coalesced'] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Only the loading caller was cancelled: retry
+                if future.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.stats['loads'] += 1
+        try:
+            value = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so an unawaited future does not log a warning
+            future.exception()
+            raise
+        except BaseException:
+            # Cancellation of this caller is not passed on to the waiting callers
+            future.cancel()
+            raise
+        else:
+            if value is not None or cache_none:
+                self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key.
+
+        Returns:
+            True if the key was cached
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def purge_expired(self) -> int:
+        """
+        Remove all expired entries.
+
+        Returns:
+            Number of removed entries
+        """
+        with self._lock:
+            return self._remove_expired(time.monotonic())
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Change the budgets (None keeps the current value) and evict as needed."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict(time.monotonic())
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and (entry[2] is None or entry[2] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        """Total size of the cached values."""
+        return self._bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['stale']
+        return dict(
+            self.stats,
+            name=self.name,
+            entries=len(self._entries),
+            bytes=self._bytes,
+            max_entries=self.max_entries,
+            max_bytes=self.max_bytes,
+            hit_rate=self.stats['hits'] / lookups if lookups else 0.0
+        )
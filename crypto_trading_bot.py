@@ -40,6 +40,7 @@ from signal_generation.systems.market_regime_detector import MarketRegimeDetecto
 from signal_generation.systems.adaptive_learning_system import AdaptiveLearningSystem
 from signal_generation.systems.correlation_manager import CorrelationManager
 from signal_generation.systems.emergency_circuit_breaker import EmergencyCircuitBreaker
+from log_pipeline import LogPipeline, RateLimitFilter
 
 # ماژول‌های هوش مصنوعی
 from trading_brain_ai import TradingBrainAI
@@ -1202,6 +1203,7 @@ class CryptoTradingBot:
 
         self.trading_brain: Optional[TradingBrainAI] = None
         self.ml_integration: Optional[MLSignalIntegration] = None
+        self._log_pipeline: Optional[LogPipeline] = None
         self._setup_logging()
 
         # وهله‌های اجزای سیستم
@@ -1612,7 +1614,13 @@ class CryptoTradingBot:
             }
 
     def _setup_logging(self):
-        """راه‌اندازی سیستم لاگینگ با پشتیبانی از چرخش لاگ و فرمت‌های بهتر"""
+        """
+        راه‌اندازی سیستم لاگینگ با پشتیبانی از چرخش لاگ و فرمت‌های بهتر
+
+        با logging.async (پیش‌فرض فعال) هندلرهای کنسول و فایل در ترد پس‌زمینه
+        LogPipeline اجرا می‌شوند و حلقه asyncio فقط رکورد را در صف قرار می‌دهد.
+        logging.rate_limits محدودیت نرخ/نمونه‌برداری به ازای پیشوند نام لاگر است.
+        """
         log_config = self.config.get('logging', {})
         log_level_str = log_config.get('level', 'INFO').upper()
         log_format = log_config.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -1620,10 +1628,18 @@ class CryptoTradingBot:
         log_rotate = log_config.get('rotate', False)
         log_max_size = log_config.get('max_size', 10 * 1024 * 1024)  # 10MB پیش‌فرض
         log_backup_count = log_config.get('backup_count', 5)
+        log_async = log_config.get('async', True)
+        log_queue_size = log_config.get('queue_size', 10000)
+        log_rate_limits = log_config.get('rate_limits') or {}
 
         log_level = getattr(logging, log_level_str, logging.INFO)
         formatter = logging.Formatter(log_format)
 
+        # توقف خط لوله قبلی (نوشتن رکوردهای باقی‌مانده صف)
+        if self._log_pipeline is not None:
+            self._log_pipeline.stop()
+            self._log_pipeline = None
+
         # تنظیم لاگر اصلی
         root_logger = logging.getLogger()
         if root_logger.hasHandlers():
@@ -1634,7 +1650,8 @@ class CryptoTradingBot:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        handlers = [console_handler]
+        file_error = None
 
         # هندلر فایل
         if log_file:
@@ -1658,10 +1675,29 @@ class CryptoTradingBot:
 
                 file_handler.setLevel(log_level)
                 file_handler.setFormatter(formatter)
-                root_logger.addHandler(file_handler)
-                logger.info(f"لاگ در فایل: {log_file}{' (با چرخش)' if log_rotate else ''}")
+                handlers.append(file_handler)
             except Exception as e:
-                logger.error(f"خطا در تنظیم هندلر فایل لاگ: {e}", exc_info=True)
+                file_error = e
+
+        if log_async:
+            # نوشتن لاگ در ترد پس‌زمینه (غیرمسدودکننده برای حلقه asyncio)
+            self._log_pipeline = LogPipeline(
+                handlers,
+                queue_size=log_queue_size,
+                rate_limits=log_rate_limits
+            )
+            self._log_pipeline.start()
+        else:
+            rate_filter = RateLimitFilter(log_rate_limits) if log_rate_limits else None
+            for handler in handlers:
+                if rate_filter:
+                    handler.addFilter(rate_filter)
+                root_logger.addHandler(handler)
+
+        if file_error is not None:
+            logger.error(f"خطا در تنظیم هندلر فایل لاگ: {file_error}", exc_info=file_error)
+        elif log_file:
+            logger.info(f"لاگ در فایل: {log_file}{' (با چرخش)' if log_rotate else ''}")
         else:
             logger.info("لاگ فایل غیرفعال است.")
 
@@ -2632,6 +2668,10 @@ class CryptoTradingBot:
             except Exception as e:
                 logger.error(f"خطا در بررسی وضعیت توقف اضطراری: {e}")
 
+        # آمار خط لوله لاگینگ (صف و پیام‌های حذف شده)
+        if self._log_pipeline is not None:
+            component_stats['logging'] = self._log_pipeline.get_stats()
+
         # اضافه کردن آمار تغییرات تنظیمات
         config_changes = self.running_status.get('config_changes', [])
         if config_changes:
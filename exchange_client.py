@@ -17,7 +17,8 @@ import pandas as pd
 import redis.asyncio as redis
 import websockets
 import random
-from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, Any, Optional, List, Union, Callable, Awaitable, Tuple, Set, cast
 from urllib.parse import urlencode
@@ -28,6 +29,11 @@ import os
 from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor
 
+from common.ttl_cache import TTLCache
+from candle_store import CandleStore, parse_candle_message
+from rate_limiter import RateLimiter, PRIORITY_NORMAL
+from http_tracing import HttpTracer
+
 logger = logging.getLogger(__name__)
 
 # نگاشت تایم‌فریم‌ها به Granularity (دقیقه) برای صرافی
@@ -40,6 +46,9 @@ TIMEFRAME_MAP = {
 # مپینگ عکس برای تبدیل granularity به timeframe
 GRANULARITY_TO_TIMEFRAME = {v: k for k, v in TIMEFRAME_MAP.items()}
 
+# حداکثر کندل در هر درخواست kline/query
+KLINE_PAGE_SIZE = 200
+
 
 # تعریف انواع قراردادها
 class ContractType(Enum):
@@ -69,11 +78,17 @@ class ExchangeConfig:
     redis_db: int = 0  # شماره دیتابیس Redis
     redis_password: Optional[str] = None  # رمز عبور Redis (اختیاری)
     debug_mode: bool = False  # حالت دیباگ
-    rate_limit_requests_per_second: float = 5.0  # تعداد درخواست در ثانیه
     websocket_enabled: bool = True  # فعال‌سازی وب‌سوکت
     websocket_ping_interval: int = 20  # فاصله زمانی ping (ثانیه)
     websocket_reconnect_delay: int = 5  # تاخیر اتصال مجدد (ثانیه)
+    websocket_candle_buffer_size: int = 1000  # حداکثر کندل‌های بسته شده هر بافر وب‌سوکت
+    websocket_candle_max_lag: float = 5.0  # تحمل تاخیر اولین پیام کندل دوره جدید (ثانیه)
     health_check_interval: int = 60  # فاصله زمانی بررسی سلامت (ثانیه)
+    http_pool_limit: int = 100  # حداکثر اتصالات باز استخر HTTP
+    http_limit_per_host: int = 20  # حداکثر اتصالات همزمان به هر هاست
+    http_dns_cache_ttl: int = 300  # مدت کش DNS (ثانیه)
+    http_keepalive_timeout: float = 30.0  # مدت نگهداری اتصال بیکار در استخر (ثانیه)
+    http_tracing: bool = True  # ردیابی تاخیر اندپوینت‌ها و استفاده مجدد از اتصالات
 
 
 @dataclass
@@ -94,18 +109,6 @@ class PriceData:
         return (time.time() - self.timestamp) < max_age_seconds
 
 
-@dataclass
-class CacheEntry:
-    """کلاس نگهداری داده کش شده با زمان انقضا"""
-    data: Any
-    timestamp: float = field(default_factory=time.time)
-    expiry: float = 60  # زمان انقضا (ثانیه)
-
-    def is_expired(self) -> bool:
-        """بررسی انقضای داده کش شده"""
-        return (time.time() - self.timestamp) > self.expiry
-
-
 class ExchangeClient:
     """
     کلاینت آسنکرون برای تعامل با API صرافی با پشتیبانی از کش چندلایه و مدیریت خطای پیشرفته.
@@ -141,11 +144,17 @@ class ExchangeClient:
             redis_db=exchange_config.get('redis_db', 0),
             redis_password=exchange_config.get('redis_password'),
             debug_mode=exchange_config.get('debug_mode', False),
-            rate_limit_requests_per_second=exchange_config.get('rate_limit_requests_per_second', 5.0),
             websocket_enabled=exchange_config.get('websocket', {}).get('enabled', True),
             websocket_ping_interval=exchange_config.get('websocket', {}).get('ping_interval', 20),
             websocket_reconnect_delay=exchange_config.get('websocket', {}).get('reconnect_delay', 5),
-            health_check_interval=exchange_config.get('health_check_interval', 60)
+            websocket_candle_buffer_size=exchange_config.get('websocket', {}).get('candle_buffer_size', 1000),
+            websocket_candle_max_lag=exchange_config.get('websocket', {}).get('candle_max_lag_seconds', 5.0),
+            health_check_interval=exchange_config.get('health_check_interval', 60),
+            http_pool_limit=exchange_config.get('http', {}).get('pool_limit', 100),
+            http_limit_per_host=exchange_config.get('http', {}).get('limit_per_host', 20),
+            http_dns_cache_ttl=exchange_config.get('http', {}).get('dns_cache_ttl', 300),
+            http_keepalive_timeout=exchange_config.get('http', {}).get('keepalive_timeout', 30.0),
+            http_tracing=exchange_config.get('http', {}).get('tracing', True)
         )
 
         # بررسی اولیه برای وجود URL صحیح فیوچرز
@@ -160,9 +169,21 @@ class ExchangeClient:
         # وهله ClientSession برای ارسال درخواست‌ها
         self._session: Optional[aiohttp.ClientSession] = None
 
+        # ردیابی درخواست‌های HTTP (آمار آن پس از بازنشانی نشست حفظ می‌شود)
+        self._http_tracer: Optional[HttpTracer] = HttpTracer() if self.config.http_tracing else None
+
         # قفل برای ایجاد session به صورت thread-safe
         self._session_lock = asyncio.Lock()
 
+        # تنظیمات اتصال تغییر کرده است: نشست در درخواست بعدی (_init_session) از نو ساخته می‌شود
+        self._session_dirty = False
+
+        # تعداد درخواست‌های در حال اجرای هر نشست و نشست‌های کنار گذاشته شده که پس از
+        # پایان درخواست‌هایشان بسته می‌شوند
+        self._session_requests: Dict[aiohttp.ClientSession, int] = {}
+        self._retired_sessions: Set[aiohttp.ClientSession] = set()
+        self._session_close_tasks: Set[asyncio.Task] = set()
+
         # یک Semaphore برای محدود کردن تعداد درخواست‌های همزمان (مدیریت Rate Limit)
         self._request_lock = asyncio.Semaphore(self.config.max_concurrent_requests)
 
@@ -179,7 +200,8 @@ class ExchangeClient:
         self._thread_executor = ThreadPoolExecutor(max_workers=4)
 
         # کش‌های داخلی
-        self._memory_cache: Dict[str, CacheEntry] = {}
+        # کش LRU پاسخ‌ها با انقضای جداگانه برای هر کلید و بارگذاری تک‌پرواز
+        self._memory_cache = TTLCache(max_entries=1000, name='exchange_memory_cache')
         self._price_cache: Dict[str, PriceData] = {}
         self._symbol_info_cache: Dict[str, Dict[str, Any]] = {}
 
@@ -190,13 +212,9 @@ class ExchangeClient:
         self._server_time_diff: Optional[float] = None
         self._last_server_time_sync = 0
 
-        # مدیریت Rate Limit
-        self._rate_limit_time_window = 1.0 / self.config.rate_limit_requests_per_second
-        self._endpoint_last_request: Dict[str, float] = {}
+        # مدیریت Rate Limit: سهمیه‌های وزن‌دار صرافی به ازای گروه اندپوینت (مشترک با MarketDataFetcher)
+        self.rate_limiter = RateLimiter.from_config(exchange_config.get('rate_limits', {}))
         self._rate_limit_violations: Dict[str, int] = {}
-        self._min_request_interval: Dict[str, float] = {}
-        for endpoint in ['kline', 'ticker', 'orders', 'account', 'public', 'server_time']:
-            self._min_request_interval[endpoint] = self._rate_limit_time_window
 
         # آمار API
         self._api_stats = {
@@ -227,6 +245,13 @@ class ExchangeClient:
         # WebSocket قیمت‌های دریافتی
         self._ws_prices: Dict[str, PriceData] = {}
 
+        # کندل‌های دریافتی از وب‌سوکت: بافر حلقوی به ازای (نماد، تایم‌فریم)
+        self.candle_store = CandleStore(
+            capacity=self.config.websocket_candle_buffer_size,
+            max_lag_seconds=self.config.websocket_candle_max_lag
+        )
+        self._ws_candle_topics: Dict[str, Tuple[str, str]] = {}  # {topic: (symbol, timeframe)}
+
         # مدیریت وضعیت خطا
         self._error_backoff = {
             'count': 0,
@@ -272,8 +297,8 @@ class ExchangeClient:
             if new_base_url != self.config.base_url:
                 logger.info(f"آدرس پایه API تغییر کرد از '{self.config.base_url}' به '{new_base_url}'")
                 self.config.base_url = new_base_url
-                # بازنشانی نشست HTTP در چرخه بعدی بررسی سلامت
-                asyncio.create_task(self._reset_http_session())
+                # بازنشانی نشست HTTP در درخواست بعدی
+                self._session_dirty = True
 
             # تنظیمات درخواست‌ها
             self.config.max_concurrent_requests = exchange_config.get('max_concurrent_requests',
@@ -324,15 +349,17 @@ class ExchangeClient:
                 # بازنشانی اتصال Redis
                 self._init_redis()
 
-            # تنظیمات مدیریت نرخ
-            new_rate_limit = exchange_config.get('rate_limit_requests_per_second',
-                                                 self.config.rate_limit_requests_per_second)
-            if new_rate_limit != self.config.rate_limit_requests_per_second:
-                self.config.rate_limit_requests_per_second = new_rate_limit
-                self._rate_limit_time_window = 1.0 / self.config.rate_limit_requests_per_second
-                for endpoint in self._min_request_interval:
-                    self._min_request_interval[endpoint] = self._rate_limit_time_window
-                logger.info(f"محدودیت نرخ درخواست به‌روزرسانی شد: {new_rate_limit} درخواست در ثانیه")
+            # تنظیمات مدیریت نرخ (صف‌های انتظار فعلی حفظ می‌شوند)
+            rate_limits_config = exchange_config.get('rate_limits')
+            if rate_limits_config is not None:
+                self.rate_limiter.configure(
+                    pools=rate_limits_config.get('pools'),
+                    endpoints=rate_limits_config.get('endpoints'),
+                    order=rate_limits_config.get('order', self.rate_limiter.order),
+                    utilization_target=rate_limits_config.get('utilization_target',
+                                                              self.rate_limiter.utilization_target)
+                )
+                logger.info("سهمیه‌های محدودیت نرخ به‌روزرسانی شد")
 
             # تنظیمات WebSocket
             websocket_config = exchange_config.get('websocket', {})
@@ -361,6 +388,21 @@ class ExchangeClient:
             self.config.health_check_interval = exchange_config.get('health_check_interval',
                                                                     self.config.health_check_interval)
 
+            # تنظیمات استخر اتصال HTTP (اعمال با ساخت نشست جدید)
+            http_config = exchange_config.get('http', {})
+            new_http_settings = (
+                http_config.get('pool_limit', self.config.http_pool_limit),
+                http_config.get('limit_per_host', self.config.http_limit_per_host),
+                http_config.get('dns_cache_ttl', self.config.http_dns_cache_ttl),
+                http_config.get('keepalive_timeout', self.config.http_keepalive_timeout)
+            )
+            if new_http_settings != (self.config.http_pool_limit, self.config.http_limit_per_host,
+                                     self.config.http_dns_cache_ttl, self.config.http_keepalive_timeout):
+                (self.config.http_pool_limit, self.config.http_limit_per_host,
+                 self.config.http_dns_cache_ttl, self.config.http_keepalive_timeout) = new_http_settings
+                logger.info(f"تنظیمات استخر اتصال HTTP تغییر کرد: {new_http_settings}")
+                self._session_dirty = True
+
             # به‌روزرسانی وضعیت کلاینت
             self._client_health_status['last_update_time'] = time.time()
 
@@ -432,15 +474,23 @@ class ExchangeClient:
         async with self._session_lock:
             # اگر session از خارج تنظیم شده و معتبر است، از آن استفاده کن
             if self._session is not None and not self._session.closed:
-                return
+                if not self._session_dirty:
+                    return
+
+                # تنظیمات اتصال تغییر کرده (update_config): نشست قبلی پس از پایان
+                # درخواست‌های در حال اجرای آن بسته می‌شود
+                self._retire_session(self._session)
+                self._session = None
+
+            self._session_dirty = False
 
-            # تنظیمات TCP بهینه
+            # تنظیمات TCP (exchange.http)
             connector = aiohttp.TCPConnector(
-                limit=100,  # حداکثر 100 اتصال همزمان
-                ttl_dns_cache=300,  # کش DNS به مدت 5 دقیقه
-                keepalive_timeout=30.0,  # زمان نگهداری اتصال باز
+                limit=self.config.http_pool_limit,  # حداکثر اتصالات همزمان
+                ttl_dns_cache=self.config.http_dns_cache_ttl,  # مدت کش DNS
+                keepalive_timeout=self.config.http_keepalive_timeout,  # زمان نگهداری اتصال باز
                 enable_cleanup_closed=True,  # پاکسازی اتصالات بسته شده
-                limit_per_host=20,  # حداکثر 20 اتصال همزمان به هر هاست
+                limit_per_host=self.config.http_limit_per_host,  # حداکثر اتصال همزمان به هر هاست
                 ssl=False  # غیرفعال کردن SSL برای کارایی بیشتر (در صورت نیاز)
             )
 
@@ -457,7 +507,8 @@ class ExchangeClient:
                     connector=connector,
                     timeout=timeout,
                     headers={"Accept-Encoding": "gzip, deflate"},
-                    json_serialize=json.dumps
+                    json_serialize=json.dumps,
+                    trace_configs=[self._http_tracer.trace_config] if self._http_tracer else None
                 )
                 logger.info("نشست HTTP جدید با تنظیمات بهینه ایجاد شد")
                 self._client_health_status['http_status'] = 'connected'
@@ -475,6 +526,42 @@ class ExchangeClient:
                 }
                 raise ConnectionError("خطا در راه‌اندازی نشست HTTP") from e
 
+    @asynccontextmanager
+    async def _session_in_use(self):
+        """نشست فعلی برای یک درخواست؛ تا پایان درخواست بسته نمی‌شود"""
+        session = self._session
+        self._session_requests[session] = self._session_requests.get(session, 0) + 1
+        try:
+            yield session
+        finally:
+            remaining = self._session_requests[session] - 1
+            if remaining:
+                self._session_requests[session] = remaining
+            else:
+                del self._session_requests[session]
+                if session in self._retired_sessions:
+                    self._retire_session(session)
+
+    def _retire_session(self, session: aiohttp.ClientSession) -> None:
+        """بستن نشست کنار گذاشته شده، پس از پایان درخواست‌های در حال اجرای آن"""
+        if self._session_requests.get(session):
+            self._retired_sessions.add(session)
+            return
+
+        self._retired_sessions.discard(session)
+        task = asyncio.create_task(self._close_session(session))
+        self._session_close_tasks.add(task)
+        task.add_done_callback(self._session_close_tasks.discard)
+
+    @staticmethod
+    async def _close_session(session: aiohttp.ClientSession) -> None:
+        """بستن یک نشست HTTP"""
+        try:
+            await session.close()
+            logger.debug("نشست HTTP قبلی بسته شد")
+        except Exception as e:
+            logger.error(f"خطا در بستن نشست HTTP: {e}")
+
     def _start_maintenance_tasks(self) -> None:
         """راه‌اندازی تسک‌های نگهداری"""
         # اگر قبلا تسک‌ها شروع شده‌اند، آنها را لغو کن
@@ -495,27 +582,17 @@ class ExchangeClient:
             while True:
                 await asyncio.sleep(300)  # هر 5 دقیقه
 
-                async with self._cache_lock:
-                    # حذف موارد منقضی شده از کش حافظه
-                    current_time = time.time()
-                    expired_keys = [k for k, v in self._memory_cache.items() if v.is_expired()]
-                    for key in expired_keys:
-                        del self._memory_cache[key]
+                # حذف موارد منقضی شده از کش حافظه (اندازه کش توسط LRU محدود می‌شود)
+                expired_count = self._memory_cache.purge_expired()
 
+                async with self._cache_lock:
                     # حذف قیمت‌های قدیمی
                     expired_price_keys = [k for k, v in self._price_cache.items() if not v.is_fresh(300)]  # 5 دقیقه
                     for key in expired_price_keys:
                         del self._price_cache[key]
 
-                    # محدود کردن اندازه کش
-                    if len(self._memory_cache) > 1000:
-                        # حذف قدیمی‌ترین موارد
-                        sorted_items = sorted(self._memory_cache.items(), key=lambda x: x[1].timestamp)
-                        for key, _ in sorted_items[:len(sorted_items) // 4]:  # حذف 25% قدیمی‌ترین موارد
-                            del self._memory_cache[key]
-
-                    logger.debug(
-                        f"پاکسازی کش: {len(expired_keys)} مورد منقضی و {len(expired_price_keys)} قیمت قدیمی حذف شدند")
+                logger.debug(
+                    f"پاکسازی کش: {expired_count} مورد منقضی و {len(expired_price_keys)} قیمت قدیمی حذف شدند")
 
         except asyncio.CancelledError:
             logger.debug("حلقه پاکسازی کش لغو شد")
@@ -600,8 +677,10 @@ class ExchangeClient:
                     logger.error(f"خطا در بستن نشست HTTP: {e}")
 
             self._session = None
-            await self._init_session()
-            logger.info("نشست HTTP بازنشانی شد")
+
+        # خارج از قفل: _init_session خودش قفل را می‌گیرد
+        await self._init_session()
+        logger.info("نشست HTTP بازنشانی شد")
 
     async def _restart_websocket(self) -> None:
         """راه‌اندازی مجدد اتصال وب‌سوکت"""
@@ -626,11 +705,11 @@ class ExchangeClient:
             endpoint = "/api/v1/timestamp"
 
             # درخواست مستقیم (بدون استفاده از _make_request برای جلوگیری از حلقه)
-            if not self._session or self._session.closed:
+            if not self._session or self._session.closed or self._session_dirty:
                 await self._init_session()
 
             url = f"{self.config.base_url}{endpoint}"
-            async with self._session.get(url) as response:
+            async with self._session_in_use() as session, session.get(url) as response:
                 if response.status == 200:
                     response_data = await response.json()
                     if response_data.get('code') == '200000':
@@ -804,88 +883,64 @@ class ExchangeClient:
 
         return signature
 
-    async def _apply_rate_limit(self, rate_limit_key: str) -> None:
+    async def _apply_rate_limit(
+            self,
+            rate_limit_key: str,
+            signed: bool = False,
+            priority: int = PRIORITY_NORMAL
+    ) -> None:
         """
-        اعمال محدودیت نرخ برای یک اندپوینت خاص
+        انتظار برای سهمیه درخواست در محدودکننده نرخ وزن‌دار
 
         Args:
-            rate_limit_key: کلید اندپوینت برای اعمال محدودیت نرخ
+            rate_limit_key: گروه اندپوینت (وزن و استخر سهمیه از تنظیمات rate_limits)
+            signed: درخواست امضا شده (استخر private برای گروه‌های ناشناخته)
+            priority: اولویت درخواست در صف انتظار
         """
-        # فعال‌سازی backoff برای اندپوینت‌هایی که نقض rate limit داشته‌اند
-        backoff_multiplier = 1.0
-        if rate_limit_key in self._rate_limit_violations and self._rate_limit_violations[rate_limit_key] > 0:
-            # افزایش تاخیر با توجه به تعداد نقض‌ها
-            violations = self._rate_limit_violations[rate_limit_key]
-            backoff_multiplier = min(5.0, 1.0 + (violations * 0.15))
-
-        # محاسبه حداقل فاصله زمانی بین درخواست‌ها
-        if rate_limit_key not in self._min_request_interval:
-            self._min_request_interval[rate_limit_key] = self._rate_limit_time_window
-
-        min_interval = self._min_request_interval[rate_limit_key] * backoff_multiplier
-
-        # بررسی زمان آخرین درخواست و انتظار در صورت نیاز
-        current_time = time.time()
-        if rate_limit_key in self._endpoint_last_request:
-            elapsed_time = current_time - self._endpoint_last_request[rate_limit_key]
-            if elapsed_time < min_interval:
-                wait_time = min_interval - elapsed_time
-                if wait_time > 0.05:  # فقط برای تاخیرهای قابل توجه
-                    await asyncio.sleep(wait_time)
-
-        # به‌روزرسانی زمان آخرین درخواست
-        self._endpoint_last_request[rate_limit_key] = time.time()
+        waited = await self.rate_limiter.acquire(rate_limit_key, signed=signed, priority=priority)
+        if waited > 1.0:
+            logger.debug(f"انتظار {waited:.2f}s برای سهمیه {rate_limit_key}")
 
-    async def _handle_rate_limit_violation(self, rate_limit_key: str, retry_after: Optional[float] = None) -> None:
+    async def _handle_rate_limit_violation(
+            self,
+            rate_limit_key: str,
+            retry_after: Optional[float] = None,
+            signed: bool = False
+    ) -> None:
         """
         ثبت و مدیریت نقض محدودیت نرخ
 
         Args:
             rate_limit_key: کلید اندپوینت که نقض محدودیت نرخ داشته
             retry_after: زمان پیشنهادی برای انتظار قبل از درخواست بعدی (ثانیه)
+            signed: درخواست امضا شده
         """
         # افزایش شمارنده نقض‌ها
         if rate_limit_key not in self._rate_limit_violations:
             self._rate_limit_violations[rate_limit_key] = 0
         self._rate_limit_violations[rate_limit_key] += 1
 
-        # تنظیم حداقل فاصله زمانی برای این اندپوینت
-        current_interval = self._min_request_interval.get(rate_limit_key, self._rate_limit_time_window)
-
-        # اگر retry_after مشخص شده، از آن استفاده کن
-        if retry_after:
-            new_interval = max(current_interval, retry_after)
-        else:
-            # افزایش تاخیر به صورت نمایی
-            violations = self._rate_limit_violations[rate_limit_key]
-            backoff_multiplier = min(5.0, 1.0 + (violations * 0.15))
-            new_interval = self._rate_limit_time_window * backoff_multiplier
-
-        self._min_request_interval[rate_limit_key] = new_interval
+        # توقف استخر سهمیه تا retry_after و کاهش نرخ آن (همه درخواست‌های منتظر این استخر)
+        throttle = self.rate_limiter.penalize(rate_limit_key, retry_after, signed=signed)
 
-        logger.warning(f"محدودیت نرخ برای {rate_limit_key} نقض شد. فاصله جدید: {new_interval:.2f}s")
+        logger.warning(f"محدودیت نرخ برای {rate_limit_key} نقض شد. ضریب نرخ استخر: {throttle:.2f}")
 
-    async def _recover_from_rate_limit_violation(self, rate_limit_key: str) -> None:
+    async def _recover_from_rate_limit_violation(self, rate_limit_key: str, signed: bool = False) -> None:
         """
         بهبود تدریجی از نقض محدودیت نرخ
 
         Args:
             rate_limit_key: کلید اندپوینت
+            signed: درخواست امضا شده
         """
         # کاهش تدریجی شمارنده نقض‌ها
         if rate_limit_key in self._rate_limit_violations and self._rate_limit_violations[rate_limit_key] > 0:
             self._rate_limit_violations[rate_limit_key] -= 1
-
-            # در صورت رسیدن به صفر، بازنشانی فاصله زمانی به مقدار پیش‌فرض
             if self._rate_limit_violations[rate_limit_key] == 0:
-                self._min_request_interval[rate_limit_key] = self._rate_limit_time_window
                 logger.info(f"بهبود کامل محدودیت نرخ برای {rate_limit_key}")
-            else:
-                # کاهش تدریجی فاصله زمانی
-                current_interval = self._min_request_interval.get(rate_limit_key, self._rate_limit_time_window)
-                new_interval = max(self._rate_limit_time_window, current_interval * 0.9)  # کاهش 10 درصدی
-                self._min_request_interval[rate_limit_key] = new_interval
-                logger.debug(f"پیشرفت بهبود محدودیت نرخ برای {rate_limit_key}. فاصله جدید: {new_interval:.2f}s")
+
+        # بازگشت تدریجی نرخ استخر
+        self.rate_limiter.recover(rate_limit_key, signed=signed)
 
     async def _fetch_with_cache(
             self,
@@ -894,7 +949,8 @@ class ExchangeClient:
             rate_limit_key: str,
             params: Optional[Dict[str, Any]] = None,
             signed: bool = False,
-            cache_ttl: Optional[int] = None
+            cache_ttl: Optional[int] = None,
+            priority: int = PRIORITY_NORMAL
     ) -> Optional[Any]:
         """
         درخواست HTTP با کش چندلایه
@@ -906,6 +962,7 @@ class ExchangeClient:
             params: پارامترهای درخواست
             signed: آیا درخواست نیاز به امضا دارد
             cache_ttl: زمان انقضای کش (ثانیه)
+            priority: اولویت درخواست در صف محدودیت نرخ
 
         Returns:
             داده‌های دریافتی یا None در صورت خطا
@@ -918,40 +975,40 @@ class ExchangeClient:
         memory_ttl = cache_ttl or self.config.memory_cache_ttl
         redis_ttl = cache_ttl or self.config.redis_cache_ttl
 
-        # بررسی کش حافظه
-        memory_result = await self._get_from_memory_cache(cache_key, memory_ttl)
-        if memory_result is not None:
-            self._api_stats['cache_hits'] += 1
-            return memory_result
+        # بدون بارگذاری: پاسخ از کش حافظه یا از درخواست همزمان مشابه (تک‌پرواز) آمده است
+        from_cache = True
+
+        async def load() -> Optional[Any]:
+            nonlocal from_cache
 
-        # بررسی کش Redis
-        if self.config.use_redis_cache and self._redis_client:
-            redis_result = await self._get_from_redis_cache(cache_key)
-            if redis_result is not None:
-                # ذخیره در کش حافظه برای دسترسی‌های بعدی
-                await self._set_in_memory_cache(cache_key, redis_result, memory_ttl)
-                self._api_stats['cache_hits'] += 1
-                return redis_result
+            # بررسی کش Redis
+            if self.config.use_redis_cache and self._redis_client:
+                redis_result = await self._get_from_redis_cache(cache_key)
+                if redis_result is not None:
+                    return redis_result
 
-        # اعمال محدودیت نرخ درخواست
-        await self._apply_rate_limit(rate_limit_key)
+            from_cache = False
 
-        # دریافت از API
-        response = await self._make_request(method, endpoint, params, signed)
+            # دریافت از API (محدودیت نرخ در هر تلاش _make_request اعمال می‌شود)
+            response = await self._make_request(
+                method, endpoint, params, signed, rate_limit_key=rate_limit_key, priority=priority
+            )
 
-        # ذخیره در کش‌ها اگر درخواست موفق بود
-        if response is not None:
-            # بهبود از نقض محدودیت نرخ در صورت موفقیت
-            await self._recover_from_rate_limit_violation(rate_limit_key)
+            # ذخیره در Redis اگر درخواست موفق بود
+            if response is not None:
+                # بهبود از نقض محدودیت نرخ در صورت موفقیت
+                await self._recover_from_rate_limit_violation(rate_limit_key, signed)
 
-            # ذخیره در کش حافظه
-            await self._set_in_memory_cache(cache_key, response, memory_ttl)
+                if self.config.use_redis_cache and self._redis_client:
+                    await self._set_in_redis_cache(cache_key, response, redis_ttl)
 
-            # ذخیره در کش Redis
-            if self.config.use_redis_cache and self._redis_client:
-                await self._set_in_redis_cache(cache_key, response, redis_ttl)
+            return response
 
-        return response
+        # بررسی کش حافظه؛ در صورت عدم وجود، درخواست‌های همزمان با کلید یکسان یک بار اجرا می‌شوند
+        result = await self._memory_cache.get_or_load(cache_key, load, ttl=memory_ttl)
+        if from_cache:
+            self._api_stats['cache_hits'] += 1
+        return result
 
     async def _get_from_memory_cache(self, key: str, ttl: int) -> Optional[Any]:
         """
@@ -964,17 +1021,10 @@ class ExchangeClient:
         Returns:
             داده کش شده یا None
         """
-        async with self._cache_lock:
-            if key in self._memory_cache:
-                cache_entry = self._memory_cache[key]
-                if not cache_entry.is_expired():
-                    if self.config.debug_mode:
-                        logger.debug(f"یافتن کش حافظه برای {key}")
-                    return cache_entry.data
-                else:
-                    # حذف داده منقضی شده
-                    del self._memory_cache[key]
-        return None
+        data = self._memory_cache.get(key, max_age=ttl)
+        if data is not None and self.config.debug_mode:
+            logger.debug(f"یافتن کش حافظه برای {key}")
+        return data
 
     async def _set_in_memory_cache(self, key: str, data: Any, ttl: int) -> None:
         """
@@ -985,18 +1035,8 @@ class ExchangeClient:
             data: داده برای ذخیره
             ttl: زمان انقضا (ثانیه)
         """
-        async with self._cache_lock:
-            self._memory_cache[key] = CacheEntry(data=data, timestamp=time.time(), expiry=ttl)
-
-            # بررسی سایز کش و پاکسازی در صورت نیاز
-            if len(self._memory_cache) > 1000:  # محدودیت حداکثر 1000 آیتم
-                # حذف قدیمی‌ترین آیتم‌ها
-                entries = [(k, v.timestamp) for k, v in self._memory_cache.items()]
-                entries.sort(key=lambda x: x[1])  # مرتب‌سازی بر اساس زمان (قدیمی‌ترین اول)
-
-                # حذف 25% قدیمی‌ترین موارد
-                for k, _ in entries[:len(entries) // 4]:
-                    del self._memory_cache[k]
+        # در صورت پر بودن کش (1000 مورد)، قدیمی‌ترین مورد (LRU) حذف می‌شود
+        self._memory_cache.set(key, data, ttl=ttl)
 
     async def _get_from_redis_cache(self, key: str) -> Optional[Any]:
         """
@@ -1054,7 +1094,9 @@ class ExchangeClient:
             endpoint: str,
             params: Optional[Dict[str, Any]] = None,
             signed: bool = False,
-            retry_count: Optional[int] = None
+            retry_count: Optional[int] = None,
+            rate_limit_key: Optional[str] = None,
+            priority: int = PRIORITY_NORMAL
     ) -> Optional[Union[Dict, List]]:
         """
         انجام درخواست HTTP به API
@@ -1065,12 +1107,14 @@ class ExchangeClient:
             params: پارامترهای درخواست
             signed: آیا درخواست نیاز به امضا دارد
             retry_count: تعداد تلاش مجدد در صورت خطا
+            rate_limit_key: گروه اندپوینت برای محدودیت نرخ (پیش‌فرض: مسیر درخواست با وزن 1)
+            priority: اولویت درخواست در صف محدودیت نرخ
 
         Returns:
             پاسخ از API یا None در صورت خطا
         """
-        # اطمینان از وجود aiohttp Session
-        if not self._session or self._session.closed:
+        # اطمینان از وجود aiohttp Session (و ساخت دوباره آن پس از تغییر تنظیمات اتصال)
+        if not self._session or self._session.closed or self._session_dirty:
             await self._init_session()
 
         if self._session is None:
@@ -1080,8 +1124,12 @@ class ExchangeClient:
 
         # تنظیم تعداد تلاش مجدد
         retries_left = retry_count if retry_count is not None else self.config.retry_count
+        rate_limit_key = rate_limit_key or endpoint
 
         while retries_left >= 0:
+            # سهمیه هر تلاش (پیش از ساخت timestamp امضا)
+            await self._apply_rate_limit(rate_limit_key, signed, priority)
+
             start_time = time.time()
             url = f"{self.config.base_url}{endpoint}"
             headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
@@ -1140,7 +1188,7 @@ class ExchangeClient:
                                           f"بدنه: {body_str[:150]}..." if body_str else "هیچ")
                         logger.debug(f"ارسال {method} به API: {endpoint} | {log_params_str}")
 
-                    async with self._session.request(
+                    async with self._session_in_use() as session, session.request(
                             method, url, headers=headers, data=data_payload, params=request_params
                     ) as response:
                         status_code = response.status
@@ -1173,14 +1221,13 @@ class ExchangeClient:
                         # بررسی rate limit
                         if status_code == 429:
                             retry_after = float(response.headers.get('Retry-After', 1))
-                            await self._handle_rate_limit_violation(endpoint.split('/')[1], retry_after)
                             endpoint_stats['failures'] += 1
 
-                            # تاخیر قبل از تلاش مجدد
+                            # توقف استخر سهمیه؛ تلاش مجدد در _apply_rate_limit منتظر پایان آن می‌ماند
                             wait_time = retry_after + random.uniform(0, 0.5)  # افزودن jitter
+                            await self._handle_rate_limit_violation(rate_limit_key, wait_time, signed)
                             logger.warning(
                                 f"محدودیت نرخ برای {endpoint} نقض شد. انتظار {wait_time:.2f}s قبل از تلاش مجدد.")
-                            await asyncio.sleep(wait_time)
                             retries_left -= 1
                             continue
 
@@ -1350,11 +1397,13 @@ class ExchangeClient:
             limit: int = 200,
             start_time_s: Optional[int] = None,
             end_time_s: Optional[int] = None,
-            since: Optional[int] = None
+            since: Optional[int] = None,
+            priority: int = PRIORITY_NORMAL
     ) -> Optional[pd.DataFrame]:
         """
         دریافت کندل‌های OHLCV با پشتیبانی از تعداد زیاد کندل‌ها.
-        اگر limit بیشتر از 200 باشد، درخواست‌های متعدد ارسال می‌شود.
+        اگر limit بیشتر از 200 باشد، پنجره‌های زمانی صفحات از قبل محاسبه شده و
+        صفحات به صورت همزمان (در محدوده rate limit) دریافت می‌شوند.
 
         Args:
             symbol: نماد ارز (مثلا 'BTC/USDT')
@@ -1363,6 +1412,7 @@ class ExchangeClient:
             start_time_s: زمان شروع به ثانیه (اختیاری)
             end_time_s: زمان پایان به ثانیه (اختیاری)
             since: زمان شروع به میلی‌ثانیه (اختیاری، برای سازگاری)
+            priority: اولویت درخواست‌ها در صف محدودیت نرخ
         """
         kucoin_symbol = self._get_kucoin_symbol(symbol)
         granularity = TIMEFRAME_MAP.get(timeframe)
@@ -1376,7 +1426,7 @@ class ExchangeClient:
             start_time_s = since / 1000
 
         # اگر limit بیشتر از 200 نباشد، از روش عادی استفاده می‌کنیم
-        if limit <= 200:
+        if limit <= KLINE_PAGE_SIZE:
             endpoint = "/api/v1/kline/query"
             params = {'symbol': kucoin_symbol, 'granularity': granularity}
 
@@ -1385,88 +1435,108 @@ class ExchangeClient:
             if end_time_s:
                 params['to'] = int(end_time_s * 1000)
 
-            return await self._fetch_single_ohlcv(endpoint, params, symbol, timeframe)
+            return await self._fetch_single_ohlcv(endpoint, params, symbol, timeframe, priority)
 
-        # برای limit بیشتر از 200، از چندین درخواست استفاده می‌کنیم
-        all_candles = []
-        batch_size = 200
-        remaining = limit
-
-        # محاسبه زمان پایان اگر مشخص نشده باشد
+        # برای limit بیشتر از 200، صفحات به صورت همزمان دریافت می‌شوند
         if end_time_s is None:
             end_time_s = time.time()
 
-        # محاسبه طول کندل به ثانیه
-        candle_duration_ms = self.timeframe_to_ms(timeframe)
-        candle_duration_s = candle_duration_ms / 1000 if candle_duration_ms else 3600  # پیش‌فرض 1 ساعت
-
-        # اگر زمان شروع مشخص نشده، آن را محاسبه می‌کنیم
-        if start_time_s is None:
-            start_time_s = end_time_s - (limit * candle_duration_s)
-
-        current_end_time = end_time_s
-
-        while remaining > 0 and current_end_time > start_time_s:
-            batch_limit = min(batch_size, remaining)
-
-            # محاسبه زمان شروع برای این batch
-            batch_start_time = current_end_time - (batch_limit * candle_duration_s)
-
-            endpoint = "/api/v1/kline/query"
-            params = {
-                'symbol': kucoin_symbol,
-                'granularity': granularity,
-                'from': int(batch_start_time * 1000),
-                'to': int(current_end_time * 1000)
-            }
-
-            # دریافت کندل‌ها
-            batch_df = await self._fetch_single_ohlcv(endpoint, params, symbol, timeframe)
+        windows = self._kline_page_windows(timeframe, limit, start_time_s, end_time_s)
+        endpoint = "/api/v1/kline/query"
+
+        # همه صفحات همزمان؛ سرعت ارسال را سهمیه kline و سمافور درخواست‌ها محدود می‌کنند
+        pages = await asyncio.gather(*(
+            self._fetch_single_ohlcv(
+                endpoint,
+                {'symbol': kucoin_symbol, 'granularity': granularity, 'from': window_start, 'to': window_end},
+                symbol,
+                timeframe,
+                priority
+            )
+            for window_start, window_end in windows
+        ), return_exceptions=True)
 
-            if batch_df is None or batch_df.empty:
-                # اگر داده‌ای دریافت نشد، احتمالاً به ابتدای داده‌ها رسیده‌ایم
+        # فقط صفحات پیوسته از جدیدترین صفحه تا اولین صفحه ناموفق یا خالی (ابتدای تاریخچه)
+        all_candles = []
+        for (window_start, window_end), page in zip(windows, pages):
+            if isinstance(page, BaseException):
+                logger.error(f"خطا در دریافت صفحه کندل {symbol} {timeframe} ({window_start}-{window_end}): {page}")
+                page = None
+            if page is None:
+                if not all_candles:
+                    return None
+                logger.warning(f"دریافت صفحات قدیمی‌تر {symbol} {timeframe} ناموفق بود، "
+                               f"{len(all_candles)} صفحه از {len(windows)} استفاده می‌شود")
                 break
-
-            # اضافه کردن کندل‌های جدید (جدیدترین‌ها اول)
-            all_candles.append(batch_df)
-
-            remaining -= len(batch_df)
-            current_end_time = batch_start_time
-
-            # تاخیر کوتاه برای رعایت rate limit
-            await asyncio.sleep(0.2)
-
-            # بررسی اینکه آیا کافی کندل دریافت کردیم
-            if len(batch_df) < batch_limit:
-                # احتمالاً دیگر کندل‌های قدیمی‌تری موجود نیست
+            if page.empty:
                 break
+            all_candles.append(page)
 
         if not all_candles:
             logger.warning(f"هیچ داده‌ای برای {symbol} {timeframe} بازگردانده نشد")
             return pd.DataFrame()
 
-        # ترکیب تمام batch‌ها
+        # ترکیب صفحات، حذف کندل‌های تکراری مرز صفحات و یک مرتب‌سازی (قدیمی‌ترین‌ها اول)
         final_df = pd.concat(all_candles)
-
-        # حذف ردیف‌های تکراری
-        final_df = final_df[~final_df.index.duplicated(keep='last')]
-
-        # مرتب‌سازی بر اساس زمان (قدیمی‌ترین‌ها اول)
-        final_df = final_df.sort_index()
+        final_df = final_df[~final_df.index.duplicated(keep='last')].sort_index()
 
         # برش‌ زدن به تعداد دقیق درخواست شده
         if len(final_df) > limit:
             final_df = final_df.iloc[-limit:]
 
-        logger.info(f"با موفقیت {len(final_df)} کندل برای {symbol} {timeframe} دریافت شد")
+        logger.info(f"با موفقیت {len(final_df)} کندل برای {symbol} {timeframe} در {len(all_candles)} صفحه دریافت شد")
         return final_df
 
+    def _kline_page_windows(
+            self,
+            timeframe: str,
+            limit: int,
+            start_time_s: Optional[float],
+            end_time_s: float
+    ) -> List[Tuple[int, int]]:
+        """
+        محاسبه پنجره‌های زمانی صفحات kline (هر صفحه حداکثر KLINE_PAGE_SIZE کندل)
+
+        Args:
+            timeframe: تایم‌فریم
+            limit: تعداد کل کندل‌ها
+            start_time_s: زمان شروع به ثانیه (None = به اندازه limit کندل قبل از پایان)
+            end_time_s: زمان پایان به ثانیه
+
+        Returns:
+            لیست (from, to) به میلی‌ثانیه، جدیدترین صفحه اول
+        """
+        # طول کندل (پیش‌فرض 1 ساعت)
+        candle_duration_ms = self.timeframe_to_ms(timeframe) or 3600 * 1000
+        page_duration_ms = KLINE_PAGE_SIZE * candle_duration_ms
+
+        end_ms = int(end_time_s * 1000)
+        if start_time_s is None:
+            start_ms = end_ms - limit * candle_duration_ms
+        else:
+            start_ms = int(start_time_s * 1000)
+
+        if start_ms >= end_ms:
+            return []
+
+        page_count = min(
+            -(-limit // KLINE_PAGE_SIZE),
+            -(-(end_ms - start_ms) // page_duration_ms)
+        )
+
+        windows = []
+        for page in range(page_count):
+            window_end = end_ms - page * page_duration_ms
+            windows.append((max(start_ms, window_end - page_duration_ms), window_end))
+        return windows
+
     async def _fetch_single_ohlcv(
             self,
             endpoint: str,
             params: Dict[str, Any],
             symbol: str,
-            timeframe: str
+            timeframe: str,
+            priority: int = PRIORITY_NORMAL
     ) -> Optional[pd.DataFrame]:
         """
         دریافت یک batch از کندل‌های OHLCV
@@ -1476,16 +1546,17 @@ class ExchangeClient:
             params: پارامترهای درخواست
             symbol: نماد ارز
             timeframe: تایم‌فریم
+            priority: اولویت درخواست در صف محدودیت نرخ
         """
         rate_limit_key = "kline"
 
         # درخواست با پشتیبانی کش
         response_data = await self._fetch_with_cache(
-            'GET', endpoint, rate_limit_key, params=params, signed=False, cache_ttl=60
+            'GET', endpoint, rate_limit_key, params=params, signed=False, cache_ttl=60, priority=priority
         )
 
-        # پردازش پاسخ
-        if response_data and isinstance(response_data, list):
+        # پردازش پاسخ (لیست خالی یعنی پیش از ابتدای تاریخچه نماد)
+        if isinstance(response_data, list):
             if not response_data:
                 return pd.DataFrame()
 
@@ -1943,7 +2014,7 @@ class ExchangeClient:
             f"ثبت سفارش {order_type} {side} برای {symbol}: اندازه={size}، قیمت={price}، قیمت توقف={stop_price}")
 
         # سفارش‌ها نباید کش شوند
-        response_data = await self._make_request('POST', endpoint, params, signed=True)
+        response_data = await self._make_request('POST', endpoint, params, signed=True, rate_limit_key=rate_limit_key)
 
         if response_data and isinstance(response_data, dict) and 'orderId' in response_data:
             logger.info(f"سفارش با موفقیت برای {symbol} ثبت شد: {response_data['orderId']}")
@@ -1970,7 +2041,7 @@ class ExchangeClient:
         rate_limit_key = "orders"
 
         logger.info(f"لغو سفارش: {order_id}")
-        response_data = await self._make_request('DELETE', endpoint, {}, signed=True)
+        response_data = await self._make_request('DELETE', endpoint, {}, signed=True, rate_limit_key=rate_limit_key)
 
         if response_data:
             logger.info(f"سفارش با موفقیت لغو شد: {order_id}")
@@ -1993,7 +2064,7 @@ class ExchangeClient:
         rate_limit_key = "orders"
 
         logger.debug(f"دریافت وضعیت سفارش: {order_id}")
-        response_data = await self._make_request('GET', endpoint, {}, signed=True)
+        response_data = await self._make_request('GET', endpoint, {}, signed=True, rate_limit_key=rate_limit_key)
 
         if response_data and isinstance(response_data, dict):
             return response_data
@@ -2019,7 +2090,7 @@ class ExchangeClient:
             params['symbol'] = self._get_kucoin_symbol(symbol)
 
         logger.debug(f"دریافت سفارشات باز" + (f" برای {symbol}" if symbol else ""))
-        response_data = await self._make_request('GET', endpoint, params, signed=True)
+        response_data = await self._make_request('GET', endpoint, params, signed=True, rate_limit_key=rate_limit_key)
 
         if response_data and isinstance(response_data, dict) and 'items' in response_data:
             return response_data['items']
@@ -2038,7 +2109,7 @@ class ExchangeClient:
         rate_limit_key = "account"
 
         logger.debug("دریافت اطلاعات کلی حساب")
-        response_data = await self._make_request('GET', endpoint, {}, signed=True)
+        response_data = await self._make_request('GET', endpoint, {}, signed=True, rate_limit_key=rate_limit_key)
 
         if response_data and isinstance(response_data, dict):
             return response_data
@@ -2064,7 +2135,7 @@ class ExchangeClient:
             params['symbol'] = self._get_kucoin_symbol(symbol)
 
         logger.debug(f"دریافت پوزیشن‌ها" + (f" برای {symbol}" if symbol else ""))
-        response_data = await self._make_request('GET', endpoint, params, signed=True)
+        response_data = await self._make_request('GET', endpoint, params, signed=True, rate_limit_key=rate_limit_key)
 
         if response_data and isinstance(response_data, list):
             return response_data
@@ -2254,6 +2325,9 @@ class ExchangeClient:
 
         logger.info("حلقه گوش دادن وب‌سوکت پایان یافت.")
 
+        # کندل‌های جاری دیگر به‌روز نمی‌شوند
+        self.candle_store.mark_stale()
+
         # اگر به اینجا برسیم و هنوز _ws_running فعال است، راه‌اندازی مجدد اتصال
         if self._ws_running:
             asyncio.create_task(self._reconnect_ws())
@@ -2275,7 +2349,9 @@ class ExchangeClient:
                 # تایید اشتراک یا لغو اشتراک
                 sub_id = data.get('id')
                 if sub_id and ':' in sub_id:
+                    # شناسه: action:topic:timestamp (خود topic هم شامل ':' است)
                     action, topic = sub_id.split(':', 1)
+                    topic = topic.rsplit(':', 1)[0]
                     if action == 'sub':
                         self._ws_subscriptions.add(topic)
                         logger.info(f"اشتراک برای {topic} تایید شد")
@@ -2316,7 +2392,7 @@ class ExchangeClient:
             if 'ticker' in topic:
                 # پیام ticker - به‌روزرسانی قیمت
                 await self._process_ticker_message(topic, message_data)
-            elif 'candle' in topic:
+            elif topic in self._ws_candle_topics:
                 # پیام کندل
                 await self._process_candle_message(topic, message_data)
             elif 'level2' in topic:
@@ -2392,9 +2468,24 @@ class ExchangeClient:
             return None
 
     async def _process_candle_message(self, topic: str, data: Dict[str, Any]):
-        """پردازش پیام کندل از وب‌سوکت."""
-        # پیاده‌سازی پردازش پیام کندل
-        pass
+        """پردازش پیام کندل از وب‌سوکت و به‌روزرسانی بافر کندل نماد/تایم‌فریم."""
+        try:
+            subscription = self._ws_candle_topics.get(topic)
+            if not subscription:
+                return
+
+            candle = parse_candle_message(data)
+            if candle is None:
+                logger.debug("پیام کندل نامعتبر برای %s: %s", topic, data)
+                return
+
+            symbol, timeframe = subscription
+            timestamp, values = candle
+            if self.candle_store.update(symbol, timeframe, timestamp, values):
+                logger.debug("کندل %s %s نهایی شد", symbol, timeframe)
+
+        except Exception as e:
+            logger.error(f"خطا در پردازش پیام کندل: {e}", exc_info=True)
 
     async def _process_orderbook_message(self, topic: str, data: Dict[str, Any]):
         """پردازش پیام order book از وب‌سوکت."""
@@ -2591,6 +2682,7 @@ class ExchangeClient:
 
         self._ws_connection = None
         self._ws_subscriptions.clear()
+        self.candle_store.mark_stale()
         self._client_health_status['ws_status'] = 'not_connected'
         logger.info("اتصال وب‌سوکت متوقف شد.")
 
@@ -2625,9 +2717,17 @@ class ExchangeClient:
             logger.error(f"تایم‌فریم غیرقابل پشتیبانی برای کندل‌های وب‌سوکت: {timeframe}")
             return False
 
-        topic = f"/contractMarket/candle:{kucoin_symbol}_{ws_timeframe}"
+        topic = f"/contractMarket/limitCandle:{kucoin_symbol}_{ws_timeframe}"
 
-        return await self.subscribe_ws_topic(topic)
+        # ثبت بافر کندل پیش از اشتراک تا اولین پیام‌ها از دست نروند
+        self._ws_candle_topics[topic] = (symbol, timeframe)
+        self.candle_store.register(symbol, timeframe, self.timeframe_to_ms(timeframe))
+
+        if not await self.subscribe_ws_topic(topic):
+            del self._ws_candle_topics[topic]
+            self.candle_store.unregister(symbol, timeframe)
+            return False
+        return True
 
     async def get_ws_orderbook(self, symbol: str) -> bool:
         """اشتراک در تغییرات order book برای یک نماد خاص."""
@@ -2652,18 +2752,22 @@ class ExchangeClient:
                 "connected": bool(self._ws_connection and not self._ws_connection.closed),
                 "subscriptions": list(self._ws_subscriptions),
                 "last_pong_time": self._ws_last_pong_time,
-                "prices_cached": len(self._ws_prices)
+                "prices_cached": len(self._ws_prices),
+                "candle_store": self.candle_store.get_stats()
             },
             "cache_stats": {
                 "memory_cache_size": len(self._memory_cache),
+                "memory_cache": self._memory_cache.get_stats(),
                 "price_cache_size": len(self._price_cache),
                 "symbol_cache_size": len(self._symbol_info_cache)
             },
-            "rate_limit_stats": {
-                "violations": dict(self._rate_limit_violations),
-                "min_intervals": {k: v for k, v in self._min_request_interval.items() if
-                                  v > self._rate_limit_time_window}
-            },
+            "rate_limit_stats": dict(
+                self.rate_limiter.get_stats(),
+                violations=dict(self._rate_limit_violations)
+            ),
+            "http_stats": self._http_tracer.get_stats(
+                self._session.connector if self._session and not self._session.closed else None
+            ) if self._http_tracer else {},
             "health_status": self._client_health_status
         }
 
@@ -2700,11 +2804,16 @@ class ExchangeClient:
             except asyncio.CancelledError:
                 pass
 
-        # بستن HTTP session
+        # بستن HTTP session (و نشست‌های قبلی که هنوز بسته نشده‌اند)
         if self._session and not self._session.closed:
             await self._session.close()
             logger.info("نشست HTTP بسته شد.")
             self._session = None
+        for session in list(self._retired_sessions):
+            await self._close_session(session)
+        self._retired_sessions.clear()
+        if self._session_close_tasks:
+            await asyncio.gather(*self._session_close_tasks, return_exceptions=True)
 
         # بستن اتصال Redis
         if self._redis_client:
@@ -0,0 +1,176 @@
+"""
+ماژول http_tracing.py: ردیابی درخواست‌های HTTP کلاینت aiohttp
+با قلاب‌های TraceConfig برای هر اندپوینت هیستوگرام تاخیر و تعداد خطا، و برای استخر اتصال
+تعداد اتصالات جدید و استفاده مجدد، زمان انتظار در صف استخر، زمان ایجاد اتصال و
+وضعیت کش DNS جمع‌آوری می‌شود.
+
+مسیر درخواست‌ها به یک برچسب ثابت تبدیل می‌شود (شناسه‌ها و نمادهای داخل مسیر با {param}
+جایگزین می‌شوند) تا تعداد هیستوگرام‌ها محدود بماند.
+
+استفاده:
+    tracer = HttpTracer()
+    session = aiohttp.ClientSession(connector=connector, trace_configs=[tracer.trace_config])
+    tracer.get_stats()
+"""
+
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, Any, Optional
+
+import aiohttp
+
+from common.latency_histogram import LatencyHistogram
+
+# بخش‌های ثابت مسیر: حروف کوچک یا نسخه API (مثلا v1)
+_STATIC_SEGMENT = re.compile(r'^(?:[a-z_\-]+|v\d+)$')
+
+
+def endpoint_label(method: str, path: str) -> str:
+    """
+    برچسب اندپوینت برای آمار
+
+    Args:
+        method: متد HTTP
+        path: مسیر درخواست (مثلا '/api/v1/contracts/XBTUSDTM')
+
+    Returns:
+        برچسب (مثلا 'GET /api/v1/contracts/{param}')
+    """
+    segments = [
+        segment if not segment or _STATIC_SEGMENT.match(segment) else '{param}'
+        for segment in path.split('?', 1)[0].split('/')
+    ]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+class HttpTracer:
+    """جمع‌آوری تاخیر اندپوینت‌ها و آمار استخر اتصال از قلاب‌های ردیابی aiohttp"""
+
+    def __init__(self):
+        """مقداردهی اولیه"""
+        # برچسب اندپوینت -> {'requests', 'errors', 'latency'}
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+        self.pool_wait = LatencyHistogram()
+        self.connect_time = LatencyHistogram()
+        self.dns_time = LatencyHistogram()
+        self.stats = {
+            'requests': 0,
+            'errors': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'queued': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0
+        }
+
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_request_end.append(self._on_request_end)
+        self.trace_config.on_request_exception.append(self._on_request_exception)
+        self.trace_config.on_connection_queued_start.append(self._on_queued_start)
+        self.trace_config.on_connection_queued_end.append(self._on_queued_end)
+        self.trace_config.on_connection_create_start.append(self._on_create_start)
+        self.trace_config.on_connection_create_end.append(self._on_create_end)
+        self.trace_config.on_connection_reuseconn.append(self._on_reuseconn)
+        self.trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        self.trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        self.trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        self.trace_config.on_dns_cache_miss.append(self._on_dns_cache_miss)
+
+    def _endpoint(self, label: str) -> Dict[str, Any]:
+        """آمار یک اندپوینت (در صورت نبود ساخته می‌شود)"""
+        stats = self._endpoints.get(label)
+        if stats is None:
+            stats = self._endpoints[label] = {
+                'requests': 0, 'errors': 0, 'new_connections': 0, 'latency': LatencyHistogram()
+            }
+        return stats
+
+    async def _on_request_start(self, session, ctx: SimpleNamespace, params) -> None:
+        ctx.start = time.perf_counter()
+        ctx.label = endpoint_label(params.method, params.url.path)
+        ctx.new_connection = False
+
+    async def _on_request_end(self, session, ctx: SimpleNamespace, params) -> None:
+        # تاخیر تا دریافت هدرهای پاسخ (شامل انتظار در صف استخر و ایجاد اتصال)
+        stats = self._endpoint(ctx.label)
+        stats['requests'] += 1
+        stats['latency'].record(time.perf_counter() - ctx.start)
+        if ctx.new_connection:
+            stats['new_connections'] += 1
+        self.stats['requests'] += 1
+
+    async def _on_request_exception(self, session, ctx: SimpleNamespace, params) -> None:
+        stats = self._endpoint(ctx.label)
+        stats['errors'] += 1
+        self.stats['errors'] += 1
+
+    async def _on_queued_start(self, session, ctx: SimpleNamespace, params) -> None:
+        ctx.queued_at = time.perf_counter()
+        self.stats['queued'] += 1
+
+    async def _on_queued_end(self, session, ctx: SimpleNamespace, params) -> None:
+        self.pool_wait.record(time.perf_counter() - ctx.queued_at)
+
+    async def _on_create_start(self, session, ctx: SimpleNamespace, params) -> None:
+        ctx.connect_at = time.perf_counter()
+
+    async def _on_create_end(self, session, ctx: SimpleNamespace, params) -> None:
+        self.connect_time.record(time.perf_counter() - ctx.connect_at)
+        self.stats['connections_created'] += 1
+        ctx.new_connection = True
+
+    async def _on_reuseconn(self, session, ctx: SimpleNamespace, params) -> None:
+        self.stats['connections_reused'] += 1
+
+    async def _on_dns_start(self, session, ctx: SimpleNamespace, params) -> None:
+        ctx.dns_at = time.perf_counter()
+
+    async def _on_dns_end(self, session, ctx: SimpleNamespace, params) -> None:
+        self.dns_time.record(time.perf_counter() - ctx.dns_at)
+
+    async def _on_dns_cache_hit(self, session, ctx: SimpleNamespace, params) -> None:
+        self.stats['dns_cache_hits'] += 1
+
+    async def _on_dns_cache_miss(self, session, ctx: SimpleNamespace, params) -> None:
+        self.stats['dns_cache_misses'] += 1
+
+    @property
+    def reuse_ratio(self) -> float:
+        """نسبت درخواست‌هایی که از اتصال باز استخر استفاده کردند"""
+        total = self.stats['connections_created'] + self.stats['connections_reused']
+        return self.stats['connections_reused'] / total if total else 0.0
+
+    def get_stats(self, connector: Optional[aiohttp.BaseConnector] = None) -> Dict[str, Any]:
+        """
+        آمار درخواست‌ها، استخر اتصال و DNS
+
+        Args:
+            connector: کانکتور نشست برای افزودن تنظیمات استخر (اختیاری)
+
+        Returns:
+            دیکشنری آمار (زمان‌ها به ثانیه)
+        """
+        stats: Dict[str, Any] = dict(self.stats)
+        stats['connection_reuse_ratio'] = round(self.reuse_ratio, 4)
+        stats['pool_wait'] = self.pool_wait.summary()
+        stats['connect_time'] = self.connect_time.summary()
+        stats['dns_time'] = self.dns_time.summary()
+        stats['endpoints'] = {
+            label: {
+                'requests': endpoint['requests'],
+                'errors': endpoint['errors'],
+                'new_connections': endpoint['new_connections'],
+                'latency': endpoint['latency'].summary()
+            }
+            for label, endpoint in self._endpoints.items()
+        }
+        if connector is not None:
+            stats['pool'] = {
+                'limit': connector.limit,
+                'limit_per_host': connector.limit_per_host,
+                'closed': connector.closed
+            }
+        return stats
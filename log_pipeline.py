@@ -0,0 +1,222 @@
+"""
+ماژول log_pipeline.py: لاگینگ غیرمسدودکننده مبتنی بر صف
+رکوردهای لاگ در ترد فراخوان (حلقه asyncio) فقط در یک صف محدود قرار می‌گیرند و
+فرمت‌بندی و نوشتن روی کنسول/فایل در ترد پس‌زمینه QueueListener انجام می‌شود
+(فقط ادغام msg و args پس از فیلترها در ترد فراخوان انجام می‌شود).
+محدودیت نرخ و نمونه‌برداری برای هر لاگر (بر اساس پیشوند نام) روی رکوردهای
+زیر WARNING اعمال می‌شود؛ هشدارها و خطاها هرگز حذف نمی‌شوند.
+"""
+
+import atexit
+import copy
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, List, Optional
+
+# تنظیم لاگر
+logger = logging.getLogger(__name__)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    فیلتر محدودیت نرخ و نمونه‌برداری برای هر لاگر
+
+    قوانین با پیشوند نام لاگر تعریف می‌شوند (طولانی‌ترین پیشوند منطبق اعمال می‌شود)
+    و همه لاگرهای زیر یک پیشوند یک سطل توکن مشترک دارند:
+        {'signal_generation.orchestrator': {'rate': 100, 'burst': 500},
+         'signal_generation.analyzers.patterns': {'sample': 0.1}}
+
+    rate: تعداد پیام در ثانیه، burst: ظرفیت سطل (پیش‌فرض برابر rate)،
+    sample: کسری از پیام‌ها که نگه داشته می‌شود (قطعی: هر 1/sample پیام یکی).
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]], max_level: int = logging.WARNING):
+        """
+        مقداردهی اولیه
+
+        Args:
+            rules: قوانین به ازای پیشوند نام لاگر
+            max_level: رکوردهای این سطح و بالاتر همیشه عبور می‌کنند
+        """
+        super().__init__()
+        self.max_level = max_level
+        self._rules: Dict[str, Dict[str, float]] = {}
+        for prefix, rule in (rules or {}).items():
+            rate = float(rule.get('rate', 0) or 0)
+            self._rules[prefix] = {
+                'rate': rate,
+                'burst': float(rule.get('burst', rate) or rate),
+                'sample': float(rule.get('sample', 1.0)),
+                'tokens': float(rule.get('burst', rate) or rate),
+                'updated': time.monotonic(),
+                'credit': 0.0
+            }
+
+        # نام لاگر -> پیشوند قانون (یا None)
+        self._rule_for_name: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+        # آمار پیام‌های حذف شده به ازای قانون
+        self.dropped: Dict[str, int] = {prefix: 0 for prefix in self._rules}
+
+    def _match(self, name: str) -> Optional[str]:
+        """یافتن طولانی‌ترین پیشوند منطبق با نام لاگر"""
+        try:
+            return self._rule_for_name[name]
+        except KeyError:
+            pass
+
+        match = None
+        for prefix in self._rules:
+            if name == prefix or name.startswith(prefix + '.') or prefix == '':
+                if match is None or len(prefix) > len(match):
+                    match = prefix
+        self._rule_for_name[name] = match
+        return match
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.max_level or not self._rules:
+            return True
+
+        prefix = self._match(record.name)
+        if prefix is None:
+            return True
+
+        rule = self._rules[prefix]
+        with self._lock:
+            # نمونه‌برداری
+            if rule['sample'] < 1.0:
+                rule['credit'] += rule['sample']
+                # تلورانس خطای جمع اعشاری (مثلا ده بار 0.1 کمتر از 1 می‌شود)
+                if rule['credit'] < 1.0 - 1e-9:
+                    self.dropped[prefix] += 1
+                    return False
+                rule['credit'] -= 1.0
+
+            # سطل توکن
+            if rule['rate'] > 0:
+                now = time.monotonic()
+                rule['tokens'] = min(
+                    rule['burst'], rule['tokens'] + (now - rule['updated']) * rule['rate']
+                )
+                rule['updated'] = now
+                if rule['tokens'] < 1.0:
+                    self.dropped[prefix] += 1
+                    return False
+                rule['tokens'] -= 1.0
+
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler با صف محدود که هرگز مسدود نمی‌شود
+
+    برخلاف QueueHandler استاندارد، Formatter در ترد فراخوان اجرا نمی‌شود: فقط
+    msg و args رکوردهایی که از فیلترها (محدودیت نرخ) عبور کرده‌اند ادغام می‌شوند
+    تا args تغییرپذیر (dict، list، DataFrame) با محتوای لحظه فراخوانی لاگ شوند؛
+    فرمت‌بندی کامل و traceback در ترد listener انجام می‌شود (صف درون‌پردازه‌ای
+    است و نیازی به pickle نیست). در صورت پر بودن صف، رکورد حذف و شمارش می‌شود.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # بعد از فیلترها فراخوانی می‌شود؛ رکورد حذف‌شده هرگز فرمت نمی‌شود
+        # (کپی، تا هندلرهای دیگر همان رکورد اصلی را ببینند)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _BlockingSentinelListener(QueueListener):
+    """QueueListener که در توقف، منتظر جا برای نشانگر پایان در صف محدود می‌ماند"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """
+    خط لوله لاگینگ: QueueHandler روی root logger و QueueListener با هندلرهای واقعی
+
+    Usage:
+        pipeline = LogPipeline([console_handler, file_handler], queue_size=10000,
+                               rate_limits={'signal_generation.orchestrator': {'rate': 100}})
+        pipeline.start()
+        ...
+        pipeline.stop()
+    """
+
+    def __init__(
+            self,
+            handlers: List[logging.Handler],
+            queue_size: int = 10000,
+            rate_limits: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        """
+        مقداردهی اولیه
+
+        Args:
+            handlers: هندلرهای مقصد (کنسول، فایل) که در ترد پس‌زمینه اجرا می‌شوند
+            queue_size: حداکثر رکوردهای منتظر در صف
+            rate_limits: قوانین محدودیت نرخ (RateLimitFilter)
+        """
+        self.handlers = handlers
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.rate_filter = RateLimitFilter(rate_limits or {})
+        self.handler.addFilter(self.rate_filter)
+        self._listener = _BlockingSentinelListener(self.queue, *handlers, respect_handler_level=True)
+        self._started = False
+
+    def start(self) -> None:
+        """نصب QueueHandler روی root logger و شروع ترد نویسنده"""
+        if self._started:
+            return
+        self._listener.start()
+        logging.getLogger().addHandler(self.handler)
+        self._started = True
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """حذف QueueHandler، نوشتن رکوردهای باقی‌مانده صف و بستن هندلرها"""
+        if not self._started:
+            return
+        self._started = False
+        atexit.unregister(self.stop)
+
+        logging.getLogger().removeHandler(self.handler)
+        self._listener.stop()
+        for handler in self.handlers:
+            try:
+                handler.flush()
+                handler.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        آمار خط لوله لاگینگ
+
+        Returns:
+            دیکشنری آمار
+        """
+        return {
+            'queued': self.queue.qsize(),
+            'queue_size': self.queue.maxsize,
+            'dropped_queue_full': self.handler.dropped,
+            'dropped_rate_limited': dict(self.rate_filter.dropped)
+        }
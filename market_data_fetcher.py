@@ -10,17 +10,18 @@ import os
 import redis.asyncio as redis
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Union, Tuple, Set, TypeVar
-from concurrent.futures import ThreadPoolExecutor
 import random
 
 import pandas as pd
 import numpy as np
 from functools import lru_cache
-import json
-from io import StringIO
 
 # استفاده از کلاینت جدید صرافی
 from exchange_client import ExchangeClient
+from rate_limiter import PRIORITY_HIGH, PRIORITY_NORMAL
+from cache_codec import encode_value, decode_value, CacheCodecError
+from ohlcv_store import OHLCVDiskStore
+from common.ttl_cache import TTLCache
 
 # تنظیم لاگر
 logger = logging.getLogger(__name__)
@@ -48,21 +49,20 @@ class SmartCache:
         # تنظیمات کش حافظه
         self.use_memory_cache = self.cache_settings.get('use_memory_cache', True)
         self.max_memory_items = self.cache_settings.get('max_memory_items', 1000)
-        self.memory_cache: Dict[
-            str, Dict[str, Any]] = {}  # {key: {'data': data, 'timestamp': time, 'access_count': count}}
+        # کش LRU با انقضای جداگانه برای هر کلید (O(1) برای خواندن، نوشتن و حذف)
+        self.memory_cache = TTLCache(max_entries=self.max_memory_items, name='smart_cache_memory')
         self.memory_cache_hits = 0
         self.memory_cache_misses = 0
 
         # تنظیمات کش Redis
         self.use_redis_cache = self.cache_settings.get('use_redis', False)
         self.redis_client = None
-        self._thread_executor = ThreadPoolExecutor(max_workers=4)  # برای عملیات I/O در Redis
+        # فشرده‌سازی zlib مقادیر Redis بزرگ‌تر از این اندازه (بایت)
+        self.redis_compression = self.cache_settings.get('redis_compression', False)
+        self.redis_compress_min_bytes = self.cache_settings.get('redis_compress_min_bytes', 16384)
         if self.use_redis_cache:
             self._init_redis()
 
-        # LRU (Least Recently Used) tracking
-        self.access_order: List[str] = []  # لیست کلیدها به ترتیب آخرین دسترسی
-
         # تنظیمات زمان انقضا
         self.cache_expiry_seconds = self.cache_settings.get('expiry_seconds', {})
         self.smart_caching = self.config.get('data_fetching', {}).get('delta_updates', {}).get('smart_caching', True)
@@ -102,6 +102,8 @@ class SmartCache:
             new_use_redis = new_cache_settings.get('use_redis', False)
             new_max_memory_items = new_cache_settings.get('max_memory_items', 1000)
             new_smart_caching = config.get('data_fetching', {}).get('delta_updates', {}).get('smart_caching', True)
+            self.redis_compression = new_cache_settings.get('redis_compression', False)
+            self.redis_compress_min_bytes = new_cache_settings.get('redis_compress_min_bytes', 16384)
 
             # بررسی تغییر در حالت کش حافظه
             if new_use_memory_cache != self.use_memory_cache:
@@ -111,16 +113,14 @@ class SmartCache:
                 # اگر کش حافظه غیرفعال شد، پاکسازی کنیم
                 if not self.use_memory_cache:
                     self.memory_cache.clear()
-                    self.access_order.clear()
                     self.logger.info("کش حافظه پاکسازی شد")
 
             # بررسی تغییر در حداکثر موارد کش حافظه
             if new_max_memory_items != self.max_memory_items:
                 self.max_memory_items = new_max_memory_items
                 self.logger.info(f"حداکثر موارد کش حافظه تغییر کرد: {self.max_memory_items}")
-                # اگر حداکثر کاهش یافته، پاکسازی انجام دهیم
-                if len(self.memory_cache) > self.max_memory_items:
-                    self._cleanup_memory_cache()
+                # اگر حداکثر کاهش یافته، قدیمی‌ترین موارد حذف می‌شوند
+                self.memory_cache.resize(max_entries=self.max_memory_items)
 
             # بررسی تغییر در حالت کش Redis
             if new_use_redis != self.use_redis_cache:
@@ -256,45 +256,6 @@ class SmartCache:
         except ValueError:
             return 3600  # پیش‌فرض 1 ساعت در صورت خطا
 
-    def _update_access_tracking(self, key: str) -> None:
-        """
-        به‌روزرسانی ردیابی LRU برای کلید
-
-        Args:
-            key: کلید مورد دسترسی
-        """
-        # حذف کلید از لیست قبلی (اگر وجود دارد)
-        if key in self.access_order:
-            self.access_order.remove(key)
-
-        # افزودن به انتهای لیست (جدیدترین دسترسی)
-        self.access_order.append(key)
-
-        # آپدیت شمارنده دسترسی
-        if key in self.memory_cache:
-            self.memory_cache[key]['access_count'] = self.memory_cache[key].get('access_count', 0) + 1
-
-    def _cleanup_memory_cache(self) -> None:
-        """پاکسازی کش حافظه بر اساس LRU"""
-        if len(self.memory_cache) <= self.max_memory_items:
-            return
-
-        # تعداد آیتم‌های اضافی که باید حذف شوند
-        items_to_remove = len(self.memory_cache) - self.max_memory_items
-
-        # حذف قدیمی‌ترین آیتم‌ها بر اساس دسترسی
-        removed = 0
-        while removed < items_to_remove and self.access_order:
-            oldest_key = self.access_order.pop(0)
-            if oldest_key in self.memory_cache:
-                del self.memory_cache[oldest_key]
-                removed += 1
-                self.logger.debug(f"پاکسازی LRU: کلید {oldest_key} از کش حافظه حذف شد")
-
-        # آپدیت آمار
-        self.stats["cleanup_operations"] += 1
-        self.stats["expired_keys_removed"] += removed
-
     async def get(self, key: str, expiry_time: Optional[int] = None) -> Optional[Any]:
         """
         دریافت داده از کش
@@ -334,35 +295,17 @@ class SmartCache:
         """
         دریافت از کش حافظه با بررسی انقضا
 
+        انقضای هر کلید هنگام ذخیره تعیین می‌شود (smart expiry تا کندل بعدی)؛
+        expiry_time در صورت تعیین، حداکثر سن مجاز داده را محدود می‌کند.
+
         Args:
             key: کلید کش
-            expiry_time: زمان انقضا (اختیاری)
+            expiry_time: حداکثر سن داده به ثانیه (اختیاری)
 
         Returns:
             داده یا None در صورت انقضا یا عدم وجود
         """
-        if key not in self.memory_cache:
-            return None
-
-        cached_item = self.memory_cache[key]
-        current_time = time.time()
-        age = current_time - cached_item['timestamp']
-
-        # اگر expiry_time تعیین نشده، از مقدار smart expiry استفاده کن
-        max_age = expiry_time if expiry_time is not None else self._get_cache_expiry_for_key(key)
-
-        if age > max_age:
-            # منقضی شده - حذف از کش
-            del self.memory_cache[key]
-            # حذف از لیست دسترسی
-            if key in self.access_order:
-                self.access_order.remove(key)
-            return None
-
-        # به‌روزرسانی ردیابی دسترسی
-        self._update_access_tracking(key)
-
-        return cached_item['data']
+        return self.memory_cache.get(key, max_age=expiry_time)
 
     async def _get_from_redis(self, key: str) -> Optional[Any]:
         """
@@ -378,40 +321,20 @@ class SmartCache:
             return None
 
         try:
-            # دریافت داده به صورت async در ترد جداگانه
-            loop = asyncio.get_event_loop()
-            cached_bytes = await loop.run_in_executor(
-                self._thread_executor,
-                lambda: self.redis_client.get(key)
-            )
+            # کلاینت redis.asyncio: فراخوانی مستقیم با await
+            cached_bytes = await self.redis_client.get(key)
 
             if cached_bytes is None:
                 return None
 
-            # تبدیل بایت‌های JSON به داده
-            json_string = cached_bytes.decode('utf-8')
-
-            # تشخیص نوع داده (DataFrame یا دیگر)
+            # رمزگشایی بر اساس برچسب نوع (DataFrame باینری یا JSON)
             try:
-                if '"index"' in json_string and '"columns"' in json_string:
-                    # احتمالا DataFrame است
-                    df = pd.read_json(StringIO(json_string), orient='split')
-
-                    # تنظیم مجدد ایندکس زمان
-                    if 'timestamp' in df.columns:
-                        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', utc=True)
-                        df = df.set_index('timestamp')
-
-                    df.sort_index(inplace=True)
-                    return df
-                else:
-                    # داده عمومی
-                    return json.loads(json_string)
+                return decode_value(cached_bytes)
 
-            except Exception as e:
+            except CacheCodecError as e:
                 self.logger.error(f"خطا در تجزیه داده Redis برای {key}: {e}")
-                # در صورت خطا، داده را نامعتبر فرض کن
-                await loop.run_in_executor(self._thread_executor, lambda: self.redis_client.delete(key))
+                # در صورت خطا (یا فرمت قدیمی JSON)، داده را نامعتبر فرض کن
+                await self.redis_client.delete(key)
                 return None
 
         except Exception as e:
@@ -437,29 +360,23 @@ class SmartCache:
         # برای سایر انواع کلیدها، از مقدار پیش‌فرض استفاده کن
         return 300  # 5 دقیقه پیش‌فرض
 
-    def _store_in_memory(self, key: str, data: Any) -> None:
+    def _store_in_memory(self, key: str, data: Any, expiry_seconds: Optional[int] = None) -> None:
         """
         ذخیره داده در کش حافظه
 
         Args:
             key: کلید کش
             data: داده برای ذخیره
+            expiry_seconds: مدت انقضا (پیش‌فرض: انقضای هوشمند کلید)
         """
         if not self.use_memory_cache:
             return
 
-        # اگر حافظه پر است، پاکسازی کن
-        self._cleanup_memory_cache()
-
-        # ذخیره‌سازی
-        self.memory_cache[key] = {
-            'data': data,
-            'timestamp': time.time(),
-            'access_count': 0
-        }
+        if expiry_seconds is None:
+            expiry_seconds = self._get_cache_expiry_for_key(key)
 
-        # به‌روزرسانی ردیابی دسترسی
-        self._update_access_tracking(key)
+        # در صورت پر بودن کش، قدیمی‌ترین مورد (LRU) حذف می‌شود
+        self.memory_cache.set(key, data, ttl=expiry_seconds)
 
         # آپدیت آمار
         self.stats["total_keys"] = len(self.memory_cache)
@@ -478,7 +395,7 @@ class SmartCache:
             expiry_seconds = self._get_cache_expiry_for_key(key)
 
         # ذخیره در کش حافظه
-        self._store_in_memory(key, data)
+        self._store_in_memory(key, data, expiry_seconds)
 
         # ذخیره در Redis
         if self.use_redis_cache and self.redis_client:
@@ -497,18 +414,14 @@ class SmartCache:
             return
 
         try:
-            # تبدیل داده به JSON
-            if hasattr(data, 'to_json'):  # احتمالا DataFrame
-                json_data = data.reset_index().to_json(orient='split', date_format='iso').encode('utf-8')
-            else:
-                json_data = json.dumps(data).encode('utf-8')
+            # DataFrame به صورت بافرهای ستونی باینری، سایر داده‌ها به صورت JSON
+            encoded = encode_value(
+                data,
+                compress_min_bytes=self.redis_compress_min_bytes if self.redis_compression else None
+            )
 
             # ذخیره در Redis
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                self._thread_executor,
-                lambda: self.redis_client.setex(key, expiry_seconds, json_data)
-            )
+            await self.redis_client.setex(key, expiry_seconds, encoded)
 
         except Exception as e:
             self.logger.error(f"خطا در ذخیره {key} در Redis: {e}")
@@ -521,16 +434,12 @@ class SmartCache:
             key: کلید کش
         """
         # حذف از کش حافظه
-        if key in self.memory_cache:
-            del self.memory_cache[key]
-            if key in self.access_order:
-                self.access_order.remove(key)
+        self.memory_cache.delete(key)
 
         # حذف از Redis
         if self.use_redis_cache and self.redis_client:
             try:
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(self._thread_executor, lambda: self.redis_client.delete(key))
+                await self.redis_client.delete(key)
             except Exception as e:
                 self.logger.error(f"خطا در حذف {key} از Redis: {e}")
 
@@ -538,17 +447,15 @@ class SmartCache:
         """پاکسازی تمام کش‌ها"""
         # پاکسازی کش حافظه
         self.memory_cache.clear()
-        self.access_order.clear()
 
         # پاکسازی کش Redis (فقط کلیدهای مرتبط با این سرویس)
         if self.use_redis_cache and self.redis_client:
             try:
-                loop = asyncio.get_event_loop()
                 # حذف کلیدهای با پیشوند 'ohlcv:'
                 pattern = 'ohlcv:*'
-                keys = await loop.run_in_executor(self._thread_executor, lambda: self.redis_client.keys(pattern))
+                keys = await self.redis_client.keys(pattern)
                 if keys:
-                    await loop.run_in_executor(self._thread_executor, lambda: self.redis_client.delete(*keys))
+                    await self.redis_client.delete(*keys)
                     self.logger.info(f"{len(keys)} کلید از کش Redis پاکسازی شد")
             except Exception as e:
                 self.logger.error(f"خطا در پاکسازی کش Redis: {e}")
@@ -580,7 +487,10 @@ class SmartCache:
         }
 
         # ترکیب آمار داخلی و آمار ردیابی شده
-        combined_stats = {**memory_stats, **self.stats}
+        memory_cache_stats = self.memory_cache.get_stats()
+        self.stats["total_keys"] = memory_cache_stats['entries']
+        self.stats["expired_keys_removed"] = memory_cache_stats['expirations'] + memory_cache_stats['evictions']
+        combined_stats = {**memory_stats, **self.stats, 'memory_cache_stats': memory_cache_stats}
 
         return combined_stats
 
@@ -612,13 +522,25 @@ class MarketDataFetcher:
         self.max_concurrent_fetches = self.data_config.get('max_concurrent_fetches', 10)
         self.fetch_semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
 
-        # انتظار بین درخواست‌ها برای مدیریت Rate Limit
-        self.delay_between_requests = 1.0 / self.data_config.get('rate_limits', {}).get('requests_per_second', 5)
-        self.last_request_time = 0
+        # درخواست‌های در حال اجرا (تک‌پرواز): {cache_key: (future, limit, force_refresh)}
+        self._inflight_fetches: Dict[str, Tuple[asyncio.Future, int, bool]] = {}
+
+        # محدودکننده نرخ مشترک با ExchangeClient (سهمیه‌ها در exchange.rate_limits)
+        self.rate_limiter = exchange_client.rate_limiter
 
         # قابلیت دریافت‌های دلتا
         self.use_delta_updates = self.data_config.get('delta_updates', {}).get('enabled', True)
 
+        # کندل‌های وب‌سوکت (بافر حلقوی ExchangeClient) به جای درخواست‌های REST
+        ws_candle_config = self.data_config.get('websocket_candles', {})
+        self.use_ws_candles = ws_candle_config.get('enabled', False)
+        self.max_ws_candle_subscriptions = ws_candle_config.get('max_subscriptions', 100)
+        self.candle_store = exchange_client.candle_store
+
+        # ذخیره‌ساز دیسک کندل‌ها: پس از راه‌اندازی مجدد فقط کندل‌های از دست رفته دریافت می‌شوند
+        self._disk_store_config = self.data_config.get('disk_store', {})
+        self.disk_store = self._create_disk_store(self._disk_store_config)
+
         # داده‌های ساختگی برای تست
         self.use_mock_data = self.data_config.get('use_mock_data', False)
 
@@ -654,6 +576,9 @@ class MarketDataFetcher:
             "successful_requests": 0,
             "failed_requests": 0,
             "cache_hits": 0,
+            "ws_candle_hits": 0,
+            "disk_store_hits": 0,
+            "coalesced_requests": 0,  # درخواست‌هایی که منتظر درخواست همزمان مشابه ماندند
             "total_candles_fetched": 0,
             "errors_by_type": {},
             "last_error_time": {},
@@ -710,20 +635,27 @@ class MarketDataFetcher:
 
                 self.logger.info(f"حداکثر درخواست همزمان تغییر کرد از {old_max_concurrent} به {new_max_concurrent}")
 
-            # نرخ درخواست
-            new_rate_limit = self.data_config.get('rate_limits', {}).get('requests_per_second', 5)
-            new_delay = 1.0 / new_rate_limit
-            if new_delay != self.delay_between_requests:
-                old_delay = self.delay_between_requests
-                self.delay_between_requests = new_delay
-                self.logger.info(f"فاصله درخواست‌ها تغییر کرد از {old_delay:.4f}s به {new_delay:.4f}s (نرخ: {new_rate_limit} در ثانیه)")
-
             # دریافت‌های دلتا
             new_delta_updates = self.data_config.get('delta_updates', {}).get('enabled', True)
             if new_delta_updates != self.use_delta_updates:
                 self.use_delta_updates = new_delta_updates
                 self.logger.info(f"به‌روزرسانی‌های دلتا {'فعال' if self.use_delta_updates else 'غیرفعال'} شد")
 
+            # کندل‌های وب‌سوکت
+            ws_candle_config = self.data_config.get('websocket_candles', {})
+            new_use_ws_candles = ws_candle_config.get('enabled', False)
+            self.max_ws_candle_subscriptions = ws_candle_config.get('max_subscriptions', 100)
+            if new_use_ws_candles != self.use_ws_candles:
+                self.use_ws_candles = new_use_ws_candles
+                self.logger.info(f"کندل‌های وب‌سوکت {'فعال' if self.use_ws_candles else 'غیرفعال'} شد")
+
+            # ذخیره‌ساز دیسک کندل‌ها
+            new_disk_store_config = self.data_config.get('disk_store', {})
+            if new_disk_store_config != self._disk_store_config:
+                self._disk_store_config = new_disk_store_config
+                self.disk_store = self._create_disk_store(new_disk_store_config)
+                self.logger.info(f"ذخیره‌ساز دیسک کندل‌ها {'فعال' if self.disk_store else 'غیرفعال'} شد")
+
             # داده‌های ساختگی
             new_mock_data = self.data_config.get('use_mock_data', False)
             if new_mock_data != self.use_mock_data:
@@ -763,6 +695,17 @@ class MarketDataFetcher:
         except Exception as e:
             self.logger.error(f"خطا در به‌روزرسانی تنظیمات دریافت‌کننده داده‌های بازار: {e}", exc_info=True)
 
+    def _create_disk_store(self, disk_store_config: Dict[str, Any]) -> Optional[OHLCVDiskStore]:
+        """ساخت ذخیره‌ساز دیسک کندل‌ها از تنظیمات data_fetching.disk_store (None در صورت غیرفعال بودن)"""
+        if not disk_store_config.get('enabled', False):
+            return None
+        try:
+            return OHLCVDiskStore(disk_store_config.get('path', 'data/ohlcv'),
+                                  disk_store_config.get('max_candles', 5000))
+        except OSError as e:
+            logger.error(f"خطا در راه‌اندازی ذخیره‌ساز دیسک کندل‌ها: {e}")
+            return None
+
     def _start_maintenance_tasks(self):
         """راه‌اندازی تسک‌های نگهداری"""
         # تسک پاکسازی کش
@@ -893,16 +836,15 @@ class MarketDataFetcher:
 
             # دریافت داده‌های شکاف
             self.logger.info(f"پر کردن شکاف برای {symbol} [{timeframe}]: {missing_count} کندل گمشده")
-            start_time_s = start_ts / 1000
 
             # محاسبه حداکثر تعداد کندل برای دریافت (کمی بیشتر از تعداد گمشده)
             limit = min(missing_count + 2, 50)
 
-            # دریافت داده‌ها
+            # دریافت داده‌ها (since به میلی‌ثانیه)
             async with self.fetch_semaphore:
                 await self._wait_for_rate_limit()
-                gap_data = await self.exchange_client.fetch_ohlcv(symbol, timeframe, since=int(start_time_s),
-                                                                  limit=limit)
+                gap_data = await self.exchange_client.fetch_ohlcv(symbol, timeframe, since=int(start_ts),
+                                                                  limit=limit, priority=self._fetch_priority(symbol))
 
             if gap_data is not None and not gap_data.empty:
                 self.logger.info(f"شکاف {symbol} [{timeframe}] با موفقیت پر شد: {len(gap_data)} کندل")
@@ -916,8 +858,16 @@ class MarketDataFetcher:
                 self._gap_tracking["filled_gaps"][symbol][timeframe] += 1
                 self._gap_tracking["total_filled"] += 1
 
-                # کش داده‌های جدید
-                full_data = await self.get_historical_data(symbol, timeframe, force_refresh=True)
+                # ادغام کندل‌های شکاف در ذخیره‌ساز دیسک و کش (بدون دریافت مجدد کل تاریخچه)
+                self._write_disk_store(symbol, timeframe, gap_data)
+                cache_key = self._get_cache_key(symbol, timeframe)
+                cached_df = await self.cache.get(cache_key)
+                if cached_df is not None:
+                    merged_df = pd.concat([cached_df, gap_data])
+                    merged_df = merged_df[~merged_df.index.duplicated(keep='last')].sort_index()
+                    await self.cache.set(cache_key, merged_df)
+                else:
+                    await self.get_historical_data(symbol, timeframe, force_refresh=True)
 
                 # اضافه کردن به نمادهای با اولویت بالا
                 self._high_priority_symbols.add(symbol)
@@ -930,6 +880,9 @@ class MarketDataFetcher:
         try:
             await self.exchange_client._init_session()
             await self._calculate_symbol_priorities()
+            # اتصال وب‌سوکت برای دریافت کندل‌ها
+            if self.use_ws_candles and not self.exchange_client._ws_running:
+                await self.exchange_client.start_websocket()
             self.logger.debug("نشست ExchangeClient از طریق MarketDataFetcher راه‌اندازی شد")
         except Exception as e:
             self.logger.error(f"خطا در راه‌اندازی نشست exchange client: {e}", exc_info=True)
@@ -954,18 +907,21 @@ class MarketDataFetcher:
         except Exception as e:
             self.logger.error(f"خطا در طول خاموش‌شدن: {e}", exc_info=True)
 
-    async def _wait_for_rate_limit(self) -> None:
-        """انتظار هوشمند برای رعایت Rate Limit"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
+    async def _wait_for_rate_limit(self, rate_limit_key: str = 'kline') -> None:
+        """
+        انتظار تا پایان توقف استخر سهمیه (پس از پاسخ 429)
+
+        سهمیه هر درخواست در ExchangeClient از محدودکننده نرخ مشترک برداشته می‌شود؛
+        این انتظار فقط از گرفتن جای fetch_semaphore در زمان توقف جلوگیری می‌کند.
 
-        if time_since_last_request < self.delay_between_requests:
-            delay = self.delay_between_requests - time_since_last_request
-            # فقط اگر تاخیر قابل توجه است، انتظار بکش
-            if delay > 0.05:
-                await asyncio.sleep(delay)
+        Args:
+            rate_limit_key: گروه اندپوینت
+        """
+        await self.rate_limiter.wait_ready(rate_limit_key)
 
-        self.last_request_time = time.time()
+    def _fetch_priority(self, symbol: str) -> int:
+        """اولویت درخواست‌های یک نماد در صف محدودیت نرخ"""
+        return PRIORITY_HIGH if symbol in self._high_priority_symbols else PRIORITY_NORMAL
 
     async def _apply_backoff_strategy(self, success: bool = True) -> None:
         """
@@ -1189,14 +1145,16 @@ class MarketDataFetcher:
                 f"دریافت کندل‌های جدید برای {symbol} {timeframe} از {from_time_str}"
             )
 
-            # دریافت کندل‌های جدید
+            # دریافت کندل‌های جدید (پس از توقف طولانی در چند صفحه، تا هیچ کندلی جا نماند)
             await self._wait_for_rate_limit()
             start_time = time.time()
             df_new = await self.exchange_client.fetch_ohlcv(
                 symbol,
                 timeframe,
+                limit=max(200, (end_time - last_timestamp) // tf_ms + 2),
                 start_time_s=last_timestamp / 1000,  # تبدیل به ثانیه
-                end_time_s=end_time / 1000  # تبدیل به ثانیه
+                end_time_s=end_time / 1000,  # تبدیل به ثانیه
+                priority=self._fetch_priority(symbol)
             )
             self._stats["last_fetch_time"] = time.time()
 
@@ -1303,24 +1261,133 @@ class MarketDataFetcher:
             # تولید داده‌های ساختگی برای تست
             return self._generate_mock_data(symbol, timeframe, limit)
 
+        # کندل‌های وب‌سوکت: در صورت گرم بودن بافر، بدون درخواست REST
+        if self.use_ws_candles and not force_refresh:
+            ws_df = self.candle_store.get_frame(symbol, timeframe, limit)
+            if ws_df is not None:
+                self._stats["ws_candle_hits"] += 1
+                return ws_df
+
+        # تک‌پرواز: فراخوان‌های همزمان برای یک کلید منتظر یک درخواست مشترک می‌مانند
+        # (به شرط اینکه درخواست در حال اجرا حداقل همین تعداد کندل را دریافت کند)
+        cache_key = self._get_cache_key(symbol, timeframe)
+        while True:
+            inflight = self._inflight_fetches.get(cache_key)
+            if inflight is None:
+                break
+            future, inflight_limit, inflight_force = inflight
+            if inflight_limit < limit or (force_refresh and not inflight_force):
+                break
+
+            self._stats["coalesced_requests"] += 1
+            try:
+                df = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # فقط فراخوان اصلی لغو شده است (نه این فراخوان): تلاش مجدد
+                if future.cancelled():
+                    continue
+                raise
+            return df.iloc[-limit:] if df is not None and len(df) > limit else df
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_fetches[cache_key] = (future, limit, force_refresh)
+        try:
+            df = await self._get_historical_data_rest(symbol, timeframe, limit, force_refresh)
+
+            # تاریخچه اولیه و شکاف‌های بافر وب‌سوکت از داده REST پر می‌شوند
+            if self.use_ws_candles and df is not None and not df.empty:
+                await self._feed_candle_store(symbol, timeframe, df)
+        except Exception as e:
+            future.set_exception(e)
+            # دریافت استثنا تا در نبود منتظر، هشدار future بازیابی نشده ثبت نشود
+            future.exception()
+            raise
+        except BaseException:
+            # لغو این فراخوان به منتظرها منتقل نمی‌شود؛ آن‌ها دوباره تلاش می‌کنند
+            future.cancel()
+            raise
+        else:
+            future.set_result(df)
+            return df
+        finally:
+            if self._inflight_fetches.get(cache_key, (None,))[0] is future:
+                del self._inflight_fetches[cache_key]
+
+    async def _get_historical_data_rest(
+            self,
+            symbol: str,
+            timeframe: str,
+            limit: int,
+            force_refresh: bool
+    ) -> Optional[pd.DataFrame]:
+        """
+        دریافت داده‌های تاریخی از کش یا API (REST)
+
+        Args:
+            symbol: نماد ارز
+            timeframe: تایم‌فریم
+            limit: تعداد کندل‌ها
+            force_refresh: دریافت مجدد بدون استفاده از کش
+
+        Returns:
+            دیتافریم داده‌ها یا None در صورت خطا
+        """
         # ساخت کلید کش
         cache_key = self._get_cache_key(symbol, timeframe)
 
         # تلاش برای دریافت از کش
+        cached_df = None
         if not force_refresh:
             cached_df = await self.cache.get(cache_key)
             if cached_df is not None and len(cached_df) >= limit:
                 self._stats["cache_hits"] += 1
                 return cached_df.iloc[-limit:] if len(cached_df) > limit else cached_df
 
+            # کش خالی (مثلا پس از راه‌اندازی مجدد): کندل‌های دیسک پایه به‌روزرسانی دلتا می‌شوند،
+            # به شرط اینکه پیوسته باشند و همراه با کندل‌های جدیدتر از آخرین کندل دیسک به limit برسند
+            if cached_df is None and self.disk_store is not None:
+                disk_df = self.disk_store.read(symbol, timeframe, limit)
+                if disk_df is not None:
+                    tf_ms = self._get_timeframe_ms(timeframe)
+                    timestamps = disk_df.index.as_unit('ms').asi8
+                    missing = (int(time.time() * 1000) - int(timestamps[-1])) // tf_ms
+                    contiguous = bool(np.all(np.diff(timestamps) == tf_ms))
+                    if contiguous and missing < limit <= len(disk_df) + missing:
+                        self._stats["disk_store_hits"] += 1
+                        cached_df = disk_df
+                        await self.cache.set(cache_key, disk_df)
+
         # استراتژی دریافت داده بر اساس وضعیت کش
-        if not force_refresh and await self.cache.get(cache_key) is not None and self.use_delta_updates:
+        if cached_df is not None and self.use_delta_updates:
             # استراتژی به‌روزرسانی دلتا (فقط دریافت کندل‌های جدید)
-            return await self._delta_update_strategy(symbol, timeframe, limit, cache_key)
+            return await self._delta_update_strategy(symbol, timeframe, limit, cache_key, cached_df)
         else:
             # استراتژی دریافت کامل
             return await self._full_fetch_strategy(symbol, timeframe, limit, cache_key)
 
+    async def _feed_candle_store(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        """
+        اشتراک کندل وب‌سوکت (در صورت نیاز) و ادغام داده REST در بافر نماد/تایم‌فریم
+
+        Args:
+            symbol: نماد ارز
+            timeframe: تایم‌فریم
+            df: داده دریافت شده از کش یا API
+        """
+        if not self.candle_store.is_registered(symbol, timeframe):
+            if (len(self.candle_store) >= self.max_ws_candle_subscriptions or
+                    not self.exchange_client._ws_running):
+                return
+            if not await self.exchange_client.get_ws_candles(symbol, timeframe):
+                return
+
+        self.candle_store.seed(symbol, timeframe, df)
+
+    def _write_disk_store(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        """ذخیره کندل‌های دریافتی از API در ذخیره‌ساز دیسک (در صورت فعال بودن)"""
+        if self.disk_store is not None and df is not None and not df.empty:
+            self.disk_store.write(symbol, timeframe, df)
+
     async def _full_fetch_strategy(
             self,
             symbol: str,
@@ -1356,7 +1423,9 @@ class MarketDataFetcher:
                 if adjusted_limit > 200:
                     fetched_df = await self._fetch_multiple_batches(symbol, timeframe, adjusted_limit)
                 else:
-                    fetched_df = await self.exchange_client.fetch_ohlcv(symbol, timeframe, limit=adjusted_limit)
+                    fetched_df = await self.exchange_client.fetch_ohlcv(
+                        symbol, timeframe, limit=adjusted_limit, priority=self._fetch_priority(symbol)
+                    )
 
                 self._stats["last_fetch_time"] = time.time()
                 response_time = (time.time() - start_time) * 1000
@@ -1390,8 +1459,9 @@ class MarketDataFetcher:
                     self._stats["average_response_time_ms"] * 0.9 + response_time * 0.1
             )
 
-            # ذخیره در کش
+            # ذخیره در کش و دیسک
             await self.cache.set(cache_key, fetched_df)
+            self._write_disk_store(symbol, timeframe, fetched_df)
 
             # ریست کانتر خطا در صورت موفقیت
             await self._apply_backoff_strategy(success=True)
@@ -1416,6 +1486,9 @@ class MarketDataFetcher:
         """
         دریافت تعداد زیادی کندل در چندین batch
 
+        صفحه‌بندی (محاسبه پنجره‌ها، دریافت همزمان صفحات و ادغام) در
+        ExchangeClient.fetch_ohlcv انجام می‌شود.
+
         Args:
             symbol: نماد ارز
             timeframe: تایم‌فریم
@@ -1425,77 +1498,11 @@ class MarketDataFetcher:
             دیتافریم داده‌ها یا None
         """
         try:
-            all_candles = []
-            batch_size = 200  # حداکثر کندل در هر درخواست
-            remaining = limit
-
-            # محاسبه طول کندل به ثانیه
-            candle_duration_ms = self._get_timeframe_ms(timeframe)
-            candle_duration_s = candle_duration_ms / 1000 if candle_duration_ms else 3600
-
-            # زمان پایان (فعلی)
-            end_time_s = time.time()
-            current_end_time = end_time_s
-
-            # زمان شروع کلی
-            start_time_s = end_time_s - (limit * candle_duration_s)
-
-            while remaining > 0 and current_end_time > start_time_s:
-                batch_limit = min(batch_size, remaining)
-
-                # محاسبه زمان شروع برای این batch
-                batch_start_time = current_end_time - (batch_limit * candle_duration_s)
-
-                self.logger.debug(f"دریافت بسته برای {symbol} {timeframe}: {batch_limit} کندل")
-
-                # دریافت کندل‌ها
-                batch_df = await self.exchange_client.fetch_ohlcv(
-                    symbol,
-                    timeframe,
-                    limit=batch_limit,
-                    start_time_s=batch_start_time,
-                    end_time_s=current_end_time
-                )
-                self._stats["last_fetch_time"] = time.time()
-
-                if batch_df is None or batch_df.empty:
-                    # اگر داده‌ای دریافت نشد، احتمالاً به ابتدای داده‌ها رسیده‌ایم
-                    self.logger.warning(f"داده بیشتری برای {symbol} {timeframe} موجود نیست")
-                    break
-
-                # اضافه کردن کندل‌های جدید (جدیدترین‌ها اول)
-                all_candles.append(batch_df)
-
-                remaining -= len(batch_df)
-                current_end_time = batch_start_time
-
-                # تاخیر کوتاه برای رعایت rate limit
-                await asyncio.sleep(0.2)
-
-                # بررسی اینکه آیا کافی کندل دریافت کردیم
-                if len(batch_df) < batch_limit:
-                    # احتمالاً دیگر کندل‌های قدیمی‌تری موجود نیست
-                    self.logger.info(f"به انتهای داده‌های موجود برای {symbol} {timeframe} رسیدیم")
-                    break
-
-            if not all_candles:
-                self.logger.warning(f"داده‌ای برای {symbol} {timeframe} بازگردانده نشد")
-                return pd.DataFrame()
-
-            # ترکیب تمام batch‌ها
-            final_df = pd.concat(all_candles)
-
-            # حذف ردیف‌های تکراری
-            final_df = final_df[~final_df.index.duplicated(keep='last')]
-
-            # مرتب‌سازی بر اساس زمان (قدیمی‌ترین‌ها اول)
-            final_df = final_df.sort_index()
-
-            # برش‌ زدن به تعداد دقیق درخواست شده
-            if len(final_df) > limit:
-                final_df = final_df.iloc[-limit:]
-
-            self.logger.info(f"{len(final_df)} کندل با موفقیت برای {symbol} {timeframe} دریافت شد")
+            self.logger.debug(f"دریافت {limit} کندل برای {symbol} {timeframe} در صفحات همزمان")
+            final_df = await self.exchange_client.fetch_ohlcv(
+                symbol, timeframe, limit=limit, priority=self._fetch_priority(symbol)
+            )
+            self._stats["last_fetch_time"] = time.time()
             return final_df
 
         except Exception as e:
@@ -1524,7 +1531,8 @@ class MarketDataFetcher:
             symbol: str,
             timeframe: str,
             limit: int,
-            cache_key: str
+            cache_key: str,
+            cached_df: Optional[pd.DataFrame] = None
     ) -> Optional[pd.DataFrame]:
         """
         استراتژی به‌روزرسانی دلتا: دریافت فقط کندل‌های جدید و ترکیب با کش
@@ -1534,13 +1542,15 @@ class MarketDataFetcher:
             timeframe: تایم‌فریم
             limit: تعداد کندل‌ها
             cache_key: کلید کش
+            cached_df: داده کش شده (در صورت عدم ارائه از کش خوانده می‌شود)
 
         Returns:
             دیتافریم به‌روز شده یا None
         """
         try:
             # دریافت کش فعلی
-            cached_df = await self.cache.get(cache_key)
+            if cached_df is None:
+                cached_df = await self.cache.get(cache_key)
             if cached_df is None or cached_df.empty:
                 # اگر کش خالی است، استراتژی دریافت کامل را اجرا کن
                 return await self._full_fetch_strategy(symbol, timeframe, limit, cache_key)
@@ -1548,6 +1558,11 @@ class MarketDataFetcher:
             # آخرین timestamp موجود در کش
             last_timestamp = int(cached_df.index[-1].timestamp() * 1000)
 
+            # توقف طولانی: اگر کندل‌های گمشده از limit بیشتر باشند، دریافت کامل ارزان‌تر است
+            missing = (int(time.time() * 1000) - last_timestamp) // self._get_timeframe_ms(timeframe)
+            if missing >= limit:
+                return await self._full_fetch_strategy(symbol, timeframe, limit, cache_key)
+
             # دریافت کندل‌های جدید
             async with self.fetch_semaphore:
                 new_df = await self.fetch_new_candles(symbol, timeframe, last_timestamp)
@@ -1570,8 +1585,9 @@ class MarketDataFetcher:
             # مرتب‌سازی بر اساس زمان
             combined_df = combined_df.sort_index()
 
-            # ذخیره در کش
+            # ذخیره در کش و الحاق کندل‌های جدید به دیسک
             await self.cache.set(cache_key, combined_df)
+            self._write_disk_store(symbol, timeframe, new_df)
 
             # برگرداندن با limit درخواستی
             return combined_df.iloc[-limit:] if len(combined_df) > limit else combined_df
@@ -1719,8 +1735,12 @@ class MarketDataFetcher:
         stats = {
             "fetcher_stats": self._stats,
             "cache_stats": self.cache.get_stats(),
+            "candle_store_stats": self.candle_store.get_stats(),
+            "disk_store_stats": self.disk_store.get_stats() if self.disk_store else None,
+            "inflight_requests": len(self._inflight_fetches),
             "gap_stats": self._gap_tracking,
             "high_priority_symbols_count": len(self._high_priority_symbols),
-            "error_backoff": self._error_backoff
+            "error_backoff": self._error_backoff,
+            "rate_limit_stats": self.rate_limiter.get_stats()
         }
         return stats
\ No newline at end of file
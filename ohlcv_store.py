@@ -0,0 +1,265 @@
+"""
+ماژول ohlcv_store.py: ذخیره‌ساز ستونی کندل‌ها روی دیسک
+برای هر (نماد، تایم‌فریم) یک فایل باینری فقط-الحاقی با رکوردهای ثابت
+(timestamp میلی‌ثانیه int64 و ستون‌های CANDLE_COLUMNS به صورت float64) نگه داشته می‌شود.
+
+- کندل‌های جدیدتر از آخرین رکورد به انتهای فایل الحاق می‌شوند؛ اگر داده جدید با
+  انتهای فایل هم‌پوشانی داشته باشد (مثلا کندل در حال تشکیل)، فایل از همان نقطه
+  کوتاه شده و داده جدید الحاق می‌شود.
+- داده قدیمی‌تر یا پر کردن شکاف وسط فایل، با ادغام و بازنویسی اتمیک (فایل موقت و
+  os.replace) ذخیره می‌شود. همین مسیر فایل را به max_candles رکورد آخر فشرده می‌کند.
+- بازه‌های غیرمجاور به هم چسبانده نمی‌شوند: داده جدیدتری که با فاصله بیش از یک کندل
+  بعد از انتهای فایل شروع شود جایگزین فایل می‌شود و داده قدیمی‌تری که به ابتدای فایل
+  نرسد نادیده گرفته می‌شود.
+- خواندن با np.memmap فقط limit رکورد آخر را از دیسک می‌خواند.
+
+رکورد ناقص انتهای فایل (قطع برنامه در میانه نوشتن) هنگام خواندن نادیده گرفته و در
+نوشتن بعدی حذف می‌شود.
+
+استفاده:
+    store = OHLCVDiskStore('data/ohlcv')
+    store.write('BTCUSDT', '5m', df)
+    df = store.read('BTCUSDT', '5m', limit=500)
+"""
+
+import logging
+import os
+import re
+from typing import Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from candle_store import CANDLE_COLUMNS
+
+# تنظیم لاگر
+logger = logging.getLogger(__name__)
+
+# ساختار رکورد فایل (little-endian برای قابلیت انتقال فایل‌ها)
+RECORD_DTYPE = np.dtype([('timestamp', '<i8')] + [(column, '<f8') for column in CANDLE_COLUMNS])
+
+FILE_SUFFIX = '.candles'
+
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9_\-]')
+
+_TIMEFRAME_PATTERN = re.compile(r'^(\d+)([mhdw])$')
+_UNIT_MS = {'m': 60 * 1000, 'h': 60 * 60 * 1000, 'd': 24 * 60 * 60 * 1000, 'w': 7 * 24 * 60 * 60 * 1000}
+
+
+class OHLCVDiskStore:
+    """ذخیره‌ساز کندل‌ها در فایل‌های فقط-الحاقی هر نماد/تایم‌فریم"""
+
+    def __init__(self, base_dir: str = 'data/ohlcv', max_candles: int = 5000):
+        """
+        مقداردهی اولیه
+
+        Args:
+            base_dir: پوشه فایل‌های کندل
+            max_candles: تعداد کندل نگهداری شده برای هر نماد/تایم‌فریم (فایل تا دو برابر
+                این مقدار رشد کرده و سپس فشرده می‌شود)
+        """
+        self.base_dir = base_dir
+        self.max_candles = max(1, int(max_candles))
+        os.makedirs(base_dir, exist_ok=True)
+
+        # آمار
+        self.stats = {
+            'reads': 0,
+            'hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'appended': 0,
+            'rewrites': 0,
+            'replaced': 0,
+            'skipped': 0,
+            'errors': 0
+        }
+
+    def _path(self, symbol: str, timeframe: str) -> str:
+        """مسیر فایل نماد/تایم‌فریم"""
+        name = f"{_UNSAFE_CHARS.sub('_', symbol.upper())}_{_UNSAFE_CHARS.sub('_', timeframe)}"
+        return os.path.join(self.base_dir, name + FILE_SUFFIX)
+
+    @staticmethod
+    def _interval_ms(timeframe: str) -> Optional[int]:
+        """فاصله کندل‌های تایم‌فریم (میلی‌ثانیه) یا None برای تایم‌فریم ناشناخته"""
+        match = _TIMEFRAME_PATTERN.match(timeframe)
+        return int(match.group(1)) * _UNIT_MS[match.group(2)] if match else None
+
+    @staticmethod
+    def _record_count(path: str) -> int:
+        """تعداد رکوردهای کامل فایل (رکورد ناقص انتهایی شمرده نمی‌شود)"""
+        try:
+            return os.path.getsize(path) // RECORD_DTYPE.itemsize
+        except OSError:
+            return 0
+
+    def _open(self, path: str) -> Optional[np.memmap]:
+        """نگاشت فقط-خواندنی رکوردهای کامل فایل یا None برای فایل خالی/ناموجود"""
+        count = self._record_count(path)
+        if count == 0:
+            return None
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        """تعداد کندل‌های ذخیره شده نماد/تایم‌فریم"""
+        return self._record_count(self._path(symbol, timeframe))
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        """زمان آخرین کندل ذخیره شده (میلی‌ثانیه) یا None"""
+        records = self._open(self._path(symbol, timeframe))
+        return int(records['timestamp'][-1]) if records is not None else None
+
+    def read(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        خواندن آخرین کندل‌های ذخیره شده
+
+        Args:
+            symbol: نماد ارز
+            timeframe: تایم‌فریم
+            limit: حداکثر تعداد کندل (None برای همه)
+
+        Returns:
+            دیتافریم با ایندکس timestamp (UTC) و ستون‌های CANDLE_COLUMNS یا None
+        """
+        self.stats['reads'] += 1
+        try:
+            records = self._open(self._path(symbol, timeframe))
+        except (OSError, ValueError) as e:
+            self.stats['errors'] += 1
+            logger.warning(f"خطا در خواندن کندل‌های {symbol} [{timeframe}] از دیسک: {e}")
+            return None
+
+        if records is None:
+            self.stats['misses'] += 1
+            return None
+
+        # کپی limit رکورد آخر؛ نگاشت فایل پس از این کپی آزاد می‌شود
+        tail = np.array(records[-limit:] if limit else records)
+        del records
+
+        self.stats['hits'] += 1
+        index = pd.DatetimeIndex(pd.to_datetime(tail['timestamp'], unit='ms', utc=True), name='timestamp')
+        return pd.DataFrame({column: tail[column] for column in CANDLE_COLUMNS}, index=index)
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> np.ndarray:
+        """تبدیل دیتافریم کندل‌ها به رکوردهای مرتب و بدون تکرار (آخرین مقدار هر زمان حفظ می‌شود)"""
+        records = np.empty(len(df), dtype=RECORD_DTYPE)
+        records['timestamp'] = (df.index.as_unit('ms').asi8 if isinstance(df.index, pd.DatetimeIndex)
+                                else np.asarray(df.index, dtype=np.int64))
+        for column in CANDLE_COLUMNS:
+            records[column] = (pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+                               if column in df.columns else np.nan)
+        return OHLCVDiskStore._dedupe(records)
+
+    @staticmethod
+    def _dedupe(records: np.ndarray) -> np.ndarray:
+        """مرتب‌سازی پایدار بر اساس زمان و حفظ آخرین رکورد هر timestamp"""
+        records = records[np.argsort(records['timestamp'], kind='stable')]
+        timestamps = records['timestamp']
+        keep = np.ones(len(records), dtype=bool)
+        keep[:-1] = timestamps[1:] != timestamps[:-1]
+        return records[keep]
+
+    def _rewrite(self, path: str, records: np.ndarray) -> None:
+        """بازنویسی اتمیک فایل با max_candles رکورد آخر"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(records[-self.max_candles:].tobytes())
+        os.replace(tmp_path, path)
+        self.stats['rewrites'] += 1
+
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        ذخیره کندل‌ها (الحاق، جایگزینی انتهای فایل یا ادغام)
+
+        Args:
+            symbol: نماد ارز
+            timeframe: تایم‌فریم
+            df: دیتافریم با ایندکس زمانی و ستون‌های CANDLE_COLUMNS
+
+        Returns:
+            تعداد کندل‌های نوشته شده
+        """
+        if df is None or df.empty:
+            return 0
+
+        path = self._path(symbol, timeframe)
+        try:
+            new = self._to_records(df)
+            count = self._record_count(path)
+            existing = self._open(path)
+            interval = self._interval_ms(timeframe)
+
+            if existing is None:
+                self._rewrite(path, new)
+            elif interval and new['timestamp'][-1] < existing['timestamp'][0] - interval:
+                # داده قدیمی‌تر که به ابتدای فایل نمی‌رسد: ادغام آن شکاف ایجاد می‌کند
+                del existing
+                self.stats['skipped'] += 1
+                logger.debug(f"کندل‌های {symbol} [{timeframe}] به داده دیسک متصل نیستند و ذخیره نشدند")
+                return 0
+            elif interval and new['timestamp'][0] > existing['timestamp'][-1] + interval:
+                # داده جدیدتر با فاصله از انتهای فایل: جایگزینی فایل
+                del existing
+                self._rewrite(path, new)
+                self.stats['replaced'] += 1
+            elif new['timestamp'][-1] < existing['timestamp'][0]:
+                # داده قدیمی‌تر مجاور ابتدای فایل (یا تایم‌فریم ناشناخته): ادغام و بازنویسی
+                records = np.concatenate([new, np.array(existing)])
+                del existing
+                self._rewrite(path, records)
+            else:
+                # اولین رکورد فایل که با داده جدید هم‌پوشانی دارد
+                cut = int(np.searchsorted(existing['timestamp'], new['timestamp'][0]))
+
+                if new['timestamp'][-1] >= existing['timestamp'][-1]:
+                    # هم‌پوشانی فقط با انتهای فایل: ادغام همان بخش، کوتاه کردن و الحاق
+                    tail = self._dedupe(np.concatenate([np.array(existing[cut:]), new]))
+                    del existing
+                    with open(path, 'r+b') as f:
+                        f.truncate(cut * RECORD_DTYPE.itemsize)
+                        f.seek(0, os.SEEK_END)
+                        f.write(tail.tobytes())
+                    self.stats['appended'] += len(tail) - (count - cut)
+                    if cut + len(tail) > 2 * self.max_candles:
+                        self._rewrite(path, np.array(self._open(path)))
+                else:
+                    # شکاف وسط فایل یا داده قدیمی‌تر از ابتدای فایل
+                    records = self._dedupe(np.concatenate([np.array(existing), new]))
+                    del existing
+                    self._rewrite(path, records)
+
+            self.stats['writes'] += 1
+            return len(new)
+
+        except (OSError, ValueError) as e:
+            self.stats['errors'] += 1
+            logger.warning(f"خطا در ذخیره کندل‌های {symbol} [{timeframe}] روی دیسک: {e}")
+            return 0
+
+    def delete(self, symbol: str, timeframe: str) -> None:
+        """حذف فایل نماد/تایم‌فریم"""
+        try:
+            os.remove(self._path(symbol, timeframe))
+        except FileNotFoundError:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        آمار ذخیره‌ساز دیسک
+
+        Returns:
+            دیکشنری آمار
+        """
+        files = [name for name in os.listdir(self.base_dir) if name.endswith(FILE_SUFFIX)]
+        size = sum(os.path.getsize(os.path.join(self.base_dir, name)) for name in files)
+        return dict(
+            self.stats,
+            path=self.base_dir,
+            files=len(files),
+            candles=size // RECORD_DTYPE.itemsize,
+            size_bytes=size,
+            max_candles=self.max_candles
+        )
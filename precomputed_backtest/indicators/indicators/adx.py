@@ -7,10 +7,10 @@ ADX measures the strength of a trend, not its direction.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
-import talib
+from typing import Dict, Any, List, Optional, Tuple
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
 
 
 class ADXIndicator(BaseIndicator):
@@ -40,32 +40,165 @@ class ADXIndicator(BaseIndicator):
     def _get_output_columns(self) -> List[str]:
         return ['adx', 'plus_di', 'minus_di']
 
+    def _get_input_columns(self) -> List[str]:
+        return ['true_range']
+
     def _get_min_periods(self) -> int:
         return self.period * 2  # ADX needs more periods to stabilize
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
-        Calculate ADX using talib.
+        Calculate ADX, +DI and -DI (same values as TA-Lib).
+
+        Uses the shared vectorized Wilder kernels (kernels.directional_movement).
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with ADX, +DI, -DI columns added
+            Dictionary with ADX, +DI, -DI values
         """
-        result_df = df.copy()
 
         # Get period with per-TF support
         period = self.get_parameter('adx_period', self.default_period, self.timeframe)
         self.period = period  # Update instance period
 
-        high = result_df['high'].values
-        low = result_df['low'].values
-        close = result_df['close'].values
-
         # Calculate ADX and directional indicators
-        result_df['adx'] = talib.ADX(high, low, close, timeperiod=period)
-        result_df['plus_di'] = talib.PLUS_DI(high, low, close, timeperiod=period)
-        result_df['minus_di'] = talib.MINUS_DI(high, low, close, timeperiod=period)
+        dm = kernels.directional_movement(
+            data['high'], data['low'], data['close'], period, tr=data.get('true_range')
+        )
+
+        return {
+            'adx': dm['adx'],
+            'plus_di': dm['plus_di'],
+            'minus_di': dm['minus_di']
+        }
+
+    def get_store_key(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Same values as kernels.directional_movement()."""
+        return 'directional_movement', {
+            'period': self.get_parameter('adx_period', self.default_period, self.timeframe)
+        }
+
+    @staticmethod
+    def _is_zero(value: float) -> bool:
+        """Zero test used by TA-Lib (TA_IS_ZERO)."""
+        return -1e-8 < value < 1e-8
+
+    def _advance(self, state: Dict[str, Any], high: float, low: float, close: float) -> None:
+        """
+        Apply one bar of TA-Lib's directional-movement smoothing to the state.
+
+        Args:
+            state: Streaming state (advanced in place)
+            high: Bar high
+            low: Bar low
+            close: Bar close
+        """
+        period = state['period']
+
+        diff_plus = high - state['prev_high']
+        diff_minus = state['prev_low'] - low
+        true_range = max(high - low, abs(high - state['prev_close']), abs(low - state['prev_close']))
+
+        state['plus_dm'] -= state['plus_dm'] / period
+        state['minus_dm'] -= state['minus_dm'] / period
+        state['tr'] = state['tr'] - state['tr'] / period + true_range
+
+        if diff_minus > 0 and diff_plus < diff_minus:
+            state['minus_dm'] += diff_minus
+        elif diff_plus > 0 and diff_plus > diff_minus:
+            state['plus_dm'] += diff_plus
+
+        state['prev_high'] = high
+        state['prev_low'] = low
+        state['prev_close'] = close
+
+    def _directional_index(self, state: Dict[str, Any]):
+        """
+        Get (+DI, -DI, DX) from the smoothed state.
+
+        Returns:
+            Tuple (plus_di, minus_di, dx); dx is None when undefined
+        """
+        if self._is_zero(state['tr']):
+            return 0.0, 0.0, None
 
-        return result_df
+        plus_di = 100.0 * state['plus_dm'] / state['tr']
+        minus_di = 100.0 * state['minus_dm'] / state['tr']
+        di_sum = plus_di + minus_di
+
+        if self._is_zero(di_sum):
+            return plus_di, minus_di, None
+
+        return plus_di, minus_di, 100.0 * abs(minus_di - plus_di) / di_sum
+
+    def init_state(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Build streaming state: Wilder running sums and ADX at the last row.
+
+        Args:
+            df: DataFrame with OHLCV data
+
+        Returns:
+            State dictionary, or None if there is not enough data
+        """
+        period = self.period
+        if len(df) < 2 * period:
+            return None
+
+        high = df['high'].values.astype(float)
+        low = df['low'].values.astype(float)
+        close = df['close'].values.astype(float)
+        dm = kernels.directional_movement(high, low, close, period)
+
+        return {
+            'period': period,
+            'prev_high': high[-1],
+            'prev_low': low[-1],
+            'prev_close': close[-1],
+            'plus_dm': float(dm['plus_dm'][-1]),
+            'minus_dm': float(dm['minus_dm'][-1]),
+            'tr': float(dm['tr'][-1]),
+            'adx': float(dm['adx'][-1])
+        }
+
+    def update_incremental(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        state: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Advance ADX, +DI and -DI by the new rows.
+
+        Args:
+            df: DataFrame with OHLCV data
+            start: Position of the first new row
+            state: Streaming state (advanced in place)
+
+        Returns:
+            Dictionary of ADX column -> values for the new rows
+        """
+        period = state['period']
+        high = df['high'].values[start:]
+        low = df['low'].values[start:]
+        close = df['close'].values[start:]
+        count = len(close)
+
+        adx = np.empty(count)
+        plus_di = np.empty(count)
+        minus_di = np.empty(count)
+
+        for i in range(count):
+            self._advance(state, high[i], low[i], close[i])
+            plus_di[i], minus_di[i], dx = self._directional_index(state)
+            if dx is not None:
+                state['adx'] = (state['adx'] * (period - 1) + dx) / period
+            adx[i] = state['adx']
+
+        return {
+            'adx': adx,
+            'plus_di': plus_di,
+            'minus_di': minus_di
+        }
@@ -7,9 +7,10 @@ ATR measures market volatility by decomposing the entire range of a price.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
 
 
 class ATRIndicator(BaseIndicator):
@@ -39,36 +40,82 @@ class ATRIndicator(BaseIndicator):
     def _get_output_columns(self) -> List[str]:
         return ['atr']
 
+    def _get_input_columns(self) -> List[str]:
+        return ['true_range']
+
     def _get_min_periods(self) -> int:
         return self.period + 1
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Calculate ATR using Exponential Moving Average (Wilder's smoothing).
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with ATR column added
+            Dictionary with 'atr' values
         """
-        result_df = df.copy()
 
         # Get period with per-TF support
         period = self.get_parameter('atr_period', self.default_period, self.timeframe)
         self.period = period  # Update instance period
 
-        # Calculate True Range components
-        high_low = result_df['high'] - result_df['low']
-        high_close = abs(result_df['high'] - result_df['close'].shift(1))
-        low_close = abs(result_df['low'] - result_df['close'].shift(1))
-
-        # True Range is the maximum of the three
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+        # True Range (first bar: high - low), shared with ADX when provided
+        true_range = data.get('true_range')
+        if true_range is None:
+            true_range = kernels.true_range(data['high'], data['low'], data['close'])
 
         # ATR uses Wilder's smoothing method (alpha = 1/period)
         # This is different from standard EMA which uses alpha = 2/(period+1)
         # Wilder's formula: ATR[i] = ((ATR[i-1] * (n-1)) + TR[i]) / n
-        result_df['atr'] = true_range.ewm(alpha=1/period, adjust=False).mean()
+        return {'atr': kernels.ewm(true_range, 1 / period)}
+
+    def init_state(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Build streaming state: last ATR and last close.
+
+        Args:
+            df: DataFrame with ATR column calculated
+
+        Returns:
+            State dictionary, or None if ATR is not available
+        """
+        atr = df['atr'].iloc[-1]
+        if pd.isna(atr):
+            return None
+
+        return {
+            'period': self.period,
+            'atr': float(atr),
+            'prev_close': float(df['close'].iloc[-1])
+        }
+
+    def update_incremental(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        state: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Advance ATR by the new rows using Wilder's smoothing.
+
+        Args:
+            df: DataFrame with OHLCV data
+            start: Position of the first new row
+            state: Streaming state (advanced in place)
+
+        Returns:
+            Dictionary with 'atr' values for the new rows
+        """
+        close = df['close'].values[start:]
+        true_range = kernels.true_range(
+            df['high'].values[start:], df['low'].values[start:], close, state['prev_close']
+        )
+
+        atr = kernels.linear_filter(true_range, 1 / state['period'], state['atr'])
+
+        state['atr'] = float(atr[-1])
+        state['prev_close'] = float(close[-1])
 
-        return result_df
+        return {'atr': atr}
@@ -6,7 +6,7 @@ It provides a consistent interface for indicator calculation and validation.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Union, List
+from typing import Dict, Any, Optional, Union, List, Tuple
 import pandas as pd
 import numpy as np
 import logging
@@ -15,6 +15,43 @@ import hashlib
 logger = logging.getLogger(__name__)
 
 
+def assemble_columns(df: pd.DataFrame, columns: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Build a new DataFrame = df + indicator columns, in a single allocation.
+
+    The indicator columns are stacked into one block and joined with a
+    single concat instead of inserting (and copying) them one by one.
+    Columns that already exist in df are replaced at their position (as
+    df[col] = values would). df itself is not modified.
+
+    Args:
+        df: DataFrame with OHLCV data
+        columns: Dictionary of column name -> values (aligned with df rows)
+
+    Returns:
+        New DataFrame with all columns
+    """
+    if not columns:
+        return df.copy()
+
+    names = [name for name in columns if name not in df.columns]
+    block = np.empty((len(df), len(names)), dtype=float)
+    for i, name in enumerate(names):
+        block[:, i] = columns[name]
+
+    result = pd.concat(
+        [df, pd.DataFrame(block, index=df.index, columns=names)],
+        axis=1
+    )
+
+    # Replaced columns keep their position
+    for name in columns:
+        if name in df.columns:
+            result[name] = np.asarray(columns[name], dtype=float)
+
+    return result
+
+
 class BaseIndicator(ABC):
     """
     Abstract base class for all indicator calculators.
@@ -28,8 +65,13 @@ class BaseIndicator(ABC):
     3. Consistent output format
     4. Error handling
     5. Caching support
+    6. Declared inputs/outputs (nodes of the orchestrator's indicator DAG)
     """
 
+    # Intermediate nodes (e.g. true range) only feed other indicators;
+    # their columns are not part of the orchestrator's outputs
+    is_intermediate = False
+
     def __init__(self, config: Dict[str, Any] = None):
         """
         Initialize the indicator calculator.
@@ -42,6 +84,7 @@ class BaseIndicator(ABC):
         self.indicator_type = self._get_indicator_type()
         self.required_columns = self._get_required_columns()
         self.output_columns = self._get_output_columns()
+        self.input_columns = self._get_input_columns()
 
         # Caching
         self._cache_enabled = self.config.get('cache_enabled', True)
@@ -94,12 +137,83 @@ class BaseIndicator(ABC):
         """
         pass
 
+    def _get_input_columns(self) -> List[str]:
+        """
+        Get list of columns produced by other indicators that this one reuses.
+
+        These are edges of the indicator DAG: when the producing indicator is
+        registered, the orchestrator computes it first and passes its values
+        in; otherwise compute_arrays() calculates them itself.
+
+        Returns:
+            List of column names (default: none, e.g. ['true_range'])
+        """
+        return []
+
     @abstractmethod
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Calculate the indicator from raw column arrays.
+
+        This is the main method that performs the calculation.
+        Arrays are either 1-D (candles) or 2-D (symbols x candles); the
+        calculation runs along the last axis so the same code serves a
+        single DataFrame and a batched panel. Inputs must not be modified.
+
+        Args:
+            data: Dictionary of required column -> values, plus any
+                  available input columns (see _get_input_columns())
+
+        Returns:
+            Dictionary of output column -> values (same shape as the inputs)
+        """
+        pass
+
+    def _gather_data(self, source, inputs: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """
+        Collect required columns from source and available input columns from inputs.
+
+        Args:
+            source: DataFrame or panel dictionary with OHLCV data
+            inputs: Outputs of other indicators (optional)
+
+        Returns:
+            Dictionary of column -> values for compute_arrays()
+        """
+        if isinstance(source, pd.DataFrame):
+            data = {col: source[col].values for col in self.required_columns}
+        else:
+            data = {col: source[col] for col in self.required_columns}
+
+        if inputs:
+            for col in self.input_columns:
+                if col in inputs:
+                    data[col] = inputs[col]
+
+        return data
+
+    def compute(
+        self,
+        df: pd.DataFrame,
+        inputs: Optional[Dict[str, np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate the indicator and return only its output columns.
+
+        Args:
+            df: DataFrame with OHLCV data (not copied or modified)
+            inputs: Outputs of other indicators to reuse (optional)
+
+        Returns:
+            Dictionary of output column -> values (aligned with df rows)
+        """
+        return self.compute_arrays(self._gather_data(df, inputs))
+
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate the indicator and add columns to DataFrame.
 
-        This is the main method that performs the calculation.
+        Kept for backward compatibility; builds a new DataFrame from compute().
 
         Args:
             df: DataFrame with OHLCV data
@@ -107,52 +221,131 @@ class BaseIndicator(ABC):
         Returns:
             DataFrame with indicator columns added
         """
-        pass
+        return assemble_columns(df, self.compute(df))
 
-    def calculate_safe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_safe(
+        self,
+        df: pd.DataFrame,
+        inputs: Optional[Dict[str, np.ndarray]] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
         """
-        Safely calculate indicator with validation and error handling.
+        Safely compute indicator outputs with validation, caching and error handling.
 
         This is the main public method that should be called.
+        Returned arrays are read-only and may be shared with the cache.
 
         Args:
             df: DataFrame with OHLCV data
+            inputs: Outputs of other indicators to reuse (optional)
 
         Returns:
-            DataFrame with indicator columns added (original if error)
+            Dictionary of output column -> values, or None if error
         """
         try:
             # Validate input
             if not self._validate_input(df):
                 logger.warning(f"{self.name}: Input validation failed")
-                return df
+                return None
 
             # Check cache
+            df_hash = None
             if self._cache_enabled:
                 df_hash = self._get_dataframe_hash(df)
                 if df_hash is not None and df_hash == self._last_hash and self._last_result is not None:
                     logger.debug(f"{self.name}: Returning cached result")
-                    return self._last_result.copy()
+                    return self._last_result
 
             # Calculate
-            result_df = self.calculate(df)
+            outputs = {
+                col: np.asarray(values, dtype=float)
+                for col, values in self.compute(df, inputs).items()
+            }
 
             # Validate output
-            if not self._validate_output(result_df):
+            if not self._validate_output(outputs):
                 logger.warning(f"{self.name}: Output validation failed")
-                return df
+                return None
+
+            # Results are shared (cache + callers), never modified in place
+            for values in outputs.values():
+                values.flags.writeable = False
 
             # Cache result
             if self._cache_enabled:
-                self._last_result = result_df.copy()
+                self._last_result = outputs
                 self._last_hash = df_hash
 
             logger.debug(f"{self.name}: Calculation completed successfully")
-            return result_df
+            return outputs
 
         except Exception as e:
             logger.error(f"Error calculating {self.name}: {e}", exc_info=True)
+            return None
+
+    def compute_panel(
+        self,
+        panel: Dict[str, np.ndarray],
+        inputs: Optional[Dict[str, np.ndarray]] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Safely compute indicator outputs for a (symbols x candles) panel.
+
+        Args:
+            panel: Dictionary of column -> 2-D array (one row per symbol)
+            inputs: Outputs of other indicators to reuse (optional)
+
+        Returns:
+            Dictionary of output column -> 2-D array, or None if error
+        """
+        try:
+            # Validate input
+            for col in self.required_columns:
+                if col not in panel:
+                    logger.warning(f"{self.name}: Missing required column: {col}")
+                    return None
+
+            candles = panel[self.required_columns[0]].shape[-1]
+            min_periods = self._get_min_periods()
+            if candles < min_periods:
+                logger.warning(
+                    f"{self.name}: Insufficient data. "
+                    f"Need at least {min_periods} rows, got {candles}"
+                )
+                return None
+
+            # Calculate
+            outputs = {
+                col: np.asarray(values, dtype=float)
+                for col, values in self.compute_arrays(self._gather_data(panel, inputs)).items()
+            }
+
+            # Validate output
+            if not self._validate_output(outputs):
+                logger.warning(f"{self.name}: Output validation failed")
+                return None
+
+            return outputs
+
+        except Exception as e:
+            logger.error(f"Error calculating {self.name} panel: {e}", exc_info=True)
+            return None
+
+    def calculate_safe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Safely calculate indicator and add columns to DataFrame.
+
+        Kept for backward compatibility; prefer compute_safe().
+
+        Args:
+            df: DataFrame with OHLCV data
+
+        Returns:
+            DataFrame with indicator columns added (original if error)
+        """
+        outputs = self.compute_safe(df)
+        if outputs is None:
             return df
+        return assemble_columns(df, outputs)
 
     def get_values(
         self,
@@ -238,19 +431,19 @@ class BaseIndicator(ABC):
 
         return True
 
-    def _validate_output(self, df: pd.DataFrame) -> bool:
+    def _validate_output(self, outputs: Dict[str, np.ndarray]) -> bool:
         """
-        Validate output DataFrame.
+        Validate computed outputs.
 
         Args:
-            df: DataFrame to validate
+            outputs: Dictionary of output column -> values
 
         Returns:
             True if valid, False otherwise
         """
-        # Check output columns were added
+        # Check all output columns were produced
         for col in self.output_columns:
-            if col not in df.columns:
+            if col not in outputs:
                 logger.warning(f"{self.name}: Output column {col} not found")
                 return False
 
@@ -397,6 +590,78 @@ class BaseIndicator(ABC):
         )
         return default_value
 
+    def get_store_key(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Get the identity of this indicator's outputs in the shared IndicatorStore.
+
+        Indicators that compute the same values as a kernel used elsewhere
+        (e.g. by MarketRegimeDetector) return that name and their effective
+        parameters for the current timeframe, so other consumers reuse them.
+
+        Returns:
+            Tuple (name, parameters), or None if the outputs are not shared
+        """
+        return None
+
+    def _get_lookback(self) -> int:
+        """
+        Get number of trailing rows needed to recompute the newest value exactly.
+
+        Used by the default (window-based) incremental update.
+        Subclasses with rolling windows may override this.
+
+        Returns:
+            Lookback in rows (default: minimum periods)
+        """
+        return self._get_min_periods()
+
+    def init_state(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Build streaming state from a DataFrame that already has this indicator's columns.
+
+        The returned state describes the LAST row of df. Window-based indicators
+        (SMA, Bollinger, Stochastic, ...) need no state and return an empty dict.
+        Recursive indicators (EMA, RSI, ATR, ...) override this.
+
+        Args:
+            df: DataFrame with OHLCV data and calculated indicator columns
+
+        Returns:
+            State dictionary, or None if the indicator cannot be streamed yet
+        """
+        return {}
+
+    def update_incremental(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        state: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate indicator values for rows df[start:] only.
+
+        `state` must describe row start-1 and is advanced in place to the last
+        row of df. The default implementation recomputes the indicator on the
+        trailing window, which is exact for window-based indicators and costs
+        O(lookback) instead of O(len(df)).
+
+        Args:
+            df: DataFrame with OHLCV data (history + new rows)
+            start: Position of the first new row
+            state: Streaming state from init_state()
+
+        Returns:
+            Dictionary of output column -> values for the new rows
+        """
+        window_start = max(0, start - self._get_lookback() + 1)
+        outputs = self.compute(df.iloc[window_start:])
+        count = len(df) - start
+
+        return {
+            col: np.asarray(outputs[col], dtype=float)[-count:]
+            for col in self.output_columns
+        }
+
     def clear_cache(self):
         """Clear cached results."""
         self._last_result = None
@@ -413,5 +678,6 @@ class BaseIndicator(ABC):
             f"{self.__class__.__name__}(name='{self.name}', "
             f"type='{self.indicator_type}', "
             f"required={self.required_columns}, "
+            f"inputs={self.input_columns}, "
             f"output={self.output_columns})"
         )
@@ -7,9 +7,10 @@ Bollinger Bands consist of a middle band (SMA) and two outer bands (standard dev
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
 
 
 class BollingerBandsIndicator(BaseIndicator):
@@ -50,17 +51,23 @@ class BollingerBandsIndicator(BaseIndicator):
     def _get_min_periods(self) -> int:
         return self.period
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def get_store_key(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Same values as talib.BBANDS() (SMA, population std)."""
+        return 'bbands', {
+            'period': self.get_parameter('bb_period', self.default_period, self.timeframe),
+            'std': float(self.get_parameter('bb_std', self.default_std_multiplier, self.timeframe))
+        }
+
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Calculate Bollinger Bands using population standard deviation.
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with Bollinger Bands columns added
+            Dictionary of Bollinger Bands column -> values
         """
-        result_df = df.copy()
 
         # Get parameters with per-TF support
         period = self.get_parameter('bb_period', self.default_period, self.timeframe)
@@ -71,14 +78,15 @@ class BollingerBandsIndicator(BaseIndicator):
         self.std_multiplier = std_multiplier
 
         # Calculate middle band (SMA)
-        result_df['bb_middle'] = result_df['close'].rolling(window=period).mean()
+        bb_middle = kernels.rolling_mean(data['close'], period)
 
         # Calculate standard deviation
         # Use ddof=0 for population standard deviation (standard for Bollinger Bands)
-        std = result_df['close'].rolling(window=period).std(ddof=0)
+        std = kernels.rolling_std(data['close'], period, ddof=0)
 
         # Calculate upper and lower bands
-        result_df['bb_upper'] = result_df['bb_middle'] + (std * std_multiplier)
-        result_df['bb_lower'] = result_df['bb_middle'] - (std * std_multiplier)
-
-        return result_df
+        return {
+            'bb_upper': bb_middle + (std * std_multiplier),
+            'bb_middle': bb_middle,
+            'bb_lower': bb_middle - (std * std_multiplier)
+        }
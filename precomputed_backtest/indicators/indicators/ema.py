@@ -7,9 +7,10 @@ EMA gives more weight to recent prices.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
 
 
 class EMAIndicator(BaseIndicator):
@@ -44,7 +45,7 @@ class EMAIndicator(BaseIndicator):
     def _get_min_periods(self) -> int:
         return max(self.periods) if self.periods else 100
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Calculate EMA for all configured periods.
 
@@ -53,41 +54,71 @@ class EMAIndicator(BaseIndicator):
         2. Subsequent values: EMA = price * alpha + prev_EMA * (1-alpha)
            where alpha = 2 / (period + 1)
 
-        Optimized version using numpy arrays for fast computation.
+        The recursion runs in the shared vectorized kernel (kernels.ema).
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with EMA columns added
+            Dictionary of EMA column -> values
         """
-        result_df = df.copy()
+        result = {}
 
         # Get periods with per-TF support
         periods = self.get_parameter('ema_periods', self.default_periods, self.timeframe)
         self.periods = periods  # Update instance periods
         self.output_columns = self._get_output_columns()  # Update expected output columns for validation
 
+        close_values = data['close']
+
         for period in periods:
-            col_name = f'ema_{period}'
+            result[f'ema_{period}'] = kernels.ema(close_values, period)
+
+        return result
+
+    def init_state(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Build streaming state: last EMA value of every period.
+
+        Args:
+            df: DataFrame with EMA columns calculated
 
-            # Convert to numpy array for fast computation
-            close_values = result_df['close'].values
-            n = len(close_values)
+        Returns:
+            State dictionary, or None if any EMA is not warmed up yet
+        """
+        last_values = {}
+        for period in self.periods:
+            value = df[f'ema_{period}'].iloc[-1]
+            if pd.isna(value):
+                return None
+            last_values[period] = float(value)
+
+        return {'ema': last_values}
+
+    def update_incremental(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        state: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Advance every EMA by the new rows: EMA = price * alpha + prev_EMA * (1-alpha).
 
-            # Initialize EMA array
-            ema_values = np.empty(n)
-            ema_values[:period-1] = np.nan
+        Args:
+            df: DataFrame with OHLCV data
+            start: Position of the first new row
+            state: Streaming state (advanced in place)
 
-            # First EMA value = SMA of first N periods
-            ema_values[period-1] = np.mean(close_values[:period])
+        Returns:
+            Dictionary of EMA column -> values for the new rows
+        """
+        close_values = df['close'].values[start:]
+        result = {}
 
-            # Calculate remaining EMA values using vectorized operations
-            # This is much faster than using iloc in a loop
-            alpha = 2.0 / (period + 1)
-            for i in range(period, n):
-                ema_values[i] = alpha * close_values[i] + (1 - alpha) * ema_values[i-1]
+        for period in list(state['ema'].keys()):
+            ema_values = kernels.linear_filter(close_values, 2.0 / (period + 1), state['ema'][period])
 
-            result_df[col_name] = ema_values
+            state['ema'][period] = float(ema_values[-1])
+            result[f'ema_{period}'] = ema_values
 
-        return result_df
+        return result
@@ -0,0 +1,448 @@
+"""
+Recursive Filter Kernels - Shared EMA / Wilder smoothing routines
+
+All exponential smoothings used by the indicators are first-order linear
+recursions of the form:
+
+    y[i] = alpha * x[i] + (1 - alpha) * y[i-1]
+
+They differ only in alpha and in how the recursion is seeded:
+- EMA (TA-Lib):        alpha = 2 / (N + 1), seed = SMA of the first N values
+- EWM (pandas):        y[0] = x[0] (same as ewm(adjust=False))
+- Wilder RMA:          alpha = 1 / N, seed = SMA of the first N values
+- Wilder running sum:  S[i] = S[i-1] - S[i-1] / N + x[i] (ADX +DM/-DM/TR)
+
+The recursion is evaluated with scipy.signal.lfilter (a C loop) instead of
+a per-element Python loop. If scipy is not available a plain numpy loop is
+used, with identical results. Rolling-window helpers (mean/std/min/max) are
+included for the non-recursive indicators.
+
+Every function takes and returns float64 numpy arrays of the same shape as
+the input; positions without a value are NaN (same layout as TA-Lib).
+Inputs may be 1-D (candles) or 2-D (symbols x candles); calculations always
+run along the last axis, so a whole panel of aligned symbols is processed
+in one call.
+"""
+
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # pragma: no cover - scipy is an optional accelerator
+    lfilter = None
+
+
+def _as_float_array(values) -> np.ndarray:
+    """Convert input (array, Series, list) to a float64 numpy array."""
+    return np.asarray(values, dtype=np.float64)
+
+
+def _first_valid(values: np.ndarray) -> int:
+    """
+    Index of the first position without NaN (in any row for a 2-D panel).
+
+    Returns the length of the last axis if there is none.
+    """
+    n = values.shape[-1]
+    has_nan = np.isnan(values).reshape(-1, n).any(axis=0)
+    valid = np.flatnonzero(~has_nan)
+    return int(valid[0]) if len(valid) else n
+
+
+def linear_filter(values, alpha: float, initial, gain: float = None) -> np.ndarray:
+    """
+    Run the recursion y[i] = gain * x[i] + (1 - alpha) * y[i-1].
+
+    Args:
+        values: Input values (no NaN), 1-D or 2-D (recursion along last axis)
+        alpha: Smoothing factor (decay is 1 - alpha)
+        initial: Value of y before the first input (y[-1]); scalar, or one
+                 value per row for a 2-D input
+        gain: Input weight (default: alpha; use 1.0 for a Wilder running sum)
+
+    Returns:
+        Filtered values
+    """
+    x = _as_float_array(values)
+    if gain is None:
+        gain = alpha
+    decay = 1.0 - alpha
+
+    if x.shape[-1] == 0:
+        return np.empty(x.shape)
+
+    initial = np.broadcast_to(np.asarray(initial, dtype=np.float64), x.shape[:-1])
+
+    if lfilter is not None:
+        y, _ = lfilter([gain], [1.0, -decay], x, axis=-1, zi=(decay * initial)[..., np.newaxis])
+        return y
+
+    y = np.empty(x.shape)
+    prev = initial
+    for i in range(x.shape[-1]):
+        prev = gain * x[..., i] + decay * prev
+        y[..., i] = prev
+    return y
+
+
+def ewm(values, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the first value.
+
+    Same as pandas Series.ewm(alpha=alpha, adjust=False).mean() for input
+    without gaps. Leading NaN values are kept as NaN.
+
+    Args:
+        values: Input values
+        alpha: Smoothing factor
+
+    Returns:
+        Smoothed values
+    """
+    x = _as_float_array(values)
+    result = np.full(x.shape, np.nan)
+
+    start = _first_valid(x)
+    if start >= x.shape[-1]:
+        return result
+
+    result[..., start:] = linear_filter(x[..., start:], alpha, x[..., start])
+    return result
+
+
+def seeded_smooth(values, period: int, alpha: float, start: int = None) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the SMA of the first `period` values.
+
+    The seed is placed at index start + period - 1; earlier values are NaN.
+
+    Args:
+        values: Input values
+        period: Seed window length
+        alpha: Smoothing factor
+        start: First input used (default: first non-NaN value)
+
+    Returns:
+        Smoothed values
+    """
+    x = _as_float_array(values)
+    n = x.shape[-1]
+    result = np.full(x.shape, np.nan)
+
+    if start is None:
+        start = _first_valid(x)
+    seed_index = start + period - 1
+    if period < 1 or seed_index >= n:
+        return result
+
+    result[..., seed_index] = np.mean(x[..., start:seed_index + 1], axis=-1)
+    result[..., seed_index + 1:] = linear_filter(x[..., seed_index + 1:], alpha, result[..., seed_index])
+    return result
+
+
+def ema(values, period: int) -> np.ndarray:
+    """
+    EMA with TA-Lib seeding (alpha = 2 / (period + 1), SMA seed).
+
+    Args:
+        values: Input values
+        period: EMA period
+
+    Returns:
+        EMA values (NaN until the seed)
+    """
+    return seeded_smooth(values, period, 2.0 / (period + 1))
+
+
+def wilder_rma(values, period: int, start: int = None) -> np.ndarray:
+    """
+    Wilder's moving average (alpha = 1 / period, SMA seed).
+
+    Avg[i] = (Avg[i-1] * (period - 1) + x[i]) / period
+
+    Args:
+        values: Input values
+        period: Smoothing period
+        start: First input used (e.g. 1 to skip an undefined first diff)
+
+    Returns:
+        Smoothed values (NaN until the seed)
+    """
+    return seeded_smooth(values, period, 1.0 / period, start)
+
+
+def dema(values, period: int) -> np.ndarray:
+    """
+    Double EMA: 2 * EMA - EMA(EMA).
+
+    Args:
+        values: Input values
+        period: EMA period
+
+    Returns:
+        DEMA values
+    """
+    ema1 = ema(values, period)
+    ema2 = ema(ema1, period)
+    return 2.0 * ema1 - ema2
+
+
+def tema(values, period: int) -> np.ndarray:
+    """
+    Triple EMA: 3 * EMA - 3 * EMA(EMA) + EMA(EMA(EMA)).
+
+    Args:
+        values: Input values
+        period: EMA period
+
+    Returns:
+        TEMA values
+    """
+    ema1 = ema(values, period)
+    ema2 = ema(ema1, period)
+    ema3 = ema(ema2, period)
+    return 3.0 * ema1 - 3.0 * ema2 + ema3
+
+
+def true_range(high, low, close, prev_close: float = None) -> np.ndarray:
+    """
+    True Range: max(high - low, |high - prev_close|, |low - prev_close|).
+
+    Without prev_close the first bar has no previous close, so
+    TR[0] = high[0] - low[0].
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        prev_close: Close of the bar before the first one (streaming)
+
+    Returns:
+        True Range values
+    """
+    high = _as_float_array(high)
+    low = _as_float_array(low)
+    close = _as_float_array(close)
+
+    tr = high - low
+    if prev_close is None:
+        first, prev = 1, close[..., :-1]
+    else:
+        prev_close = np.broadcast_to(np.asarray(prev_close, dtype=np.float64), close.shape[:-1])
+        first, prev = 0, np.concatenate((prev_close[..., np.newaxis], close[..., :-1]), axis=-1)
+
+    if tr.shape[-1] > first:
+        tr[..., first:] = np.maximum(tr[..., first:], np.maximum(
+            np.abs(high[..., first:] - prev),
+            np.abs(low[..., first:] - prev)
+        ))
+    return tr
+
+
+def rsi(close, period: int) -> np.ndarray:
+    """
+    RSI with Wilder's smoothing of gains and losses (TA-Lib seeding).
+
+    Uses RSI = 100 * avg_gain / (avg_gain + avg_loss); returns 50 when
+    there was no price movement at all.
+
+    Args:
+        close: Close prices
+        period: RSI period
+
+    Returns:
+        RSI values in [0, 100] (NaN for the first `period` bars)
+    """
+    avg_gain, avg_loss = rsi_averages(close, period)
+    return rsi_from_averages(avg_gain, avg_loss)
+
+
+def rsi_averages(close, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wilder averages of gains and losses used by RSI.
+
+    Args:
+        close: Close prices
+        period: RSI period
+
+    Returns:
+        Tuple (avg_gain, avg_loss)
+    """
+    close = _as_float_array(close)
+    delta = np.empty(close.shape)
+    delta[..., :1] = np.nan
+    delta[..., 1:] = np.diff(close, axis=-1)
+
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    return wilder_rma(gain, period, start=1), wilder_rma(loss, period, start=1)
+
+
+def rsi_from_averages(avg_gain, avg_loss) -> np.ndarray:
+    """
+    Convert Wilder average gain/loss to RSI.
+
+    Args:
+        avg_gain: Average gains
+        avg_loss: Average losses
+
+    Returns:
+        RSI values in [0, 100]
+    """
+    avg_gain = _as_float_array(avg_gain)
+    total = avg_gain + _as_float_array(avg_loss)
+
+    # When total = 0 (no movement), RSI = 50 (neutral)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(total != 0, avg_gain / np.where(total != 0, total, 1.0), 0.5)
+    ratio = np.where(np.isnan(total), np.nan, ratio)
+
+    return np.clip(100.0 * ratio, 0, 100)
+
+
+def atr(high, low, close, period: int) -> np.ndarray:
+    """
+    ATR with TA-Lib seeding (Wilder RMA of TR, seeded from bar 1).
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period: ATR period
+
+    Returns:
+        ATR values (NaN for the first `period` bars)
+    """
+    return wilder_rma(true_range(high, low, close), period, start=1)
+
+
+def _is_zero(values: np.ndarray) -> np.ndarray:
+    """Zero test used by TA-Lib (TA_IS_ZERO)."""
+    return (values > -1e-8) & (values < 1e-8)
+
+
+def directional_movement(high, low, close, period: int, tr=None) -> Dict[str, np.ndarray]:
+    """
+    ADX / +DI / -DI, matching TA-Lib's ADX, PLUS_DI and MINUS_DI.
+
+    +DM, -DM and TR are smoothed with Wilder's running sum
+    (S = S - S / period + x), seeded with the sum of bars 1..period-1.
+    ADX is the Wilder RMA of DX, seeded with the mean DX of the first
+    `period` DI bars. Bars where DX is undefined leave ADX unchanged.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period: ADX period
+        tr: Precomputed true_range(high, low, close) (optional)
+
+    Returns:
+        Dictionary with 'adx', 'plus_di', 'minus_di' and the smoothed
+        'plus_dm', 'minus_dm', 'tr' (the running sums, for streaming)
+    """
+    high = _as_float_array(high)
+    low = _as_float_array(low)
+    close = _as_float_array(close)
+    n = close.shape[-1]
+
+    names = ('adx', 'plus_di', 'minus_di', 'plus_dm', 'minus_dm', 'tr')
+    result = {name: np.full(close.shape, np.nan) for name in names}
+    if period < 2 or n <= period:
+        return result
+
+    # Raw directional movement (only one of +DM / -DM is non-zero per bar)
+    diff_plus = np.zeros(close.shape)
+    diff_minus = np.zeros(close.shape)
+    diff_plus[..., 1:] = np.diff(high, axis=-1)
+    diff_minus[..., 1:] = -np.diff(low, axis=-1)
+
+    minus_dm = np.where((diff_minus > 0) & (diff_plus < diff_minus), diff_minus, 0.0)
+    plus_dm = np.where((diff_plus > 0) & (diff_plus > diff_minus), diff_plus, 0.0)
+    tr = true_range(high, low, close) if tr is None else _as_float_array(tr)
+
+    # Wilder running sums: seed at bar period-1, recursion from bar period
+    decay_alpha = 1.0 / period
+    seed_index = period - 1
+    for name, raw in (('plus_dm', plus_dm), ('minus_dm', minus_dm), ('tr', tr)):
+        smoothed = result[name]
+        smoothed[..., seed_index] = raw[..., 1:period].sum(axis=-1)
+        smoothed[..., period:] = linear_filter(
+            raw[..., period:], decay_alpha, smoothed[..., seed_index], gain=1.0
+        )
+
+    # Directional indicators
+    tr_s = result['tr'][..., period:]
+    tr_zero = _is_zero(tr_s)
+    safe_tr = np.where(tr_zero, 1.0, tr_s)
+    plus_di = np.where(tr_zero, 0.0, 100.0 * result['plus_dm'][..., period:] / safe_tr)
+    minus_di = np.where(tr_zero, 0.0, 100.0 * result['minus_dm'][..., period:] / safe_tr)
+    result['plus_di'][..., period:] = plus_di
+    result['minus_di'][..., period:] = minus_di
+
+    # DX (undefined when TR or +DI + -DI is zero)
+    di_sum = plus_di + minus_di
+    dx_valid = ~tr_zero & ~_is_zero(di_sum)
+    dx = np.where(dx_valid, 100.0 * np.abs(minus_di - plus_di) / np.where(dx_valid, di_sum, 1.0), 0.0)
+
+    first_adx = 2 * period - 1
+    if n <= first_adx:
+        return result
+
+    # First ADX = average DX over the first `period` DI bars
+    adx = result['adx']
+    adx[..., first_adx] = dx[..., :period].sum(axis=-1) / period
+
+    tail_dx = dx[..., period:]
+    tail_valid = dx_valid[..., period:]
+    if tail_valid.all():
+        adx[..., first_adx + 1:] = linear_filter(tail_dx, decay_alpha, adx[..., first_adx])
+    else:
+        # Rare flat-market case: ADX holds its value on undefined DX bars
+        value = adx[..., first_adx]
+        for i in range(tail_dx.shape[-1]):
+            value = np.where(tail_valid[..., i], (value * (period - 1) + tail_dx[..., i]) / period, value)
+            adx[..., first_adx + 1 + i] = value
+
+    return result
+
+
+def _rolling(values, window: int, reducer: Callable) -> np.ndarray:
+    """
+    Apply reducer over a trailing window along the last axis.
+
+    The first window-1 positions are NaN, and any window containing NaN
+    gives NaN (same as pandas rolling with min_periods=window).
+    """
+    x = _as_float_array(values)
+    result = np.full(x.shape, np.nan)
+    if window < 1 or window > x.shape[-1]:
+        return result
+
+    windows = sliding_window_view(x, window, axis=-1)
+    result[..., window - 1:] = reducer(windows, axis=-1)
+    return result
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """Trailing simple moving average (pandas rolling(window).mean())."""
+    return _rolling(values, window, np.mean)
+
+
+def rolling_std(values, window: int, ddof: int = 0) -> np.ndarray:
+    """Trailing standard deviation (pandas rolling(window).std(ddof))."""
+    return _rolling(values, window, lambda windows, axis: np.std(windows, axis=axis, ddof=ddof))
+
+
+def rolling_min(values, window: int) -> np.ndarray:
+    """Trailing minimum (pandas rolling(window).min())."""
+    return _rolling(values, window, np.min)
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    """Trailing maximum (pandas rolling(window).max())."""
+    return _rolling(values, window, np.max)
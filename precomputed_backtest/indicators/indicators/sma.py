@@ -10,6 +10,7 @@ import numpy as np
 from typing import Dict, Any, List
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
 
 
 class SMAIndicator(BaseIndicator):
@@ -44,17 +45,17 @@ class SMAIndicator(BaseIndicator):
     def _get_min_periods(self) -> int:
         return max(self.periods) if self.periods else 200
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Calculate SMA for all configured periods.
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with SMA columns added
+            Dictionary of SMA column -> values
         """
-        result_df = df.copy()
+        result = {}
 
         # Get periods with per-TF support
         periods = self.get_parameter('sma_periods', self.default_periods, self.timeframe)
@@ -63,6 +64,6 @@ class SMAIndicator(BaseIndicator):
 
         for period in periods:
             col_name = f'sma_{period}'
-            result_df[col_name] = result_df['close'].rolling(window=period).mean()
+            result[col_name] = kernels.rolling_mean(data['close'], period)
 
-        return result_df
+        return result
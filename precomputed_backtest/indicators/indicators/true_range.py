@@ -0,0 +1,50 @@
+"""
+True Range - Intermediate node of the indicator DAG
+
+True Range is not used by analyzers directly; it is computed once and
+shared by the indicators built on it (ATR, ADX).
+"""
+
+import numpy as np
+from typing import Dict, List
+
+from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
+
+
+class TrueRangeIndicator(BaseIndicator):
+    """
+    True Range calculator (shared intermediate).
+
+    TR = max(high - low, |high - prev_close|, |low - prev_close|);
+    the first bar has no previous close and uses high - low.
+    """
+
+    is_intermediate = True
+
+    def _get_indicator_name(self) -> str:
+        return "TrueRange"
+
+    def _get_indicator_type(self) -> str:
+        return "volatility"
+
+    def _get_required_columns(self) -> List[str]:
+        return ['high', 'low', 'close']
+
+    def _get_output_columns(self) -> List[str]:
+        return ['true_range']
+
+    def _get_lookback(self) -> int:
+        return 2  # Needs the previous close
+
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Calculate True Range.
+
+        Args:
+            data: Dictionary of column -> values (1-D or symbols x candles)
+
+        Returns:
+            Dictionary with 'true_range' values
+        """
+        return {'true_range': kernels.true_range(data['high'], data['low'], data['close'])}
@@ -4,6 +4,8 @@ HTFAnalyzer - Higher Timeframe Analysis
 Analyzes higher timeframe structure for multi-timeframe confirmation.
 
 Note: This analyzer requires HTF data to be passed in context metadata.
+SignalOrchestrator.analyze_symbol attaches the frames of all analyzed
+timeframes (with their indicator columns once calculated) by reference.
 If HTF data is not available, it will skip analysis.
 
 Uses indicators:
@@ -46,6 +48,12 @@ class HTFAnalyzer(BaseAnalyzer):
         '4h': 240      # 4 hours
     }
     
+    # Indicator columns read from context.df
+    REQUIRED_INDICATORS = ['ema_20', 'ema_50']  # read from the HTF frame
+    
+    # Analyzer results read from the context
+    REQUIRED_RESULTS = ['trend']
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
 
@@ -83,7 +91,7 @@ class HTFAnalyzer(BaseAnalyzer):
                 return
             
             # Get higher timeframe
-            htf = self._get_higher_timeframe(current_tf)
+            htf = self.get_higher_timeframe(current_tf)
             
             if htf not in htf_data:
                 logger.debug(f"HTF {htf} not available")
@@ -148,7 +156,7 @@ class HTFAnalyzer(BaseAnalyzer):
                 'error': str(e)
             })
     
-    def _get_higher_timeframe(self, current_tf: str) -> str:
+    def get_higher_timeframe(self, current_tf: str) -> str:
         """Get the next higher timeframe."""
         current_minutes = self.TF_HIERARCHY.get(current_tf, 60)
         
@@ -6,12 +6,14 @@ It provides a consistent interface for pattern detection and scoring.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
 import logging
 
 from signal_generation.pattern_score_utils import get_pattern_score
+from signal_generation.analyzers.patterns.candlestick_scan import CandlestickScan
+from common.swing_index import SwingIndex
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,9 @@ class BasePattern(ABC):
     4. Consistent output format
     """
 
+    # TA-Lib CDL function of this detector (None for custom detectors)
+    TALIB_FUNCTION: Optional[str] = None
+
     def __init__(self, config: Dict[str, Any] = None):
         """
         Initialize the pattern detector.
@@ -56,6 +61,12 @@ class BasePattern(ABC):
         # Cache for last detection position
         self._last_detection_candles_ago = None
 
+        # Shared TA-Lib scan of the current DataFrame (set by PatternOrchestrator)
+        self.scan: Optional[CandlestickScan] = None
+
+        # Shared swing index of the current DataFrame (set by PatternOrchestrator)
+        self.swings: Optional[SwingIndex] = None
+
         logger.debug(f"Pattern initialized: {self.name}")
 
     @abstractmethod
@@ -125,6 +136,99 @@ class BasePattern(ABC):
         """
         pass
 
+    def _get_talib_params(self) -> Dict[str, Any]:
+        """
+        Get the TA-Lib parameters of TALIB_FUNCTION.
+
+        Subclasses override this for tunable functions (e.g. penetration).
+
+        Returns:
+            Dictionary of TA-Lib keyword arguments
+        """
+        return {}
+
+    def get_talib_spec(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Get the TA-Lib function this detector needs in the shared scan.
+
+        Returns:
+            (function name, parameters), or None for custom detectors
+        """
+        if self.TALIB_FUNCTION is None:
+            return None
+        return self.TALIB_FUNCTION, self._get_talib_params()
+
+    def _talib_result(
+        self,
+        df: pd.DataFrame,
+        open_col: str = 'open',
+        high_col: str = 'high',
+        low_col: str = 'low',
+        close_col: str = 'close'
+    ) -> np.ndarray:
+        """
+        Get the TALIB_FUNCTION values for the recent candles of df.
+
+        Reads this detector's row of the shared scan when it covers df,
+        otherwise scans df for this function alone.
+
+        Args:
+            df: DataFrame with OHLC data
+            open_col: Name of open price column
+            high_col: Name of high price column
+            low_col: Name of low price column
+            close_col: Name of close price column
+
+        Returns:
+            TA-Lib values for at least lookback_window recent candles
+            (last = last candle)
+        """
+        columns = (open_col, high_col, low_col, close_col)
+        scan = self.scan
+
+        if scan is None or not scan.covers(df, columns, self.lookback_window):
+            scan = CandlestickScan(
+                df,
+                recent=self.lookback_window,
+                open_col=open_col,
+                high_col=high_col,
+                low_col=low_col,
+                close_col=close_col
+            )
+
+        return scan.get(self.TALIB_FUNCTION, self._get_talib_params())
+
+    def _swing_peaks(
+        self,
+        df: pd.DataFrame,
+        kind: str,
+        distance: int,
+        prominence_factor: float = 0.5,
+        high_col: str = 'high',
+        low_col: str = 'low'
+    ) -> np.ndarray:
+        """
+        Get peak (kind='high') or trough (kind='low') positions of df.
+
+        Reads the shared swing index when it covers df, otherwise
+        builds an index for df.
+
+        Args:
+            df: DataFrame with OHLC data
+            kind: 'high' or 'low'
+            distance: Minimum distance between peaks
+            prominence_factor: Required prominence in standard deviations
+            high_col: Name of high price column
+            low_col: Name of low price column
+
+        Returns:
+            Peak positions, ascending
+        """
+        swings = self.swings
+        if swings is None or not swings.covers(df, high_col, low_col):
+            swings = SwingIndex(df, high_col, low_col)
+        return swings.peaks(kind, distance, prominence_factor)
+
     def get_pattern_info(
         self,
         df: pd.DataFrame,
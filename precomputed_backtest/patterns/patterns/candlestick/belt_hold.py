@@ -12,7 +12,6 @@ Version: 1.0.0 (2025-10-26) - Initial Implementation
 
 BELT_HOLD_PATTERN_VERSION = "1.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -40,6 +39,8 @@ class BeltHoldPattern(BasePattern):
     Direction: Can be bullish or bearish
     """
 
+    TALIB_FUNCTION = 'CDLBELTHOLD'
+
     def _get_pattern_name(self) -> str:
         return "Belt Hold"
 
@@ -84,12 +85,7 @@ class BeltHoldPattern(BasePattern):
             return False
 
         try:
-            result = talib.CDLBELTHOLD(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
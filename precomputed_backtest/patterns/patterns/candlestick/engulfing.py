@@ -22,7 +22,6 @@ Version: 2.0.0 (2025-10-25) - MAJOR CHANGE
 
 ENGULFING_PATTERN_VERSION = "3.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -48,6 +47,8 @@ class EngulfingPattern(BasePattern):
     - Highest detection rate among all patterns!
     """
 
+    TALIB_FUNCTION = 'CDLENGULFING'
+
     def __init__(self, config: Dict[str, Any] = None):
         """Initialize Engulfing detector."""
         super().__init__(config)
@@ -68,12 +69,7 @@ class EngulfingPattern(BasePattern):
     def _get_talib_result(self, df: pd.DataFrame) -> np.ndarray:
         """Get TALib CDLENGULFING result (helper method to avoid duplicate calls)."""
         try:
-            result = talib.CDLENGULFING(
-                df['open'].values,
-                df['high'].values,
-                df['low'].values,
-                df['close'].values
-            )
+            result = self._talib_result(df)
             return result
         except Exception:
             return np.array([])
@@ -116,12 +112,7 @@ class EngulfingPattern(BasePattern):
         try:
             # Use TALib to detect
             # Pass full DataFrame - TA-Lib uses previous candles for context
-            result = talib.CDLENGULFING(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # NEW v3.0.0: Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
@@ -43,7 +43,6 @@ Quality Score:
 
 HAMMER_PATTERN_VERSION = "4.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -81,6 +80,8 @@ class HammerPattern(BasePattern):
     They are still used in quality_metrics calculation.
     """
 
+    TALIB_FUNCTION = 'CDLHAMMER'
+
     def __init__(
         self,
         config: Dict[str, Any] = None,
@@ -175,18 +176,9 @@ class HammerPattern(BasePattern):
             return False
 
         try:
-            # Prepare data for TA-Lib
-            # Use last 100 candles for performance (minimum 12, but more is fine)
-            df_tail = df.tail(100)
-
             # Call TA-Lib CDLHAMMER
             # TA-Lib uses previous candles for context in its algorithm
-            pattern = talib.CDLHAMMER(
-                df_tail[open_col].values,
-                df_tail[high_col].values,
-                df_tail[low_col].values,
-                df_tail[close_col].values
-            )
+            pattern = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # NEW v3.0.0: Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(pattern))
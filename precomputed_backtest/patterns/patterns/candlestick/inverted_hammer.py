@@ -21,7 +21,6 @@ Version: 2.0.0 (2025-10-25) - MAJOR CHANGE
 
 INVERTED_HAMMER_PATTERN_VERSION = "3.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -47,6 +46,8 @@ class InvertedHammerPattern(BasePattern):
     - Detection rate on BTC 1-hour: 59/10543 = 0.56%
     """
 
+    TALIB_FUNCTION = 'CDLINVERTEDHAMMER'
+
     def __init__(self, config: Dict[str, Any] = None):
         """Initialize Inverted Hammer detector."""
         super().__init__(config)
@@ -101,12 +102,7 @@ class InvertedHammerPattern(BasePattern):
         try:
             # Use TALib to detect
             # Pass full DataFrame - TA-Lib uses previous candles for context
-            result = talib.CDLINVERTEDHAMMER(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # NEW v3.0.0: Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
@@ -14,7 +14,6 @@ Version: 1.0.0 (2025-11-18) - Initial TALib Implementation
 
 KICKING_PATTERN_VERSION = "1.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -61,6 +60,8 @@ class KickingPattern(BasePattern):
     - Best results in 4h+ timeframes
     """
 
+    TALIB_FUNCTION = 'CDLKICKING'
+
     def __init__(self, config: Dict[str, Any] = None):
         """
         Initialize Kicking detector.
@@ -125,12 +126,7 @@ class KickingPattern(BasePattern):
 
         try:
             # Use TA-Lib to detect Kicking
-            result = talib.CDLKICKING(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
@@ -171,12 +167,7 @@ class KickingPattern(BasePattern):
         """
         try:
             # Get TA-Lib result
-            result = talib.CDLKICKING(
-                df['open'].values,
-                df['high'].values,
-                df['low'].values,
-                df['close'].values
-            )
+            result = self._talib_result(df)
 
             if len(result) == 0:
                 return 'bullish'
@@ -233,12 +224,7 @@ class KickingPattern(BasePattern):
             candle2 = df.iloc[idx2]
 
             # Determine variant (bullish or bearish)
-            result = talib.CDLKICKING(
-                df['open'].values,
-                df['high'].values,
-                df['low'].values,
-                df['close'].values
-            )
+            result = self._talib_result(df)
 
             variant = 'bullish' if result[idx2] > 0 else 'bearish'
 
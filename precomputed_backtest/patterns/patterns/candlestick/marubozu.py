@@ -12,7 +12,6 @@ Version: 1.0.0 (2025-10-26) - Initial Implementation
 
 MARUBOZU_PATTERN_VERSION = "1.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -35,6 +34,8 @@ class MarubozuPattern(BasePattern):
     Direction: Can be bullish or bearish
     """
 
+    TALIB_FUNCTION = 'CDLMARUBOZU'
+
     def _get_pattern_name(self) -> str:
         return "Marubozu"
 
@@ -79,12 +80,7 @@ class MarubozuPattern(BasePattern):
             return False
 
         try:
-            result = talib.CDLMARUBOZU(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
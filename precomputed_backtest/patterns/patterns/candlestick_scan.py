@@ -0,0 +1,177 @@
+"""
+Candlestick Scan - Single-pass TA-Lib CDL scan shared by candlestick detectors
+
+PatternOrchestrator builds one scan per DataFrame: the OHLC arrays are
+extracted once, every enabled TA-Lib CDL function runs once over them, and
+the results are kept as a compact detection matrix (patterns x recent
+candles). Candlestick detectors read their row of the matrix instead of
+extracting the arrays and calling TA-Lib themselves.
+"""
+
+from typing import Dict, Any, Iterable, Optional, Tuple
+import pandas as pd
+import numpy as np
+import logging
+import talib
+
+logger = logging.getLogger(__name__)
+
+
+class CandlestickScan:
+    """
+    Detection matrix of TA-Lib CDL functions over the last candles of a DataFrame.
+
+    TA-Lib CDL functions only look at a short trailing window (body/shadow
+    averages of about 10 candles plus the pattern candles, at most
+    TALIB_LOOKBACK candles), so scanning the last `scan_window` candles gives
+    the same values for the recent candles as scanning the full history. The
+    scan is extended when `recent` plus that lookback exceeds `scan_window`.
+
+    Rows are keyed by (function name, parameters). Values are the raw TA-Lib
+    output: +100/-100 (bullish/bearish), +200/-200 (confirmed), 0 (no pattern).
+    The last column is the last candle.
+    """
+
+    DEFAULT_SCAN_WINDOW = 100
+    DEFAULT_RECENT = 15
+
+    # Largest TA-Lib CDL lookback (candles before the first valid value)
+    TALIB_LOOKBACK = 14
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        recent: int = DEFAULT_RECENT,
+        scan_window: int = DEFAULT_SCAN_WINDOW,
+        open_col: str = 'open',
+        high_col: str = 'high',
+        low_col: str = 'low',
+        close_col: str = 'close'
+    ):
+        """
+        Extract the OHLC arrays of df.
+
+        Args:
+            df: DataFrame with OHLC data
+            recent: Number of recent candles kept per pattern
+            scan_window: Number of last candles passed to TA-Lib
+                         (at least recent + TALIB_LOOKBACK)
+            open_col: Name of open price column
+            high_col: Name of high price column
+            low_col: Name of low price column
+            close_col: Name of close price column
+        """
+        self.df = df
+        self.columns = (open_col, high_col, low_col, close_col)
+
+        scan_window = max(scan_window, recent + self.TALIB_LOOKBACK)
+        tail = df.iloc[-scan_window:] if len(df) > scan_window else df
+        self._ohlc = tuple(
+            np.ascontiguousarray(tail[col].values, dtype=np.float64)
+            for col in self.columns
+        )
+
+        self.recent = max(0, min(recent, len(tail)))
+
+        # Row index by (function, params) and the detection matrix
+        self._rows: Dict[Tuple, int] = {}
+        self.matrix = np.zeros((0, self.recent), dtype=np.int32)
+
+    @staticmethod
+    def key(function_name: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+        """Row key of a TA-Lib function with its parameters."""
+        return (function_name, tuple(sorted((params or {}).items())))
+
+    def covers(
+        self,
+        df: pd.DataFrame,
+        columns: Tuple[str, str, str, str],
+        lookback: int
+    ) -> bool:
+        """
+        Check if this scan can answer a detector looking at df.
+
+        Args:
+            df: DataFrame passed to the detector
+            columns: (open, high, low, close) column names used by the detector
+            lookback: Number of recent candles the detector checks
+
+        Returns:
+            True if the scan was built from the same DataFrame and columns
+            and keeps at least `lookback` recent candles
+        """
+        return (
+            df is self.df and
+            columns == self.columns and
+            (lookback <= self.recent or self.recent == len(self._ohlc[0]))
+        )
+
+    def run(self, specs: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Run TA-Lib CDL functions and add their rows to the matrix.
+
+        Args:
+            specs: (function name, parameters) pairs, e.g. ('CDLMATHOLD', {'penetration': 0.3})
+        """
+        new = {}
+        for function_name, params in specs:
+            key = self.key(function_name, params)
+            if key not in self._rows and key not in new:
+                new[key] = (function_name, params or {})
+
+        if not new:
+            return
+
+        rows = np.empty((len(new), self.recent), dtype=np.int32)
+        start = len(self._rows)
+
+        for i, (key, (function_name, params)) in enumerate(new.items()):
+            result = getattr(talib, function_name)(*self._ohlc, **params)
+            rows[i] = result[len(result) - self.recent:]
+            self._rows[key] = start + i
+
+        self.matrix = np.concatenate([self.matrix, rows]) if start else rows
+
+    def get(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """
+        Get the recent values of a TA-Lib function (runs it if not scanned yet).
+
+        Args:
+            function_name: TA-Lib function name (e.g. 'CDLHAMMER')
+            params: TA-Lib parameters
+
+        Returns:
+            Values for the recent candles (last = last candle)
+        """
+        key = self.key(function_name, params)
+        if key not in self._rows:
+            self.run([(function_name, params)])
+        return self.matrix[self._rows[key]]
+
+    def candles_ago(self, lookbacks: Optional[Dict[Tuple, int]] = None) -> Dict[Tuple, int]:
+        """
+        Position of the most recent detection of every row, in one pass.
+
+        Args:
+            lookbacks: Number of recent candles to check per row key
+                       (default: all recent candles)
+
+        Returns:
+            Dictionary of row key -> candles ago (0 = last candle);
+            rows without a detection in their lookback are omitted
+        """
+        if not self._rows:
+            return {}
+
+        lookbacks = lookbacks or {}
+        keys = list(self._rows)
+        limits = np.array([lookbacks.get(key, self.recent) for key in keys])
+
+        # Newest candle first, masked to each row's lookback
+        hits = self.matrix[[self._rows[key] for key in keys], ::-1] != 0
+        hits &= np.arange(self.recent) < limits[:, None]
+
+        found = hits.any(axis=1)
+        first = hits.argmax(axis=1)
+
+        return {key: int(first[i]) for i, key in enumerate(keys) if found[i]}
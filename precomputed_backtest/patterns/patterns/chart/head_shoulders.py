@@ -8,7 +8,6 @@ These are strong reversal patterns.
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional
-from scipy.signal import find_peaks
 
 from signal_generation.analyzers.patterns.base_pattern import BasePattern
 
@@ -72,12 +71,12 @@ class HeadShouldersPattern(BasePattern):
             lows = df[low_col].values
 
             # Try to detect regular Head and Shoulders
-            if self._detect_regular_hs(highs):
+            if self._detect_regular_hs(df, highs, high_col, low_col):
                 self._detected_type = 'regular'
                 return True
 
             # Try to detect Inverse Head and Shoulders
-            if self._detect_inverse_hs(lows):
+            if self._detect_inverse_hs(df, lows, high_col, low_col):
                 self._detected_type = 'inverse'
                 return True
 
@@ -86,15 +85,17 @@ class HeadShouldersPattern(BasePattern):
         except Exception as e:
             return False
 
-    def _detect_regular_hs(self, highs: np.ndarray) -> bool:
+    def _detect_regular_hs(
+        self,
+        df: pd.DataFrame,
+        highs: np.ndarray,
+        high_col: str = 'high',
+        low_col: str = 'low'
+    ) -> bool:
         """Detect regular Head and Shoulders pattern."""
         try:
             # Find peaks
-            peaks, _ = find_peaks(
-                highs,
-                distance=self.min_distance,
-                prominence=np.std(highs) * 0.5
-            )
+            peaks = self._swing_peaks(df, 'high', self.min_distance, high_col=high_col, low_col=low_col)
 
             if len(peaks) < 3:
                 return False
@@ -117,15 +118,17 @@ class HeadShouldersPattern(BasePattern):
         except Exception:
             return False
 
-    def _detect_inverse_hs(self, lows: np.ndarray) -> bool:
+    def _detect_inverse_hs(
+        self,
+        df: pd.DataFrame,
+        lows: np.ndarray,
+        high_col: str = 'high',
+        low_col: str = 'low'
+    ) -> bool:
         """Detect Inverse Head and Shoulders pattern."""
         try:
             # Find troughs
-            troughs, _ = find_peaks(
-                -lows,
-                distance=self.min_distance,
-                prominence=np.std(lows) * 0.5
-            )
+            troughs = self._swing_peaks(df, 'low', self.min_distance, high_col=high_col, low_col=low_col)
 
             if len(troughs) < 3:
                 return False
@@ -172,11 +175,7 @@ class HeadShouldersPattern(BasePattern):
         """Get details for regular H&S pattern."""
         try:
             highs = df['high'].values
-            peaks, _ = find_peaks(
-                highs,
-                distance=self.min_distance,
-                prominence=np.std(highs) * 0.5
-            )
+            peaks = self._swing_peaks(df, 'high', self.min_distance)
 
             if len(peaks) >= 3:
                 last_three = peaks[-3:]
@@ -212,11 +211,7 @@ class HeadShouldersPattern(BasePattern):
         """Get details for inverse H&S pattern."""
         try:
             lows = df['low'].values
-            troughs, _ = find_peaks(
-                -lows,
-                distance=self.min_distance,
-                prominence=np.std(lows) * 0.5
-            )
+            troughs = self._swing_peaks(df, 'low', self.min_distance)
 
             if len(troughs) >= 3:
                 last_three = troughs[-3:]
@@ -5,7 +5,7 @@ This orchestrator manages the detection of all patterns (candlestick and chart).
 It loads pattern detectors dynamically and coordinates their execution.
 """
 
-from typing import Dict, Any, List, Optional, Type
+from typing import Dict, Any, List, Optional, Tuple, Type
 import pandas as pd
 import logging
 from pathlib import Path
@@ -13,6 +13,8 @@ import importlib
 import inspect
 
 from signal_generation.analyzers.patterns.base_pattern import BasePattern
+from signal_generation.analyzers.patterns.candlestick_scan import CandlestickScan
+from common.swing_index import SwingIndex
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,8 @@ class PatternOrchestrator:
     - Parallel detection support (future)
     - Filtering by pattern type
     - Context-aware scoring
+    - Single TA-Lib scan shared by all candlestick detectors
+    - Swing index shared by all chart detectors
     """
 
     def __init__(self, config: Dict[str, Any] = None):
@@ -51,12 +55,17 @@ class PatternOrchestrator:
         self.enabled_candlestick = self.config.get('patterns', {}).get('candlestick_enabled', True)
         self.enabled_chart = self.config.get('patterns', {}).get('chart_enabled', True)
         self.min_strength = self.config.get('patterns', {}).get('min_strength', 1)
+        self.scan_window = self.config.get('patterns', {}).get(
+            'candlestick_scan_window', CandlestickScan.DEFAULT_SCAN_WINDOW
+        )
 
         # Statistics
         self.stats = {
             'total_detections': 0,
             'candlestick_detections': 0,
-            'chart_detections': 0
+            'chart_detections': 0,
+            'candlestick_scans': 0,
+            'candlestick_skipped': 0
         }
 
         # Load patterns
@@ -114,7 +123,8 @@ class PatternOrchestrator:
         df: pd.DataFrame,
         timeframe: str = '1h',
         context: Optional[Dict[str, Any]] = None,
-        pattern_types: Optional[List[str]] = None
+        pattern_types: Optional[List[str]] = None,
+        swings: Optional[SwingIndex] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect all patterns in the data.
@@ -125,6 +135,8 @@ class PatternOrchestrator:
             context: Optional context for context-aware scoring
             pattern_types: Optional filter for pattern types
                           (e.g., ['candlestick'], ['chart'], or both)
+            swings: Optional shared swing index of df
+                    (e.g., AnalysisContext.get_swing_index())
 
         Returns:
             List of detected patterns with their information
@@ -152,7 +164,7 @@ class PatternOrchestrator:
         # Detect chart patterns
         if check_chart:
             chart_results = self._detect_chart_patterns(
-                df, timeframe, context
+                df, timeframe, context, swings
             )
             detected_patterns.extend(chart_results)
             self.stats['chart_detections'] += len(chart_results)
@@ -183,6 +195,9 @@ class PatternOrchestrator:
         """
         Detect all candlestick patterns.
 
+        TA-Lib detectors share one scan of df; detectors without a detection
+        in their lookback window are skipped without calling them.
+
         Args:
             df: DataFrame with OHLCV data
             timeframe: Timeframe string
@@ -192,59 +207,135 @@ class PatternOrchestrator:
             List of detected candlestick patterns
         """
         detected = []
+        scan, recent_hits = self._scan_candlesticks(df)
 
-        for pattern_name, pattern_detector in self.candlestick_patterns.items():
-            try:
-                pattern_info = pattern_detector.get_pattern_info(
-                    df, timeframe, context
-                )
+        try:
+            for pattern_name, pattern_detector in self.candlestick_patterns.items():
+                spec = pattern_detector.get_talib_spec()
+                if scan is not None and spec is not None and CandlestickScan.key(*spec) not in recent_hits:
+                    self.stats['candlestick_skipped'] += 1
+                    continue
+
+                try:
+                    pattern_info = pattern_detector.get_pattern_info(
+                        df, timeframe, context
+                    )
+
+                    if pattern_info:
+                        detected.append(pattern_info)
+                        logger.debug("Detected candlestick pattern: %s", pattern_name)
+
+                except Exception as e:
+                    logger.error(
+                        f"Error detecting candlestick pattern {pattern_name}: {e}",
+                        exc_info=True
+                    )
+        finally:
+            if scan is not None:
+                for pattern_detector in self.candlestick_patterns.values():
+                    pattern_detector.scan = None
 
-                if pattern_info:
-                    detected.append(pattern_info)
-                    logger.debug(f"Detected candlestick pattern: {pattern_name}")
+        return detected
 
-            except Exception as e:
-                logger.error(
-                    f"Error detecting candlestick pattern {pattern_name}: {e}",
-                    exc_info=True
-                )
+    def _scan_candlesticks(
+        self,
+        df: pd.DataFrame
+    ) -> Tuple[Optional[CandlestickScan], Dict[Tuple, int]]:
+        """
+        Run the TA-Lib functions of all candlestick detectors once over df.
 
-        return detected
+        The scan is attached to the detectors for the current detection pass.
+
+        Args:
+            df: DataFrame with OHLCV data
+
+        Returns:
+            (scan, row key -> candles ago of the latest detection within the
+            detectors' lookback window); (None, {}) if df cannot be scanned
+        """
+        specs = {}
+        lookbacks = {}
+
+        for pattern_detector in self.candlestick_patterns.values():
+            spec = pattern_detector.get_talib_spec()
+            if spec is None:
+                continue
+            key = CandlestickScan.key(*spec)
+            specs[key] = spec
+            lookbacks[key] = max(lookbacks.get(key, 0), pattern_detector.lookback_window)
+
+        if not specs or df is None or len(df) == 0:
+            return None, {}
+
+        try:
+            scan = CandlestickScan(
+                df,
+                recent=max(lookbacks.values()),
+                scan_window=self.scan_window
+            )
+            scan.run(specs.values())
+        except Exception as e:
+            logger.warning(f"Candlestick scan failed, detectors will scan individually: {e}")
+            return None, {}
+
+        for pattern_detector in self.candlestick_patterns.values():
+            if pattern_detector.TALIB_FUNCTION is not None:
+                pattern_detector.scan = scan
+
+        self.stats['candlestick_scans'] += 1
+        return scan, scan.candles_ago(lookbacks)
 
     def _detect_chart_patterns(
         self,
         df: pd.DataFrame,
         timeframe: str,
-        context: Optional[Dict[str, Any]]
+        context: Optional[Dict[str, Any]],
+        swings: Optional[SwingIndex] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect all chart patterns.
 
+        All chart detectors read peaks from one swing index of df.
+
         Args:
             df: DataFrame with OHLCV data
             timeframe: Timeframe string
             context: Optional context
+            swings: Optional shared swing index of df (built if not provided)
 
         Returns:
             List of detected chart patterns
         """
         detected = []
 
-        for pattern_name, pattern_detector in self.chart_patterns.items():
+        if swings is None or not swings.covers(df):
             try:
-                pattern_info = pattern_detector.get_pattern_info(
-                    df, timeframe, context
-                )
+                swings = SwingIndex(df)
+            except Exception:
+                swings = None
 
-                if pattern_info:
-                    detected.append(pattern_info)
-                    logger.debug(f"Detected chart pattern: {pattern_name}")
+        for pattern_detector in self.chart_patterns.values():
+            pattern_detector.swings = swings
 
-            except Exception as e:
-                logger.error(
-                    f"Error detecting chart pattern {pattern_name}: {e}",
-                    exc_info=True
-                )
+        try:
+            for pattern_name, pattern_detector in self.chart_patterns.items():
+                try:
+                    pattern_info = pattern_detector.get_pattern_info(
+                        df, timeframe, context
+                    )
+
+                    if pattern_info:
+                        detected.append(pattern_info)
+                        logger.debug("Detected chart pattern: %s", pattern_name)
+
+                except Exception as e:
+                    logger.error(
+                        f"Error detecting chart pattern {pattern_name}: {e}",
+                        exc_info=True
+                    )
+        finally:
+            for pattern_detector in self.chart_patterns.values():
+                pattern_detector.swings = None
 
         return detected
 
@@ -294,7 +385,9 @@ class PatternOrchestrator:
         self.stats = {
             'total_detections': 0,
             'candlestick_detections': 0,
-            'chart_detections': 0
+            'chart_detections': 0,
+            'candlestick_scans': 0,
+            'candlestick_skipped': 0
         }
         logger.debug("Pattern detection stats reset")
 
@@ -31,6 +31,7 @@ import numpy as np
 
 from signal_generation.analyzers.base_analyzer import BaseAnalyzer
 from signal_generation.context import AnalysisContext
+from common.swing_index import SwingIndex
 from signal_generation.constants import (
     SR_MIN_TOUCHES,
     SR_LEVEL_TOLERANCE_PERCENT,
@@ -52,6 +53,12 @@ class SRAnalyzer(BaseAnalyzer):
     5. Breakout detection
     """
     
+    # Indicator columns read from context.df
+    REQUIRED_INDICATORS = ['atr']
+    
+    # Analyzer results read from the context
+    REQUIRED_RESULTS = ['trend', 'volume']
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize SRAnalyzer.
@@ -129,11 +136,13 @@ class SRAnalyzer(BaseAnalyzer):
             current_price = df['close'].iloc[-1]
             atr = df['atr'].iloc[-1] if 'atr' in df.columns else None
 
+            swings = context.get_swing_index()
+
             # 5. Detect support levels
-            support_levels = self._detect_support_levels(df, current_price)
+            support_levels = self._detect_support_levels(df, current_price, swings)
 
             # 6. Detect resistance levels
-            resistance_levels = self._detect_resistance_levels(df, current_price)
+            resistance_levels = self._detect_resistance_levels(df, current_price, swings)
 
             # 7. Find nearest levels
             nearest_support = self._find_nearest_level(support_levels, current_price, 'below')
@@ -227,7 +236,8 @@ class SRAnalyzer(BaseAnalyzer):
     def _detect_support_levels(
         self,
         df: pd.DataFrame,
-        current_price: float
+        current_price: float,
+        swings: Optional[SwingIndex] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect support levels (potential buying zones).
@@ -235,22 +245,23 @@ class SRAnalyzer(BaseAnalyzer):
         Args:
             df: DataFrame with OHLC data
             current_price: Current price
+            swings: Shared swing index of df (built if not provided)
             
         Returns:
             List of support levels
         """
         lookback = min(self.lookback, len(df))
         recent_df = df.tail(lookback)
+        swings = swings or SwingIndex(df)
         
         lows = recent_df['low'].values
         
         # Find local lows using scipy
         try:
-            from scipy.signal import find_peaks
-            peaks, properties = find_peaks(-lows, distance=5, prominence=np.std(lows) * self.prominence_factor)
+            peaks = swings.peaks('low', distance=5, prominence_factor=self.prominence_factor, lookback=lookback)
         except:
-            # Fallback: simple method
-            peaks = self._find_local_extrema(lows, 'min')
+            # Fallback: simple window pivots
+            peaks = swings.pivots(5, lookback=lookback)[1]
         
         # Group similar levels
         support_prices = lows[peaks]
@@ -283,7 +294,8 @@ class SRAnalyzer(BaseAnalyzer):
     def _detect_resistance_levels(
         self,
         df: pd.DataFrame,
-        current_price: float
+        current_price: float,
+        swings: Optional[SwingIndex] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect resistance levels (potential selling zones).
@@ -291,21 +303,22 @@ class SRAnalyzer(BaseAnalyzer):
         Args:
             df: DataFrame with OHLC data
             current_price: Current price
+            swings: Shared swing index of df (built if not provided)
             
         Returns:
             List of resistance levels
         """
         lookback = min(self.lookback, len(df))
         recent_df = df.tail(lookback)
+        swings = swings or SwingIndex(df)
         
         highs = recent_df['high'].values
         
         # Find local highs
         try:
-            from scipy.signal import find_peaks
-            peaks, properties = find_peaks(highs, distance=5, prominence=np.std(highs) * self.prominence_factor)
+            peaks = swings.peaks('high', distance=5, prominence_factor=self.prominence_factor, lookback=lookback)
         except:
-            peaks = self._find_local_extrema(highs, 'max')
+            peaks = swings.pivots(5, lookback=lookback)[0]
         
         # Group similar levels
         resistance_prices = highs[peaks]
@@ -335,36 +348,6 @@ class SRAnalyzer(BaseAnalyzer):
         
         return resistance_levels
     
-    def _find_local_extrema(
-        self,
-        data: np.ndarray,
-        extrema_type: str = 'max'
-    ) -> List[int]:
-        """
-        Simple method to find local extrema (fallback).
-        
-        Args:
-            data: Price data
-            extrema_type: 'max' or 'min'
-            
-        Returns:
-            List of indices
-        """
-        extrema = []
-        window = 5
-        
-        for i in range(window, len(data) - window):
-            window_data = data[i-window:i+window+1]
-            
-            if extrema_type == 'max':
-                if data[i] == max(window_data):
-                    extrema.append(i)
-            else:  # min
-                if data[i] == min(window_data):
-                    extrema.append(i)
-        
-        return extrema
-    
     def _group_levels(
         self,
         prices: np.ndarray,
@@ -57,6 +57,9 @@ class TrendAnalyzer(BaseAnalyzer):
     5. Confidence level
     """
     
+    # Indicator columns read from context.df
+    REQUIRED_INDICATORS = ['ema_20', 'ema_50', 'ema_100']
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize TrendAnalyzer.
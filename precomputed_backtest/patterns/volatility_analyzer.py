@@ -55,6 +55,12 @@ class VolatilityAnalyzer(BaseAnalyzer):
     5. Stop loss recommendations
     """
     
+    # Indicator columns read from context.df
+    REQUIRED_INDICATORS = ['atr', 'bb_upper', 'bb_middle', 'bb_lower']
+    
+    # Analyzer results read from the context
+    REQUIRED_RESULTS = ['trend', 'volume']
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize VolatilityAnalyzer.
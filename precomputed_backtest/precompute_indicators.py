@@ -1,10 +1,13 @@
 """
 Pre-compute Indicators - محاسبه و ذخیره اندیکاتورها (نسخه مستقل)
 
-این اسکریپت بدون وابستگی به سیستم اصلی، اندیکاتورها را محاسبه می‌کند.
+این اسکریپت بدون وابستگی به سیستم اصلی، اندیکاتورها را محاسبه می‌کند
+(به جز kernel های مشترک EMA / Wilder).
+
+اجرا از ریشه پروژه:
+    python -m precomputed_backtest.precompute_indicators
 """
 
-import sys
 import logging
 from pathlib import Path
 from datetime import datetime
@@ -14,6 +17,8 @@ import numpy as np
 import yaml
 import argparse
 
+from signal_generation.analyzers.indicators import kernels
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -22,12 +27,18 @@ logger = logging.getLogger(__name__)
 
 
 class SimpleIndicatorCalculator:
-    """محاسبه‌گر ساده اندیکاتورها (بدون وابستگی به talib)"""
+    """
+    محاسبه‌گر ساده اندیکاتورها (بدون وابستگی به talib)
+
+    EMA / RSI / MACD / ATR / ADX از kernel های مشترک سیستم اصلی
+    (signal_generation.analyzers.indicators.kernels) استفاده می‌کنند
+    تا مقادیر بک‌تست با محاسبات لایو یکسان باشد.
+    """
 
     @staticmethod
     def ema(series: pd.Series, period: int) -> pd.Series:
         """Exponential Moving Average"""
-        return series.ewm(span=period, adjust=False).mean()
+        return pd.Series(kernels.ewm(series.values, 2.0 / (period + 1)), index=series.index)
 
     @staticmethod
     def sma(series: pd.Series, period: int) -> pd.Series:
@@ -36,31 +47,24 @@ class SimpleIndicatorCalculator:
 
     @staticmethod
     def rsi(series: pd.Series, period: int = 14) -> pd.Series:
-        """Relative Strength Index"""
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        """Relative Strength Index (Wilder's smoothing)"""
+        return pd.Series(kernels.rsi(series.values, period), index=series.index)
 
     @staticmethod
     def macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
         """MACD"""
-        ema_fast = series.ewm(span=fast, adjust=False).mean()
-        ema_slow = series.ewm(span=slow, adjust=False).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        ema_fast = kernels.ewm(series.values, 2.0 / (fast + 1))
+        ema_slow = kernels.ewm(series.values, 2.0 / (slow + 1))
+        macd_line = pd.Series(ema_fast - ema_slow, index=series.index)
+        signal_line = pd.Series(kernels.ewm(macd_line.values, 2.0 / (signal + 1)), index=series.index)
         histogram = macd_line - signal_line
         return macd_line, signal_line, histogram
 
     @staticmethod
     def atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-        """Average True Range"""
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        return tr.rolling(window=period).mean()
+        """Average True Range (Wilder's smoothing)"""
+        tr = kernels.true_range(high.values, low.values, close.values)
+        return pd.Series(kernels.ewm(tr, 1.0 / period), index=close.index)
 
     @staticmethod
     def bollinger_bands(series: pd.Series, period: int = 20, std_dev: float = 2.0):
@@ -89,25 +93,9 @@ class SimpleIndicatorCalculator:
 
     @staticmethod
     def adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-        """Average Directional Index (simplified)"""
-        plus_dm = high.diff()
-        minus_dm = -low.diff()
-        plus_dm[plus_dm < 0] = 0
-        minus_dm[minus_dm < 0] = 0
-
-        tr = pd.concat([
-            high - low,
-            abs(high - close.shift()),
-            abs(low - close.shift())
-        ], axis=1).max(axis=1)
-
-        atr = tr.rolling(window=period).mean()
-        plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
-
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.rolling(window=period).mean()
-        return adx
+        """Average Directional Index (Wilder's smoothing)"""
+        dm = kernels.directional_movement(high.values, low.values, close.values, period)
+        return pd.Series(dm['adx'], index=close.index)
 
     @staticmethod
     def ichimoku(high: pd.Series, low: pd.Series, close: pd.Series,
@@ -13,7 +13,7 @@ import pandas as pd
 import numpy as np
 import yaml
 import argparse
-from tqdm import tqdm
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy.signal import find_peaks
 
 logging.basicConfig(
@@ -300,6 +300,107 @@ class SimpleCandlePatternDetector:
             return True, 'bearish', 0.7
         return False, 'none', 0
 
+    def detect_arrays(
+        self,
+        open_p: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray
+    ) -> Dict[str, Tuple[np.ndarray, Any, float]]:
+        """
+        تشخیص برداری همه الگوهای کندلی برای همه کندل‌ها
+
+        همان شرایط متدهای detect_* روی آرایه‌ها؛ کندل‌های قبلی با شیفت
+        آرایه‌ها خوانده می‌شوند (کندل‌های ابتدایی بدون کندل قبلی NaN هستند).
+
+        Returns:
+            {نام الگو: (ماسک تشخیص, جهت (رشته یا آرایه), امتیاز)}
+        """
+        def shift(values: np.ndarray, periods: int) -> np.ndarray:
+            shifted = np.full(len(values), np.nan)
+            shifted[periods:] = values[:len(values) - periods]
+            return shifted
+
+        o, h, l, c = open_p, high, low, close
+        body = np.abs(c - o)
+        range_size = h - l
+        upper_shadow = h - np.maximum(o, c)
+        lower_shadow = np.minimum(o, c) - l
+        has_range = range_size != 0
+        bullish = c > o
+        bearish = c < o
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            body_ratio = np.where(has_range, body / range_size, 0.0)
+
+        # کندل قبلی (p) و دو کندل قبل (p2)
+        po, ph, pl, pc = shift(o, 1), shift(h, 1), shift(l, 1), shift(c, 1)
+        p2o, p2c = shift(o, 2), shift(c, 2)
+        prev_body = np.abs(pc - po)
+        prev_body_ratio = shift(body_ratio, 1)
+        prev_bullish = pc > po
+        prev_bearish = pc < po
+        prev2_bullish = p2c > p2o
+        prev2_bearish = p2c < p2o
+        prev_mid = (po + pc) / 2
+        prev2_mid = (p2o + p2c) / 2
+
+        bullish_engulfing = prev_bearish & bullish & (o <= pc) & (c >= po) & (body > prev_body)
+        bearish_engulfing = prev_bullish & bearish & (o >= pc) & (c <= po) & (body > prev_body)
+        bullish_harami = prev_bearish & bullish & (o > pc) & (c < po)
+        bearish_harami = prev_bullish & bearish & (o < pc) & (c > po)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            top_tolerance = np.abs(ph - h) / np.maximum(ph, h)
+            bottom_tolerance = np.abs(pl - l) / np.maximum(pl, l)
+
+        return {
+            'doji': (body_ratio < 0.1, 'neutral', 0.6),
+            'hammer': (has_range & (lower_shadow > body * 2) & (upper_shadow < body * 0.5), 'bullish', 0.7),
+            'shooting_star': ((upper_shadow > body * 2) & (lower_shadow < body * 0.5), 'bearish', 0.7),
+            'engulfing': (
+                bullish_engulfing | bearish_engulfing,
+                np.where(bullish_engulfing, 'bullish', 'bearish'),
+                0.8
+            ),
+            'morning_star': (
+                prev2_bearish & (prev_body_ratio < 0.3) & bullish & (c > prev2_mid), 'bullish', 0.85
+            ),
+            'evening_star': (
+                prev2_bullish & (prev_body_ratio < 0.3) & bearish & (c < prev2_mid), 'bearish', 0.85
+            ),
+            'three_white_soldiers': (
+                prev2_bullish & prev_bullish & bullish & (pc > p2c) & (c > pc), 'bullish', 0.8
+            ),
+            'three_black_crows': (
+                prev2_bearish & prev_bearish & bearish & (pc < p2c) & (c < pc), 'bearish', 0.8
+            ),
+            'harami': (
+                bullish_harami | bearish_harami,
+                np.where(bullish_harami, 'bullish', 'bearish'),
+                0.65
+            ),
+            'piercing_line': (prev_bearish & bullish & (o < pl) & (c > prev_mid), 'bullish', 0.75),
+            'dark_cloud_cover': (prev_bullish & bearish & (o > ph) & (c < prev_mid), 'bearish', 0.75),
+            'spinning_top': (
+                has_range & (body_ratio < 0.3) & (np.abs(upper_shadow - lower_shadow) < range_size * 0.2),
+                'neutral', 0.5
+            ),
+            'marubozu': (has_range & (body_ratio > 0.9), np.where(bullish, 'bullish', 'bearish'), 0.8),
+            'inverted_hammer': ((upper_shadow > body * 2) & (lower_shadow < body * 0.3), 'bullish', 0.65),
+            'hanging_man': ((lower_shadow > body * 2) & (upper_shadow < body * 0.5), 'bearish', 0.65),
+            'tweezer_top': ((top_tolerance < 0.001) & prev_bullish & bearish, 'bearish', 0.7),
+            'tweezer_bottom': ((bottom_tolerance < 0.001) & prev_bearish & bullish, 'bullish', 0.7),
+            'dragonfly_doji': (
+                has_range & (body_ratio < 0.1) & (lower_shadow > range_size * 0.7) & (upper_shadow < range_size * 0.1),
+                'bullish', 0.7
+            ),
+            'gravestone_doji': (
+                has_range & (body_ratio < 0.1) & (upper_shadow > range_size * 0.7) & (lower_shadow < range_size * 0.1),
+                'bearish', 0.7
+            ),
+        }
+
 
 class SimpleChartPatternDetector:
     """تشخیص‌دهنده الگوهای چارت (Chart Patterns)"""
@@ -554,6 +655,148 @@ class SimpleChartPatternDetector:
             return True, 0.7
         return False, 0
 
+    @staticmethod
+    def _last_peaks(
+        windows: np.ndarray,
+        prominence_factor: float,
+        count: int = 3
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        آخرین قله‌های find_peaks هر پنجره
+
+        Args:
+            windows: پنجره‌ها (هر سطر یک پنجره)
+            prominence_factor: برجستگی لازم بر حسب انحراف معیار پنجره
+            count: تعداد قله‌های آخر
+
+        Returns:
+            (موقعیت آخرین count قله هر پنجره، راست‌چین و با -1 پر شده,
+             تعداد کل قله‌های هر پنجره)
+        """
+        prominences = windows.std(axis=1) * prominence_factor
+        last = np.full((len(windows), count), -1, dtype=np.intp)
+        totals = np.zeros(len(windows), dtype=np.intp)
+
+        # find_peaks تنها بخش غیر برداری است: یک فراخوانی برای هر پنجره
+        for k in range(len(windows)):
+            peaks, _ = find_peaks(windows[k], distance=5, prominence=prominences[k])
+            tail = peaks[-count:]
+            last[k, count - len(tail):] = tail
+            totals[k] = len(peaks)
+
+        return last, totals
+
+    def detect_windows(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        window_size: int = 30
+    ) -> Dict[str, Tuple[np.ndarray, str, float]]:
+        """
+        تشخیص برداری همه الگوهای چارت روی همه پنجره‌ها
+
+        سطر k نتیجه پنجره [k, k + window_size) است (همان شرایط متدهای
+        detect_* با پنجره‌های sliding_window_view؛ window_size حداقل 30).
+
+        Returns:
+            {نام الگو: (ماسک تشخیص, جهت, امتیاز)}
+        """
+        high_windows = sliding_window_view(highs, window_size)
+        low_windows = sliding_window_view(lows, window_size)
+        close_windows = sliding_window_view(closes, window_size)
+        rows = np.arange(len(high_windows))[:, None]
+
+        def peak_values(windows: np.ndarray, positions: np.ndarray) -> np.ndarray:
+            return windows[rows, np.maximum(positions, 0)]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            long_enough = window_size >= self.min_window
+
+
+            # قله‌ها و دره‌ها با برجستگی 0.3 (Double و Head & Shoulders)
+            peaks, peak_count = self._last_peaks(high_windows, 0.3)
+            troughs, trough_count = self._last_peaks(-low_windows, 0.3)
+            p = peak_values(high_windows, peaks)
+            t = peak_values(low_windows, troughs)
+
+            double_top = long_enough & (peak_count >= 2) & (
+                np.abs(p[:, 1] - p[:, 2]) / np.maximum(p[:, 1], 0.0001) < self.tolerance
+            )
+            double_bottom = long_enough & (trough_count >= 2) & (
+                np.abs(t[:, 1] - t[:, 2]) / np.maximum(np.abs(t[:, 1]), 0.0001) < self.tolerance
+            )
+            head_shoulders = (peak_count >= 3) & (
+                (p[:, 1] > p[:, 0]) & (p[:, 1] > p[:, 2]) &
+                (np.abs(p[:, 0] - p[:, 2]) / np.maximum(p[:, 0], 0.0001) < self.shoulder_tolerance)
+            )
+            inverse_head_shoulders = (trough_count >= 3) & (
+                (t[:, 1] < t[:, 0]) & (t[:, 1] < t[:, 2]) &
+                (np.abs(t[:, 0] - t[:, 2]) / np.maximum(np.abs(t[:, 0]), 0.0001) < self.shoulder_tolerance)
+            )
+
+            # قله‌ها و دره‌ها با برجستگی 0.2 (مثلث‌ها): 3 قله آخر، یا 2 قله اگر کمتر باشد
+            peaks, peak_count = self._last_peaks(high_windows, 0.2)
+            troughs, trough_count = self._last_peaks(-low_windows, 0.2)
+            p = peak_values(high_windows, peaks)
+            t = peak_values(low_windows, troughs)
+            has_three_peaks = peak_count >= 3
+            has_three_troughs = trough_count >= 3
+            enough_pivots = long_enough & (peak_count >= 2) & (trough_count >= 2)
+
+            def flatness(values: np.ndarray, has_three: np.ndarray) -> np.ndarray:
+                ratio_three = values.std(axis=1) / values.mean(axis=1)
+                ratio_two = values[:, 1:].std(axis=1) / values[:, 1:].mean(axis=1)
+                return np.where(has_three, ratio_three, ratio_two) < 0.02
+
+            highs_flat = flatness(p, has_three_peaks)
+            lows_flat = flatness(t, has_three_troughs)
+            lows_rising = (t[:, 1] < t[:, 2]) & (~has_three_troughs | (t[:, 0] < t[:, 1]))
+            highs_falling = (p[:, 1] > p[:, 2]) & (~has_three_peaks | (p[:, 0] > p[:, 1]))
+
+            # Flag: میله (10 کندل اول) و پرچم (باقی کندل‌ها)
+            pole_change = (close_windows[:, 9] - close_windows[:, 0]) / close_windows[:, 0]
+            flag_change = (close_windows[:, -1] - close_windows[:, 10]) / close_windows[:, 10]
+
+            # Cup and Handle
+            cup = close_windows[:, :25]
+            min_idx = cup.argmin(axis=1)
+            left_rim = close_windows[:, 0]
+            right_rim = close_windows[:, 25]
+            cup_bottom = cup.min(axis=1)
+            handle = close_windows[:, 25:]
+            handle_max = handle.max(axis=1)
+            handle_drop = (handle_max - handle.min(axis=1)) / handle_max
+            cup_and_handle = (
+                (min_idx >= 5) & (min_idx <= 20) &
+                ~(np.abs(left_rim - right_rim) / np.maximum(left_rim, 0.0001) > 0.05) &
+                ~(cup_bottom >= np.minimum(left_rim, right_rim) * 0.97) &
+                ~((handle_drop < 0.01) | (handle_drop > 0.05))
+            )
+
+            # Wedge: شیب خطوط بین اولین و آخرین کندل
+            high_slope = (high_windows[:, -1] - high_windows[:, 0]) / window_size
+            low_slope = (low_windows[:, -1] - low_windows[:, 0]) / window_size
+
+        return {
+            'double_top': (double_top, 'bearish', 0.75),
+            'double_bottom': (double_bottom, 'bullish', 0.75),
+            'head_shoulders': (head_shoulders, 'bearish', 0.85),
+            'inverse_head_shoulders': (inverse_head_shoulders, 'bullish', 0.85),
+            'ascending_triangle': (enough_pivots & highs_flat & lows_rising, 'bullish', 0.7),
+            'descending_triangle': (enough_pivots & lows_flat & highs_falling, 'bearish', 0.7),
+            'symmetric_triangle': (enough_pivots & highs_falling & lows_rising, 'neutral', 0.65),
+            'bull_flag': ((pole_change > 0.03) & (-0.02 < flag_change) & (flag_change < 0.01), 'bullish', 0.7),
+            'bear_flag': ((pole_change < -0.03) & (-0.01 < flag_change) & (flag_change < 0.02), 'bearish', 0.7),
+            'cup_and_handle': (cup_and_handle, 'bullish', 0.8),
+            'rising_wedge': (
+                long_enough & (high_slope > 0) & (low_slope > 0) & (low_slope > high_slope), 'bearish', 0.7
+            ),
+            'falling_wedge': (
+                long_enough & (high_slope < 0) & (low_slope < 0) & (high_slope > low_slope), 'bullish', 0.7
+            ),
+        }
+
 
 class PatternPrecomputer:
     """محاسبه و ذخیره الگوها"""
@@ -593,246 +836,67 @@ class PatternPrecomputer:
         return None
 
     def detect_all_patterns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """تشخیص همه الگوها برای هر کندل"""
+        """
+        تشخیص همه الگوها برای هر کندل
+
+        الگوهای کندلی با عبارات برداری روی کل آرایه‌ها و الگوهای چارت روی
+        پنجره‌های 30 کندلی قبل از هر کندل محاسبه می‌شوند. مانند قبل، سه کندل
+        اول بدون الگو هستند و الگوهای چارت از کندل 30 به بعد بررسی می‌شوند.
+        """
         n = len(df)
-        result = df.copy()
 
         # ستون‌های الگو (کندلی و چارت)
-        pattern_names = [
-            # الگوهای کندلی
+        candlestick_names = [
             'doji', 'hammer', 'shooting_star', 'engulfing',
             'morning_star', 'evening_star', 'three_white_soldiers',
             'three_black_crows', 'harami', 'piercing_line', 'dark_cloud_cover',
             'spinning_top', 'marubozu', 'inverted_hammer', 'hanging_man',
-            'tweezer_top', 'tweezer_bottom', 'dragonfly_doji', 'gravestone_doji',
-            # الگوهای چارت
+            'tweezer_top', 'tweezer_bottom', 'dragonfly_doji', 'gravestone_doji'
+        ]
+        chart_names = [
             'double_top', 'double_bottom', 'head_shoulders', 'inverse_head_shoulders',
             'ascending_triangle', 'descending_triangle', 'symmetric_triangle',
             'bull_flag', 'bear_flag', 'cup_and_handle', 'rising_wedge', 'falling_wedge'
         ]
 
-        for pname in pattern_names:
-            result[f'pattern_{pname}'] = 0
-            result[f'pattern_{pname}_direction'] = 'none'
-            result[f'pattern_{pname}_score'] = 0.0
-
-        # پیمایش کندل به کندل
-        for i in tqdm(range(3, n), desc="    Detecting patterns", unit="candle"):
-            curr = df.iloc[i]
-            prev = df.iloc[i-1]
-            prev2 = df.iloc[i-2]
-
-            # الگوهای تک کندلی
-            found, direction, score = self.detector.detect_doji(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_doji'] = 1
-                result.loc[result.index[i], 'pattern_doji_direction'] = direction
-                result.loc[result.index[i], 'pattern_doji_score'] = score
-
-            found, direction, score = self.detector.detect_hammer(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_hammer'] = 1
-                result.loc[result.index[i], 'pattern_hammer_direction'] = direction
-                result.loc[result.index[i], 'pattern_hammer_score'] = score
-
-            found, direction, score = self.detector.detect_shooting_star(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_shooting_star'] = 1
-                result.loc[result.index[i], 'pattern_shooting_star_direction'] = direction
-                result.loc[result.index[i], 'pattern_shooting_star_score'] = score
-
-            # الگوهای دو کندلی
-            found, direction, score = self.detector.detect_engulfing(curr, prev)
-            if found:
-                result.loc[result.index[i], 'pattern_engulfing'] = 1
-                result.loc[result.index[i], 'pattern_engulfing_direction'] = direction
-                result.loc[result.index[i], 'pattern_engulfing_score'] = score
-
-            found, direction, score = self.detector.detect_harami(curr, prev)
-            if found:
-                result.loc[result.index[i], 'pattern_harami'] = 1
-                result.loc[result.index[i], 'pattern_harami_direction'] = direction
-                result.loc[result.index[i], 'pattern_harami_score'] = score
-
-            found, direction, score = self.detector.detect_piercing_line(curr, prev)
-            if found:
-                result.loc[result.index[i], 'pattern_piercing_line'] = 1
-                result.loc[result.index[i], 'pattern_piercing_line_direction'] = direction
-                result.loc[result.index[i], 'pattern_piercing_line_score'] = score
-
-            found, direction, score = self.detector.detect_dark_cloud_cover(curr, prev)
-            if found:
-                result.loc[result.index[i], 'pattern_dark_cloud_cover'] = 1
-                result.loc[result.index[i], 'pattern_dark_cloud_cover_direction'] = direction
-                result.loc[result.index[i], 'pattern_dark_cloud_cover_score'] = score
-
-            # الگوهای سه کندلی
-            found, direction, score = self.detector.detect_morning_star(prev2, prev, curr)
-            if found:
-                result.loc[result.index[i], 'pattern_morning_star'] = 1
-                result.loc[result.index[i], 'pattern_morning_star_direction'] = direction
-                result.loc[result.index[i], 'pattern_morning_star_score'] = score
-
-            found, direction, score = self.detector.detect_evening_star(prev2, prev, curr)
-            if found:
-                result.loc[result.index[i], 'pattern_evening_star'] = 1
-                result.loc[result.index[i], 'pattern_evening_star_direction'] = direction
-                result.loc[result.index[i], 'pattern_evening_star_score'] = score
-
-            found, direction, score = self.detector.detect_three_white_soldiers(prev2, prev, curr)
-            if found:
-                result.loc[result.index[i], 'pattern_three_white_soldiers'] = 1
-                result.loc[result.index[i], 'pattern_three_white_soldiers_direction'] = direction
-                result.loc[result.index[i], 'pattern_three_white_soldiers_score'] = score
-
-            found, direction, score = self.detector.detect_three_black_crows(prev2, prev, curr)
-            if found:
-                result.loc[result.index[i], 'pattern_three_black_crows'] = 1
-                result.loc[result.index[i], 'pattern_three_black_crows_direction'] = direction
-                result.loc[result.index[i], 'pattern_three_black_crows_score'] = score
-
-            # الگوهای جدید تک کندلی
-            found, direction, score = self.detector.detect_spinning_top(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_spinning_top'] = 1
-                result.loc[result.index[i], 'pattern_spinning_top_direction'] = direction
-                result.loc[result.index[i], 'pattern_spinning_top_score'] = score
-
-            found, direction, score = self.detector.detect_marubozu(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_marubozu'] = 1
-                result.loc[result.index[i], 'pattern_marubozu_direction'] = direction
-                result.loc[result.index[i], 'pattern_marubozu_score'] = score
-
-            found, direction, score = self.detector.detect_inverted_hammer(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_inverted_hammer'] = 1
-                result.loc[result.index[i], 'pattern_inverted_hammer_direction'] = direction
-                result.loc[result.index[i], 'pattern_inverted_hammer_score'] = score
-
-            found, direction, score = self.detector.detect_hanging_man(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_hanging_man'] = 1
-                result.loc[result.index[i], 'pattern_hanging_man_direction'] = direction
-                result.loc[result.index[i], 'pattern_hanging_man_score'] = score
-
-            found, direction, score = self.detector.detect_dragonfly_doji(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_dragonfly_doji'] = 1
-                result.loc[result.index[i], 'pattern_dragonfly_doji_direction'] = direction
-                result.loc[result.index[i], 'pattern_dragonfly_doji_score'] = score
-
-            found, direction, score = self.detector.detect_gravestone_doji(curr)
-            if found:
-                result.loc[result.index[i], 'pattern_gravestone_doji'] = 1
-                result.loc[result.index[i], 'pattern_gravestone_doji_direction'] = direction
-                result.loc[result.index[i], 'pattern_gravestone_doji_score'] = score
-
-            # الگوهای جدید دو کندلی
-            found, direction, score = self.detector.detect_tweezer_top(curr, prev)
-            if found:
-                result.loc[result.index[i], 'pattern_tweezer_top'] = 1
-                result.loc[result.index[i], 'pattern_tweezer_top_direction'] = direction
-                result.loc[result.index[i], 'pattern_tweezer_top_score'] = score
-
-            found, direction, score = self.detector.detect_tweezer_bottom(curr, prev)
-            if found:
-                result.loc[result.index[i], 'pattern_tweezer_bottom'] = 1
-                result.loc[result.index[i], 'pattern_tweezer_bottom_direction'] = direction
-                result.loc[result.index[i], 'pattern_tweezer_bottom_score'] = score
-
-            # الگوهای چارت (نیاز به پنجره داده)
-            window_size = 30
-            if i >= window_size:
-                window_highs = df['high'].iloc[i-window_size:i].values
-                window_lows = df['low'].iloc[i-window_size:i].values
-                window_closes = df['close'].iloc[i-window_size:i].values
-
-                # Double Top
-                found, score = self.chart_detector.detect_double_top(window_highs)
-                if found:
-                    result.loc[result.index[i], 'pattern_double_top'] = 1
-                    result.loc[result.index[i], 'pattern_double_top_direction'] = 'bearish'
-                    result.loc[result.index[i], 'pattern_double_top_score'] = score
-
-                # Double Bottom
-                found, score = self.chart_detector.detect_double_bottom(window_lows)
-                if found:
-                    result.loc[result.index[i], 'pattern_double_bottom'] = 1
-                    result.loc[result.index[i], 'pattern_double_bottom_direction'] = 'bullish'
-                    result.loc[result.index[i], 'pattern_double_bottom_score'] = score
-
-                # Head and Shoulders
-                found, score = self.chart_detector.detect_head_shoulders(window_highs)
-                if found:
-                    result.loc[result.index[i], 'pattern_head_shoulders'] = 1
-                    result.loc[result.index[i], 'pattern_head_shoulders_direction'] = 'bearish'
-                    result.loc[result.index[i], 'pattern_head_shoulders_score'] = score
-
-                # Inverse Head and Shoulders
-                found, score = self.chart_detector.detect_inverse_head_shoulders(window_lows)
-                if found:
-                    result.loc[result.index[i], 'pattern_inverse_head_shoulders'] = 1
-                    result.loc[result.index[i], 'pattern_inverse_head_shoulders_direction'] = 'bullish'
-                    result.loc[result.index[i], 'pattern_inverse_head_shoulders_score'] = score
-
-                # Ascending Triangle
-                found, score = self.chart_detector.detect_ascending_triangle(window_highs, window_lows)
-                if found:
-                    result.loc[result.index[i], 'pattern_ascending_triangle'] = 1
-                    result.loc[result.index[i], 'pattern_ascending_triangle_direction'] = 'bullish'
-                    result.loc[result.index[i], 'pattern_ascending_triangle_score'] = score
-
-                # Descending Triangle
-                found, score = self.chart_detector.detect_descending_triangle(window_highs, window_lows)
-                if found:
-                    result.loc[result.index[i], 'pattern_descending_triangle'] = 1
-                    result.loc[result.index[i], 'pattern_descending_triangle_direction'] = 'bearish'
-                    result.loc[result.index[i], 'pattern_descending_triangle_score'] = score
-
-                # Symmetric Triangle
-                found, score = self.chart_detector.detect_symmetric_triangle(window_highs, window_lows)
-                if found:
-                    result.loc[result.index[i], 'pattern_symmetric_triangle'] = 1
-                    result.loc[result.index[i], 'pattern_symmetric_triangle_direction'] = 'neutral'
-                    result.loc[result.index[i], 'pattern_symmetric_triangle_score'] = score
-
-                # Bull Flag
-                found, score = self.chart_detector.detect_bull_flag(window_closes)
-                if found:
-                    result.loc[result.index[i], 'pattern_bull_flag'] = 1
-                    result.loc[result.index[i], 'pattern_bull_flag_direction'] = 'bullish'
-                    result.loc[result.index[i], 'pattern_bull_flag_score'] = score
-
-                # Bear Flag
-                found, score = self.chart_detector.detect_bear_flag(window_closes)
-                if found:
-                    result.loc[result.index[i], 'pattern_bear_flag'] = 1
-                    result.loc[result.index[i], 'pattern_bear_flag_direction'] = 'bearish'
-                    result.loc[result.index[i], 'pattern_bear_flag_score'] = score
-
-                # Cup and Handle
-                found, score = self.chart_detector.detect_cup_and_handle(window_closes)
-                if found:
-                    result.loc[result.index[i], 'pattern_cup_and_handle'] = 1
-                    result.loc[result.index[i], 'pattern_cup_and_handle_direction'] = 'bullish'
-                    result.loc[result.index[i], 'pattern_cup_and_handle_score'] = score
-
-                # Rising Wedge
-                found, score = self.chart_detector.detect_rising_wedge(window_highs, window_lows)
-                if found:
-                    result.loc[result.index[i], 'pattern_rising_wedge'] = 1
-                    result.loc[result.index[i], 'pattern_rising_wedge_direction'] = 'bearish'
-                    result.loc[result.index[i], 'pattern_rising_wedge_score'] = score
-
-                # Falling Wedge
-                found, score = self.chart_detector.detect_falling_wedge(window_highs, window_lows)
-                if found:
-                    result.loc[result.index[i], 'pattern_falling_wedge'] = 1
-                    result.loc[result.index[i], 'pattern_falling_wedge_direction'] = 'bullish'
-                    result.loc[result.index[i], 'pattern_falling_wedge_score'] = score
-
-        return result
+        open_p = df['open'].to_numpy(dtype=float)
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)
+
+        # ماسک‌های هم‌طول با کندل‌ها
+        detections = {}
+        candle_start = min(3, n)
+        for pname, (found, direction, score) in self.detector.detect_arrays(open_p, high, low, close).items():
+            found[:candle_start] = False
+            detections[pname] = (found, direction, score)
+
+        # الگوهای چارت (نیاز به پنجره داده): پنجره [i-30, i) برای کندل i
+        window_size = 30
+        chart_count = max(n - window_size, 0)
+        chart_results = {}
+        if chart_count > 0:
+            chart_results = self.chart_detector.detect_windows(
+                high[:n - 1], low[:n - 1], close[:n - 1], window_size
+            )
+        for pname in chart_names:
+            found = np.zeros(n, dtype=bool)
+            direction, score = 'none', 0.0
+            if pname in chart_results:
+                window_found, direction, score = chart_results[pname]
+                found[window_size:] = window_found[:chart_count]
+            detections[pname] = (found, direction, score)
+
+        # ساخت همه ستون‌ها در یک مرحله
+        columns = {}
+        for pname in candlestick_names + chart_names:
+            found, direction, score = detections[pname]
+            columns[f'pattern_{pname}'] = found.astype(np.int64)
+            columns[f'pattern_{pname}_direction'] = np.where(found, direction, 'none').astype(object)
+            columns[f'pattern_{pname}_score'] = np.where(found, score, 0.0)
+
+        base = df.drop(columns=[col for col in columns if col in df.columns])
+        return pd.concat([base, pd.DataFrame(columns, index=df.index)], axis=1)
 
     def precompute_all(self) -> Dict[str, Dict[str, pd.DataFrame]]:
         """محاسبه الگوها برای همه سیمبل‌ها و تایم‌فریم‌ها"""
@@ -0,0 +1,214 @@
+"""
+Parity test and benchmark for the vectorized PatternPrecomputer.detect_all_patterns.
+
+Compares the array-based implementation with the previous candle-by-candle
+loop (kept here as the reference) on random OHLC data that includes flat
+candles, equal highs/lows and rounded prices.
+
+Usage:
+    python precomputed_backtest/test_precompute_patterns.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from precomputed_backtest.precompute_patterns import (
+    PatternPrecomputer,
+    SimpleCandlePatternDetector,
+    SimpleChartPatternDetector,
+)
+
+CANDLESTICK_PATTERNS = [
+    'doji', 'hammer', 'shooting_star', 'engulfing',
+    'morning_star', 'evening_star', 'three_white_soldiers',
+    'three_black_crows', 'harami', 'piercing_line', 'dark_cloud_cover',
+    'spinning_top', 'marubozu', 'inverted_hammer', 'hanging_man',
+    'tweezer_top', 'tweezer_bottom', 'dragonfly_doji', 'gravestone_doji'
+]
+SINGLE_CANDLE = {
+    'doji', 'hammer', 'shooting_star', 'spinning_top', 'marubozu',
+    'inverted_hammer', 'hanging_man', 'dragonfly_doji', 'gravestone_doji'
+}
+TWO_CANDLE = {
+    'engulfing', 'harami', 'piercing_line', 'dark_cloud_cover',
+    'tweezer_top', 'tweezer_bottom'
+}
+# Chart pattern -> (detector method, window series, direction)
+CHART_PATTERNS = {
+    'double_top': ('detect_double_top', ('high',), 'bearish'),
+    'double_bottom': ('detect_double_bottom', ('low',), 'bullish'),
+    'head_shoulders': ('detect_head_shoulders', ('high',), 'bearish'),
+    'inverse_head_shoulders': ('detect_inverse_head_shoulders', ('low',), 'bullish'),
+    'ascending_triangle': ('detect_ascending_triangle', ('high', 'low'), 'bullish'),
+    'descending_triangle': ('detect_descending_triangle', ('high', 'low'), 'bearish'),
+    'symmetric_triangle': ('detect_symmetric_triangle', ('high', 'low'), 'neutral'),
+    'bull_flag': ('detect_bull_flag', ('close',), 'bullish'),
+    'bear_flag': ('detect_bear_flag', ('close',), 'bearish'),
+    'cup_and_handle': ('detect_cup_and_handle', ('close',), 'bullish'),
+    'rising_wedge': ('detect_rising_wedge', ('high', 'low'), 'bearish'),
+    'falling_wedge': ('detect_falling_wedge', ('high', 'low'), 'bullish'),
+}
+
+
+def _make_ohlc(n: int, seed: int) -> pd.DataFrame:
+    """Random-walk OHLC data with flat candles and repeated highs/lows."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.8, n))
+    open_p = close + rng.normal(0, 0.5, n)
+    high = np.maximum(open_p, close) + rng.random(n) * rng.choice([0, 1], n)
+    low = np.minimum(open_p, close) - rng.random(n) * rng.choice([0, 1], n)
+
+    if seed % 2:
+        # Tick-rounded prices: dojis, equal highs/lows (tweezers), marubozu
+        open_p, high, low, close = (np.round(x, 1) for x in (open_p, high, low, close))
+
+    flat = rng.random(n) < 0.02
+    open_p[flat] = high[flat] = low[flat] = close[flat]
+
+    return pd.DataFrame(
+        {'open': open_p, 'high': high, 'low': low, 'close': close, 'volume': 1.0},
+        index=pd.date_range('2024-01-01', periods=n, freq='15min')
+    )
+
+
+def _make_precomputer() -> PatternPrecomputer:
+    """PatternPrecomputer without __init__ (which creates output directories)."""
+    precomputer = PatternPrecomputer.__new__(PatternPrecomputer)
+    precomputer.detector = SimpleCandlePatternDetector()
+    precomputer.chart_detector = SimpleChartPatternDetector()
+    return precomputer
+
+
+def reference_detect_all_patterns(precomputer: PatternPrecomputer, df: pd.DataFrame) -> pd.DataFrame:
+    """Previous candle-by-candle implementation of detect_all_patterns."""
+    n = len(df)
+    result = df.copy()
+
+    for pname in CANDLESTICK_PATTERNS + list(CHART_PATTERNS):
+        result[f'pattern_{pname}'] = 0
+        result[f'pattern_{pname}_direction'] = 'none'
+        result[f'pattern_{pname}_score'] = 0.0
+
+    def mark(i: int, pname: str, direction: str, score: float) -> None:
+        result.loc[result.index[i], f'pattern_{pname}'] = 1
+        result.loc[result.index[i], f'pattern_{pname}_direction'] = direction
+        result.loc[result.index[i], f'pattern_{pname}_score'] = score
+
+    for i in range(3, n):
+        curr = df.iloc[i]
+        prev = df.iloc[i-1]
+        prev2 = df.iloc[i-2]
+
+        for pname in CANDLESTICK_PATTERNS:
+            method = getattr(precomputer.detector, f'detect_{pname}')
+            if pname in SINGLE_CANDLE:
+                found, direction, score = method(curr)
+            elif pname in TWO_CANDLE:
+                found, direction, score = method(curr, prev)
+            else:
+                found, direction, score = method(prev2, prev, curr)
+            if found:
+                mark(i, pname, direction, score)
+
+        window_size = 30
+        if i >= window_size:
+            windows = {
+                col: df[col].iloc[i-window_size:i].values
+                for col in ('high', 'low', 'close')
+            }
+            for pname, (method_name, series, direction) in CHART_PATTERNS.items():
+                method = getattr(precomputer.chart_detector, method_name)
+                found, score = method(*(windows[col] for col in series))
+                if found:
+                    mark(i, pname, direction, score)
+
+    return result
+
+
+def test_parity_with_candle_loop():
+    """Vectorized output equals the candle loop (values and dtypes)."""
+    precomputer = _make_precomputer()
+    hits = pd.Series(0, index=CANDLESTICK_PATTERNS + list(CHART_PATTERNS))
+
+    for seed in range(6):
+        df = _make_ohlc(400, seed)
+        expected = reference_detect_all_patterns(precomputer, df)
+        actual = precomputer.detect_all_patterns(df)
+
+        assert list(actual.columns) == list(expected.columns), "column order differs"
+        for col in actual.columns:
+            pd.testing.assert_series_equal(
+                actual[col], expected[col], check_dtype=False, obj=f"seed {seed} {col}"
+            )
+            assert actual[col].dtype.kind == expected[col].dtype.kind or col.endswith('_direction'), \
+                f"{col}: dtype {actual[col].dtype} != {expected[col].dtype}"
+
+        for pname in hits.index:
+            hits[pname] += int(expected[f'pattern_{pname}'].sum())
+
+    print(f"  ✓ parity on 6 frames ({int(hits.sum())} detections, "
+          f"{int((hits > 0).sum())}/{len(hits)} patterns seen)")
+
+
+def test_short_frames():
+    """Frames shorter than the pattern windows."""
+    precomputer = _make_precomputer()
+    for n in (0, 1, 3, 4, 30, 31):
+        df = _make_ohlc(n, 1)
+        expected = reference_detect_all_patterns(precomputer, df)
+        actual = precomputer.detect_all_patterns(df)
+        for col in actual.columns:
+            pd.testing.assert_series_equal(actual[col], expected[col], check_dtype=False)
+    print("  ✓ short frames")
+
+
+def benchmark():
+    """Time the vectorized implementation against the candle loop."""
+    precomputer = _make_precomputer()
+    df = _make_ohlc(3000, 3)
+
+    start = time.perf_counter()
+    reference_detect_all_patterns(precomputer, df)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    precomputer.detect_all_patterns(df)
+    vector_time = time.perf_counter() - start
+
+    print(f"  3000 candles: loop {loop_time:.2f}s, vectorized {vector_time:.3f}s "
+          f"({loop_time / vector_time:.0f}x)")
+
+
+def main():
+    print("\nPatternPrecomputer.detect_all_patterns")
+    print("-" * 60)
+
+    tests = [test_parity_with_candle_loop, test_short_frames]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("\nBenchmark")
+    print("-" * 60)
+    benchmark()
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed")
+        return 1
+    print(f"✅ all {len(tests)} tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,514 @@
+"""
+ماژول rate_limiter.py: محدودکننده نرخ async مبتنی بر سطل توکن (token bucket)
+توکن‌ها با نرخ ثابت تا سقف ظرفیت پر می‌شوند و هر درخواست قبل از ارسال به اندازه وزن
+خود توکن برمی‌دارد. درخواست‌های منتظر به ترتیب ورود (FIFO) یا اولویت پاسخ داده می‌شوند
+و بیدار شدن آن‌ها با یک تایمر رویداد حلقه انجام می‌شود (بدون sleep های تکراری).
+
+RateLimiter سهمیه‌های صرافی را مدل می‌کند: هر استخر (مثلا public و private در KuCoin
+Futures با سهمیه 2000 وزن در هر 30 ثانیه) یک سطل توکن است و هر گروه اندپوینت
+(kline، ticker، orders، ...) به یک استخر با وزن مشخص نگاشت می‌شود. نرخ و ظرفیت
+سطل طوری انتخاب می‌شوند که مصرف در هر پنجره از utilization_target سهمیه بیشتر نشود:
+
+    rate = quota * target / window ، capacity = quota * (1 - target)
+    (حداکثر مصرف در هر پنجره: capacity + rate * window = quota)
+
+استفاده:
+    limiter = RateLimiter.from_config(config['exchange'].get('rate_limits', {}))
+    await limiter.acquire('kline')
+    limiter.penalize('kline', retry_after=2)   # پاسخ 429
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Tuple
+
+from common.latency_histogram import LatencyHistogram
+
+# اولویت درخواست‌ها (عدد کمتر = زودتر)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# سهمیه‌های پیش‌فرض KuCoin Futures (وزن در هر پنجره)
+DEFAULT_POOLS: Dict[str, Dict[str, float]] = {
+    'public': {'quota': 2000, 'window_seconds': 30},
+    'private': {'quota': 2000, 'window_seconds': 30},
+}
+
+# گروه اندپوینت -> استخر و وزن درخواست
+DEFAULT_ENDPOINTS: Dict[str, Dict[str, Any]] = {
+    'kline': {'pool': 'public', 'weight': 3},
+    'ticker': {'pool': 'public', 'weight': 2},
+    'public': {'pool': 'public', 'weight': 3},
+    'server_time': {'pool': 'public', 'weight': 2},
+    'orders': {'pool': 'private', 'weight': 2},
+    'account': {'pool': 'private', 'weight': 5},
+}
+
+
+class TokenBucket:
+    """سطل توکن async با صف انتظار FIFO یا اولویت‌دار و آمار مصرف"""
+
+    def __init__(
+            self,
+            rate: float,
+            capacity: Optional[float] = None,
+            name: str = 'bucket',
+            use_priority: bool = False,
+            utilization_window: float = 30.0
+    ):
+        """
+        مقداردهی اولیه
+
+        Args:
+            rate: نرخ پر شدن (توکن در ثانیه)
+            capacity: حداکثر توکن‌ها (حداکثر درخواست‌های پشت سر هم)، پیش‌فرض max(1, rate)
+            name: نام برای آمار و لاگ
+            use_priority: پاسخ به منتظرها بر اساس اولویت (False = فقط ترتیب ورود)
+            utilization_window: بازه محاسبه میزان استفاده (ثانیه)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.name = name
+        self.use_priority = use_priority
+        self.utilization_window = utilization_window
+
+        # موجودی منفی = بدهی (پس از penalize تا بازپرداخت آن درخواستی داده نمی‌شود)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+        # (اولویت، شماره ورود، تعداد توکن، Future) درخواست‌های منتظر
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # حلقه رویداد درخواست‌های منتظر (Future ها و تایمر فقط در همین حلقه لمس می‌شوند)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # آمار: (زمان، توکن) برداشت‌های اخیر برای میزان استفاده
+        self._recent: Deque[Tuple[float, float]] = deque()
+        self._recent_tokens = 0.0
+        self.wait_times = LatencyHistogram()
+        self.stats = {
+            'requests': 0,
+            'tokens': 0.0,
+            'waited': 0,
+            'penalties': 0
+        }
+
+    def _refill(self, now: float) -> None:
+        """اضافه کردن توکن‌های تولید شده از آخرین به‌روزرسانی"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self, tokens: float, now: float) -> None:
+        """برداشت توکن و ثبت آن در آمار"""
+        self._tokens -= tokens
+        self.stats['requests'] += 1
+        self.stats['tokens'] += tokens
+        self._recent.append((now, tokens))
+        self._recent_tokens += tokens
+
+    def _wake(self) -> None:
+        """پاسخ به درخواست‌های منتظر به ترتیب صف و زمان‌بندی بیدار شدن بعدی"""
+        self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                # درخواست لغو شده
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < tokens:
+                break
+            heapq.heappop(self._waiters)
+            self._take(tokens, now)
+            future.set_result(None)
+
+        if self._waiters:
+            tokens = self._waiters[0][2]
+            delay = (tokens - self._tokens) / self.rate
+            self._timer = self._loop.call_later(max(0.0, delay), self._wake)
+
+    def _call_in_loop(self, callback, *args) -> bool:
+        """
+        اجرای callback در حلقه رویداد سطل اگر فراخوانی از thread دیگری است
+        (مثلا update_config از thread بارگذاری تنظیمات، بدون حلقه فعال)
+
+        Returns:
+            True اگر callback به حلقه سپرده شد (فراخواننده نباید تغییر را خودش اعمال کند)
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return False
+        loop.call_soon_threadsafe(callback, *args)
+        return True
+
+    def _reschedule(self) -> None:
+        """محاسبه دوباره زمان بیدار شدن (پس از تغییر نرخ، بدهی یا ترتیب صف)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._waiters:
+            self._wake()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        برداشت فوری توکن بدون انتظار
+
+        Returns:
+            True اگر توکن کافی موجود بود و صف انتظار خالی بود
+        """
+        tokens = min(tokens, self.capacity)
+        now = time.monotonic()
+        self._refill(now)
+        if self._waiters or self._tokens < tokens:
+            return False
+        self._take(tokens, now)
+        self.wait_times.record(0.0)
+        return True
+
+    async def acquire(self, tokens: float = 1.0, priority: int = PRIORITY_NORMAL) -> float:
+        """
+        انتظار تا در دسترس بودن توکن و برداشت آن
+
+        Args:
+            tokens: تعداد توکن (وزن درخواست، حداکثر به اندازه ظرفیت)
+            priority: اولویت درخواست (فقط با use_priority)
+
+        Returns:
+            مدت انتظار (ثانیه)
+        """
+        tokens = min(tokens, self.capacity)
+        if self.try_acquire(tokens):
+            return 0.0
+
+        start = time.monotonic()
+        self._loop = asyncio.get_running_loop()
+        future = self._loop.create_future()
+        heapq.heappush(
+            self._waiters,
+            (priority if self.use_priority else 0, next(self._sequence), tokens, future)
+        )
+        # درخواست جدید ممکن است در ابتدای صف قرار گرفته باشد
+        self._reschedule()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # توکن داده شده ولی استفاده نشده: بازگرداندن به سطل
+                self._tokens = min(self.capacity, self._tokens + tokens)
+            self._reschedule()
+            raise
+
+        waited = time.monotonic() - start
+        self.stats['waited'] += 1
+        self.wait_times.record(waited)
+        return waited
+
+    async def wait_ready(self) -> None:
+        """انتظار تا پایان بدهی سطل (پس از penalize) بدون برداشت توکن"""
+        while True:
+            self._refill(time.monotonic())
+            if self._tokens >= 0:
+                return
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    def penalize(self, seconds: float) -> None:
+        """
+        توقف پاسخ به درخواست‌ها برای حداقل seconds ثانیه (مثلا پس از پاسخ 429)
+
+        Args:
+            seconds: مدت توقف
+        """
+        if self._call_in_loop(self.penalize, seconds):
+            return
+
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+        self.stats['penalties'] += 1
+        self._reschedule()
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        تغییر نرخ (و ظرفیت) سطل؛ توکن‌های تولید شده تا این لحظه با نرخ قبلی حساب می‌شوند
+
+        از thread دیگر، تغییر در حلقه رویداد منتظرها (به صورت ناهمزمان) اعمال می‌شود.
+
+        Args:
+            rate: نرخ جدید (توکن در ثانیه)
+            capacity: ظرفیت جدید (None = بدون تغییر)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+        if self._call_in_loop(self.set_rate, rate, capacity):
+            return
+
+        self._refill(time.monotonic())
+        self.rate = float(rate)
+        if capacity:
+            self.capacity = float(capacity)
+            self._tokens = min(self._tokens, self.capacity)
+        self._reschedule()
+
+    @property
+    def available(self) -> float:
+        """توکن‌های در دسترس در این لحظه (منفی = بدهی)"""
+        self._refill(time.monotonic())
+        return self._tokens
+
+    @property
+    def waiting(self) -> int:
+        """تعداد درخواست‌های منتظر"""
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    def utilization(self) -> float:
+        """نسبت توکن‌های برداشت شده در utilization_window اخیر به نرخ پایدار سطل"""
+        cutoff = time.monotonic() - self.utilization_window
+        while self._recent and self._recent[0][0] < cutoff:
+            self._recent_tokens -= self._recent.popleft()[1]
+        return self._recent_tokens / (self.rate * self.utilization_window)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        آمار سطل
+
+        Returns:
+            دیکشنری آمار
+        """
+        return dict(
+            self.stats,
+            name=self.name,
+            rate=self.rate,
+            capacity=self.capacity,
+            available=round(self.available, 3),
+            waiting=self.waiting,
+            utilization=round(self.utilization(), 4),
+            wait_time=self.wait_times.summary()
+        )
+
+
+class RateLimiter:
+    """محدودکننده نرخ وزن‌دار صرافی: استخرهای سهمیه و نگاشت گروه اندپوینت‌ها به آن‌ها"""
+
+    def __init__(
+            self,
+            pools: Optional[Dict[str, Dict[str, float]]] = None,
+            endpoints: Optional[Dict[str, Dict[str, Any]]] = None,
+            order: str = 'fifo',
+            utilization_target: float = 0.9,
+            min_throttle: float = 0.25
+    ):
+        """
+        مقداردهی اولیه
+
+        Args:
+            pools: {نام استخر: {'quota': وزن مجاز، 'window_seconds': طول پنجره}}
+            endpoints: {گروه اندپوینت: {'pool': نام استخر، 'weight': وزن}}
+            order: ترتیب پاسخ به منتظرها ('fifo' یا 'priority')
+            utilization_target: کسری از سهمیه که مصرف می‌شود (0 تا 1)
+            min_throttle: حداقل ضریب کاهش نرخ پس از نقض‌های پیاپی
+        """
+        self.pools: Dict[str, Dict[str, float]] = {}
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self.order = order
+        self.utilization_target = utilization_target
+        self.min_throttle = min_throttle
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        # ضریب نرخ هر استخر (کمتر از 1 پس از پاسخ‌های 429)
+        self._throttle: Dict[str, float] = {}
+        # آمار گروه اندپوینت‌ها
+        self._endpoint_stats: Dict[str, Dict[str, Any]] = {}
+
+        self.configure(pools, endpoints, order, utilization_target)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RateLimiter':
+        """
+        ساخت از بخش rate_limits تنظیمات صرافی
+
+        Args:
+            config: {'order', 'utilization_target', 'pools', 'endpoints'}
+        """
+        return cls(
+            pools=config.get('pools'),
+            endpoints=config.get('endpoints'),
+            order=config.get('order', 'fifo'),
+            utilization_target=config.get('utilization_target', 0.9)
+        )
+
+    def configure(
+            self,
+            pools: Optional[Dict[str, Dict[str, float]]] = None,
+            endpoints: Optional[Dict[str, Dict[str, Any]]] = None,
+            order: Optional[str] = None,
+            utilization_target: Optional[float] = None
+    ) -> None:
+        """
+        اعمال تنظیمات (پیش‌فرض‌ها با مقادیر داده شده جایگزین می‌شوند)؛ صف‌های فعلی حفظ می‌شوند
+
+        از thread دیگر (بدون حلقه فعال) هم قابل فراخوانی است: نرخ سطل‌هایی که منتظر
+        دارند در حلقه رویداد همان منتظرها تغییر می‌کند.
+        """
+        if order is not None:
+            if order not in ('fifo', 'priority'):
+                raise ValueError(f"Unknown rate limit order: {order}")
+            self.order = order
+        if utilization_target is not None:
+            if not 0 < utilization_target <= 1:
+                raise ValueError(f"utilization_target must be in (0, 1]: {utilization_target}")
+            self.utilization_target = utilization_target
+
+        self.pools = {name: dict(spec) for name, spec in DEFAULT_POOLS.items()}
+        for name, spec in (pools or {}).items():
+            self.pools.setdefault(name, {}).update(spec)
+
+        self.endpoints = {key: dict(spec) for key, spec in DEFAULT_ENDPOINTS.items()}
+        for key, spec in (endpoints or {}).items():
+            self.endpoints.setdefault(key, {'pool': 'public', 'weight': 1}).update(spec)
+
+        for name in self.pools:
+            self._apply_pool(name)
+
+    def _apply_pool(self, name: str) -> None:
+        """ساخت یا به‌روزرسانی سطل یک استخر"""
+        spec = self.pools[name]
+        quota = float(spec['quota'])
+        window = float(spec.get('window_seconds', 30))
+        throttle = self._throttle.setdefault(name, 1.0)
+
+        rate = quota * self.utilization_target / window * throttle
+        # ظرفیت حداقل به اندازه سنگین‌ترین درخواست
+        max_weight = max([e['weight'] for e in self.endpoints.values() if e['pool'] == name] or [1])
+        capacity = max(round(quota * (1 - self.utilization_target), 6), max_weight)
+
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            self._buckets[name] = TokenBucket(
+                rate, capacity=capacity, name=name,
+                use_priority=self.order == 'priority', utilization_window=window
+            )
+        else:
+            bucket.use_priority = self.order == 'priority'
+            bucket.utilization_window = window
+            bucket.set_rate(rate, capacity=capacity)
+
+    def _resolve(self, key: str, signed: bool = False) -> Tuple[str, TokenBucket, float]:
+        """
+        گروه اندپوینت -> (نام استخر، سطل، وزن)
+
+        گروه‌های ناشناخته با وزن 1 از استخر private (درخواست امضا شده) یا public استفاده می‌کنند.
+        """
+        spec = self.endpoints.get(key)
+        if spec is None:
+            pool = 'private' if signed else 'public'
+            weight = 1.0
+        else:
+            pool = spec['pool']
+            weight = float(spec['weight'])
+        return pool, self._buckets[pool], weight
+
+    def _get_endpoint_stats(self, key: str, pool: str, weight: float) -> Dict[str, Any]:
+        """آمار یک گروه اندپوینت (در صورت نبود ساخته می‌شود)"""
+        stats = self._endpoint_stats.get(key)
+        if stats is None:
+            stats = self._endpoint_stats[key] = {
+                'pool': pool, 'weight': weight, 'requests': 0, 'violations': 0,
+                'wait_time': LatencyHistogram()
+            }
+        return stats
+
+    async def acquire(
+            self,
+            key: str,
+            signed: bool = False,
+            priority: int = PRIORITY_NORMAL,
+            weight: Optional[float] = None
+    ) -> float:
+        """
+        انتظار برای سهمیه یک درخواست
+
+        Args:
+            key: گروه اندپوینت (مثلا 'kline')
+            signed: درخواست امضا شده (برای گروه‌های ناشناخته)
+            priority: اولویت درخواست
+            weight: وزن درخواست (None = وزن گروه)
+
+        Returns:
+            مدت انتظار (ثانیه)
+        """
+        pool, bucket, default_weight = self._resolve(key, signed)
+        waited = await bucket.acquire(default_weight if weight is None else weight, priority)
+
+        stats = self._get_endpoint_stats(key, pool, default_weight)
+        stats['requests'] += 1
+        stats['wait_time'].record(waited)
+        return waited
+
+    async def wait_ready(self, key: str, signed: bool = False) -> None:
+        """انتظار تا پایان توقف استخر یک گروه اندپوینت (بدون مصرف سهمیه)"""
+        _, bucket, _ = self._resolve(key, signed)
+        await bucket.wait_ready()
+
+    def penalize(self, key: str, retry_after: Optional[float] = None, signed: bool = False) -> float:
+        """
+        ثبت نقض سهمیه (پاسخ 429): توقف استخر تا retry_after و کاهش نرخ آن
+
+        Args:
+            key: گروه اندپوینت
+            retry_after: زمان انتظار اعلام شده توسط صرافی (ثانیه)
+            signed: درخواست امضا شده
+
+        Returns:
+            ضریب جدید نرخ استخر
+        """
+        pool, bucket, weight = self._resolve(key, signed)
+        self._throttle[pool] = max(self.min_throttle, self._throttle.get(pool, 1.0) * 0.8)
+        self._apply_pool(pool)
+        bucket.penalize(retry_after if retry_after else weight / bucket.rate)
+
+        self._get_endpoint_stats(key, pool, weight)['violations'] += 1
+        return self._throttle[pool]
+
+    def recover(self, key: str, signed: bool = False) -> None:
+        """بازگشت تدریجی نرخ استخر پس از درخواست موفق"""
+        pool, _, _ = self._resolve(key, signed)
+        throttle = self._throttle.get(pool, 1.0)
+        if throttle < 1.0:
+            self._throttle[pool] = min(1.0, throttle * 1.05)
+            self._apply_pool(pool)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        آمار استخرها و گروه اندپوینت‌ها
+
+        Returns:
+            دیکشنری آمار
+        """
+        return {
+            'order': self.order,
+            'utilization_target': self.utilization_target,
+            'pools': {
+                name: dict(bucket.get_stats(), throttle=self._throttle.get(name, 1.0))
+                for name, bucket in self._buckets.items()
+            },
+            'endpoints': {
+                key: dict(stats, wait_time=stats['wait_time'].summary())
+                for key, stats in self._endpoint_stats.items()
+            }
+        }
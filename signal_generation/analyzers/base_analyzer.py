@@ -11,7 +11,7 @@ Standard pattern:
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 
 from signal_generation.analysis_result import AnalysisResult, AnalysisError, ErrorSeverity
@@ -27,8 +27,22 @@ class BaseAnalyzer(ABC):
     1. Inherit from this class
     2. Implement the analyze() method
     3. Store results in context using context.add_result()
+
+    Analyzers declare the indicator columns they read in REQUIRED_INDICATORS;
+    SignalOrchestrator passes the union for the enabled analyzers to the
+    IndicatorCalculator, which then only calculates those indicators.
+
+    Analyzers that read other analyzers' results declare them in
+    REQUIRED_RESULTS; SignalOrchestrator only starts an analyzer after those
+    have finished and runs independent analyzers concurrently.
     """
     
+    # Indicator columns read from context.df (none by default)
+    REQUIRED_INDICATORS: List[str] = []
+    
+    # Analyzer results read from the context (none by default)
+    REQUIRED_RESULTS: List[str] = []
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the analyzer.
@@ -30,6 +30,7 @@ import numpy as np
 
 from signal_generation.analyzers.base_analyzer import BaseAnalyzer
 from signal_generation.context import AnalysisContext
+from common.swing_index import SwingIndex
 
 logger = logging.getLogger(__name__)
 
@@ -128,7 +129,7 @@ class HarmonicAnalyzer(BaseAnalyzer):
                 return
             
             # Detect swing points
-            swing_points = self._detect_swing_points(df)
+            swing_points = self._detect_swing_points(df, context.get_swing_index())
 
             # Search for harmonic patterns
             patterns = self._search_harmonic_patterns(swing_points, df)
@@ -164,25 +165,33 @@ class HarmonicAnalyzer(BaseAnalyzer):
                 'error': str(e)
             })
     
-    def _detect_swing_points(self, df: pd.DataFrame) -> List[Dict]:
+    def _detect_swing_points(
+        self,
+        df: pd.DataFrame,
+        swings: Optional[SwingIndex] = None
+    ) -> List[Dict]:
         """
         Detect swing highs and lows.
 
+        Pivots are read from the shared swing index (built if not provided).
         Prevents duplicate swing points at the same index by choosing
         the stronger signal (high or low) based on distance from mean.
         """
         lookback = min(self.lookback, len(df))
-        recent_df = df.tail(lookback)
+        swings = swings or SwingIndex(df)
 
-        highs = recent_df['high'].values
-        lows = recent_df['low'].values
+        highs = swings.values('high', lookback)
+        lows = swings.values('low', lookback)
 
         swing_points = []
         window = self.swing_window
+        high_positions, low_positions = swings.pivots(window, lookback=lookback)
+        high_set = set(high_positions.tolist())
+        low_set = set(low_positions.tolist())
 
-        for i in range(window, len(highs) - window):
-            is_swing_high = highs[i] == max(highs[i-window:i+window+1])
-            is_swing_low = lows[i] == min(lows[i-window:i+window+1])
+        for i in sorted(high_set | low_set):
+            is_swing_high = i in high_set
+            is_swing_low = i in low_set
 
             # If both high and low, choose the stronger one
             if is_swing_high and is_swing_low:
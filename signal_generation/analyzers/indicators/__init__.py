@@ -6,11 +6,13 @@ This module provides technical indicator calculation functionality.
 Components:
 - BaseIndicator: Abstract base class for all indicators
 - IndicatorOrchestrator: Main coordinator for indicator calculation
+- IncrementalIndicatorEngine: Streaming (per-candle) indicator updates
 - Individual indicators: EMA, SMA, RSI, MACD, ATR, Bollinger, Stochastic, OBV
 """
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
 from signal_generation.analyzers.indicators.indicator_orchestrator import IndicatorOrchestrator
+from signal_generation.analyzers.indicators.incremental_engine import IncrementalIndicatorEngine
 
 # Trend Indicators
 from signal_generation.analyzers.indicators.ema import EMAIndicator
@@ -31,6 +33,7 @@ from signal_generation.analyzers.indicators.obv import OBVIndicator
 __all__ = [
     'BaseIndicator',
     'IndicatorOrchestrator',
+    'IncrementalIndicatorEngine',
 
     # Trend
     'EMAIndicator',
@@ -0,0 +1,415 @@
+"""
+Incremental Indicator Engine - Streaming O(1)-per-candle indicator updates
+
+Keeps per-(symbol, timeframe, parameter-set) indicator state so that when a
+new candle is appended only the new rows are calculated, instead of
+recomputing every indicator over the full window.
+
+A fixed-size window that slides forward (drops its oldest candles, as the
+live loop does with ohlcv_limit) keeps streaming: the state stays anchored
+at the first candle it was built from, so recursive and cumulative
+indicators (EMA, RSI, OBV, ...) continue from the full history seen so far.
+Their values equal a full recompute from that anchor, not a recompute of
+the slid window alone (which would restart the warm-up at its first row).
+
+Falls back to a full recompute (IndicatorOrchestrator.calculate_all) when:
+- there is no state yet for the key
+- the indicator parameters changed
+- the new data has a gap, or history before the last candle was rewritten
+- the window starts earlier than the stored one (older candles prepended)
+- any indicator cannot be streamed (e.g. not warmed up yet)
+
+The last candle may be revised (live data: the forming candle keeps changing);
+this is handled by keeping the state snapshot from before the last candle.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import copy
+import hashlib
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.analyzers.indicators.base_indicator import assemble_columns
+from signal_generation.analyzers.indicators.indicator_orchestrator import IndicatorOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndicatorStreamState:
+    """Streaming state for one (symbol, timeframe, parameter-set)."""
+
+    # Candle timestamps (int64) and closes of the stored window
+    timestamps: np.ndarray
+    closes: np.ndarray
+
+    # Last stored candle (open, high, low, close, volume)
+    last_candle: Tuple[float, ...]
+
+    # Expected distance between candles (same unit as timestamps)
+    interval: int
+
+    # Indicator output columns aligned with timestamps
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    # Per-indicator state after the last row / before the last row
+    states: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    prev_states: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class IncrementalIndicatorEngine:
+    """
+    Stateful incremental mode for IndicatorOrchestrator.
+
+    Usage:
+        engine = IncrementalIndicatorEngine(orchestrator, config)
+        enriched_df = engine.calculate(df, 'BTCUSDT', '5m')
+    """
+
+    OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, orchestrator: IndicatorOrchestrator, config: Dict[str, Any] = None):
+        """
+        Initialize IncrementalIndicatorEngine.
+
+        Args:
+            orchestrator: IndicatorOrchestrator with registered indicators
+            config: Configuration dictionary
+        """
+        self.orchestrator = orchestrator
+        self.config = config or {}
+
+        incremental_config = self._get_indicator_config().get('incremental', {})
+        self.max_states = incremental_config.get('max_states', 2000)
+
+        # States by key, least recently used first
+        self._states: 'OrderedDict[Tuple[str, str, str], IndicatorStreamState]' = OrderedDict()
+
+        # Statistics
+        self.stats = {
+            'incremental_updates': 0,
+            'unchanged': 0,
+            'full_recomputes': 0,
+            'rows_streamed': 0,
+            'rows_dropped': 0,
+            'evictions': 0,
+            'fallback_reasons': {}
+        }
+
+        logger.info(f"IncrementalIndicatorEngine initialized (max_states={self.max_states})")
+
+    def _get_indicator_config(self) -> Dict[str, Any]:
+        """Get indicator_calculator config (nested or flat)."""
+        if 'signal_generation_v2' in self.config:
+            return self.config.get('signal_generation_v2', {}).get('indicator_calculator', {})
+        return self.config.get('indicator_calculator', {})
+
+    def _get_params_signature(self) -> str:
+        """Hash of the indicator parameters and plan, so config changes invalidate state."""
+        indicator_config = self._get_indicator_config()
+        payload = json.dumps(
+            [indicator_config, self.orchestrator.required_columns], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _extract_timestamps(df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Get candle timestamps as int64 array.
+
+        Supports DatetimeIndex (live data) and 'timestamp' column (backtest data).
+        """
+        try:
+            if isinstance(df.index, pd.DatetimeIndex):
+                return df.index.asi8
+            if 'timestamp' in df.columns:
+                ts = df['timestamp']
+                if pd.api.types.is_datetime64_any_dtype(ts):
+                    return ts.values.astype('datetime64[ns]').astype(np.int64)
+                return ts.values.astype(np.int64)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Cannot extract timestamps: {e}")
+        return None
+
+    def calculate(self, df: pd.DataFrame, symbol: str, timeframe: str) -> pd.DataFrame:
+        """
+        Calculate all indicators, streaming only the new rows when possible.
+
+        Args:
+            df: DataFrame with OHLCV data (oldest first)
+            symbol: Trading symbol
+            timeframe: Timeframe (indicators must already be set to it)
+
+        Returns:
+            New DataFrame with all indicator columns added
+        """
+        return assemble_columns(df, self.calculate_outputs(df, symbol, timeframe))
+
+    def calculate_outputs(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Dict[str, np.ndarray]:
+        """
+        Same as calculate(), but returns only the indicator columns.
+
+        Args:
+            df: DataFrame with OHLCV data (oldest first)
+            symbol: Trading symbol
+            timeframe: Timeframe (indicators must already be set to it)
+
+        Returns:
+            Dictionary of indicator column -> values (aligned with df rows)
+        """
+        timestamps = self._extract_timestamps(df)
+        if timestamps is None or len(timestamps) < 2:
+            return self._full_recompute(df, None, None, 'no_timestamps')
+
+        key = (symbol, timeframe, self._get_params_signature())
+        state = self._states.get(key)
+
+        if state is None:
+            return self._full_recompute(df, key, timestamps, 'no_state')
+
+        self._states.move_to_end(key)
+
+        try:
+            result = self._incremental_update(df, state, timestamps)
+        except Exception as e:
+            logger.debug(f"Incremental update failed for {symbol} {timeframe}: {e}", exc_info=True)
+            result = 'error'
+
+        if isinstance(result, str):
+            return self._full_recompute(df, key, timestamps, result)
+
+        return result
+
+    def _incremental_update(
+        self,
+        df: pd.DataFrame,
+        state: IndicatorStreamState,
+        timestamps: np.ndarray
+    ):
+        """
+        Try to extend the stored state with the new rows of df.
+
+        Returns:
+            Dictionary of indicator column -> values, or a fallback reason string
+        """
+        n = len(df)
+        last_ts = state.timestamps[-1]
+
+        # Position of the last stored candle in the new data
+        pos = int(np.searchsorted(timestamps, last_ts))
+        if pos >= n or timestamps[pos] != last_ts:
+            return 'history_mismatch'
+
+        # Stored rows dropped from the front of the window (window slid)
+        dropped = len(state.timestamps) - 1 - pos
+        if dropped < 0:
+            return 'window_grew'
+
+        # The overlap with the stored window must be unchanged
+        if not np.array_equal(state.timestamps[dropped:], timestamps[:pos + 1]):
+            return 'gap'
+        closes = df['close'].values
+        if not np.array_equal(state.closes[dropped:-1], closes[:pos]):
+            return 'history_rewrite'
+
+        stored_columns = state.columns
+        if dropped:
+            stored_columns = {col: values[dropped:] for col, values in stored_columns.items()}
+
+        # Appended candles must be contiguous
+        if pos + 1 < n and np.any(np.diff(timestamps[pos:]) != state.interval):
+            return 'gap'
+
+        # Last stored candle revised (forming candle) -> restart from the snapshot before it
+        candle = tuple(float(v) for v in df[self.OHLCV_COLUMNS].iloc[pos].values)
+        revised = not np.array_equal(candle, state.last_candle)
+
+        if revised:
+            if not state.prev_states and state.states:
+                return 'no_snapshot'
+            start = pos
+            indicator_states = copy.deepcopy(state.prev_states)
+        else:
+            start = pos + 1
+            indicator_states = state.states
+
+        if start == n:
+            # Nothing new: serve stored values
+            self.stats['unchanged'] += 1
+            return dict(stored_columns)
+
+        new_values, prev_states = self._stream_rows(df, start, indicator_states)
+
+        # Stitch stored history with the new values (aligned to df)
+        columns = {}
+        for col, values in stored_columns.items():
+            columns[col] = np.concatenate([values[:start], new_values[col]])
+
+        state.timestamps = timestamps.copy()
+        state.closes = closes.astype(float)
+        state.last_candle = tuple(float(v) for v in df[self.OHLCV_COLUMNS].iloc[-1].values)
+        state.columns = columns
+        state.states = indicator_states
+        state.prev_states = prev_states
+
+        self.stats['incremental_updates'] += 1
+        self.stats['rows_streamed'] += n - start
+        self.stats['rows_dropped'] += dropped
+
+        return columns
+
+    def _stream_rows(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        indicator_states: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, Any]]]:
+        """
+        Run update_incremental for every streamed indicator.
+
+        Rows start..n-2 and row n-1 are processed separately so that the state
+        before the last row can be kept as a snapshot.
+
+        Returns:
+            Tuple (new values by column, states before the last row)
+        """
+        n = len(df)
+        head_df = df.iloc[:n - 1] if start < n - 1 else None
+
+        new_values: Dict[str, np.ndarray] = {}
+        prev_states: Dict[str, Dict[str, Any]] = {}
+
+        for name, indicator_state in indicator_states.items():
+            indicator = self.orchestrator.all_indicators[name]
+
+            parts: Dict[str, List[np.ndarray]] = {}
+            if head_df is not None:
+                for col, values in indicator.update_incremental(head_df, start, indicator_state).items():
+                    parts.setdefault(col, []).append(values)
+
+            prev_states[name] = copy.deepcopy(indicator_state)
+
+            for col, values in indicator.update_incremental(df, n - 1, indicator_state).items():
+                parts.setdefault(col, []).append(values)
+
+            for col, chunks in parts.items():
+                new_values[col] = np.concatenate(chunks) if len(chunks) > 1 else np.asarray(chunks[0], dtype=float)
+
+        return new_values, prev_states
+
+    def _full_recompute(
+        self,
+        df: pd.DataFrame,
+        key: Optional[Tuple[str, str, str]],
+        timestamps: Optional[np.ndarray],
+        reason: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Recompute all indicators and rebuild streaming state.
+
+        Args:
+            df: DataFrame with OHLCV data
+            key: State key (None = do not store state)
+            timestamps: Candle timestamps
+            reason: Why the incremental path was not used
+
+        Returns:
+            Dictionary of indicator column -> values
+        """
+        self.stats['full_recomputes'] += 1
+        self.stats['fallback_reasons'][reason] = self.stats['fallback_reasons'].get(reason, 0) + 1
+        logger.debug(f"Full indicator recompute (reason: {reason})")
+
+        outputs = self.orchestrator.calculate_outputs(df)
+
+        if key is not None:
+            self._states.pop(key, None)
+            try:
+                state = self._build_state(assemble_columns(df, outputs), outputs, timestamps)
+            except Exception as e:
+                logger.debug(f"Cannot build streaming state for {key[0]} {key[1]}: {e}", exc_info=True)
+                state = None
+
+            if state is not None:
+                self._states[key] = state
+                self._evict()
+
+        return outputs
+
+    def _build_state(
+        self,
+        enriched_df: pd.DataFrame,
+        outputs: Dict[str, np.ndarray],
+        timestamps: np.ndarray
+    ) -> Optional[IndicatorStreamState]:
+        """
+        Build streaming state from a fully calculated DataFrame.
+
+        The state before the last row comes from init_state() on all rows but the
+        last; the last row is then streamed to get the current state.
+        """
+        diffs = np.diff(timestamps)
+        positive = diffs[diffs > 0]
+        if len(positive) == 0:
+            return None
+
+        columns: Dict[str, np.ndarray] = {}
+        states: Dict[str, Dict[str, Any]] = {}
+        prev_states: Dict[str, Dict[str, Any]] = {}
+        head_df = enriched_df.iloc[:-1]
+
+        for name, indicator in self.orchestrator.all_indicators.items():
+            # Skip indicators that the full calculation did not produce
+            if not all(col in outputs for col in indicator.output_columns):
+                continue
+
+            prev_state = indicator.init_state(head_df)
+            if prev_state is None:
+                return None
+
+            state = copy.deepcopy(prev_state)
+            indicator.update_incremental(enriched_df, len(enriched_df) - 1, state)
+
+            prev_states[name] = prev_state
+            states[name] = state
+
+            for col in indicator.output_columns:
+                columns[col] = outputs[col]
+
+        return IndicatorStreamState(
+            timestamps=timestamps.copy(),
+            closes=enriched_df['close'].values.astype(float),
+            last_candle=tuple(float(v) for v in enriched_df[self.OHLCV_COLUMNS].iloc[-1].values),
+            interval=int(positive.min()),
+            columns=columns,
+            states=states,
+            prev_states=prev_states
+        )
+
+    def _evict(self) -> None:
+        """Drop least recently used states above max_states."""
+        while len(self._states) > self.max_states:
+            self._states.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def clear(self) -> None:
+        """Drop all streaming state."""
+        self._states.clear()
+        logger.debug("Incremental indicator state cleared")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get engine statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = dict(self.stats)
+        stats['fallback_reasons'] = dict(self.stats['fallback_reasons'])
+        stats['states'] = len(self._states)
+        return stats
@@ -3,13 +3,20 @@ Indicator Orchestrator - Coordinates all indicator calculations
 
 This orchestrator manages the calculation of all technical indicators.
 It loads indicator calculators dynamically and coordinates their execution.
+
+Indicators form a DAG: each declares the columns it reads (OHLCV plus
+outputs of other indicators, see BaseIndicator._get_input_columns()) and
+the columns it writes. Given the columns consumers need, only the required
+closure is computed, once, in topological order; shared intermediates such
+as the true range feed every indicator built on them.
 """
 
-from typing import Dict, Any, List, Optional, Type
+from typing import Dict, Any, List, Optional, Type, Iterable
+import numpy as np
 import pandas as pd
 import logging
 
-from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators.base_indicator import BaseIndicator, assemble_columns
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +33,7 @@ class IndicatorOrchestrator:
 
     Key features:
     - Dynamic indicator loading
-    - Dependency management
+    - Dependency management (indicator DAG, required-closure plans)
     - Caching support
     - Batch calculation
     """
@@ -50,6 +57,12 @@ class IndicatorOrchestrator:
         # All indicators (for easy access)
         self.all_indicators: Dict[str, BaseIndicator] = {}
 
+        # Columns consumers read (None = compute every indicator)
+        self.required_columns: Optional[List[str]] = None
+
+        # Indicator names to compute, in topological order
+        self._plan: List[str] = []
+
         # Settings
         self.cache_enabled = self.config.get('indicators', {}).get('cache_enabled', True)
 
@@ -81,9 +94,12 @@ class IndicatorOrchestrator:
             from signal_generation.analyzers.indicators.bollinger_bands import BollingerBandsIndicator
             from signal_generation.analyzers.indicators.obv import OBVIndicator
             from signal_generation.analyzers.indicators.adx import ADXIndicator
+            from signal_generation.analyzers.indicators.true_range import TrueRangeIndicator
 
             # Register all indicators
             indicators = [
+                # Shared intermediates
+                TrueRangeIndicator,
                 # Trend indicators
                 EMAIndicator,
                 SMAIndicator,
@@ -135,6 +151,9 @@ class IndicatorOrchestrator:
             # Add to all_indicators
             self.all_indicators[indicator.name] = indicator
 
+            # The DAG changed: rebuild the calculation plan
+            self._plan = self.resolve_indicators(self.required_columns)
+
             logger.debug(f"Registered {indicator_type} indicator: {indicator.name}")
 
         except Exception as e:
@@ -151,54 +170,195 @@ class IndicatorOrchestrator:
         Args:
             df: DataFrame with OHLCV data
             indicator_names: Optional list of specific indicators to calculate
-                           (if None, calculates all)
+                           (if None, calculates the current plan)
 
         Returns:
-            DataFrame with all indicator columns added
+            New DataFrame with all indicator columns added (df is not modified)
         """
-        result_df = df.copy()
+        return assemble_columns(df, self.calculate_outputs(df, indicator_names))
 
-        # Determine which indicators to calculate
-        if indicator_names:
-            indicators_to_calc = [
-                self.all_indicators[name]
-                for name in indicator_names
-                if name in self.all_indicators
-            ]
-        else:
-            indicators_to_calc = list(self.all_indicators.values())
-
-        # Calculate in order: trend -> momentum -> volatility -> volume -> other
-        # This ensures any dependencies are satisfied
-        calculation_order = [
-            ('trend', self.trend_indicators),
-            ('momentum', self.momentum_indicators),
-            ('volatility', self.volatility_indicators),
-            ('volume', self.volume_indicators),
-            ('other', self.other_indicators)
+    def calculate_outputs(
+        self,
+        df: pd.DataFrame,
+        indicator_names: Optional[List[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate all (or specified) indicators without building a DataFrame.
+
+        Indicators only read the OHLCV columns of df (and outputs of the
+        indicators they depend on), so no intermediate copies are made;
+        callers assemble the enriched frame once.
+
+        Args:
+            df: DataFrame with OHLCV data
+            indicator_names: Optional list of specific indicators to calculate
+                           (their dependencies are added; if None, calculates
+                           the current plan, see set_required_columns())
+
+        Returns:
+            Dictionary of output column -> values, in calculation order
+        """
+        outputs: Dict[str, np.ndarray] = {}
+
+        for indicator_type, indicator in self._iter_indicators(indicator_names):
+            self._compute_into(outputs, indicator, df, indicator_type)
+
+        return self._drop_intermediates(outputs, indicator_names)
+
+    def calculate_panel(
+        self,
+        panel: Dict[str, np.ndarray],
+        indicator_names: Optional[List[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate all (or specified) indicators for many symbols at once.
+
+        The panel holds aligned OHLCV data as (symbols x candles) arrays;
+        every indicator runs once over the whole panel.
+
+        Args:
+            panel: Dictionary of column -> 2-D array (one row per symbol)
+            indicator_names: Optional list of specific indicators to calculate
+                           (their dependencies are added; if None, calculates
+                           the current plan, see set_required_columns())
+
+        Returns:
+            Dictionary of output column -> 2-D array, in calculation order
+        """
+        outputs: Dict[str, np.ndarray] = {}
+
+        for indicator_type, indicator in self._iter_indicators(indicator_names):
+            self._compute_into(outputs, indicator, panel, indicator_type, is_panel=True)
+
+        return self._drop_intermediates(outputs, indicator_names)
+
+    def set_required_columns(self, columns: Optional[Iterable[str]]) -> List[str]:
+        """
+        Restrict calculate_outputs() / calculate_panel() to what consumers read.
+
+        Args:
+            columns: Indicator columns read by analyzers and other consumers
+                     (None = calculate every registered indicator)
+
+        Returns:
+            Names of the indicators in the new plan, in calculation order
+        """
+        self.required_columns = None if columns is None else sorted(set(columns))
+        self._plan = self.resolve_indicators(self.required_columns)
+
+        public = [name for name in self.all_indicators if not self.all_indicators[name].is_intermediate]
+        skipped = [name for name in public if name not in self._plan]
+        logger.info(
+            f"Indicator plan: {', '.join(self._plan) or 'none'}"
+            f"{' (skipped: ' + ', '.join(skipped) + ')' if skipped else ''}"
+        )
+
+        return list(self._plan)
+
+    def resolve_indicators(self, columns: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Resolve the indicators needed to produce columns, in topological order.
+
+        Every indicator comes after the indicators whose outputs it declares
+        as inputs. Intermediates are only included when something needs them.
+
+        Args:
+            columns: Required output columns (None = every non-intermediate
+                     indicator). Columns no indicator produces are ignored.
+
+        Returns:
+            List of indicator names
+
+        Raises:
+            ValueError: If the declared inputs form a cycle
+        """
+        # Registration order within type order: trend -> momentum -> volatility -> volume -> other
+        ordered = [
+            name
+            for indicator_dict in (
+                self.trend_indicators, self.momentum_indicators, self.volatility_indicators,
+                self.volume_indicators, self.other_indicators
+            )
+            for name in indicator_dict
         ]
 
-        for indicator_type, indicator_dict in calculation_order:
-            for indicator_name, indicator in indicator_dict.items():
-                # Skip if not in requested list
-                if indicator_names and indicator_name not in indicator_names:
-                    continue
+        producers: Dict[str, str] = {}
+        for name in ordered:
+            for col in self.all_indicators[name].output_columns:
+                producers.setdefault(col, name)
 
-                try:
-                    # Calculate indicator
-                    result_df = indicator.calculate_safe(result_df)
-                    self.stats['total_calculations'] += 1
+        if columns is None:
+            roots = [name for name in ordered if not self.all_indicators[name].is_intermediate]
+        else:
+            wanted = {producers[col] for col in columns if col in producers}
+            roots = [name for name in ordered if name in wanted]
+
+        plan: List[str] = []
+        visiting = set()
+
+        def visit(name: str) -> None:
+            if name in plan:
+                return
+            if name in visiting:
+                raise ValueError(f"Indicator dependency cycle at {name}")
+            visiting.add(name)
+            for col in self.all_indicators[name].input_columns:
+                producer = producers.get(col)
+                if producer is not None and producer != name:
+                    visit(producer)
+            visiting.discard(name)
+            plan.append(name)
+
+        for name in roots:
+            visit(name)
+
+        return plan
+
+    def _iter_indicators(self, indicator_names: Optional[List[str]] = None):
+        """
+        Yield (indicator_type, indicator) in calculation (topological) order.
+
+        Args:
+            indicator_names: Optional list of specific indicators (None = current plan)
+        """
+        if indicator_names is None:
+            plan = self._plan
+        else:
+            plan = self.resolve_indicators([
+                col
+                for name in indicator_names if name in self.all_indicators
+                for col in self.all_indicators[name].output_columns
+            ])
 
-                    logger.debug(f"Calculated {indicator_type} indicator: {indicator_name}")
+        for name in plan:
+            indicator = self.all_indicators[name]
+            yield indicator.indicator_type, indicator
 
-                except Exception as e:
-                    logger.error(
-                        f"Error calculating indicator {indicator_name}: {e}",
-                        exc_info=True
-                    )
-                    self.stats['errors'] += 1
+    def _drop_intermediates(
+        self,
+        outputs: Dict[str, np.ndarray],
+        indicator_names: Optional[List[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Remove columns of intermediate indicators that were not asked for.
+
+        Args:
+            outputs: Output dictionary (updated in place)
+            indicator_names: Indicators requested explicitly (kept)
 
-        return result_df
+        Returns:
+            The same dictionary
+        """
+        keep = set(self.required_columns or [])
+        for indicator in self.all_indicators.values():
+            if not indicator.is_intermediate:
+                continue
+            if indicator_names and indicator.name in indicator_names:
+                continue
+            for col in indicator.output_columns:
+                if col not in keep:
+                    outputs.pop(col, None)
+        return outputs
 
     def calculate_by_type(
         self,
@@ -213,10 +373,8 @@ class IndicatorOrchestrator:
             indicator_type: Type of indicators ('trend', 'momentum', 'volatility', 'volume', 'other')
 
         Returns:
-            DataFrame with indicator columns added
+            New DataFrame with indicator columns added
         """
-        result_df = df.copy()
-
         # Get indicators of specified type
         if indicator_type == 'trend':
             indicators = self.trend_indicators
@@ -230,22 +388,56 @@ class IndicatorOrchestrator:
             indicators = self.other_indicators
         else:
             logger.warning(f"Unknown indicator type: {indicator_type}")
-            return result_df
+            return df.copy()
 
         # Calculate each indicator
-        for indicator_name, indicator in indicators.items():
-            try:
-                result_df = indicator.calculate_safe(result_df)
-                self.stats['total_calculations'] += 1
+        outputs: Dict[str, np.ndarray] = {}
+        for indicator in indicators.values():
+            self._compute_into(outputs, indicator, df, indicator_type)
 
-            except Exception as e:
-                logger.error(
-                    f"Error calculating {indicator_type} indicator {indicator_name}: {e}",
-                    exc_info=True
-                )
-                self.stats['errors'] += 1
+        return assemble_columns(df, self._drop_intermediates(outputs))
 
-        return result_df
+    def _compute_into(
+        self,
+        outputs: Dict[str, np.ndarray],
+        indicator: BaseIndicator,
+        data,
+        indicator_type: str,
+        is_panel: bool = False
+    ) -> None:
+        """
+        Compute one indicator and merge its outputs.
+
+        Outputs computed so far are passed in as the indicator's inputs,
+        so shared intermediates are reused instead of recomputed.
+
+        Args:
+            outputs: Output dictionary (updated in place)
+            indicator: Indicator to compute
+            data: DataFrame with OHLCV data, or a panel dictionary
+            indicator_type: Indicator type (for logging)
+            is_panel: True if data is a (symbols x candles) panel
+        """
+        try:
+            if is_panel:
+                result = indicator.compute_panel(data, outputs)
+            else:
+                result = indicator.compute_safe(data, outputs)
+            self.stats['total_calculations'] += 1
+
+            # None = validation failed (already logged by the indicator)
+            if result is None:
+                return
+
+            outputs.update(result)
+            logger.debug(f"Calculated {indicator_type} indicator: {indicator.name}")
+
+        except Exception as e:
+            logger.error(
+                f"Error calculating {indicator_type} indicator {indicator.name}: {e}",
+                exc_info=True
+            )
+            self.stats['errors'] += 1
 
     def get_indicator(self, name: str) -> Optional[BaseIndicator]:
         """
@@ -317,6 +509,15 @@ class IndicatorOrchestrator:
             indicator.timeframe = timeframe
         logger.debug(f"Set timeframe={timeframe} for {len(self.all_indicators)} indicators")
 
+    def get_plan(self) -> List[str]:
+        """
+        Get the indicators calculated by calculate_outputs(), in order.
+
+        Returns:
+            List of indicator names
+        """
+        return list(self._plan)
+
     def get_stats(self) -> Dict[str, int]:
         """
         Get calculation statistics.
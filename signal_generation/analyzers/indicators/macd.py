@@ -7,9 +7,10 @@ MACD is a trend-following momentum indicator.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
 
 
 class MACDIndicator(BaseIndicator):
@@ -51,17 +52,16 @@ class MACDIndicator(BaseIndicator):
     def _get_min_periods(self) -> int:
         return self.slow_period + self.signal_period
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Calculate MACD, Signal, and Histogram.
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with MACD columns added
+            Dictionary of MACD column -> values
         """
-        result_df = df.copy()
 
         # Get periods with per-TF support
         fast_period = self.get_parameter('macd_fast', self.default_fast_period, self.timeframe)
@@ -73,17 +73,77 @@ class MACDIndicator(BaseIndicator):
         self.slow_period = slow_period
         self.signal_period = signal_period
 
-        # Calculate fast and slow EMAs
-        ema_fast = result_df['close'].ewm(span=fast_period, adjust=False).mean()
-        ema_slow = result_df['close'].ewm(span=slow_period, adjust=False).mean()
+        # Calculate fast and slow EMAs (seeded with the first close)
+        close_values = data['close']
+        ema_fast = kernels.ewm(close_values, 2.0 / (fast_period + 1))
+        ema_slow = kernels.ewm(close_values, 2.0 / (slow_period + 1))
 
         # Calculate MACD line
-        result_df['macd'] = ema_fast - ema_slow
+        macd = ema_fast - ema_slow
 
         # Calculate Signal line
-        result_df['macd_signal'] = result_df['macd'].ewm(span=signal_period, adjust=False).mean()
+        macd_signal = kernels.ewm(macd, 2.0 / (signal_period + 1))
 
         # Calculate Histogram
-        result_df['macd_hist'] = result_df['macd'] - result_df['macd_signal']
+        return {
+            'macd': macd,
+            'macd_signal': macd_signal,
+            'macd_hist': macd - macd_signal
+        }
+
+    def init_state(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Build streaming state: fast/slow EMA and signal line at the last row.
+
+        Args:
+            df: DataFrame with MACD columns calculated
+
+        Returns:
+            State dictionary, or None if MACD is not available
+        """
+        signal_value = df['macd_signal'].iloc[-1]
+        if pd.isna(signal_value):
+            return None
+
+        return {
+            'fast_period': self.fast_period,
+            'slow_period': self.slow_period,
+            'signal_period': self.signal_period,
+            'ema_fast': float(kernels.ewm(df['close'].values, 2.0 / (self.fast_period + 1))[-1]),
+            'ema_slow': float(kernels.ewm(df['close'].values, 2.0 / (self.slow_period + 1))[-1]),
+            'signal': float(signal_value)
+        }
+
+    def update_incremental(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        state: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Advance fast/slow EMAs and the signal line by the new rows.
 
-        return result_df
+        Args:
+            df: DataFrame with OHLCV data
+            start: Position of the first new row
+            state: Streaming state (advanced in place)
+
+        Returns:
+            Dictionary of MACD column -> values for the new rows
+        """
+        close_values = df['close'].values[start:]
+
+        ema_fast = kernels.linear_filter(close_values, 2.0 / (state['fast_period'] + 1), state['ema_fast'])
+        ema_slow = kernels.linear_filter(close_values, 2.0 / (state['slow_period'] + 1), state['ema_slow'])
+        macd = ema_fast - ema_slow
+        signal = kernels.linear_filter(macd, 2.0 / (state['signal_period'] + 1), state['signal'])
+
+        state['ema_fast'] = float(ema_fast[-1])
+        state['ema_slow'] = float(ema_slow[-1])
+        state['signal'] = float(signal[-1])
+
+        return {
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_hist': macd - signal
+        }
@@ -7,7 +7,7 @@ OBV relates volume to price change to predict price movements.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
 
@@ -40,32 +40,78 @@ class OBVIndicator(BaseIndicator):
     def _get_min_periods(self) -> int:
         return 2  # Need at least 2 periods to compare close prices
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Calculate OBV with proper handling of edge cases.
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with OBV column added
+            Dictionary with 'obv' values
         """
-        result_df = df.copy()
 
-        # Calculate price direction (-1, 0, +1)
-        price_direction = np.sign(result_df['close'].diff())
+        close = np.asarray(data['close'], dtype=float)
+
+        # Calculate price direction (-1, 0, +1); the first bar has no direction
+        price_direction = np.zeros(close.shape)
+        price_direction[..., 1:] = np.sign(np.diff(close, axis=-1))
 
         # Ensure volume is valid (replace NaN and negative values with 0)
-        volume = result_df['volume'].fillna(0)
-        volume = volume.clip(lower=0)  # No negative volumes
+        volume = np.nan_to_num(np.asarray(data['volume'], dtype=float), nan=0.0)
+        volume = np.clip(volume, 0, None)  # No negative volumes
 
         # Calculate signed volume
         signed_volume = volume * price_direction
 
         # Replace NaN and inf values with 0 before cumsum
-        signed_volume = signed_volume.replace([np.inf, -np.inf], 0).fillna(0)
+        signed_volume = np.nan_to_num(signed_volume, nan=0.0, posinf=0.0, neginf=0.0)
 
         # OBV is cumulative sum of signed volume
-        result_df['obv'] = signed_volume.cumsum()
+        return {'obv': np.cumsum(signed_volume, axis=-1)}
+
+    def init_state(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Build streaming state: last OBV and last close.
+
+        Args:
+            df: DataFrame with OBV column calculated
+
+        Returns:
+            State dictionary
+        """
+        return {
+            'obv': float(df['obv'].iloc[-1]),
+            'prev_close': float(df['close'].iloc[-1])
+        }
+
+    def update_incremental(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        state: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Advance OBV by the signed volume of the new rows.
+
+        Args:
+            df: DataFrame with OHLCV data
+            start: Position of the first new row
+            state: Streaming state (advanced in place)
+
+        Returns:
+            Dictionary with 'obv' values for the new rows
+        """
+        close = df['close'].values[start:]
+        volume = np.nan_to_num(df['volume'].values[start:].astype(float), nan=0.0).clip(min=0)
+
+        obv = np.empty(len(close))
+
+        for i in range(len(close)):
+            signed_volume = volume[i] * np.sign(close[i] - state['prev_close'])
+            if np.isfinite(signed_volume):
+                state['obv'] += signed_volume
+            state['prev_close'] = close[i]
+            obv[i] = state['obv']
 
-        return result_df
+        return {'obv': obv}
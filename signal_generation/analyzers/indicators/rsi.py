@@ -7,9 +7,10 @@ RSI measures the magnitude of recent price changes to evaluate overbought/overso
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
 
 
 class RSIIndicator(BaseIndicator):
@@ -44,7 +45,11 @@ class RSIIndicator(BaseIndicator):
     def _get_min_periods(self) -> int:
         return self.period + 1
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def get_store_key(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Same values as kernels.rsi()."""
+        return 'rsi', {'period': self.get_parameter('rsi_period', self.default_period, self.timeframe)}
+
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Calculate RSI using Wilder's smoothing method.
 
@@ -56,58 +61,73 @@ class RSIIndicator(BaseIndicator):
            Avg = (Previous Avg * (N-1) + Current Value) / N
            This is equivalent to EMA with alpha = 1/N
 
-        Optimized version using numpy arrays for fast computation.
+        The smoothing runs in the shared vectorized kernel (kernels.wilder_rma).
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with RSI column added
+            Dictionary with 'rsi' values
         """
-        result_df = df.copy()
 
         # Get period with per-TF support
         period = self.get_parameter('rsi_period', self.default_period, self.timeframe)
         self.period = period  # Update instance period
 
-        # Calculate price changes
-        delta = result_df['close'].diff()
+        # Wilder's smoothing of gains and losses
+        avg_gain, avg_loss = kernels.rsi_averages(data['close'], period)
 
-        # Separate gains and losses
-        gain = delta.where(delta > 0, 0).values
-        loss = (-delta.where(delta < 0, 0)).values
+        return {'rsi': kernels.rsi_from_averages(avg_gain, avg_loss)}
 
-        # Convert to numpy arrays for fast computation
-        n = len(gain)
-
-        # Initialize arrays
-        avg_gain = np.empty(n)
-        avg_loss = np.empty(n)
-        avg_gain[:period] = np.nan
-        avg_loss[:period] = np.nan
+    def init_state(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Build streaming state: Wilder averages of gains/losses at the last row.
 
-        # First average = SMA of first N periods
-        avg_gain[period] = np.mean(gain[1:period+1])
-        avg_loss[period] = np.mean(loss[1:period+1])
+        Args:
+            df: DataFrame with OHLCV data
 
-        # Apply Wilder's smoothing for subsequent values
-        # Wilder's formula: Avg[i] = (Avg[i-1] * (N-1) + Value[i]) / N
-        # This is much faster with numpy arrays than pandas iloc
-        for i in range(period + 1, n):
-            avg_gain[i] = (avg_gain[i-1] * (period - 1) + gain[i]) / period
-            avg_loss[i] = (avg_loss[i-1] * (period - 1) + loss[i]) / period
+        Returns:
+            State dictionary, or None if there is not enough data
+        """
+        period = self.period
+        if len(df) <= period:
+            return None
+
+        avg_gain, avg_loss = kernels.rsi_averages(df['close'].values, period)
+
+        return {
+            'period': period,
+            'avg_gain': float(avg_gain[-1]),
+            'avg_loss': float(avg_loss[-1]),
+            'prev_close': float(df['close'].iloc[-1])
+        }
+
+    def update_incremental(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        state: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Advance Wilder averages by the new rows and emit RSI.
 
-        # Calculate RSI using the alternative formula: RSI = 100 * avg_gain / (avg_gain + avg_loss)
-        # This is mathematically equivalent to: RSI = 100 - (100 / (1 + RS))
-        # But handles edge cases better (when avg_loss = 0)
-        total = avg_gain + avg_loss
+        Args:
+            df: DataFrame with OHLCV data
+            start: Position of the first new row
+            state: Streaming state (advanced in place)
 
-        # Use safe division: when total = 0 (no movement), RSI = 50 (neutral)
-        rsi = 100 * self._safe_divide(avg_gain, total, 0.5)
+        Returns:
+            Dictionary with 'rsi' values for the new rows
+        """
+        alpha = 1.0 / state['period']
+        close_values = df['close'].values[start:].astype(float)
 
-        # Ensure RSI is within valid range [0, 100]
-        rsi = np.clip(rsi, 0, 100)
+        delta = np.diff(close_values, prepend=state['prev_close'])
+        avg_gain = kernels.linear_filter(np.maximum(delta, 0.0), alpha, state['avg_gain'])
+        avg_loss = kernels.linear_filter(np.maximum(-delta, 0.0), alpha, state['avg_loss'])
 
-        result_df['rsi'] = rsi
+        state['avg_gain'] = float(avg_gain[-1])
+        state['avg_loss'] = float(avg_loss[-1])
+        state['prev_close'] = float(close_values[-1])
 
-        return result_df
+        return {'rsi': kernels.rsi_from_averages(avg_gain, avg_loss)}
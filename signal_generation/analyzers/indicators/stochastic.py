@@ -10,6 +10,7 @@ import numpy as np
 from typing import Dict, Any, List
 
 from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators import kernels
 
 
 class StochasticIndicator(BaseIndicator):
@@ -54,17 +55,16 @@ class StochasticIndicator(BaseIndicator):
     def _get_min_periods(self) -> int:
         return self.k_period + self.smooth_k + self.d_period
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_arrays(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Calculate Stochastic %K and %D.
 
         Args:
-            df: DataFrame with OHLCV data
+            data: Dictionary of column -> values (1-D or symbols x candles)
 
         Returns:
-            DataFrame with Stochastic columns added
+            Dictionary of Stochastic column -> values
         """
-        result_df = df.copy()
 
         # Get parameters with per-TF support
         k_period = self.get_parameter('stoch_k', self.default_k_period, self.timeframe)
@@ -77,8 +77,8 @@ class StochasticIndicator(BaseIndicator):
         self.smooth_k = smooth_k
 
         # Calculate lowest low and highest high over k_period
-        low_min = result_df['low'].rolling(window=k_period).min()
-        high_max = result_df['high'].rolling(window=k_period).max()
+        low_min = kernels.rolling_min(data['low'], k_period)
+        high_max = kernels.rolling_max(data['high'], k_period)
 
         # Calculate the range (high - low)
         range_hl = high_max - low_min
@@ -86,18 +86,21 @@ class StochasticIndicator(BaseIndicator):
         # Calculate raw %K with safe division
         # When range is 0 (flat price), use 50 as neutral value
         raw_k = 100 * self._safe_divide(
-            result_df['close'] - low_min,
+            data['close'] - low_min,
             range_hl,
             0.5  # 0.5 * 100 = 50 (neutral value)
         )
 
         # Ensure raw_k is within valid range [0, 100]
-        raw_k = raw_k.clip(0, 100)
+        raw_k = np.clip(raw_k, 0, 100)
 
         # Smooth %K
-        result_df['stoch_k'] = raw_k.rolling(window=smooth_k).mean()
+        stoch_k = kernels.rolling_mean(raw_k, smooth_k)
 
         # Calculate %D (moving average of %K)
-        result_df['stoch_d'] = result_df['stoch_k'].rolling(window=d_period).mean()
+        stoch_d = kernels.rolling_mean(stoch_k, d_period)
 
-        return result_df
+        return {
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d
+        }
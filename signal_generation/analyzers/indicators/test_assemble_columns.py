@@ -0,0 +1,156 @@
+"""
+Parity test for the single-allocation enriched frame (assemble_columns).
+
+IndicatorCalculator.calculate_all builds context.df with one concat of all
+indicator outputs. The frame must equal the one the former pipeline built
+by copying the frame for every indicator and inserting its columns one by
+one (values, column order, dtypes and index), also for frames with integer
+volume, extra columns and indicator columns from an earlier calculation.
+
+Usage:
+    python signal_generation/analyzers/indicators/test_assemble_columns.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.analyzers.indicators.base_indicator import assemble_columns
+from signal_generation.analyzers.indicators.indicator_orchestrator import IndicatorOrchestrator
+from signal_generation.context import AnalysisContext
+from signal_generation.shared.indicator_calculator import IndicatorCalculator
+
+CONFIG = {'indicator_calculator': {'store': {'enabled': False}}}
+
+
+def _make_ohlcv(n: int = 300, seed: int = 42) -> pd.DataFrame:
+    """Random-walk OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_p = close + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        'open': open_p,
+        'high': np.maximum(open_p, close) + rng.random(n),
+        'low': np.minimum(open_p, close) - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 1000,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='1h'))
+
+
+def _frames() -> dict:
+    """Plain, integer volume, NaN closes, extra columns and an already enriched frame."""
+    int_volume = _make_ohlcv(seed=2)
+    int_volume['volume'] = (int_volume['volume'] * 10).astype('int64')
+
+    gaps = _make_ohlcv(seed=3)
+    gaps.iloc[100:104, gaps.columns.get_loc('close')] = np.nan
+
+    extra = _make_ohlcv(120, seed=4)
+    extra.insert(0, 'timestamp', extra.index.asi8 // 10**6)
+    extra['symbol'] = 'ETHUSDT'
+
+    enriched = _make_ohlcv(seed=5)
+    enriched['rsi'] = 50.0
+    enriched['atr'] = np.arange(len(enriched))
+    enriched['note'] = 'stale'
+
+    return {'plain': _make_ohlcv(seed=1), 'int_volume': int_volume, 'gaps': gaps,
+            'extra': extra, 'enriched': enriched}
+
+
+def _per_indicator_copy(df: pd.DataFrame, timeframe: str = '1h') -> pd.DataFrame:
+    """The former calculate_all: copy per indicator, insert its columns, then the compat columns."""
+    orchestrator = IndicatorOrchestrator(CONFIG)
+    orchestrator.set_timeframe(timeframe)
+
+    result = df.copy()
+    for indicators in (orchestrator.trend_indicators, orchestrator.momentum_indicators,
+                       orchestrator.volatility_indicators, orchestrator.volume_indicators,
+                       orchestrator.other_indicators):
+        for indicator in indicators.values():
+            if indicator.is_intermediate or not indicator._validate_input(result):
+                continue
+            outputs = indicator.compute(result)
+            result = result.copy()
+            for col, values in outputs.items():
+                result[col] = values
+
+    if 'stoch_k' in result.columns:
+        result['slowk'] = result['stoch_k']
+    if 'stoch_d' in result.columns:
+        result['slowd'] = result['stoch_d']
+    if 'volume' in result.columns:
+        result['volume_sma'] = result['volume'].rolling(window=20).mean()
+    return result
+
+
+def test_calculate_all_matches_per_indicator_copy():
+    """calculate_all's enriched frame equals the per-indicator-copy frame."""
+    for name, df in _frames().items():
+        original = df.copy()
+        context = AnalysisContext('BTCUSDT', '1h', df)
+        IndicatorCalculator(CONFIG).calculate_all(context)
+
+        expected = _per_indicator_copy(original)
+        # volume_sma: windowed np.mean vs pandas running-sum rolling mean (last-bit differences)
+        pd.testing.assert_frame_equal(context.df, expected, check_exact=False, rtol=1e-12)
+        assert list(context.df.columns) == list(expected.columns), name
+        assert context.df.dtypes.equals(expected.dtypes), name
+        pd.testing.assert_frame_equal(df, original, check_exact=True)   # input not modified
+    print(f"  ✓ {len(_frames())} frames: same values, column order, dtypes and index")
+
+
+def test_assemble_columns():
+    """assemble_columns equals inserting the columns one by one into a copy."""
+    df = _frames()['enriched']
+    columns = {
+        'ema_20': np.linspace(0, 1, len(df)),
+        'rsi': np.full(len(df), 70.0),
+        'obv': np.arange(len(df), dtype='int64'),
+        'adx': pd.Series(np.ones(len(df)), index=df.index).values,
+    }
+
+    expected = df.copy()
+    for col, values in columns.items():
+        expected[col] = np.asarray(values, dtype=float)
+
+    result = assemble_columns(df, columns)
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    assert result is not df and 'ema_20' not in df.columns
+
+    empty = assemble_columns(df, {})
+    pd.testing.assert_frame_equal(empty, df, check_exact=True)
+    assert empty is not df
+    print("  ✓ replaced columns keep their position, new columns are appended")
+
+
+def main():
+    """Run the assemble_columns tests."""
+    logging.disable(logging.CRITICAL)
+
+    tests = [test_calculate_all_matches_per_indicator_copy, test_assemble_columns]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All assemble_columns tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
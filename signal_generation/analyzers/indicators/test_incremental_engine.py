@@ -0,0 +1,192 @@
+"""
+Parity tests for the incremental indicator engine.
+
+Every result of IncrementalIndicatorEngine.calculate_outputs() must match a
+full IndicatorOrchestrator.calculate_outputs(): on the same DataFrame for a
+growing window and a revised forming candle, and on the history since the
+stream anchor (last rows) for a sliding fixed-size window.
+
+Usage:
+    python signal_generation/analyzers/indicators/test_incremental_engine.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.analyzers.indicators.indicator_orchestrator import IndicatorOrchestrator
+from signal_generation.analyzers.indicators.incremental_engine import IncrementalIndicatorEngine
+
+# Relative tolerance (OBV is a running sum of volumes and grows large)
+TOLERANCE = 1e-9
+
+
+def _make_ohlcv(n: int = 800, seed: int = 7) -> pd.DataFrame:
+    """Random-walk OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.3, n),
+        'high': close + rng.random(n),
+        'low': close - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 1000
+    }, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+def _make_engine():
+    """Engine on a fresh orchestrator with the default indicator set."""
+    orchestrator = IndicatorOrchestrator({})
+    return IncrementalIndicatorEngine(orchestrator, {}), orchestrator
+
+
+def _assert_matches_full(engine, orchestrator, df: pd.DataFrame, label: str,
+                         anchored_df: pd.DataFrame = None) -> None:
+    """
+    Engine output equals a full recompute (same columns, NaN layout and values).
+
+    The reference is df itself, or anchored_df (all candles since the stream
+    started, ending with df) cut to the last len(df) rows.
+    """
+    actual = engine.calculate_outputs(df, 'BTCUSDT', '5m')
+    expected = orchestrator.calculate_outputs(df if anchored_df is None else anchored_df)
+    if anchored_df is not None:
+        expected = {col: np.asarray(values, dtype=float)[-len(df):] for col, values in expected.items()}
+
+    assert sorted(actual) == sorted(expected), f"{label}: columns differ"
+    for col, values in expected.items():
+        values = np.asarray(values, dtype=float)
+        streamed = np.asarray(actual[col], dtype=float)
+        assert streamed.shape == values.shape, f"{label}: {col} shape {streamed.shape} != {values.shape}"
+        assert np.array_equal(np.isnan(streamed), np.isnan(values)), f"{label}: {col} NaN layout differs"
+
+        valid = ~np.isnan(values)
+        error = np.abs(streamed[valid] - values[valid]) / np.maximum(1.0, np.abs(values[valid]))
+        assert not valid.any() or error.max() < TOLERANCE, f"{label}: {col} relative error {error.max():.2e}"
+
+
+def test_growing_window():
+    """Appending candles to a window with a fixed start streams only the new rows."""
+    df = _make_ohlcv()
+    engine, orchestrator = _make_engine()
+
+    for end in (300, 301, 302, 310, 350, 351):
+        _assert_matches_full(engine, orchestrator, df.iloc[:end], f"growing[:{end}]")
+
+    stats = engine.get_stats()
+    assert stats['full_recomputes'] == 1, stats
+    assert stats['incremental_updates'] == 5 and stats['rows_streamed'] == 51, stats
+    print(f"  ✓ 6 windows, {stats['rows_streamed']} rows streamed, 1 full recompute")
+
+
+def test_sliding_window():
+    """A fixed 500-candle window (live ohlcv_limit) streams each slide, anchored at the first window."""
+    df = _make_ohlcv()
+    engine, orchestrator = _make_engine()
+
+    starts = (0, 1, 2, 3, 10, 11, 150)
+    for start in starts:
+        _assert_matches_full(engine, orchestrator, df.iloc[start:start + 500], f"sliding[{start}:+500]",
+                             anchored_df=df.iloc[:start + 500])
+
+    stats = engine.get_stats()
+    assert stats['full_recomputes'] == 1, stats
+    assert stats['incremental_updates'] == len(starts) - 1 and stats['rows_dropped'] == 150, stats
+    assert stats['rows_streamed'] == 150, stats
+
+    # Forming candle revised right after a slide
+    window = df.iloc[151:651].copy()
+    window.iloc[-1, window.columns.get_loc('close')] += 0.5
+    window.iloc[-1, window.columns.get_loc('high')] = max(window['high'].iloc[-1], window['close'].iloc[-1])
+    anchored = pd.concat([df.iloc[:650], window.iloc[-1:]])
+    _assert_matches_full(engine, orchestrator, window, "slide + revision", anchored_df=anchored)
+    revised = window.copy()
+    revised.iloc[-1, revised.columns.get_loc('volume')] += 100.0
+    anchored.iloc[-1, anchored.columns.get_loc('volume')] += 100.0
+    _assert_matches_full(engine, orchestrator, revised, "revision", anchored_df=anchored)
+
+    # A changed candle inside the overlap still falls back
+    rewritten = df.iloc[152:652].copy()
+    rewritten.iloc[10, rewritten.columns.get_loc('close')] += 1.0
+    _assert_matches_full(engine, orchestrator, rewritten, "rewrite after slide")
+
+    stats = engine.get_stats()
+    assert stats['full_recomputes'] == 2 and stats['fallback_reasons'].get('history_rewrite') == 1, stats
+    print(f"  ✓ {stats['incremental_updates']} slides/revisions streamed, "
+          f"{stats['rows_dropped']} rows dropped, 1 full recompute before the rewrite")
+
+
+def test_revised_forming_candle():
+    """The last candle changing in place (live data) restarts from the state before it."""
+    df = _make_ohlcv()
+    engine, orchestrator = _make_engine()
+
+    window = df.iloc[:400].copy()
+    _assert_matches_full(engine, orchestrator, window, "initial")
+
+    for step, (price, volume) in enumerate([(1.5, 200.0), (-2.0, 900.0), (0.25, 950.0)]):
+        window.iloc[-1, window.columns.get_loc('close')] = window['close'].iloc[-2] + price
+        window.iloc[-1, window.columns.get_loc('high')] = max(window['high'].iloc[-1], window['close'].iloc[-1])
+        window.iloc[-1, window.columns.get_loc('low')] = min(window['low'].iloc[-1], window['close'].iloc[-1])
+        window.iloc[-1, window.columns.get_loc('volume')] = volume
+        _assert_matches_full(engine, orchestrator, window, f"revision {step + 1}")
+
+    # Same data again, then the forming candle closes and the next one starts
+    _assert_matches_full(engine, orchestrator, window, "unchanged")
+    window = pd.concat([window, df.iloc[400:401]])
+    _assert_matches_full(engine, orchestrator, window, "next candle")
+
+    stats = engine.get_stats()
+    assert stats['full_recomputes'] == 1 and stats['unchanged'] == 1, stats
+    print(f"  ✓ 3 revisions + next candle, {stats['incremental_updates']} incremental updates")
+
+
+def test_history_rewrite_falls_back():
+    """A changed older candle or a gap forces a full recompute."""
+    df = _make_ohlcv()
+    engine, orchestrator = _make_engine()
+    _assert_matches_full(engine, orchestrator, df.iloc[:300], "initial")
+
+    rewritten = df.iloc[:301].copy()
+    rewritten.iloc[100, rewritten.columns.get_loc('close')] += 1.0
+    _assert_matches_full(engine, orchestrator, rewritten, "history rewrite")
+
+    gapped = pd.concat([rewritten, df.iloc[305:306]])
+    _assert_matches_full(engine, orchestrator, gapped, "gap")
+
+    reasons = engine.get_stats()['fallback_reasons']
+    assert reasons.get('history_rewrite') == 1 and reasons.get('gap') == 1, reasons
+    print(f"  ✓ fallbacks {reasons}")
+
+
+def main():
+    """Run the parity tests."""
+    tests = [
+        test_growing_window,
+        test_sliding_window,
+        test_revised_forming_candle,
+        test_history_rewrite_falls_back,
+    ]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All incremental engine parity tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
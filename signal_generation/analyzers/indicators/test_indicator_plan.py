@@ -0,0 +1,223 @@
+"""
+Tests for the indicator DAG plan (IndicatorOrchestrator.resolve_indicators /
+_drop_intermediates) and the plan SignalOrchestrator configures from the
+enabled analyzers.
+
+Checks that disabling analyzers removes the indicators only they read,
+that the shared True Range is computed once and not returned, and that
+plans are in topological order (cycles are rejected).
+
+Usage:
+    python signal_generation/analyzers/indicators/test_indicator_plan.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+import logging
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.analyzers.indicators import kernels
+from signal_generation.analyzers.indicators.atr import ATRIndicator
+from signal_generation.analyzers.indicators.base_indicator import BaseIndicator
+from signal_generation.analyzers.indicators.indicator_orchestrator import IndicatorOrchestrator
+from signal_generation.context import AnalysisContext
+from signal_generation.orchestrator import SignalOrchestrator
+from signal_generation.shared.indicator_calculator import IndicatorCalculator
+
+OHLCV = ['open', 'high', 'low', 'close', 'volume']
+
+
+def _make_ohlcv(n: int = 300, seed: int = 42) -> pd.DataFrame:
+    """Random-walk OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_p = close + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        'open': open_p,
+        'high': np.maximum(open_p, close) + rng.random(n),
+        'low': np.minimum(open_p, close) - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 1000,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='1h'))
+
+
+def _make_orchestrator(enabled_analyzers: List[str], regime: bool = False) -> SignalOrchestrator:
+    config = {
+        'orchestrator': {'enabled_analyzers': enabled_analyzers, 'analyzer_workers': 1,
+                         'send_to_trade_manager': False},
+        'systems': {'regime_detector': {'market_regime': {'enabled': regime}}},
+    }
+    return SignalOrchestrator(
+        config,
+        market_data_fetcher=None,
+        indicator_calculator=IndicatorCalculator(config),
+        skip_validation=True
+    )
+
+
+def _assert_topological(orchestrator: IndicatorOrchestrator, plan: List[str]) -> None:
+    """Every indicator comes after the producers of its input columns."""
+    position = {name: i for i, name in enumerate(plan)}
+    for name in plan:
+        for col in orchestrator.all_indicators[name].input_columns:
+            producers = [p for p in plan if col in orchestrator.all_indicators[p].output_columns]
+            assert producers, f"{name} reads {col}, which no planned indicator produces"
+            assert all(position[p] < position[name] for p in producers), f"{name} planned before {producers}"
+
+
+def test_disabled_analyzers():
+    """Only the indicators of enabled consumers are planned and calculated."""
+    cases = [
+        (['trend', 'support_resistance'], False, ['EMA', 'TrueRange', 'ATR']),
+        (['trend', 'momentum'], False, ['EMA', 'RSI', 'MACD', 'Stochastic', 'TrueRange', 'ATR']),
+        (['volume'], False, ['TrueRange', 'ATR', 'OBV']),
+        (['volume'], True, ['TrueRange', 'ADX', 'RSI', 'ATR', 'Bollinger Bands', 'OBV']),
+    ]
+    for enabled, regime, expected in cases:
+        orchestrator = _make_orchestrator(enabled, regime)
+        try:
+            calculator = orchestrator.indicator_calculator
+            plan = calculator.orchestrator.get_plan()
+            assert plan == expected, (enabled, regime, plan)
+
+            context = AnalysisContext('BTCUSDT', '1h', _make_ohlcv())
+            calculator.calculate_all(context)
+            produced = {
+                col for name in plan for col in calculator.orchestrator.all_indicators[name].output_columns
+            } - {'true_range'}
+            extra = set(context.df.columns) - set(OHLCV) - produced - {'slowk', 'slowd', 'volume_sma'}
+            assert not extra and produced <= set(context.df.columns), (enabled, extra)
+            assert ('volume_sma' in context.df.columns) == ('volume' in enabled or regime), enabled
+        finally:
+            orchestrator.shutdown()
+    print(f"  ✓ {len(cases)} analyzer sets give the expected plans and columns")
+
+
+def test_true_range_once():
+    """ATR and ADX share one True Range computation; true_range is not an output."""
+    calls = []
+    true_range = kernels.true_range
+
+    def counting_true_range(*args, **kwargs):
+        calls.append(args[0].shape)
+        return true_range(*args, **kwargs)
+
+    # New candles for every call: indicators cache their last result
+    orchestrator = IndicatorOrchestrator({})
+    kernels.true_range = counting_true_range
+    try:
+        outputs = orchestrator.calculate_outputs(_make_ohlcv(seed=1))
+        assert len(calls) == 1, f"true range computed {len(calls)} times"
+        assert 'true_range' not in outputs and {'atr', 'adx'} <= set(outputs), list(outputs)
+
+        # Asked for explicitly (by name or as a required column) it is kept
+        calls.clear()
+        outputs = orchestrator.calculate_outputs(_make_ohlcv(seed=2), ['TrueRange', 'ATR'])
+        assert len(calls) == 1 and list(outputs) == ['true_range', 'atr'], (calls, list(outputs))
+
+        orchestrator.set_required_columns(['adx', 'true_range'])
+        calls.clear()
+        outputs = orchestrator.calculate_outputs(_make_ohlcv(seed=3))
+        assert len(calls) == 1 and 'true_range' in outputs and 'atr' not in outputs, (calls, list(outputs))
+    finally:
+        kernels.true_range = true_range
+
+    # Same values as ATR computing its own true range
+    df = _make_ohlcv(seed=4)
+    expected = ATRIndicator({}).compute(df)['atr']
+    orchestrator.set_required_columns(['atr'])
+    assert orchestrator.get_plan() == ['TrueRange', 'ATR']
+    np.testing.assert_array_equal(orchestrator.calculate_outputs(df)['atr'], expected)
+    print("  ✓ one true range for ATR + ADX, dropped unless requested")
+
+
+def _fake_indicator(name: str, indicator_type: str, outputs: List[str], inputs: List[str]):
+    """Indicator class producing outputs (= close) that declares inputs."""
+
+    class FakeIndicator(BaseIndicator):
+        def _get_indicator_name(self):
+            return name
+
+        def _get_indicator_type(self):
+            return indicator_type
+
+        def _get_required_columns(self):
+            return ['close']
+
+        def _get_output_columns(self):
+            return outputs
+
+        def _get_input_columns(self):
+            return inputs
+
+        def compute_arrays(self, data):
+            missing = [col for col in inputs if col not in data]
+            assert not missing, f"{name} computed before {missing}"
+            return {col: data['close'] + 1 for col in outputs}
+
+    return FakeIndicator
+
+
+def test_topological_order():
+    """Plans follow input edges across type order; cycles raise ValueError."""
+    orchestrator = IndicatorOrchestrator({})
+    full_plan = orchestrator.resolve_indicators()
+    _assert_topological(orchestrator, full_plan)
+    assert 'TrueRange' in full_plan
+
+    # A trend indicator reading a volume indicator's output (volume comes later in type order)
+    orchestrator.register_indicator(_fake_indicator('Late', 'trend', ['late'], ['feed']))
+    orchestrator.register_indicator(_fake_indicator('Feed', 'volume', ['feed'], ['atr']))
+    plan = orchestrator.resolve_indicators(['late'])
+    assert plan == ['TrueRange', 'ATR', 'Feed', 'Late'], plan
+    _assert_topological(orchestrator, orchestrator.resolve_indicators())
+
+    outputs = orchestrator.calculate_outputs(_make_ohlcv(), ['Late'])
+    assert list(outputs) == ['atr', 'feed', 'late'], list(outputs)
+    assert orchestrator.stats['errors'] == 0
+
+    # Unknown columns are ignored
+    assert orchestrator.resolve_indicators(['no_such_column']) == []
+
+    cyclic = IndicatorOrchestrator({})
+    cyclic.register_indicator(_fake_indicator('A', 'other', ['a'], ['b']))
+    cyclic.register_indicator(_fake_indicator('B', 'other', ['b'], ['a']))
+    try:
+        cyclic.resolve_indicators(['a'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("dependency cycle not detected")
+    print(f"  ✓ {len(full_plan)} indicators in topological order, cycle rejected")
+
+
+def main():
+    """Run the indicator plan tests."""
+    logging.disable(logging.CRITICAL)
+
+    tests = [test_disabled_analyzers, test_true_range_once, test_topological_order]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All indicator plan tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,203 @@
+"""
+Parity tests and micro-benchmark for the recursive filter kernels.
+
+Checks kernels.py (and the indicators built on it) against TA-Lib and the
+previous pandas implementations, then times the kernels against a plain
+Python loop.
+
+Usage:
+    python signal_generation/analyzers/indicators/test_kernels.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+import time
+
+import numpy as np
+import pandas as pd
+import talib
+
+from signal_generation.analyzers.indicators import kernels
+from signal_generation.analyzers.indicators import (
+    EMAIndicator,
+    RSIIndicator,
+    MACDIndicator,
+    ATRIndicator,
+)
+from signal_generation.analyzers.indicators.adx import ADXIndicator
+
+TOLERANCE = 1e-8
+
+
+def _make_ohlcv(n: int = 2000, seed: int = 42) -> pd.DataFrame:
+    """Random-walk OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.3, n),
+        'high': close + rng.random(n),
+        'low': close - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 1000
+    }, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+def _assert_parity(actual: np.ndarray, expected: np.ndarray, name: str) -> None:
+    """Same NaN layout and values within TOLERANCE."""
+    actual = np.asarray(actual, dtype=float)
+    expected = np.asarray(expected, dtype=float)
+
+    assert actual.shape == expected.shape, f"{name}: shape {actual.shape} != {expected.shape}"
+    assert np.array_equal(np.isnan(actual), np.isnan(expected)), f"{name}: NaN layout differs"
+
+    valid = ~np.isnan(expected)
+    error = np.max(np.abs(actual[valid] - expected[valid])) if valid.any() else 0.0
+    assert error < TOLERANCE, f"{name}: max error {error}"
+    print(f"  ✓ {name:<22} max error {error:.2e}")
+
+
+def test_kernels_match_talib():
+    """EMA / DEMA / TEMA / RSI / ATR / ADX kernels vs TA-Lib."""
+    df = _make_ohlcv()
+    high, low, close = df['high'].values, df['low'].values, df['close'].values
+
+    for period in (5, 14, 50):
+        _assert_parity(kernels.ema(close, period), talib.EMA(close, timeperiod=period), f"EMA({period})")
+        _assert_parity(kernels.dema(close, period), talib.DEMA(close, timeperiod=period), f"DEMA({period})")
+        _assert_parity(kernels.tema(close, period), talib.TEMA(close, timeperiod=period), f"TEMA({period})")
+        _assert_parity(kernels.rsi(close, period), talib.RSI(close, timeperiod=period), f"RSI({period})")
+        _assert_parity(kernels.atr(high, low, close, period), talib.ATR(high, low, close, timeperiod=period), f"ATR({period})")
+
+        dm = kernels.directional_movement(high, low, close, period)
+        _assert_parity(dm['adx'], talib.ADX(high, low, close, timeperiod=period), f"ADX({period})")
+        _assert_parity(dm['plus_di'], talib.PLUS_DI(high, low, close, timeperiod=period), f"PLUS_DI({period})")
+        _assert_parity(dm['minus_di'], talib.MINUS_DI(high, low, close, timeperiod=period), f"MINUS_DI({period})")
+
+
+def test_kernels_short_and_flat_input():
+    """Too-short input gives all NaN; flat prices keep TA-Lib's ADX behaviour."""
+    close = np.linspace(100, 101, 10)
+    assert np.isnan(kernels.ema(close, 20)).all()
+    assert np.isnan(kernels.directional_movement(close, close, close, 14)['adx']).all()
+
+    df = _make_ohlcv(300)
+    high, low, close = df['high'].values.copy(), df['low'].values.copy(), df['close'].values.copy()
+    high[150:200] = low[150:200] = close[150:200] = close[149]
+    dm = kernels.directional_movement(high, low, close, 14)
+    _assert_parity(dm['adx'], talib.ADX(high, low, close, timeperiod=14), "ADX(14) flat segment")
+
+
+def test_ewm_matches_pandas():
+    """ewm() kernel vs pandas ewm(adjust=False), used by MACD and ATR."""
+    close = _make_ohlcv()['close']
+    for alpha in (2.0 / 13, 2.0 / 27, 1.0 / 14):
+        _assert_parity(
+            kernels.ewm(close.values, alpha),
+            close.ewm(alpha=alpha, adjust=False).mean().values,
+            f"EWM(alpha={alpha:.3f})"
+        )
+
+
+def test_indicators_use_kernels():
+    """Indicator outputs vs TA-Lib / previous pandas formulas."""
+    df = _make_ohlcv()
+    high, low, close = df['high'].values, df['low'].values, df['close'].values
+
+    ema = EMAIndicator().compute(df)
+    _assert_parity(ema['ema_20'], talib.EMA(close, timeperiod=20), "EMAIndicator")
+
+    rsi = RSIIndicator().compute(df)
+    _assert_parity(rsi['rsi'], talib.RSI(close, timeperiod=14), "RSIIndicator")
+
+    adx = ADXIndicator().compute(df)
+    _assert_parity(adx['adx'], talib.ADX(high, low, close, timeperiod=14), "ADXIndicator")
+
+    macd = MACDIndicator().compute(df)
+    expected_macd = (
+        df['close'].ewm(span=12, adjust=False).mean() - df['close'].ewm(span=26, adjust=False).mean()
+    )
+    _assert_parity(macd['macd'], expected_macd.values, "MACDIndicator")
+
+    true_range = pd.concat([
+        df['high'] - df['low'],
+        abs(df['high'] - df['close'].shift(1)),
+        abs(df['low'] - df['close'].shift(1))
+    ], axis=1).max(axis=1)
+    atr = ATRIndicator().compute(df)
+    _assert_parity(atr['atr'], true_range.ewm(alpha=1 / 14, adjust=False).mean().values, "ATRIndicator")
+
+
+def _python_ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Reference per-element loop (the previous EMAIndicator implementation)."""
+    result = np.empty(len(values))
+    result[:period - 1] = np.nan
+    result[period - 1] = np.mean(values[:period])
+    alpha = 2.0 / (period + 1)
+    for i in range(period, len(values)):
+        result[i] = alpha * values[i] + (1 - alpha) * result[i - 1]
+    return result
+
+
+def _time(func, repeat: int = 20) -> float:
+    """Best wall time of `repeat` runs, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark():
+    """Micro-benchmark: kernel vs Python loop vs TA-Lib."""
+    print("\n⏱  Micro-benchmark (best of 20, ms)")
+    for n in (1000, 10000, 100000):
+        df = _make_ohlcv(n)
+        high, low, close = df['high'].values, df['low'].values, df['close'].values
+
+        loop_ms = _time(lambda: _python_ema(close, 20), repeat=3)
+        kernel_ms = _time(lambda: kernels.ema(close, 20))
+        talib_ms = _time(lambda: talib.EMA(close, timeperiod=20))
+        adx_ms = _time(lambda: kernels.directional_movement(high, low, close, 14))
+        talib_adx_ms = _time(lambda: (
+            talib.ADX(high, low, close, timeperiod=14),
+            talib.PLUS_DI(high, low, close, timeperiod=14),
+            talib.MINUS_DI(high, low, close, timeperiod=14)
+        ))
+
+        print(f"  n={n:>6}: EMA loop {loop_ms:8.2f} | kernel {kernel_ms:6.3f} | talib {talib_ms:6.3f}"
+              f" || ADX+DI kernel {adx_ms:6.3f} | talib {talib_adx_ms:6.3f}")
+
+
+def main():
+    """Run parity tests and the benchmark."""
+    tests = [
+        test_kernels_match_talib,
+        test_kernels_short_and_flat_input,
+        test_ewm_matches_pandas,
+        test_indicators_use_kernels,
+    ]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    benchmark()
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All kernel parity tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
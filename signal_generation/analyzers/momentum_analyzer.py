@@ -63,6 +63,12 @@ class MomentumAnalyzer(BaseAnalyzer):
     5. Context-aware scoring (considers trend)
     """
     
+    # Indicator columns read from context.df
+    REQUIRED_INDICATORS = ['rsi', 'macd', 'macd_signal', 'macd_hist', 'slowk', 'slowd']
+    
+    # Analyzer results read from the context
+    REQUIRED_RESULTS = ['trend']
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize MomentumAnalyzer.
@@ -75,6 +75,9 @@ class PatternAnalyzer(BaseAnalyzer):
     5. Confidence calculation
     """
 
+    # Analyzer results read from the context
+    REQUIRED_RESULTS = ['trend', 'momentum', 'volume']
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize PatternAnalyzer.
@@ -219,7 +222,8 @@ class PatternAnalyzer(BaseAnalyzer):
             all_patterns = self.orchestrator.detect_all_patterns(
                 df=df,
                 timeframe=context.timeframe,
-                context=analysis_context
+                context=analysis_context,
+                swings=context.get_swing_index()
             )
 
             # 7. Separate candlestick and chart patterns
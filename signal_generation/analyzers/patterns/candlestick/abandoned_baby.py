@@ -18,7 +18,6 @@ Version: 1.0.0 (2025-11-18) - Initial Manual Implementation
 
 ABANDONED_BABY_PATTERN_VERSION = "2.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -65,6 +64,8 @@ class AbandonedBabyPattern(BasePattern):
     - Best results in 4h+ timeframes and futures
     """
 
+    TALIB_FUNCTION = 'CDLABANDONEDBABY'
+
     def __init__(self, config: Dict[str, Any] = None):
         """
         Initialize Abandoned Baby detector.
@@ -95,6 +96,9 @@ class AbandonedBabyPattern(BasePattern):
     def _get_base_strength(self) -> int:
         return 3  # Very strong pattern
 
+    def _get_talib_params(self) -> Dict[str, Any]:
+        return {'penetration': self.penetration}
+
     def detect(
         self,
         df: pd.DataFrame,
@@ -139,13 +143,7 @@ class AbandonedBabyPattern(BasePattern):
         try:
             # Use TA-Lib to detect Abandoned Baby
             # penetration: default 0.3 (can be adjusted for crypto)
-            result = talib.CDLABANDONEDBABY(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values,
-                penetration=self.penetration
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
@@ -186,13 +184,7 @@ class AbandonedBabyPattern(BasePattern):
         """
         try:
             # Get TA-Lib result
-            result = talib.CDLABANDONEDBABY(
-                df['open'].values,
-                df['high'].values,
-                df['low'].values,
-                df['close'].values,
-                penetration=self.penetration
-            )
+            result = self._talib_result(df)
 
             if len(result) == 0:
                 return 'bullish'
@@ -251,13 +243,7 @@ class AbandonedBabyPattern(BasePattern):
             candle3 = df.iloc[idx3]
 
             # Determine variant (bullish or bearish)
-            result = talib.CDLABANDONEDBABY(
-                df['open'].values,
-                df['high'].values,
-                df['low'].values,
-                df['close'].values,
-                penetration=self.penetration
-            )
+            result = self._talib_result(df)
 
             variant = 'bullish' if result[idx3] > 0 else 'bearish'
 
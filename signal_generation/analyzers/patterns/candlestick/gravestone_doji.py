@@ -12,7 +12,6 @@ Version: 1.0.0 (2025-10-26) - Initial Implementation
 
 GRAVESTONE_DOJI_PATTERN_VERSION = "1.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -35,6 +34,8 @@ class GravestoneDojiPattern(BasePattern):
     Direction: Bearish
     """
 
+    TALIB_FUNCTION = 'CDLGRAVESTONEDOJI'
+
     def _get_pattern_name(self) -> str:
         return "Gravestone Doji"
 
@@ -78,12 +79,7 @@ class GravestoneDojiPattern(BasePattern):
             return False
 
         try:
-            result = talib.CDLGRAVESTONEDOJI(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
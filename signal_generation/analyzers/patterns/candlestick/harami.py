@@ -15,7 +15,6 @@ Version: 3.0.0 (2025-10-25) - Recency Scoring Implementation
 
 HARAMI_PATTERN_VERSION = "3.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -36,6 +35,8 @@ class HaramiPattern(BasePattern):
     Strength: 2/3 (Medium)
     """
 
+    TALIB_FUNCTION = 'CDLHARAMI'
+
     def _get_pattern_name(self) -> str:
         return "Harami"
 
@@ -79,12 +80,7 @@ class HaramiPattern(BasePattern):
             return False
 
         try:
-            result = talib.CDLHARAMI(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # NEW v3.0.0: Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
@@ -107,12 +103,7 @@ class HaramiPattern(BasePattern):
     ) -> str:
         """Determine actual direction (bullish or bearish)."""
         try:
-            result = talib.CDLHARAMI(
-                df['open'].values,
-                df['high'].values,
-                df['low'].values,
-                df['close'].values
-            )
+            result = self._talib_result(df)
 
             # Positive = bullish, negative = bearish
             return 'bullish' if result[-1] > 0 else 'bearish'
@@ -15,7 +15,6 @@ Version: 3.0.0 (2025-10-25) - Recency Scoring Implementation
 
 HARAMI_CROSS_PATTERN_VERSION = "3.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -37,6 +36,8 @@ class HaramiCrossPattern(BasePattern):
     Strength: 2/3 (Medium)
     """
 
+    TALIB_FUNCTION = 'CDLHARAMICROSS'
+
     def _get_pattern_name(self) -> str:
         return "Harami Cross"
 
@@ -80,12 +81,7 @@ class HaramiCrossPattern(BasePattern):
             return False
 
         try:
-            result = talib.CDLHARAMICROSS(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # NEW v3.0.0: Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
@@ -108,12 +104,7 @@ class HaramiCrossPattern(BasePattern):
     ) -> str:
         """Determine actual direction (bullish or bearish)."""
         try:
-            result = talib.CDLHARAMICROSS(
-                df['open'].values,
-                df['high'].values,
-                df['low'].values,
-                df['close'].values
-            )
+            result = self._talib_result(df)
 
             # Positive = bullish, negative = bearish
             return 'bullish' if result[-1] > 0 else 'bearish'
@@ -22,7 +22,6 @@ Version: 1.0.0 (2025-10-26) - Initial Implementation
 
 MAT_HOLD_PATTERN_VERSION = "1.1.1"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -54,6 +53,8 @@ class MatHoldPattern(BasePattern):
                    Default: 0.3 (30% penetration)
     """
 
+    TALIB_FUNCTION = 'CDLMATHOLD'
+
     def __init__(self, config: Dict[str, Any] = None, penetration: float = None):
         """
         Initialize Mat Hold pattern detector.
@@ -90,6 +91,9 @@ class MatHoldPattern(BasePattern):
     def _get_base_strength(self) -> int:
         return 3  # Strong pattern - confirms uptrend
 
+    def _get_talib_params(self) -> Dict[str, Any]:
+        return {'penetration': self.penetration}
+
     def detect(
         self,
         df: pd.DataFrame,
@@ -121,13 +125,7 @@ class MatHoldPattern(BasePattern):
             return False
 
         try:
-            result = talib.CDLMATHOLD(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values,
-                penetration=self.penetration
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
@@ -15,7 +15,6 @@ Version: 3.0.0 (2025-10-25) - Recency Scoring Implementation
 
 MORNING_DOJI_STAR_PATTERN_VERSION = "3.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -36,6 +35,8 @@ class MorningDojiStarPattern(BasePattern):
     Strength: 2/3 (Medium)
     """
 
+    TALIB_FUNCTION = 'CDLMORNINGDOJISTAR'
+
     def _get_pattern_name(self) -> str:
         return "Morning Doji Star"
 
@@ -79,12 +80,7 @@ class MorningDojiStarPattern(BasePattern):
             return False
 
         try:
-            result = talib.CDLMORNINGDOJISTAR(
-                df[open_col].values,
-                df[high_col].values,
-                df[low_col].values,
-                df[close_col].values
-            )
+            result = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # NEW v3.0.0: Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(result))
@@ -42,7 +42,6 @@ Quality Score:
 
 SHOOTING_STAR_PATTERN_VERSION = "4.0.0"
 
-import talib
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -80,6 +79,8 @@ class ShootingStarPattern(BasePattern):
     They are still used in quality_metrics calculation.
     """
 
+    TALIB_FUNCTION = 'CDLSHOOTINGSTAR'
+
     def __init__(
         self,
         config: Dict[str, Any] = None,
@@ -183,18 +184,9 @@ class ShootingStarPattern(BasePattern):
             return False
 
         try:
-            # Prepare data for TA-Lib
-            # Use last 100 candles for performance (minimum 12, but more is fine)
-            df_tail = df.tail(100)
-
             # Call TA-Lib CDLSHOOTINGSTAR
             # TA-Lib uses previous candles for context in its algorithm
-            pattern = talib.CDLSHOOTINGSTAR(
-                df_tail[open_col].values,
-                df_tail[high_col].values,
-                df_tail[low_col].values,
-                df_tail[close_col].values
-            )
+            pattern = self._talib_result(df, open_col, high_col, low_col, close_col)
 
             # NEW v3.0.0: Check last N candles (lookback_window)
             lookback = min(self.lookback_window, len(pattern))
@@ -8,7 +8,6 @@ These are reversal patterns formed by two peaks or troughs at similar levels.
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional
-from scipy.signal import find_peaks
 
 from signal_generation.analyzers.patterns.base_pattern import BasePattern
 
@@ -72,12 +71,12 @@ class DoubleTopBottomPattern(BasePattern):
             lows = df[low_col].values
 
             # Try to detect Double Top
-            if self._detect_double_top(highs):
+            if self._detect_double_top(df, highs, high_col, low_col):
                 self._detected_type = 'top'
                 return True
 
             # Try to detect Double Bottom
-            if self._detect_double_bottom(lows):
+            if self._detect_double_bottom(df, lows, high_col, low_col):
                 self._detected_type = 'bottom'
                 return True
 
@@ -86,15 +85,17 @@ class DoubleTopBottomPattern(BasePattern):
         except Exception as e:
             return False
 
-    def _detect_double_top(self, highs: np.ndarray) -> bool:
+    def _detect_double_top(
+        self,
+        df: pd.DataFrame,
+        highs: np.ndarray,
+        high_col: str = 'high',
+        low_col: str = 'low'
+    ) -> bool:
         """Detect double top pattern."""
         try:
             # Find peaks
-            peaks, properties = find_peaks(
-                highs,
-                distance=self.min_distance,
-                prominence=np.std(highs) * 0.5
-            )
+            peaks = self._swing_peaks(df, 'high', self.min_distance, high_col=high_col, low_col=low_col)
 
             if len(peaks) < 2:
                 return False
@@ -113,15 +114,17 @@ class DoubleTopBottomPattern(BasePattern):
         except Exception:
             return False
 
-    def _detect_double_bottom(self, lows: np.ndarray) -> bool:
+    def _detect_double_bottom(
+        self,
+        df: pd.DataFrame,
+        lows: np.ndarray,
+        high_col: str = 'high',
+        low_col: str = 'low'
+    ) -> bool:
         """Detect double bottom pattern."""
         try:
             # Find troughs (peaks of inverted signal)
-            troughs, properties = find_peaks(
-                -lows,
-                distance=self.min_distance,
-                prominence=np.std(lows) * 0.5
-            )
+            troughs = self._swing_peaks(df, 'low', self.min_distance, high_col=high_col, low_col=low_col)
 
             if len(troughs) < 2:
                 return False
@@ -164,11 +167,7 @@ class DoubleTopBottomPattern(BasePattern):
         """Get details for double top pattern."""
         try:
             highs = df['high'].values
-            peaks, _ = find_peaks(
-                highs,
-                distance=self.min_distance,
-                prominence=np.std(highs) * 0.5
-            )
+            peaks = self._swing_peaks(df, 'high', self.min_distance)
 
             if len(peaks) >= 2:
                 last_two = peaks[-2:]
@@ -205,11 +204,7 @@ class DoubleTopBottomPattern(BasePattern):
         """Get details for double bottom pattern."""
         try:
             lows = df['low'].values
-            troughs, _ = find_peaks(
-                -lows,
-                distance=self.min_distance,
-                prominence=np.std(lows) * 0.5
-            )
+            troughs = self._swing_peaks(df, 'low', self.min_distance)
 
             if len(troughs) >= 2:
                 last_two = troughs[-2:]
@@ -0,0 +1,222 @@
+"""
+Parity test for the shared TA-Lib candlestick scan (CandlestickScan).
+
+Every TA-Lib candlestick detector must give the same detect() result,
+_last_detection_candles_ago and pattern info when it reads the shared scan
+(or scans df alone through BasePattern._talib_result) as with its own
+talib.CDL* call on the full DataFrame. Covered: the penetration-tuned
+functions (CDLMATHOLD, CDLABANDONEDBABY), detectors whose lookback_window
+exceeds the shared scan's recent candles or the scan window, and the
+PatternOrchestrator skip of detectors without a recent detection.
+
+Usage:
+    python signal_generation/analyzers/patterns/test_candlestick_scan.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+import logging
+
+import numpy as np
+import pandas as pd
+import talib
+import talib.abstract
+
+from signal_generation.analyzers.patterns import candlestick
+from signal_generation.analyzers.patterns.candlestick_scan import CandlestickScan
+from signal_generation.analyzers.patterns.pattern_orchestrator import PatternOrchestrator
+
+LENGTHS = (20, 60, 150, 500)
+SEEDS = range(6)
+
+
+# Textbook multi-candle patterns as (open, high, low, close) offsets from the last close
+PLANTED = {
+    'abandoned_baby': [(0, 0.1, -3.1, -3), (-4, -3.9, -4.1, -4), (-3, -0.9, -3.1, -1)],
+    'mat_hold': [(0, 3.05, -0.05, 3), (3.5, 3.6, 3.25, 3.3), (3.1, 3.15, 2.85, 2.9),
+                 (2.8, 2.85, 2.55, 2.6), (2.8, 5.05, 2.75, 5)],
+    'kicking': [(0, 0, -3, -3), (0.5, 3.5, 0.5, 3.5)],
+    'morning_star': [(0, 0.1, -3.1, -3), (-3.5, -3.3, -3.8, -3.6), (-3.2, -0.9, -3.3, -1)],
+    'three_white_soldiers': [(0, 1.6, -0.05, 1.5), (1.0, 3.05, 0.95, 3.0), (2.5, 4.55, 2.45, 4.5)],
+}
+
+
+def _make_candles(n: int, seed: int) -> pd.DataFrame:
+    """Small random candles with planted multi-candle patterns, so that rare patterns occur."""
+    rng = np.random.default_rng(seed)
+    names = list(PLANTED)
+    rows = []
+    price = 100.0
+    since_planted = 0
+    while len(rows) < n:
+        if since_planted > 12 and rng.random() < 0.08:
+            for open_p, high, low, close in PLANTED[names[rng.integers(len(names))]]:
+                rows.append((price + open_p, price + high, price + low, price + close))
+            price = rows[-1][3]
+            since_planted = 0
+            continue
+        open_p = price + rng.normal(0, 0.1)
+        close = open_p + rng.normal(0, 0.3)
+        rows.append((open_p, max(open_p, close) + rng.exponential(0.3),
+                     min(open_p, close) - rng.exponential(0.3), close))
+        price = close
+        since_planted += 1
+
+    df = pd.DataFrame(rows[:n], columns=['open', 'high', 'low', 'close'],
+                      index=pd.date_range('2024-01-01', periods=n, freq='1h'))
+    df['volume'] = rng.random(n) * 1000
+    return df
+
+
+def _make_orchestrator(lookbacks: dict = None) -> PatternOrchestrator:
+    """Orchestrator with every candlestick detector; lookbacks: pattern key -> lookback_window."""
+    patterns = {key: {'lookback_window': lookback} for key, lookback in (lookbacks or {}).items()}
+    orchestrator = PatternOrchestrator({'patterns': patterns})
+    for name in candlestick.__all__:
+        orchestrator.register_pattern(getattr(candlestick, name))
+    return orchestrator
+
+
+def _talib_detectors(orchestrator: PatternOrchestrator) -> list:
+    return [d for d in orchestrator.candlestick_patterns.values() if d.TALIB_FUNCTION is not None]
+
+
+def _full_talib_result(detector):
+    """The detector's former TA-Lib call: its CDL function on the full columns of df."""
+    def talib_result(df, open_col='open', high_col='high', low_col='low', close_col='close'):
+        return getattr(talib, detector.TALIB_FUNCTION)(
+            df[open_col].values, df[high_col].values, df[low_col].values, df[close_col].values,
+            **detector._get_talib_params()
+        )
+    return talib_result
+
+
+def _detect(detector, df):
+    """(detect(), candles ago, pattern info) of one detector."""
+    found = detector.detect(df)
+    candles_ago = detector._last_detection_candles_ago
+    return found, candles_ago, repr(detector.get_pattern_info(df, '1h', None))
+
+
+def _expected(detector, df):
+    """_detect with the detector's own full-history TA-Lib call."""
+    detector._talib_result = _full_talib_result(detector)
+    try:
+        return _detect(detector, df)
+    finally:
+        del detector._talib_result
+
+
+def _shared_scan(df, detectors, recent=None):
+    """Scan built the way PatternOrchestrator builds it."""
+    scan = CandlestickScan(df, recent=recent or max(d.lookback_window for d in detectors))
+    scan.run(d.get_talib_spec() for d in detectors)
+    return scan
+
+
+def test_detectors_match_talib():
+    """Shared scan, private scan and full-history TA-Lib agree for every detector."""
+    orchestrator = _make_orchestrator({'mat_hold': 12, 'abandoned_baby': 10, 'kicking': 20})
+    detectors = _talib_detectors(orchestrator)
+    specs = {d.get_talib_spec()[0] for d in detectors}
+    assert {'CDLMATHOLD', 'CDLABANDONEDBABY'} <= specs, specs
+    assert max(talib.abstract.Function(f).lookback for f in specs) <= CandlestickScan.TALIB_LOOKBACK
+
+    hits = {}
+    for seed in SEEDS:
+        for n in LENGTHS:
+            df = _make_candles(n, seed)
+            scan = _shared_scan(df, detectors)
+            for detector in detectors:
+                expected = _expected(detector, df)
+                for shared in (scan, None):
+                    detector.scan = shared
+                    actual = _detect(detector, df)
+                    assert actual == expected, (detector.name, n, seed, shared is not None, actual[:2], expected[:2])
+                detector.scan = None
+                hits[detector.TALIB_FUNCTION] = hits.get(detector.TALIB_FUNCTION, 0) + expected[0]
+
+    assert hits['CDLMATHOLD'] and hits['CDLABANDONEDBABY'], hits
+    detected = sum(1 for count in hits.values() if count)
+    print(f"  ✓ {len(detectors)} detectors match, {detected} with detections "
+          f"(MATHOLD {hits['CDLMATHOLD']}, ABANDONEDBABY {hits['CDLABANDONEDBABY']})")
+
+
+def test_lookback_beyond_scan():
+    """Detectors looking further back than the shared scan's recent candles or the scan window."""
+    for lookback in (30, 99, 100, 120):
+        orchestrator = _make_orchestrator({'mat_hold': lookback, 'engulfing': lookback, 'harami': lookback})
+        detectors = _talib_detectors(orchestrator)
+        for seed in SEEDS:
+            for n in LENGTHS:
+                df = _make_candles(n, seed)
+                # Shared scan keeps fewer recent candles than the long-lookback detectors check
+                scan = _shared_scan(df, detectors, recent=CandlestickScan.DEFAULT_RECENT)
+                for detector in detectors:
+                    if detector.lookback_window != lookback:
+                        continue
+                    expected = _expected(detector, df)
+                    for shared in (scan, None):
+                        detector.scan = shared
+                        actual = _detect(detector, df)
+                        assert actual == expected, (detector.name, lookback, n, seed, actual[:2], expected[:2])
+                    detector.scan = None
+    print("  ✓ lookback_window 30 / 99 / 100 / 120 matches the full-history call")
+
+
+def test_orchestrator_skip():
+    """Orchestrator output (with detectors skipped by the scan) equals calling every detector."""
+    orchestrator = _make_orchestrator({'mat_hold': 12, 'three_methods': 40})
+    detected = 0
+    for seed in SEEDS:
+        for n in LENGTHS:
+            df = _make_candles(n, seed)
+
+            expected = []
+            for detector in orchestrator.candlestick_patterns.values():
+                if detector.TALIB_FUNCTION is not None:
+                    detector._talib_result = _full_talib_result(detector)
+                try:
+                    info = detector.get_pattern_info(df, '1h', None)
+                finally:
+                    detector.__dict__.pop('_talib_result', None)
+                if info:
+                    expected.append(repr(info))
+
+            actual = [repr(info) for info in orchestrator._detect_candlestick_patterns(df, '1h', None)]
+            assert actual == expected, (n, seed, len(actual), len(expected))
+            assert all(d.scan is None for d in orchestrator.candlestick_patterns.values())
+            detected += len(actual)
+
+    stats = orchestrator.stats
+    assert stats['candlestick_scans'] == len(SEEDS) * len(LENGTHS) and stats['candlestick_skipped'] > 0, stats
+    print(f"  ✓ {detected} detections, {stats['candlestick_skipped']} detector calls skipped")
+
+
+def main():
+    """Run the candlestick scan tests."""
+    logging.disable(logging.CRITICAL)
+
+    tests = [test_detectors_match_talib, test_lookback_beyond_scan, test_orchestrator_skip]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All candlestick scan tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -53,6 +53,12 @@ class VolumeAnalyzer(BaseAnalyzer):
     5. Context-aware validation
     """
     
+    # Indicator columns read from context.df
+    REQUIRED_INDICATORS = ['obv', 'volume_sma']
+    
+    # Analyzer results read from the context
+    REQUIRED_RESULTS = ['trend', 'momentum']
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize VolumeAnalyzer.
@@ -59,6 +59,9 @@ class VolumePatternAnalyzer(BaseAnalyzer):
     6. Volume Profile: Volume distribution across price levels
     """
 
+    # Indicator columns read from context.df
+    REQUIRED_INDICATORS = ['obv', 'volume_sma']
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize VolumePatternAnalyzer.
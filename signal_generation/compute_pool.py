@@ -0,0 +1,295 @@
+"""
+ComputePool - Process pool for the CPU-bound part of signal generation.
+
+Data fetching, scoring and validation stay on the asyncio loop; indicators
+and the analyzers run in worker processes, so the loop keeps serving
+websocket pings, price updates and other fetches while a symbol is being
+analyzed. Market regime detection keeps a regime history and stays in the
+main process (SignalOrchestrator runs it on the returned frame).
+
+Each worker preloads its own SignalOrchestrator (IndicatorCalculator and all
+analyzers) once, in the pool initializer. Frames cross the process boundary
+as one contiguous float64 block plus the index (see pack_frame), in both
+directions.
+
+A symbol is always analyzed by the same worker (stable hash of the symbol),
+so the worker's IncrementalIndicatorEngine keeps the symbol's stream state
+between cycles.
+
+Workers are started with the 'spawn' method by default: the pool starts
+lazily, after the logging listener thread and the analyzer thread pool
+exist, and forking a process while another thread holds a lock can leave
+that lock held forever in the child.
+
+Enabled with orchestrator.compute_workers > 0 (start method:
+orchestrator.compute_start_method).
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import multiprocessing
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.context import AnalysisContext
+
+logger = logging.getLogger(__name__)
+
+# Packed DataFrame: (index, columns, float64 block, non-float columns)
+PackedFrame = Tuple[pd.Index, List[str], np.ndarray, Dict[str, np.ndarray]]
+
+# SignalOrchestrator of this worker process (set by _init_worker)
+_worker_orchestrator = None
+
+
+def pack_frame(df: pd.DataFrame) -> PackedFrame:
+    """
+    Pack a DataFrame for transfer to / from a worker process.
+
+    float64 columns are stacked into one contiguous 2D block (pickled as a
+    single buffer instead of one array per column); other columns (e.g. a
+    'timestamp' column) are passed as they are.
+
+    Args:
+        df: DataFrame to pack
+
+    Returns:
+        Packed frame for unpack_frame()
+    """
+    columns = list(df.columns)
+    float_columns = [col for col in columns if df[col].dtype == np.float64]
+    others = {col: df[col].to_numpy() for col in columns if col not in float_columns}
+
+    block = np.empty((len(df), len(float_columns)), dtype=np.float64)
+    for i, col in enumerate(float_columns):
+        block[:, i] = df[col].to_numpy()
+
+    return df.index, columns, block, others
+
+
+def unpack_frame(packed: PackedFrame) -> pd.DataFrame:
+    """
+    Rebuild a DataFrame packed by pack_frame() (same columns, order and dtypes).
+
+    Args:
+        packed: Packed frame
+
+    Returns:
+        DataFrame
+    """
+    index, columns, block, others = packed
+    float_columns = [col for col in columns if col not in others]
+
+    df = pd.DataFrame(block, index=index, columns=float_columns, copy=False)
+    if others:
+        df = pd.concat(
+            [df, pd.DataFrame(others, index=index)], axis=1
+        )[columns]
+    return df
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Pool initializer: build the worker's SignalOrchestrator once."""
+    global _worker_orchestrator
+
+    # Imported here: orchestrator imports this module
+    from signal_generation.orchestrator import SignalOrchestrator
+    from signal_generation.shared.indicator_calculator import IndicatorCalculator
+
+    worker_config = dict(config)
+    worker_config['orchestrator'] = dict(
+        config.get('orchestrator', {}),
+        compute_workers=0,
+        analyzer_workers=1,
+        send_to_trade_manager=False
+    )
+
+    _worker_orchestrator = SignalOrchestrator(
+        worker_config,
+        market_data_fetcher=None,
+        indicator_calculator=IndicatorCalculator(worker_config),
+        skip_validation=True
+    )
+
+
+def _analyze_in_worker(
+        symbol: str,
+        timeframe: str,
+        packed: PackedFrame,
+        metadata: Dict[str, Any]
+) -> Tuple[bool, PackedFrame, Dict[str, Any], Dict[str, Any], Any]:
+    """
+    Run indicators and analyzers for one frame in a worker.
+
+    metadata['htf_data'] holds packed frames; it is not returned.
+
+    Returns:
+        Tuple of (success, packed enriched frame, analyzer results, metadata,
+        OrchestratorStats of this run: analyzer times and stage latencies)
+    """
+    from signal_generation.orchestrator import OrchestratorStats
+
+    orchestrator = _worker_orchestrator
+    orchestrator.stats = OrchestratorStats()
+
+    context = AnalysisContext(symbol=symbol, timeframe=timeframe, df=unpack_frame(packed))
+    context.metadata.update(metadata)
+    if 'htf_data' in metadata:
+        context.metadata['htf_data'] = {
+            tf: unpack_frame(htf_packed) for tf, htf_packed in metadata['htf_data'].items()
+        }
+
+    success = orchestrator._analyze_context(context, detect_regime=False)
+
+    return (
+        success,
+        pack_frame(context.df),
+        context.results,
+        {key: value for key, value in context.metadata.items() if key != 'htf_data'},
+        orchestrator.stats
+    )
+
+
+class ComputePool:
+    """
+    Process pool running AnalysisContext computations off the event loop.
+
+    Usage:
+        pool = ComputePool(config, workers=2)
+        success = await pool.analyze(context, stats=orchestrator.stats)
+        pool.shutdown()
+    """
+
+    def __init__(
+            self,
+            config: Dict[str, Any],
+            workers: int,
+            start_method: Optional[str] = 'spawn'
+    ):
+        """
+        Initialize ComputePool.
+
+        Worker processes start on first use; each builds its analyzers once.
+
+        Args:
+            config: Configuration dictionary (passed to the workers)
+            workers: Number of worker processes
+            start_method: multiprocessing start method ('spawn', 'forkserver';
+                          None = platform default, 'fork' on Linux)
+        """
+        self.workers = workers
+        self.start_method = start_method
+        mp_context = multiprocessing.get_context(start_method)
+
+        # One single-process executor per worker, so a symbol can be routed to
+        # the worker holding its incremental indicator state
+        self._executors = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(config,)
+            )
+            for _ in range(workers)
+        ]
+
+        # Statistics
+        self.stats = {
+            'tasks': 0,
+            'failures': 0,
+            'total_time': 0.0,
+            'tasks_per_worker': [0] * workers
+        }
+
+        logger.info(f"ComputePool initialized ({workers} workers, start method {mp_context.get_start_method()})")
+
+    def worker_for(self, symbol: str) -> int:
+        """Index of the worker that analyzes symbol (stable across runs)."""
+        return zlib.crc32(symbol.encode()) % self.workers
+
+    async def analyze(
+            self,
+            context: AnalysisContext,
+            stats: Any = None,
+            htf_timeframes: Optional[Iterable[str]] = None
+    ) -> bool:
+        """
+        Calculate indicators and analyzer results of a context in a worker.
+
+        On return context.df holds the indicator columns and the analyzer
+        results are stored in the context. Of context.metadata['htf_data'],
+        only the frames of htf_timeframes are sent to the worker.
+
+        Args:
+            context: AnalysisContext with OHLCV data
+            stats: Optional OrchestratorStats receiving the analyzer wall times
+                   and stage latencies of the worker
+            htf_timeframes: Timeframes of metadata['htf_data'] read by the analyzers
+
+        Returns:
+            False if indicators could not be calculated
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+
+        metadata = {key: value for key, value in context.metadata.items() if key != 'htf_data'}
+        htf_data = context.metadata.get('htf_data')
+        if htf_data:
+            metadata['htf_data'] = {
+                tf: pack_frame(htf_data[tf]) for tf in (htf_timeframes or []) if tf in htf_data
+            }
+
+        worker = self.worker_for(context.symbol)
+        self.stats['tasks_per_worker'][worker] += 1
+
+        try:
+            success, packed, results, metadata, worker_stats = await loop.run_in_executor(
+                self._executors[worker],
+                _analyze_in_worker,
+                context.symbol,
+                context.timeframe,
+                pack_frame(context.df),
+                metadata
+            )
+        except Exception:
+            self.stats['failures'] += 1
+            raise
+        finally:
+            self.stats['tasks'] += 1
+            self.stats['total_time'] += time.perf_counter() - start
+
+        context.df = unpack_frame(packed)
+        context.metadata.update(metadata)
+        for analyzer_name, result in results.items():
+            context.add_result(analyzer_name, result)
+
+        if stats is not None:
+            stats.merge(worker_stats)
+
+        return success
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        tasks = self.stats['tasks']
+        return dict(
+            self.stats,
+            tasks_per_worker=list(self.stats['tasks_per_worker']),
+            workers=self.workers,
+            start_method=self.start_method,
+            avg_time=self.stats['total_time'] / tasks if tasks else 0.0
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        for executor in self._executors:
+            executor.shutdown(wait=True)
@@ -11,11 +11,14 @@ It contains:
 All analyzers read from and write to this context, enabling collaboration.
 """
 
+import threading
 import pandas as pd
 from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
 
+from common.swing_index import SwingIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,7 +46,9 @@ class AnalysisContext:
         """
         self.symbol = symbol
         self.timeframe = timeframe
-        self.df = df.copy()  # Make a copy to avoid modifying original
+        # Held by reference: analyzers only read it, and IndicatorCalculator
+        # replaces it with a new enriched frame (the original is never modified)
+        self.df = df
         
         # Results from analyzers (e.g., {'trend': {...}, 'momentum': {...}})
         self.results: Dict[str, Any] = {}
@@ -57,6 +62,12 @@ class AnalysisContext:
             'indicators_calculated': False
         }
         
+        # Swing highs/lows of df, built on first use (see get_swing_index)
+        self._swing_index: Optional[SwingIndex] = None
+        
+        # Analyzers may run concurrently (SignalOrchestrator thread pool)
+        self._lock = threading.Lock()
+        
         # Statistics
         self._stats = {
             'analyzers_run': 0,
@@ -76,11 +87,12 @@ class AnalysisContext:
             analyzer_name: Name of the analyzer (e.g., 'trend', 'momentum')
             result: Dictionary with analyzer results
         """
-        self.results[analyzer_name] = result
-        self._stats['analyzers_run'] += 1
-        
-        if result.get('status') == 'error':
-            self._stats['analyzers_failed'] += 1
+        with self._lock:
+            self.results[analyzer_name] = result
+            self._stats['analyzers_run'] += 1
+            
+            if result.get('status') == 'error':
+                self._stats['analyzers_failed'] += 1
         
         logger.debug(
             f"Result added from {analyzer_name} for {self.symbol}: "
@@ -142,6 +154,21 @@ class AnalysisContext:
         """
         return self.metadata.get(key)
     
+    def get_swing_index(self) -> SwingIndex:
+        """
+        Get the swing-point index of df, shared by all analyzers.
+        
+        Built on first use and rebuilt if df has been replaced
+        (e.g. by IndicatorCalculator).
+        
+        Returns:
+            SwingIndex of the current df
+        """
+        with self._lock:
+            if self._swing_index is None or not self._swing_index.covers(self.df):
+                self._swing_index = SwingIndex(self.df)
+            return self._swing_index
+    
     def get_stats(self) -> Dict[str, int]:
         """
         Get analysis statistics.
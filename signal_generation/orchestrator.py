@@ -13,13 +13,20 @@ This is the main entry point that ties everything together.
 """
 
 from typing import Dict, Any, List, Optional, Callable, Tuple
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
 from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import logging
 import asyncio
 import time
 
+import pandas as pd
+
 from signal_generation.context import AnalysisContext
+from signal_generation.compute_pool import ComputePool
+from signal_generation.shared.context_cache import ContextCache
+from common.latency_histogram import LatencyHistogram
 from signal_generation.signal_scorer import SignalScorer
 from signal_generation.signal_validator import SignalValidator
 from signal_generation.signal_info import SignalInfo
@@ -72,17 +79,114 @@ class OrchestratorStats:
     # Breakdown by reason
     rejection_reasons: Dict[str, int] = field(default_factory=dict)
 
+    # Analyzer wall time (seconds, summed over runs) and run counts
+    analyzer_time: Dict[str, float] = field(default_factory=dict)
+    analyzer_runs: Dict[str, int] = field(default_factory=dict)
+    analyzers_wall_time: float = 0.0
+
+    # Latency histograms per pipeline stage, overall and per 'symbol:timeframe'
+    stage_latency: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    symbol_latency: Dict[str, Dict[str, LatencyHistogram]] = field(default_factory=dict)
+
     def get_success_rate(self) -> float:
         """Calculate success rate."""
         if self.total_signals_attempted == 0:
             return 0.0
         return self.valid_signals / self.total_signals_attempted
 
+    def record_analyzer_time(
+            self,
+            analyzer_name: str,
+            elapsed: float,
+            symbol: Optional[str] = None,
+            timeframe: Optional[str] = None
+    ) -> None:
+        """Add one run of an analyzer (also recorded as stage 'analyzer.<name>')."""
+        self.analyzer_time[analyzer_name] = self.analyzer_time.get(analyzer_name, 0.0) + elapsed
+        self.analyzer_runs[analyzer_name] = self.analyzer_runs.get(analyzer_name, 0) + 1
+        self.record_latency(f"analyzer.{analyzer_name}", elapsed, symbol, timeframe)
+
+    def record_latency(
+            self,
+            stage: str,
+            elapsed: float,
+            symbol: Optional[str] = None,
+            timeframe: Optional[str] = None
+    ) -> None:
+        """
+        Add one latency sample of a pipeline stage.
+
+        Args:
+            stage: Stage name (e.g. 'fetch', 'indicators', 'analyzer.trend')
+            elapsed: Wall time in seconds
+            symbol: Symbol (with timeframe: also kept per 'symbol:timeframe')
+            timeframe: Timeframe
+        """
+        histogram = self.stage_latency.get(stage)
+        if histogram is None:
+            histogram = self.stage_latency[stage] = LatencyHistogram()
+        histogram.record(elapsed)
+
+        if symbol and timeframe:
+            stages = self.symbol_latency.setdefault(f"{symbol}:{timeframe}", {})
+            histogram = stages.get(stage)
+            if histogram is None:
+                histogram = stages[stage] = LatencyHistogram()
+            histogram.record(elapsed)
+
+    @contextmanager
+    def measure(self, stage: str, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """Record the wall time of the with-block as a latency sample of stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_latency(stage, time.perf_counter() - start, symbol, timeframe)
+
+    def merge(self, other: 'OrchestratorStats') -> None:
+        """Add the analyzer times and latency histograms of other (e.g. from a compute worker)."""
+        for name, elapsed in other.analyzer_time.items():
+            self.analyzer_time[name] = self.analyzer_time.get(name, 0.0) + elapsed
+            self.analyzer_runs[name] = self.analyzer_runs.get(name, 0) + other.analyzer_runs[name]
+        self.analyzers_wall_time += other.analyzers_wall_time
+
+        for stage, histogram in other.stage_latency.items():
+            self.stage_latency.setdefault(stage, LatencyHistogram()).merge(histogram)
+        for key, stages in other.symbol_latency.items():
+            own = self.symbol_latency.setdefault(key, {})
+            for stage, histogram in stages.items():
+                own.setdefault(stage, LatencyHistogram()).merge(histogram)
+
+    def get_latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, average, p50/p95/p99 and maximum (seconds) per stage."""
+        return {stage: histogram.summary() for stage, histogram in self.stage_latency.items()}
+
+    def get_symbol_latency_summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Latency summary per stage for every 'symbol:timeframe'."""
+        return {
+            key: {stage: histogram.summary() for stage, histogram in stages.items()}
+            for key, stages in self.symbol_latency.items()
+        }
+
+    def get_analyzer_timings(self) -> Dict[str, Dict[str, float]]:
+        """Total and average wall time per analyzer."""
+        return {
+            name: {
+                'runs': self.analyzer_runs[name],
+                'total_time': total,
+                'avg_time': total / self.analyzer_runs[name]
+            }
+            for name, total in self.analyzer_time.items()
+        }
+
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
-        data = asdict(self)
+        data = asdict(replace(self, stage_latency={}, symbol_latency={}))
         if self.last_run_time:
             data['last_run_time'] = self.last_run_time.isoformat()
+        data['analyzer_timings'] = self.get_analyzer_timings()
+        data['stage_latency'] = self.get_latency_summary()
+        data['symbol_latency'] = self.get_symbol_latency_summary()
         return data
 
     def __str__(self) -> str:
@@ -162,12 +266,36 @@ class SignalOrchestrator:
         # Initialize Phase 3 components (10 Analyzers)
         self.analyzers = self._initialize_analyzers(config)
 
+        # Analyzer scheduling: analyzers run once their REQUIRED_RESULTS are
+        # available, independent ones concurrently (analyzer_workers <= 1: one by one)
+        self.analyzer_workers = orch_config.get('analyzer_workers', 4)
+        self.analyzer_dependencies = self._resolve_analyzer_dependencies()
+        self._analyzer_executor = (
+            ThreadPoolExecutor(max_workers=self.analyzer_workers, thread_name_prefix='analyzer')
+            if self.analyzer_workers > 1 else None
+        )
+
+        # Process pool for indicators, regime and analyzers (compute_workers <= 0: in-process)
+        self.compute_workers = orch_config.get('compute_workers', 0)
+        self.compute_pool = (
+            ComputePool(
+                config,
+                workers=self.compute_workers,
+                start_method=orch_config.get('compute_start_method', 'spawn')
+            )
+            if self.compute_workers > 0 else None
+        )
+
         # Initialize Advanced Systems
         systems_config = config.get('systems', {})
 
+        # Shared per-candle indicator store (published by the IndicatorCalculator)
+        self.indicator_store = getattr(indicator_calculator, 'indicator_store', None)
+
         # Market Regime Detector
         self.regime_detector = MarketRegimeDetector(
-            systems_config.get('regime_detector', {})
+            systems_config.get('regime_detector', {}),
+            indicator_store=self.indicator_store
         )
 
         # Adaptive Learning System
@@ -182,12 +310,16 @@ class SignalOrchestrator:
 
         # Emergency Circuit Breaker
         self.circuit_breaker = EmergencyCircuitBreaker(
-            systems_config.get('circuit_breaker', {})
+            systems_config.get('circuit_breaker', {}),
+            indicator_store=self.indicator_store
         )
 
+        # Only calculate the indicators that enabled consumers read
+        self._configure_indicator_plan()
+
         # ✨ Timeframe Score Cache - برای جلوگیری از محاسبات تکراری
         self.tf_score_cache = TimeframeScoreCache(config)
-        logger.info(f"TimeframeScoreCache initialized (enabled={self.tf_score_cache.enabled})")
+        logger.info("TimeframeScoreCache initialized (enabled=%s)", self.tf_score_cache.enabled)
 
         # ✨ Multi-Timeframe Aggregator (OLD SYSTEM)
         # Always use multi-TF aggregation (can be disabled via config if needed)
@@ -205,16 +337,24 @@ class SignalOrchestrator:
         self.stats = OrchestratorStats()
 
         # Context cache to avoid recalculation in _generate_signal_with_context
-        self._context_cache: Dict[str, Tuple[AnalysisContext, float]] = {}
-        self._context_cache_ttl = 60  # 60 seconds TTL
+        # (bounded by entries and estimated DataFrame bytes, LRU eviction)
+        context_cache_config = orch_config.get('context_cache', {})
+        self._context_cache = ContextCache(
+            max_entries=context_cache_config.get('max_entries', 500),
+            max_bytes=int(context_cache_config.get('max_mb', 256) * 1024 * 1024),
+            ttl_seconds=context_cache_config.get('ttl_seconds', 14400)
+        )
+        self._context_cache_ttl = 60  # reuse without regenerating the signal for 60 seconds
 
         # Semaphore for concurrent processing
         self.processing_semaphore = asyncio.Semaphore(self.max_concurrent)
 
         logger.info(
-            f"SignalOrchestrator initialized: "
-            f"{len(self.analyzers)} analyzers, "
-            f"max_concurrent={self.max_concurrent}"
+            "SignalOrchestrator initialized: "
+            "%s analyzers, "
+            "max_concurrent=%s, "
+            "compute_workers=%s",
+            len(self.analyzers), self.max_concurrent, self.compute_workers
         )
 
     def _initialize_analyzers(self, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -250,18 +390,81 @@ class SignalOrchestrator:
             if name in enabled:
                 try:
                     analyzers[name] = analyzer_class(config)
-                    logger.debug(f"Initialized {name} analyzer")
+                    logger.debug("Initialized %s analyzer", name)
                 except Exception as e:
-                    logger.error(f"Failed to initialize {name} analyzer: {e}")
+                    logger.error("Failed to initialize %s analyzer: %s", name, e)
 
-        logger.info(f"Initialized {len(analyzers)}/11 analyzers")
+        logger.info("Initialized %s/11 analyzers", len(analyzers))
 
         return analyzers
 
+    def _resolve_analyzer_dependencies(self) -> Dict[str, List[str]]:
+        """
+        Resolve the result dependencies of the enabled analyzers.
+
+        Dependencies on analyzers that are not enabled are dropped (the
+        analyzer then runs without that result, as before). A dependency
+        cycle is logged and broken at the first analyzer in configured order.
+
+        Returns:
+            Dictionary of analyzer_name -> names it waits for, in dependency
+            order (configured order where dependencies allow)
+        """
+        pending = {
+            name: [
+                dep for dep in getattr(analyzer, 'REQUIRED_RESULTS', [])
+                if dep in self.analyzers and dep != name
+            ]
+            for name, analyzer in self.analyzers.items()
+        }
+
+        ordered: Dict[str, List[str]] = {}
+        while pending:
+            name = next(
+                (name for name, deps in pending.items() if all(dep in ordered for dep in deps)),
+                None
+            )
+            if name is None:
+                name = next(iter(pending))
+                logger.error(
+                    "Analyzer dependency cycle between %s: "
+                    "running %s without %s",
+                    list(pending), name, [d for d in pending[name] if d not in ordered]
+                )
+                pending[name] = [dep for dep in pending[name] if dep in ordered]
+            ordered[name] = pending.pop(name)
+
+        return ordered
+
+    def _configure_indicator_plan(self) -> None:
+        """
+        Pass the indicator columns read by enabled consumers to the IndicatorCalculator.
+
+        Columns come from the REQUIRED_INDICATORS declarations of the enabled
+        analyzers and the regime detector, plus 'atr' for stop-loss / take-profit
+        (RiskCalculator). Signal metadata records whatever was calculated.
+        """
+        set_required_columns = getattr(self.indicator_calculator, 'set_required_columns', None)
+        if set_required_columns is None:
+            return
+
+        required = {'atr'}
+        for analyzer in self.analyzers.values():
+            required.update(getattr(analyzer, 'REQUIRED_INDICATORS', []))
+        if self.regime_detector.enabled:
+            required.update(self.regime_detector.REQUIRED_INDICATORS)
+
+        try:
+            set_required_columns(sorted(required))
+        except Exception as e:
+            logger.error("Failed to configure indicator plan: %s", e, exc_info=True)
+
     async def generate_signal_for_symbol(
             self,
             symbol: str,
-            timeframe: str
+            timeframe: str,
+            df: Optional[pd.DataFrame] = None,
+            htf_data: Optional[Dict[str, pd.DataFrame]] = None
     ) -> Optional[SignalInfo]:
         """
         Main method: Generate signal for single symbol/timeframe.
@@ -271,6 +474,11 @@ class SignalOrchestrator:
         Args:
             symbol: Trading symbol (e.g., 'BTCUSDT')
             timeframe: Timeframe (e.g., '1h')
+            df: OHLCV data already fetched by the caller (None = fetch it)
+            htf_data: Frames of the other timeframes of the symbol, attached to
+                      the context by reference (context.metadata['htf_data']);
+                      this timeframe's entry is replaced by the frame with its
+                      indicator columns once they are calculated
 
         Returns:
             Valid SignalInfo or None
@@ -278,55 +486,65 @@ class SignalOrchestrator:
         start_time = time.time()
 
         try:
-            logger.info(f"=== Starting signal generation for {symbol} {timeframe} ===")
+            logger.info("=== Starting signal generation for %s %s ===", symbol, timeframe)
 
             # === STEP 0: Circuit Breaker Check ===
             if self.circuit_breaker.enabled:
                 is_active, reason = self.circuit_breaker.check_if_active()
                 if is_active:
                     logger.warning(
-                        f"🚨 Circuit breaker active: {reason}. "
-                        f"Skipping signal generation for {symbol}."
+                        "🚨 Circuit breaker active: %s. "
+                        "Skipping signal generation for %s.",
+                        reason, symbol
                     )
                     self.stats.errors += 1
                     return None
 
-            # === STEP 1: Fetch Market Data ===
-            logger.info(f"[1/7] Fetching data for {symbol} {timeframe}")
-
-            df = await self._fetch_market_data(symbol, timeframe)
+            # === STEP 1: Fetch Market Data (unless supplied by the caller) ===
+            with self.stats.measure('fetch', symbol, timeframe):
+                if df is None:
+                    logger.info("[1/7] Fetching data for %s %s", symbol, timeframe)
+                    df = await self._fetch_market_data(symbol, timeframe)
+                else:
+                    logger.info("[1/7] Using supplied data for %s %s", symbol, timeframe)
+                    df = self._check_market_data(symbol, df)
 
             if df is None:
-                logger.warning(f"No data available for {symbol}")
+                logger.warning("No data available for %s", symbol)
                 self.stats.errors += 1
                 return None
 
-            logger.info(f"  ✓ Fetched {len(df)} candles")
+            logger.info("  ✓ Fetched %s candles", len(df))
 
             # === STEP 1.5: Check Cache ===
             # آیا باید دوباره محاسبه کنیم یا از کش استفاده کنیم؟
-            should_recalc, reason = self.tf_score_cache.should_recalculate(
-                symbol, timeframe, df
-            )
-
-            if not should_recalc:
-                # کش معتبر است - استفاده از امتیاز کش شده
-                logger.info(
-                    f"  💾 Using CACHED score for {symbol} {timeframe} "
-                    f"(reason: {reason}) - Skipping recalculation"
+            with self.stats.measure('cache_check', symbol, timeframe):
+                should_recalc, reason = self.tf_score_cache.should_recalculate(
+                    symbol, timeframe, df
                 )
-                cached_signal = self.tf_score_cache.get_cached_score(symbol, timeframe)
-                if cached_signal:
-                    return cached_signal
+
+                cached_signal = None
+                if not should_recalc:
+                    # کش معتبر است - استفاده از امتیاز کش شده
+                    logger.info(
+                        "  💾 Using CACHED score for %s %s "
+                        "(reason: %s) - Skipping recalculation",
+                        symbol, timeframe, reason
+                    )
+                    cached_signal = self.tf_score_cache.get_cached_score(symbol, timeframe)
+
+            if cached_signal:
+                return cached_signal
 
             # کندل جدید آمده یا کش invalid است - محاسبه مجدد
             logger.info(
-                f"  🔄 RECALCULATING score for {symbol} {timeframe} "
-                f"(reason: {reason})"
+                "  🔄 RECALCULATING score for %s %s "
+                "(reason: %s)",
+                symbol, timeframe, reason
             )
 
             # === STEP 2: Create Analysis Context ===
-            logger.info(f"[2/7] Creating context for {symbol}")
+            logger.info("[2/7] Creating context for %s", symbol)
 
             context = AnalysisContext(
                 symbol=symbol,
@@ -334,96 +552,79 @@ class SignalOrchestrator:
                 df=df
             )
 
-            # === STEP 3: Calculate Indicators ===
-            logger.info(f"[3/7] Calculating indicators for {symbol}")
+            if htf_data is not None:
+                context.metadata['htf_data'] = htf_data
 
-            success = self._calculate_indicators(context)
+            # === STEP 3-4: Indicators, Market Regime, Analyzers ===
+            success = await self._compute_context(context)
 
             if not success:
-                logger.error(f"Failed to calculate indicators for {symbol}")
+                logger.error("Failed to calculate indicators for %s", symbol)
                 self.stats.errors += 1
                 return None
 
-            logger.info(f"  ✓ Indicators calculated")
-
-
-            logger.info(f"[3.5/7] Detecting market regime for {symbol}")
-
-            regime_info = {'regime': 'unknown', 'confidence': 0.0}
-
-            if self.regime_detector.enabled:
-                regime_info = self.regime_detector.detect_regime(context.df)
-                logger.info(
-                    f"  ✓ Regime: {regime_info.get('regime')}, "
-                    f"Confidence: {regime_info.get('confidence', 0):.2f}"
-                )
-
-                # Store in context for analyzers to use
-                context.metadata['regime_info'] = regime_info
-
-
-            # === STEP 4: Run Analyzers ===
-            logger.info(f"[4/7] Running {len(self.analyzers)} analyzers for {symbol}")
-
-            self._run_analyzers(context)
-
             # Check minimum required analyzers
             required = ['trend', 'momentum', 'volume']
             missing = [r for r in required if not context.get_result(r)]
 
             if missing:
-                logger.warning(f"Missing required analyzers for {symbol}: {missing}")
+                logger.warning("Missing required analyzers for %s: %s", symbol, missing)
                 self.stats.errors += 1
                 return None
 
-            logger.info(f"  ✓ All analyzers completed")
+            logger.info("  ✓ All analyzers completed")
 
             # === STEP 5: Determine Direction ===
-            logger.info(f"[5/7] Determining signal direction for {symbol}")
+            logger.info("[5/7] Determining signal direction for %s", symbol)
 
-            direction = self._determine_direction(context)
+            with self.stats.measure('direction', symbol, timeframe):
+                direction = self._determine_direction(context)
 
             if not direction:
-                logger.info(f"No clear direction for {symbol}")
+                logger.info("No clear direction for %s", symbol)
                 return None
 
-            logger.info(f"  ✓ Direction: {direction}")
+            logger.info("  ✓ Direction: %s", direction)
 
             # === STEP 6: Calculate Score ===
-            logger.info(f"[6/7] Scoring signal for {symbol} {direction}")
+            logger.info("[6/7] Scoring signal for %s %s", symbol, direction)
 
-            score = self.signal_scorer.calculate_score(context, direction)
+            with self.stats.measure('scoring', symbol, timeframe):
+                score = self.signal_scorer.calculate_score(context, direction)
 
             if not score:
-                logger.warning(f"Failed to calculate score for {symbol}")
+                logger.warning("Failed to calculate score for %s", symbol)
                 self.stats.errors += 1
                 return None
 
             # Get confidence from details if available
             confidence = score.details.get('confidence', 0.7) if score.details else 0.7
-            logger.info(f"  ✓ Score: {score.final_score:.2f} (conf={confidence:.2f})")
+            logger.info("  ✓ Score: %.2f (conf=%.2f)", score.final_score, confidence)
 
             # Build SignalInfo
-            signal = self._build_signal_info(context, direction, score)
+            with self.stats.measure('signal_build', symbol, timeframe):
+                signal = self._build_signal_info(context, direction, score)
 
             if not signal:
-                logger.warning(f"Failed to build signal for {symbol}")
+                logger.warning("Failed to build signal for %s", symbol)
                 self.stats.errors += 1
                 return None
 
             self.stats.total_signals_attempted += 1
 
             if self.correlation_manager.enabled:
-                correlation_factor = self.correlation_manager.get_correlation_safety_factor(
-                    symbol,
-                    direction
-                )
+                with self.stats.measure('correlation', symbol, timeframe):
+                    correlation_factor = self.correlation_manager.get_correlation_safety_factor(
+                        symbol,
+                        direction
+                    )
 
                 if correlation_factor < 0.7:
                     logger.info(
-                        f"High correlation exposure for {symbol} "
-                        f"(factor: {correlation_factor:.2f}). "
-                        f"Reducing signal score."
+                        "High correlation exposure for %s "
+                        "(factor: %.2f). "
+                        "Reducing signal score.",
+                        symbol, correlation_factor
                     )
                     # Reduce score
                     score.final_score *= correlation_factor
@@ -432,18 +633,19 @@ class SignalOrchestrator:
                     # Update in signal
                     signal.score = score
             # === STEP 7: Validate ===
-            logger.info(f"[7/7] Validating signal for {symbol}")
+            logger.info("[7/7] Validating signal for %s", symbol)
 
             # Skip validation if requested (for analysis purposes)
             if self.skip_validation:
-                logger.info(f"⚠️  Skipping validation for {symbol} (analysis mode)")
+                logger.info("⚠️  Skipping validation for %s (analysis mode)", symbol)
                 is_valid = True
                 reason = "validation_skipped"
             else:
-                is_valid, reason = self.signal_validator.validate(signal, context)
+                with self.stats.measure('validation', symbol, timeframe):
+                    is_valid, reason = self.signal_validator.validate(signal, context)
 
             if not is_valid:
-                logger.info(f"Signal rejected for {symbol}: {reason}")
+                logger.info("Signal rejected for %s: %s", symbol, reason)
                 self.stats.rejected_signals += 1
 
                 # Track rejection reason
@@ -457,8 +659,9 @@ class SignalOrchestrator:
             self.stats.valid_signals += 1
 
             logger.info(
-                f"✅ Valid signal generated for {symbol} {direction}! "
-                f"Score: {score.final_score:.2f}, RR: {signal.risk_reward_ratio:.2f}"
+                "✅ Valid signal generated for %s %s! "
+                "Score: %.2f, RR: %.2f",
+                symbol, direction, score.final_score, signal.risk_reward_ratio
             )
 
             # Register signal (skip if validation was skipped)
@@ -467,32 +670,34 @@ class SignalOrchestrator:
 
             # ✨ Update Cache - ذخیره امتیاز برای استفاده‌های بعدی
             self.tf_score_cache.update_cache(symbol, timeframe, signal, df)
-            logger.debug(f"💾 Cached signal for {symbol} {timeframe}")
+            logger.debug("💾 Cached signal for %s %s", symbol, timeframe)
 
             # ✨ Cache context to avoid recalculation in _generate_signal_with_context
             cache_key = f"{symbol}:{timeframe}"
-            self._context_cache[cache_key] = (context, time.time())
-            logger.debug(f"💾 Cached context for {symbol} {timeframe}")
+            self._context_cache.put(cache_key, context)
+            logger.debug("💾 Cached context for %s %s", symbol, timeframe)
 
             # Send to TradeManager
             if self.send_to_trade_manager and self.trade_manager_callback:
-                await self._send_to_trade_manager(signal)
+                with self.stats.measure('trade_manager', symbol, timeframe):
+                    await self._send_to_trade_manager(signal)
 
             return signal
 
         except asyncio.TimeoutError:
-            logger.error(f"Timeout processing {symbol}")
+            logger.error("Timeout processing %s", symbol)
             self.stats.errors += 1
             return None
 
         except Exception as e:
-            logger.error(f"Error generating signal for {symbol}: {e}", exc_info=True)
+            logger.error("Error generating signal for %s: %s", symbol, e, exc_info=True)
             self.stats.errors += 1
             return None
 
         finally:
             # Update stats
             elapsed = time.time() - start_time
+            self.stats.record_latency('total', elapsed, symbol, timeframe)
             self.stats.total_time += elapsed
             self.stats.total_symbols_processed += 1
             self.stats.avg_time_per_symbol = (
@@ -500,8 +705,9 @@ class SignalOrchestrator:
             )
 
             logger.info(
-                f"=== Completed {symbol} in {elapsed:.2f}s "
-                f"(avg: {self.stats.avg_time_per_symbol:.2f}s) ==="
+                "=== Completed %s in %.2fs "
+                "(avg: %.2fs) ===",
+                symbol, elapsed, self.stats.avg_time_per_symbol
             )
 
     async def _fetch_market_data(self, symbol: str, timeframe: str):
@@ -514,16 +720,139 @@ class SignalOrchestrator:
                 limit=self.ohlcv_limit
             )
 
-            if df is None or len(df) < 200:
-                logger.warning(f"Insufficient data for {symbol}: {len(df) if df is not None else 0} candles")
-                return None
-
-            return df
+            return self._check_market_data(symbol, df)
 
         except Exception as e:
-            logger.error(f"Error fetching data for {symbol}: {e}")
+            logger.error("Error fetching data for %s: %s", symbol, e)
+            return None
+
+    def _check_market_data(self, symbol: str, df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Return df if it has enough candles for analysis, otherwise None."""
+        if df is None or len(df) < 200:
+            logger.warning("Insufficient data for %s: %s candles", symbol, len(df) if df is not None else 0)
             return None
 
+        return df
+
+    async def _compute_context(self, context: AnalysisContext) -> bool:
+        """
+        Indicators, market regime and analyzers for a context, in a ComputePool
+        worker when compute_workers > 0, otherwise in-process.
+
+        Both paths produce the same context: the regime is always detected in
+        the main process and the frame with indicator columns is shared as HTF data.
+
+        Args:
+            context: AnalysisContext with OHLCV data
+
+        Returns:
+            False if indicators could not be calculated
+        """
+        if self.compute_pool is None:
+            if not self._prepare_context(context):
+                return False
+            # Analyzers run on the analyzer threads; the loop keeps serving other tasks
+            await self._run_analyzers_async(context)
+            return True
+
+        with self.stats.measure('compute_pool', context.symbol, context.timeframe):
+            success = await self.compute_pool.analyze(
+                context,
+                stats=self.stats,
+                htf_timeframes=self._htf_timeframes(context.timeframe)
+            )
+        if success:
+            self._detect_regime(context)
+            htf_data = context.metadata.get('htf_data')
+            if htf_data is not None:
+                htf_data[context.timeframe] = context.df
+        return success
+
+    def _analyze_context(self, context: AnalysisContext, detect_regime: bool = True) -> bool:
+        """
+        CPU-bound part of the pipeline: indicators, market regime and analyzers.
+
+        Synchronous version, run in ComputePool workers (the in-process path of
+        _compute_context awaits the analyzer phase instead).
+        Workers skip the market regime: the detector keeps a regime history,
+        so it runs in the main process on the returned frame.
+
+        Args:
+            context: AnalysisContext with OHLCV data
+            detect_regime: Detect the market regime (stored in context.metadata)
+
+        Returns:
+            False if indicators could not be calculated
+        """
+        if not self._prepare_context(context, detect_regime):
+            return False
+
+        self._run_analyzers(context)
+
+        return True
+
+    def _prepare_context(self, context: AnalysisContext, detect_regime: bool = True) -> bool:
+        """
+        Indicators and market regime of a context (everything before the analyzers).
+
+        Args:
+            context: AnalysisContext with OHLCV data
+            detect_regime: Detect the market regime (stored in context.metadata)
+
+        Returns:
+            False if indicators could not be calculated
+        """
+        symbol = context.symbol
+
+        # === STEP 3: Calculate Indicators ===
+        logger.info("[3/7] Calculating indicators for %s", symbol)
+
+        with self.stats.measure('indicators', symbol, context.timeframe):
+            calculated = self._calculate_indicators(context)
+
+        if not calculated:
+            return False
+
+        logger.info("  ✓ Indicators calculated")
+
+        # Share this timeframe's indicator columns with lower timeframes
+        htf_data = context.metadata.get('htf_data')
+        if htf_data is not None:
+            htf_data[context.timeframe] = context.df
+
+        if detect_regime:
+            self._detect_regime(context)
+
+        # === STEP 4: Run Analyzers ===
+        logger.info("[4/7] Running %s analyzers for %s", len(self.analyzers), symbol)
+
+        return True
+
+    def _htf_timeframes(self, timeframe: str) -> List[str]:
+        """Timeframes of the HTF data read by the HTF analyzer for timeframe."""
+        htf_analyzer = self.analyzers.get('htf')
+        if htf_analyzer is None:
+            return []
+        return [htf_analyzer.get_higher_timeframe(timeframe)]
+
+    def _detect_regime(self, context: AnalysisContext) -> None:
+        """Detect the market regime and store it in context.metadata['regime_info']."""
+        logger.info("[3.5/7] Detecting market regime for %s", context.symbol)
+
+        if self.regime_detector.enabled:
+            with self.stats.measure('regime', context.symbol, context.timeframe):
+                regime_info = self.regime_detector.detect_regime(
+                    context.df, context.symbol, context.timeframe
+                )
+            logger.info(
+                "  ✓ Regime: %s, "
+                "Confidence: %.2f",
+                regime_info.get('regime'), regime_info.get('confidence', 0)
+            )
+
+            # Store in context for analyzers to use
+            context.metadata['regime_info'] = regime_info
+
     def _calculate_indicators(self, context: AnalysisContext) -> bool:
         """Calculate indicators using IndicatorCalculator."""
         try:
@@ -532,17 +861,103 @@ class SignalOrchestrator:
             return True
 
         except Exception as e:
-            logger.error(f"Error calculating indicators: {e}")
+            logger.error("Error calculating indicators: %s", e)
             return False
 
     def _run_analyzers(self, context: AnalysisContext) -> None:
-        """Run all enabled analyzers."""
-        for analyzer_name, analyzer in self.analyzers.items():
-            try:
-                analyzer.analyze(context)
-                logger.debug(f"  ✓ {analyzer_name} completed")
-            except Exception as e:
-                logger.error(f"  ✗ {analyzer_name} failed: {e}", exc_info=True)
+        """
+        Run all enabled analyzers.
+
+        An analyzer starts once the analyzers in its REQUIRED_RESULTS have
+        finished; independent analyzers run concurrently on the analyzer
+        thread pool (TA-Lib and NumPy release the GIL for most of their work).
+        Wall time of each analyzer is recorded in stats. Blocks the calling
+        thread until all analyzers finished.
+        """
+        start = time.perf_counter()
+        symbol, timeframe = context.symbol, context.timeframe
+
+        if self._analyzer_executor is None:
+            for analyzer_name in self.analyzer_dependencies:
+                self.stats.record_analyzer_time(
+                    *self._run_analyzer(analyzer_name, context), symbol, timeframe
+                )
+        else:
+            pending = dict(self.analyzer_dependencies)
+            finished = set()
+            running = {}
+
+            while pending or running:
+                ready = [name for name, deps in pending.items() if finished.issuperset(deps)]
+                for analyzer_name in ready:
+                    del pending[analyzer_name]
+                    future = self._analyzer_executor.submit(self._run_analyzer, analyzer_name, context)
+                    running[future] = analyzer_name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    analyzer_name, elapsed = future.result()
+                    del running[future]
+                    finished.add(analyzer_name)
+                    self.stats.record_analyzer_time(analyzer_name, elapsed, symbol, timeframe)
+
+        self._record_analyzers_phase(context, time.perf_counter() - start)
+
+    async def _run_analyzers_async(self, context: AnalysisContext) -> None:
+        """
+        Same schedule as _run_analyzers, awaited on the event loop.
+
+        The loop waits on the analyzer threads (asyncio.wrap_future) instead of
+        blocking in concurrent.futures.wait, so it keeps serving websocket
+        pings, fetches and other symbols during the analyzer phase. With
+        analyzer_workers <= 1 the analyzers run one by one on the loop, as before.
+        """
+        if self._analyzer_executor is None:
+            self._run_analyzers(context)
+            return
+
+        start = time.perf_counter()
+        pending = dict(self.analyzer_dependencies)
+        finished = set()
+        running = {}
+
+        while pending or running:
+            ready = [name for name, deps in pending.items() if finished.issuperset(deps)]
+            for analyzer_name in ready:
+                del pending[analyzer_name]
+                future = asyncio.wrap_future(
+                    self._analyzer_executor.submit(self._run_analyzer, analyzer_name, context)
+                )
+                running[future] = analyzer_name
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                analyzer_name, elapsed = future.result()
+                del running[future]
+                finished.add(analyzer_name)
+                self.stats.record_analyzer_time(analyzer_name, elapsed, context.symbol, context.timeframe)
+
+        self._record_analyzers_phase(context, time.perf_counter() - start)
+
+    def _record_analyzers_phase(self, context: AnalysisContext, elapsed: float) -> None:
+        """Record the wall time of the whole analyzer phase."""
+        self.stats.analyzers_wall_time += elapsed
+        self.stats.record_latency('analyzers', elapsed, context.symbol, context.timeframe)
+
+    def _run_analyzer(self, analyzer_name: str, context: AnalysisContext) -> Tuple[str, float]:
+        """
+        Run one analyzer.
+
+        Returns:
+            Tuple of (analyzer_name, wall time in seconds)
+        """
+        start = time.perf_counter()
+        try:
+            self.analyzers[analyzer_name].analyze(context)
+            logger.debug("  ✓ %s completed", analyzer_name)
+        except Exception as e:
+            logger.error("  ✗ %s failed: %s", analyzer_name, e, exc_info=True)
+        return analyzer_name, time.perf_counter() - start
 
     def _determine_direction(self, context: AnalysisContext) -> Optional[str]:
         """
@@ -614,7 +1029,7 @@ class SignalOrchestrator:
             elif htf_trend == 'bearish':
                 bearish_score += 2
 
-        logger.debug(f"Direction scores: Bullish={bullish_score:.1f}, Bearish={bearish_score:.1f}")
+        logger.debug("Direction scores: Bullish=%.1f, Bearish=%.1f", bullish_score, bearish_score)
 
         # Require 1.2x dominance
         if bullish_score > bearish_score * 1.2:
@@ -799,13 +1214,15 @@ class SignalOrchestrator:
             return signal
 
         except Exception as e:
-            logger.error(f"Error building signal: {e}")
+            logger.error("Error building signal: %s", e)
             return None
 
     async def _generate_signal_with_context(
             self,
             symbol: str,
-            timeframe: str
+            timeframe: str,
+            df: Optional[pd.DataFrame] = None,
+            htf_data: Optional[Dict[str, pd.DataFrame]] = None
     ) -> Optional[Tuple[SignalInfo, AnalysisContext]]:
         """
         Generate signal and return both signal and context.
@@ -815,6 +1232,8 @@ class SignalOrchestrator:
         Args:
             symbol: Trading symbol
             timeframe: Timeframe
+            df: OHLCV data already fetched by the caller (None = fetch it)
+            htf_data: Frames of the other timeframes (see generate_signal_for_symbol)
 
         Returns:
             Tuple of (SignalInfo, AnalysisContext) or None
@@ -822,30 +1241,31 @@ class SignalOrchestrator:
         try:
             # Check if context is cached (to avoid duplicate calculation)
             cache_key = f"{symbol}:{timeframe}"
-            if cache_key in self._context_cache:
-                cached_context, timestamp = self._context_cache[cache_key]
-                # Check if cache is still valid (within TTL)
-                if time.time() - timestamp < self._context_cache_ttl:
-                    logger.debug(f"💾 Using cached context for {symbol} {timeframe}")
-                    # Get signal from TimeframeScoreCache
-                    signal = self.tf_score_cache.get_cached_score(symbol, timeframe)
-                    if signal:
-                        return (signal, cached_context)
+            cached_context = self._context_cache.get(cache_key, max_age=self._context_cache_ttl)
+            if cached_context is not None:
+                logger.debug("💾 Using cached context for %s %s", symbol, timeframe)
+                # Get signal from TimeframeScoreCache
+                signal = self.tf_score_cache.get_cached_score(symbol, timeframe)
+                if signal:
+                    return (signal, cached_context)
 
             # Use the main generate_signal_for_symbol method
-            signal = await self.generate_signal_for_symbol(symbol, timeframe)
+            signal = await self.generate_signal_for_symbol(symbol, timeframe, df, htf_data)
 
             if not signal:
                 return None
 
             # Get context from cache (should be there after generate_signal_for_symbol)
-            if cache_key in self._context_cache:
-                cached_context, _ = self._context_cache[cache_key]
+            cached_context = self._context_cache.get(cache_key)
+            if cached_context is not None:
                 return (signal, cached_context)
 
             # Fallback: Recreate context if not in cache (shouldn't happen normally)
-            logger.warning(f"Context not found in cache for {symbol} {timeframe}, recreating...")
-            df = await self._fetch_market_data(symbol, timeframe)
+            logger.warning("Context not found in cache for %s %s, recreating...", symbol, timeframe)
+            if df is None:
+                df = await self._fetch_market_data(symbol, timeframe)
+            else:
+                df = self._check_market_data(symbol, df)
             if df is None:
                 return None
 
@@ -854,15 +1274,17 @@ class SignalOrchestrator:
                 timeframe=timeframe,
                 df=df
             )
+            if htf_data is not None:
+                context.metadata['htf_data'] = htf_data
 
-            # Recalculate indicators and analyzers to populate context
-            self._calculate_indicators(context)
-            self._run_analyzers(context)
+            # Recalculate indicators, market regime and analyzers to populate context
+            if not await self._compute_context(context):
+                return None
 
             return (signal, context)
 
         except Exception as e:
-            logger.error(f"Error generating signal with context for {symbol} {timeframe}: {e}")
+            logger.error("Error generating signal with context for %s %s: %s", symbol, timeframe, e)
             return None
 
     async def analyze_symbol(
@@ -874,65 +1296,86 @@ class SignalOrchestrator:
         Wrapper method for multi-timeframe signal generation.
 
         This method is called by SignalProcessor with multi-timeframe data.
-        It generates signals for each timeframe and aggregates them.
+        It generates signals for all timeframes concurrently from the supplied
+        frames (fetching only frames that are missing) and aggregates them.
 
         Args:
             symbol: Trading symbol (e.g., 'BTCUSDT')
-            timeframes_data: Dict of {timeframe: DataFrame}
+            timeframes_data: Dict of {timeframe: DataFrame}; a None value
+                             means the frame is fetched by the orchestrator
 
         Returns:
             Aggregated SignalInfo or best signal (depending on config)
         """
         try:
-            logger.debug(f"analyze_symbol called for {symbol} with {len(timeframes_data)} timeframes")
+            logger.debug("analyze_symbol called for %s with %s timeframes", symbol, len(timeframes_data))
 
-            # Filter valid timeframes
+            # Filter valid timeframes (None = not supplied, fetched below)
             valid_timeframes = {
                 tf: df for tf, df in timeframes_data.items()
-                if df is not None and not df.empty
+                if df is None or not df.empty
             }
 
             if not valid_timeframes:
-                logger.warning(f"No valid timeframes data for {symbol}")
+                logger.warning("No valid timeframes data for %s", symbol)
                 return None
 
             # === Multi-TF Aggregation (OLD SYSTEM) ===
             if not self.use_multi_tf_aggregation or not self.multi_tf_aggregator:
-                logger.warning(f"Multi-TF aggregation is disabled - cannot analyze {symbol}")
+                logger.warning("Multi-TF aggregation is disabled - cannot analyze %s", symbol)
                 return None
 
-            logger.info(f"🔄 Using Multi-TF Aggregation (OLD SYSTEM) for {symbol}")
+            logger.info("🔄 Using Multi-TF Aggregation (OLD SYSTEM) for %s", symbol)
 
-            # Generate signals with contexts for each timeframe
-            timeframe_signals: Dict[str, TimeframeSignal] = {}
+            # Frames of all timeframes, shared by reference as HTF data; each
+            # entry is replaced by the frame with indicator columns once calculated
+            htf_data = {tf: df for tf, df in valid_timeframes.items() if df is not None}
 
-            for timeframe in valid_timeframes.keys():
+            # Generate signals with contexts for all timeframes concurrently
+            async def timeframe_signal(timeframe: str, df: Optional[pd.DataFrame]) -> Optional[TimeframeSignal]:
                 try:
-                    result = await self._generate_signal_with_context(symbol, timeframe)
-                    if result:
-                        signal, context = result
-
-                        # Build TimeframeSignal
-                        tf_signal = TimeframeSignal(
-                            timeframe=timeframe,
-                            direction=signal.direction,
-                            score=signal.score,
-                            context=context,
-                            volume_confirmed=(context.get_result('volume') or {}).get('is_confirmed', False)
-                        )
+                    result = await self._generate_signal_with_context(symbol, timeframe, df, htf_data)
+                    if not result:
+                        return None
+
+                    signal, context = result
+                    logger.debug(
+                        "  ✓ Generated %s signal: %s, score=%.2f",
+                        timeframe, signal.direction, signal.score.final_score
+                    )
 
-                        timeframe_signals[timeframe] = tf_signal
-                        logger.debug(f"  ✓ Generated {timeframe} signal: {signal.direction}, score={signal.score.final_score:.2f}")
+                    return TimeframeSignal(
+                        timeframe=timeframe,
+                        direction=signal.direction,
+                        score=signal.score,
+                        context=context,
+                        volume_confirmed=(context.get_result('volume') or {}).get('is_confirmed', False)
+                    )
 
                 except Exception as e:
-                    logger.error(f"Error generating signal for {symbol} {timeframe}: {e}")
-                    continue
+                    logger.error("Error generating signal for %s %s: %s", symbol, timeframe, e)
+                    return None
+
+            # Highest timeframe first: in-process, its indicators are calculated
+            # before lower timeframes run the HTF analyzer
+            ordered = sorted(
+                valid_timeframes,
+                key=lambda tf: HTFAnalyzer.TF_HIERARCHY.get(tf, 0),
+                reverse=True
+            )
+            results = await asyncio.gather(*(
+                timeframe_signal(timeframe, valid_timeframes[timeframe]) for timeframe in ordered
+            ))
+
+            timeframe_signals: Dict[str, TimeframeSignal] = {
+                tf_signal.timeframe: tf_signal for tf_signal in results if tf_signal
+            }
 
             if not timeframe_signals:
-                logger.debug(f"No valid timeframe signals for {symbol}")
+                logger.debug("No valid timeframe signals for %s", symbol)
                 return None
 
-            logger.info(f"  📊 Aggregating {len(timeframe_signals)} timeframe signals for {symbol}")
+            logger.info("  📊 Aggregating %s timeframe signals for %s", len(timeframe_signals), symbol)
 
             # Aggregate using OLD SYSTEM approach
             aggregated_signal = self.multi_tf_aggregator.aggregate_timeframe_scores(
@@ -942,25 +1385,26 @@ class SignalOrchestrator:
 
             if aggregated_signal:
                 logger.info(
-                    f"✅ Multi-TF aggregated signal for {symbol}: {aggregated_signal.direction}, "
-                    f"score={aggregated_signal.score.final_score:.2f}"
+                    "✅ Multi-TF aggregated signal for %s: %s, "
+                    "score=%.2f",
+                    symbol, aggregated_signal.direction, aggregated_signal.score.final_score
                 )
                 return aggregated_signal
             else:
-                logger.info(f"No clear direction from multi-TF aggregation for {symbol}")
+                logger.info("No clear direction from multi-TF aggregation for %s", symbol)
                 return None
 
         except Exception as e:
-            logger.error(f"Error in analyze_symbol for {symbol}: {e}", exc_info=True)
+            logger.error("Error in analyze_symbol for %s: %s", symbol, e, exc_info=True)
             return None
 
     async def _send_to_trade_manager(self, signal: SignalInfo) -> None:
         """Send signal to TradeManager via callback."""
         try:
             await self.trade_manager_callback(signal)
-            logger.info(f"Signal sent to TradeManager: {signal.symbol}")
+            logger.info("Signal sent to TradeManager: %s", signal.symbol)
         except Exception as e:
-            logger.error(f"Failed to send signal to TradeManager: {e}", exc_info=True)
+            logger.error("Failed to send signal to TradeManager: %s", e, exc_info=True)
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get orchestrator statistics."""
@@ -975,6 +1419,8 @@ class SignalOrchestrator:
                 'efficiency': efficiency
             }
 
+        stats['context_cache'] = self._context_cache.get_stats()
+
         return stats
 
     def reset_statistics(self) -> None:
@@ -991,13 +1437,55 @@ class SignalOrchestrator:
             efficiency = self.tf_score_cache.estimate_efficiency_gain()
             logger.info("=" * 60)
             logger.info("📈 Efficiency Gains from Caching:")
-            logger.info(f"Total requests: {efficiency['total_requests']}")
-            logger.info(f"Requests saved: {efficiency['cache_hits']} ({efficiency['requests_saved_percentage']:.1f}%)")
-            logger.info(f"Estimated time saved: {efficiency['estimated_time_saved_minutes']:.1f} minutes")
+            logger.info("Total requests: %s", efficiency['total_requests'])
+            logger.info("Requests saved: %s (%.1f%%)", efficiency['cache_hits'], efficiency['requests_saved_percentage'])
+            logger.info("Estimated time saved: %.1f minutes", efficiency['estimated_time_saved_minutes'])
             logger.info("=" * 60)
         else:
             logger.info("Timeframe score cache is disabled")
 
+        # آمار کش context
+        context_stats = self._context_cache.get_stats()
+        logger.info(
+            "Context cache: %s entries, "
+            "%.1f MB, "
+            "hit rate %.1f%%, "
+            "evictions %s, "
+            "expirations %s",
+            context_stats['entries'], context_stats['bytes'] / (1024 * 1024),
+            context_stats['hit_rate'] * 100, context_stats['evictions'], context_stats['expirations']
+        )
+
+        # تاخیر مراحل pipeline (p50/p95/p99)
+        latency = self.stats.get_latency_summary()
+        if latency:
+            logger.info("⏱️  Pipeline stage latency (ms):")
+            for stage, summary in sorted(latency.items(), key=lambda item: -item[1]['p95']):
+                logger.info(
+                    "  %-28s n=%-6s "
+                    "p50=%8.1f "
+                    "p95=%8.1f "
+                    "p99=%8.1f "
+                    "max=%8.1f",
+                    stage, summary['count'], summary['p50'] * 1000, summary['p95'] * 1000,
+                    summary['p99'] * 1000, summary['max'] * 1000
+                )
+
+            # کندترین symbol/timeframe ها بر اساس p95 کل
+            slowest = sorted(
+                (
+                    (key, stages['total'].percentile(95))
+                    for key, stages in self.stats.symbol_latency.items()
+                    if 'total' in stages
+                ),
+                key=lambda item: -item[1]
+            )[:5]
+            if slowest:
+                logger.info(
+                    "  Slowest (total p95): %s",
+                    ", ".join(f"{key} {p95 * 1000:.0f}ms" for key, p95 in slowest)
+                )
+
     def register_trade_result(self, trade_result: TradeResult) -> None:
         """
         Register a trade result for system learning and feedback.
@@ -1010,28 +1498,32 @@ class SignalOrchestrator:
             if self.adaptive_learning.enabled:
                 self.adaptive_learning.add_trade_result(trade_result)
                 logger.debug(
-                    f"Trade result registered in adaptive learning: "
-                    f"{trade_result.symbol}, Profit: {trade_result.profit_r:.2f}R"
+                    "Trade result registered in adaptive learning: "
+                    "%s, Profit: %.2fR",
+                    trade_result.symbol, trade_result.profit_r
                 )
 
             # Add to emergency circuit breaker
             if self.circuit_breaker.enabled:
                 self.circuit_breaker.add_trade_result(trade_result)
                 logger.debug(
-                    f"Trade result registered in circuit breaker: "
-                    f"{trade_result.symbol}, Profit: {trade_result.profit_r:.2f}R"
+                    "Trade result registered in circuit breaker: "
+                    "%s, Profit: %.2fR",
+                    trade_result.symbol, trade_result.profit_r
                 )
 
             logger.info(
-                f"✅ Registered trade result for {trade_result.symbol}: "
-                f"Signal ID: {trade_result.signal_id}, "
-                f"Direction: {trade_result.direction}, "
-                f"Profit: {trade_result.profit_r:.2f}R, "
-                f"Exit: {trade_result.exit_reason}"
+                "✅ Registered trade result for %s: "
+                "Signal ID: %s, "
+                "Direction: %s, "
+                "Profit: %.2fR, "
+                "Exit: %s",
+                trade_result.symbol, trade_result.signal_id, trade_result.direction,
+                trade_result.profit_r, trade_result.exit_reason
             )
 
         except Exception as e:
-            logger.error(f"Error registering trade result: {e}", exc_info=True)
+            logger.error("Error registering trade result: %s", e, exc_info=True)
 
     def update_active_positions(self, positions: Dict[str, Dict[str, Any]]) -> None:
         """
@@ -1044,12 +1536,10 @@ class SignalOrchestrator:
         try:
             if self.correlation_manager.enabled:
                 self.correlation_manager.update_active_positions(positions)
-                logger.debug(
-                    f"Updated active positions: {len(positions)} positions"
-                )
+                logger.debug("Updated active positions: %s positions", len(positions))
 
         except Exception as e:
-            logger.error(f"Error updating active positions: {e}", exc_info=True)
+            logger.error("Error updating active positions: %s", e, exc_info=True)
 
     def shutdown(self) -> None:
         """
@@ -1068,13 +1558,19 @@ class SignalOrchestrator:
                 self.correlation_manager.save_data()
                 logger.info("  ✓ Correlation data saved")
 
+            # Stop analyzer threads and compute workers
+            if self._analyzer_executor is not None:
+                self._analyzer_executor.shutdown(wait=True)
+            if self.compute_pool is not None:
+                self.compute_pool.shutdown()
+
             # Log final statistics
-            logger.info(f"  Final stats: {self.stats}")
+            logger.info("  Final stats: %s", self.stats)
 
             logger.info("SignalOrchestrator shut down successfully.")
 
         except Exception as e:
-            logger.error(f"Error during shutdown: {e}", exc_info=True)
+            logger.error("Error during shutdown: %s", e, exc_info=True)
 
     def _build_signal_metadata(self, context: 'AnalysisContext', score: 'SignalScore', direction: str) -> Dict[str, Any]:
         """
@@ -1226,6 +1722,16 @@ class SignalOrchestrator:
             'regime_detector': {
                 'enabled': self.regime_detector.enabled if self.regime_detector else False
             },
+            'indicator_store': (
+                self.indicator_store.get_stats()
+                if self.indicator_store is not None
+                else {'enabled': False}
+            ),
+            'compute_pool': (
+                self.compute_pool.get_stats()
+                if self.compute_pool is not None
+                else {'enabled': False}
+            ),
             'adaptive_learning': {
                 'enabled': self.adaptive_learning.enabled if self.adaptive_learning else False,
                 'trade_count': len(self.adaptive_learning.trade_history) if self.adaptive_learning else 0
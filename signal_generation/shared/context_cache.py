@@ -0,0 +1,106 @@
+"""
+ContextCache - bounded cache of AnalysisContext objects.
+
+SignalOrchestrator keeps the context of the last analysis of every
+symbol/timeframe, so multi-timeframe aggregation can reuse it instead of
+recalculating. Each context holds the indicator-enriched DataFrame and all
+analyzer results; this cache bounds them by entry count and by an estimated
+byte budget (DataFrame memory_usage), evicting least recently used entries,
+and expires entries after a TTL. Cached contexts do not keep the frames of
+other timeframes (metadata['htf_data']), so every frame is released with
+the context that owns it.
+
+Usage:
+    cache = ContextCache(max_entries=500, max_bytes=256 * 1024 * 1024, ttl_seconds=14400)
+    cache.put('BTCUSDT:1h', context)
+    context = cache.get('BTCUSDT:1h', max_age=60)
+"""
+
+import logging
+from typing import Any, Optional
+
+from common.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCache(TTLCache):
+    """
+    LRU cache of AnalysisContext objects with entry, byte and TTL limits.
+
+    Entry size is the memory of the context's DataFrame (values and index,
+    without deep inspection of object columns). That is all a cached context
+    keeps alive: the HTF frames attached to its metadata belong to the
+    contexts of other timeframes and are detached on put().
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 500,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 14400
+    ):
+        """
+        Initialize ContextCache.
+
+        Args:
+            max_entries: Maximum number of contexts kept
+            max_bytes: Maximum estimated size of the kept DataFrames
+            ttl_seconds: Age after which an entry expires
+        """
+        super().__init__(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            default_ttl=ttl_seconds,
+            size_of=self.estimate_size,
+            name='context_cache'
+        )
+        self.ttl_seconds = ttl_seconds
+
+        logger.debug(
+            f"ContextCache initialized (max_entries={max_entries}, "
+            f"max_bytes={max_bytes}, ttl={ttl_seconds}s)"
+        )
+
+    @staticmethod
+    def estimate_size(context: Any) -> int:
+        """Estimated memory of a context: its DataFrame values and index."""
+        df = getattr(context, 'df', None)
+        if df is None:
+            return 0
+        return int(df.memory_usage(index=True, deep=False).sum())
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Get a cached context.
+
+        Args:
+            key: Cache key (e.g. 'BTCUSDT:1h')
+            max_age: Only return the context if it is younger than this
+                     (seconds); older entries are kept for other callers
+
+        Returns:
+            AnalysisContext, or None if not cached, expired or too old
+        """
+        return super().get(key, None, max_age=max_age)
+
+    def put(self, key: str, context: Any) -> None:
+        """
+        Store a context.
+
+        Least recently used entries are removed while the cache is over its
+        entry or byte limit. metadata['htf_data'] is removed from the context
+        (it is only read by HTFAnalyzer during the analysis), otherwise the
+        frames of other timeframes would stay alive, uncounted, after their
+        own contexts are evicted.
+
+        Args:
+            key: Cache key (e.g. 'BTCUSDT:1h')
+            context: AnalysisContext to store
+        """
+        metadata = getattr(context, 'metadata', None)
+        if metadata is not None:
+            metadata.pop('htf_data', None)
+
+        if not self.set(key, context):
+            logger.debug(f"Context {key} exceeds the cache budget, not cached")
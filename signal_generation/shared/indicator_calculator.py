@@ -7,10 +7,14 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 
+from signal_generation.analyzers.indicators import kernels
+from signal_generation.analyzers.indicators.base_indicator import assemble_columns
 from signal_generation.analyzers.indicators.indicator_orchestrator import IndicatorOrchestrator
+from signal_generation.analyzers.indicators.incremental_engine import IncrementalIndicatorEngine
+from signal_generation.shared.indicator_store import IndicatorStore
 
 # Import all indicator classes
 from signal_generation.analyzers.indicators import (
@@ -44,8 +48,22 @@ class IndicatorCalculator:
         calculator = IndicatorCalculator(config)
         calculator.calculate_all(context)
         # Now context.df has all indicator columns
+
+    Batch usage (many symbols, one vectorized pass per timeframe):
+        enriched = calculator.calculate_batch({'BTCUSDT': df1, 'ETHUSDT': df2}, '5m')
+        # Later calculate_all() calls for the same candles reuse these results
     """
 
+    OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+    # Backward compatibility columns -> indicator column they are built from
+    # (None = built from raw OHLCV, see _add_compat_columns())
+    COMPAT_COLUMNS = {
+        'slowk': 'stoch_k',
+        'slowd': 'stoch_d',
+        'volume_sma': None
+    }
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the IndicatorCalculator.
@@ -61,6 +79,33 @@ class IndicatorCalculator:
         # Register all indicators
         self._register_indicators()
 
+        # Required-columns mode: only indicators that consumers read are calculated
+        self.required_only = self._get_indicator_config().get('required_only', True)
+        self.required_columns: Optional[List[str]] = None
+
+        # Incremental (streaming) mode: only new candles are calculated
+        self.incremental_engine = None
+        if self._get_indicator_config().get('incremental', {}).get('enabled', False):
+            self.incremental_engine = IncrementalIndicatorEngine(self.orchestrator, config)
+
+        # Batch mode: per-symbol results of calculate_batch(), used by calculate_all()
+        batch_config = self._get_indicator_config().get('batch', {})
+        self.batch_enabled = batch_config.get('enabled', True)
+        self.batch_min_symbols = batch_config.get('min_symbols', 2)
+        self._batch_results: Dict[Tuple[str, str], Tuple[Tuple, Dict[str, np.ndarray]]] = {}
+        self.batch_stats = {
+            'batches': 0,
+            'symbols_batched': 0,
+            'hits': 0,
+            'misses': 0
+        }
+
+        # Shared per-candle store: results published for the regime detector / circuit breaker
+        self.indicator_store = None
+        store_config = self._get_indicator_config().get('store', {})
+        if store_config.get('enabled', True):
+            self.indicator_store = IndicatorStore(store_config.get('max_entries', 5000))
+
         logger.info(
             f"IndicatorCalculator initialized with {len(self.orchestrator.all_indicators)} indicators"
         )
@@ -85,6 +130,42 @@ class IndicatorCalculator:
 
         logger.debug(f"Registered {len(self.orchestrator.all_indicators)} indicators")
 
+    def set_required_columns(self, columns: Optional[List[str]]) -> None:
+        """
+        Calculate only the indicators needed for the given columns.
+
+        Called by SignalOrchestrator with the columns declared by the enabled
+        analyzers; the orchestrator resolves the indicator DAG closure.
+
+        Args:
+            columns: Indicator columns read by consumers (None = all indicators)
+        """
+        if not self.required_only or columns is None:
+            self.required_columns = None
+            self.orchestrator.set_required_columns(None)
+            return
+
+        self.required_columns = sorted(set(columns))
+
+        indicator_columns = set()
+        for col in self.required_columns:
+            if col in self.COMPAT_COLUMNS:
+                if self.COMPAT_COLUMNS[col] is not None:
+                    indicator_columns.add(self.COMPAT_COLUMNS[col])
+            elif col not in self.OHLCV_COLUMNS:
+                indicator_columns.add(col)
+
+        self.orchestrator.set_required_columns(indicator_columns)
+
+        # Drop batch results calculated with the previous plan
+        self._batch_results.clear()
+
+    def _get_indicator_config(self) -> Dict[str, Any]:
+        """Get indicator_calculator config (nested or flat)."""
+        if 'signal_generation_v2' in self.config:
+            return self.config.get('signal_generation_v2', {}).get('indicator_calculator', {})
+        return self.config.get('indicator_calculator', {})
+
     def calculate_all(self, context) -> None:
         """
         Calculate all indicators and add them to context.df
@@ -110,23 +191,24 @@ class IndicatorCalculator:
             # Set timeframe for all indicators (for per-TF parameter support)
             self.orchestrator.set_timeframe(timeframe)
 
-            # Calculate all indicators using orchestrator
-            enriched_df = self.orchestrator.calculate_all(df)
+            # Reuse the result of a previous calculate_batch() for the same candles
+            outputs = self._take_batch_result(context.symbol, timeframe, df)
+
+            if outputs is None:
+                # Calculate all indicators using orchestrator (output columns only)
+                # (incremental mode only calculates candles added since the last call)
+                if self.incremental_engine is not None:
+                    outputs = dict(self.incremental_engine.calculate_outputs(df, context.symbol, timeframe))
+                else:
+                    outputs = self.orchestrator.calculate_outputs(df)
 
-            # Add backward compatibility aliases for column names
-            # Old code expects 'slowk' and 'slowd' but new code uses 'stoch_k' and 'stoch_d'
-            if 'stoch_k' in enriched_df.columns:
-                enriched_df['slowk'] = enriched_df['stoch_k']
-            if 'stoch_d' in enriched_df.columns:
-                enriched_df['slowd'] = enriched_df['stoch_d']
+                self._add_compat_columns(outputs, df['volume'].values)
 
-            # Add volume_sma for backward compatibility (volume analyzer expects it)
-            if 'volume' in enriched_df.columns:
-                volume_sma_period = self.config.get('volume_sma_period', 20)
-                enriched_df['volume_sma'] = enriched_df['volume'].rolling(window=volume_sma_period).mean()
+            # Update context with enriched dataframe (built once, in a single allocation)
+            context.df = assemble_columns(df, outputs)
 
-            # Update context with enriched dataframe
-            context.df = enriched_df
+            # Share the results with other consumers of the same candle
+            self._publish_to_store(context.symbol, timeframe, df, outputs)
 
             # Get stats
             stats = self.orchestrator.get_stats()
@@ -140,6 +222,177 @@ class IndicatorCalculator:
         except Exception as e:
             logger.error(f"Error in IndicatorCalculator for {context.symbol}: {e}", exc_info=True)
 
+    def calculate_batch(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        timeframe: str
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Calculate all indicators for many symbols of one timeframe at once.
+
+        Frames with the same number of candles are stacked into
+        (symbols x candles) arrays and every indicator runs once over the
+        whole panel, instead of once per symbol. The results are kept so that
+        the next calculate_all() for the same symbol/candles reuses them.
+
+        Args:
+            frames: Dictionary of symbol -> DataFrame with OHLCV data
+            timeframe: Timeframe of all frames
+
+        Returns:
+            Dictionary of symbol -> new DataFrame with all indicator columns
+        """
+        results: Dict[str, pd.DataFrame] = {}
+
+        # Drop results of the previous batch for this timeframe
+        for key in [key for key in self._batch_results if key[1] == timeframe]:
+            del self._batch_results[key]
+
+        try:
+            valid_frames = {
+                symbol: df for symbol, df in frames.items()
+                if self._validate_dataframe(df)
+            }
+
+            self.orchestrator.set_timeframe(timeframe)
+
+            # Group aligned frames (same number of candles)
+            groups: Dict[int, List[str]] = {}
+            for symbol, df in valid_frames.items():
+                groups.setdefault(len(df), []).append(symbol)
+
+            for symbols in groups.values():
+                if not self.batch_enabled or len(symbols) < self.batch_min_symbols:
+                    # Too few symbols to benefit from a panel
+                    for symbol in symbols:
+                        df = valid_frames[symbol]
+                        outputs = self.orchestrator.calculate_outputs(df)
+                        self._add_compat_columns(outputs, df['volume'].values)
+                        self._store_batch_result(symbol, timeframe, df, outputs)
+                        results[symbol] = assemble_columns(df, outputs)
+                    continue
+
+                panel = {
+                    col: np.vstack([valid_frames[symbol][col].values for symbol in symbols]).astype(float)
+                    for col in self.OHLCV_COLUMNS
+                }
+                panel_outputs = self.orchestrator.calculate_panel(panel)
+                self._add_compat_columns(panel_outputs, panel['volume'])
+
+                # Split back into per-symbol rows (views of the panel arrays)
+                for row, symbol in enumerate(symbols):
+                    df = valid_frames[symbol]
+                    outputs = {col: values[row] for col, values in panel_outputs.items()}
+                    self._store_batch_result(symbol, timeframe, df, outputs)
+                    results[symbol] = assemble_columns(df, outputs)
+
+                self.batch_stats['batches'] += 1
+                self.batch_stats['symbols_batched'] += len(symbols)
+
+            logger.debug(
+                f"Batch indicators for {len(results)} symbols ({timeframe}) "
+                f"in {len(groups)} group(s)"
+            )
+
+        except Exception as e:
+            logger.error(f"Error in batch indicator calculation ({timeframe}): {e}", exc_info=True)
+
+        return results
+
+    def _add_compat_columns(self, outputs: Dict[str, np.ndarray], volume: np.ndarray) -> None:
+        """
+        Add backward compatibility columns to indicator outputs.
+
+        Args:
+            outputs: Indicator outputs (updated in place)
+            volume: Volume values (1-D, or symbols x candles for a panel)
+        """
+        # Add backward compatibility aliases for column names
+        # Old code expects 'slowk' and 'slowd' but new code uses 'stoch_k' and 'stoch_d'
+        if 'stoch_k' in outputs:
+            outputs['slowk'] = outputs['stoch_k']
+        if 'stoch_d' in outputs:
+            outputs['slowd'] = outputs['stoch_d']
+
+        # Add volume_sma for backward compatibility (volume analyzer expects it)
+        if self.required_columns is None or 'volume_sma' in self.required_columns:
+            volume_sma_period = self.config.get('volume_sma_period', 20)
+            outputs['volume_sma'] = kernels.rolling_mean(volume, volume_sma_period)
+
+    def _publish_to_store(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        outputs: Dict[str, np.ndarray]
+    ) -> None:
+        """
+        Publish shareable indicator outputs to the IndicatorStore.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            df: DataFrame with OHLCV data (identifies the candle)
+            outputs: Calculated indicator outputs
+        """
+        if self.indicator_store is None:
+            return
+
+        for name in self.orchestrator.get_plan():
+            indicator = self.orchestrator.all_indicators[name]
+            store_key = indicator.get_store_key()
+            if store_key is None or not all(col in outputs for col in indicator.output_columns):
+                continue
+
+            key = self.indicator_store.make_key(symbol, timeframe, df, *store_key)
+            self.indicator_store.put(key, {col: outputs[col] for col in indicator.output_columns})
+
+        if 'volume_sma' in outputs:
+            key = self.indicator_store.make_key(
+                symbol, timeframe, df, 'volume_sma', {'period': self.config.get('volume_sma_period', 20)}
+            )
+            self.indicator_store.put(key, {'volume_sma': outputs['volume_sma']})
+
+    @staticmethod
+    def _frame_signature(df: pd.DataFrame) -> Tuple:
+        """Identify a frame's candles (length, last index, first/last close, last volume)."""
+        close = df['close'].values
+        return (len(df), df.index[-1], float(close[0]), float(close[-1]), float(df['volume'].values[-1]))
+
+    def _store_batch_result(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        outputs: Dict[str, np.ndarray]
+    ) -> None:
+        """Keep a batch result for the next calculate_all() of this symbol/timeframe."""
+        self._batch_results[(symbol, timeframe)] = (self._frame_signature(df), outputs)
+
+    def _take_batch_result(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get (and release) the batch result for these candles, if any.
+
+        Returns:
+            Indicator outputs, or None if there is no matching batch result
+        """
+        entry = self._batch_results.pop((symbol, timeframe), None)
+        if entry is None:
+            return None
+
+        signature, outputs = entry
+        if signature != self._frame_signature(df):
+            self.batch_stats['misses'] += 1
+            return None
+
+        self.batch_stats['hits'] += 1
+        return dict(outputs)
+
     def _validate_dataframe(self, df: pd.DataFrame) -> bool:
         """
         Validate that dataframe has required columns.
@@ -227,6 +480,11 @@ class IndicatorCalculator:
     def clear_cache(self):
         """Clear caches for all indicators."""
         self.orchestrator.clear_all_caches()
+        if self.incremental_engine is not None:
+            self.incremental_engine.clear()
+        self._batch_results.clear()
+        if self.indicator_store is not None:
+            self.indicator_store.clear()
         logger.debug("All indicator caches cleared")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -236,7 +494,14 @@ class IndicatorCalculator:
         Returns:
             Dictionary with statistics
         """
-        return self.orchestrator.get_stats()
+        stats = self.orchestrator.get_stats()
+        if self.incremental_engine is not None:
+            stats['incremental'] = self.incremental_engine.get_stats()
+        stats['batch'] = dict(self.batch_stats, pending=len(self._batch_results))
+        if self.indicator_store is not None:
+            stats['store'] = self.indicator_store.get_stats()
+        stats['plan'] = self.orchestrator.get_plan()
+        return stats
 
     def get_available_indicators(self) -> Dict[str, List[str]]:
         """
@@ -0,0 +1,236 @@
+"""
+IndicatorStore - shared per-candle indicator results.
+
+Content-addressed store for indicator values, keyed by
+(symbol, timeframe, last candle, indicator name, parameter hash).
+IndicatorCalculator publishes what it calculated; MarketRegimeDetector and
+EmergencyCircuitBreaker query the store before recalculating, so each value
+is computed once per candle and reused by every consumer.
+
+Usage:
+    store = IndicatorStore(max_entries=5000)
+    values = store.get_or_compute(
+        'BTCUSDT', '5m', df, 'atr', {'period': 14},
+        lambda: {'atr': kernels.atr(high, low, close, 14)}
+    )
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class IndicatorStore:
+    """
+    LRU store of indicator results shared between consumers.
+
+    The candle part of the key is (last timestamp, number of rows, last close),
+    so a revised forming candle or a different history window never returns
+    stale values. Stored arrays are read-only and shared by reference.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        """
+        Initialize IndicatorStore.
+
+        Args:
+            max_entries: Maximum number of entries kept (least recently used are evicted)
+        """
+        self.max_entries = max_entries
+
+        # Entries by key, least recently used first
+        self._entries: 'OrderedDict[Tuple, Dict[str, np.ndarray]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'puts': 0,
+            'evictions': 0,
+            'uncacheable': 0
+        }
+
+        logger.debug(f"IndicatorStore initialized (max_entries={max_entries})")
+
+    @staticmethod
+    def _candle_signature(df: pd.DataFrame) -> Optional[Tuple]:
+        """
+        Identify the last candle of df: (timestamp, rows, close).
+
+        Supports DatetimeIndex (live data) and 'timestamp' column (backtest data).
+
+        Returns:
+            Signature tuple, or None if df has no timestamps
+        """
+        if df is None or len(df) == 0:
+            return None
+
+        if isinstance(df.index, pd.DatetimeIndex):
+            last_ts = df.index.asi8[-1]
+        elif 'timestamp' in df.columns:
+            last_ts = df['timestamp'].iloc[-1]
+            if isinstance(last_ts, pd.Timestamp):
+                last_ts = last_ts.value
+        else:
+            return None
+
+        return (last_ts, len(df), float(df['close'].values[-1]))
+
+    @staticmethod
+    def _normalize_param(value: Any) -> Any:
+        """Same value for equal numbers (14, 14.0, np.int64(14)), so every consumer builds the same key."""
+        if isinstance(value, (bool, np.bool_)):
+            return bool(value)
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            value = float(value)
+            return int(value) if value.is_integer() else value
+        return value
+
+    @staticmethod
+    def params_hash(params: Optional[Dict[str, Any]]) -> str:
+        """Stable hash of indicator parameters."""
+        normalized = {name: IndicatorStore._normalize_param(value) for name, value in (params or {}).items()}
+        payload = json.dumps(normalized, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def make_key(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        name: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple]:
+        """
+        Build the store key for an indicator on the last candle of df.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            df: DataFrame with OHLCV data
+            name: Indicator name (e.g. 'rsi', 'directional_movement')
+            params: Indicator parameters
+
+        Returns:
+            Key tuple, or None if df cannot be identified
+        """
+        signature = self._candle_signature(df)
+        if symbol is None or signature is None:
+            return None
+        return (symbol, timeframe, signature, name, self.params_hash(params))
+
+    def get(self, key: Optional[Tuple]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get stored values.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Dictionary of column -> values, or None if not stored
+        """
+        if key is None:
+            return None
+
+        with self._lock:
+            values = self._entries.get(key)
+            if values is None:
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return values
+
+    def put(self, key: Optional[Tuple], values: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Store values (arrays are converted to read-only float arrays).
+
+        Args:
+            key: Key from make_key()
+            values: Dictionary of column -> values
+
+        Returns:
+            The stored dictionary
+        """
+        entry = {}
+        for col, array in values.items():
+            array = np.asarray(array, dtype=float)
+            array.flags.writeable = False
+            entry[col] = array
+
+        if key is None:
+            return entry
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.stats['puts'] += 1
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+        return entry
+
+    def get_or_compute(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        name: str,
+        params: Optional[Dict[str, Any]],
+        compute: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get stored values, or compute and store them.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            df: DataFrame with OHLCV data
+            name: Indicator name
+            params: Indicator parameters
+            compute: Function returning a dictionary of column -> values
+
+        Returns:
+            Dictionary of column -> values
+        """
+        key = self.make_key(symbol, timeframe, df, name, params)
+        if key is None:
+            self.stats['uncacheable'] += 1
+            return compute()
+
+        values = self.get(key)
+        if values is None:
+            values = self.put(key, compute())
+
+        return values
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        lookups = self.stats['hits'] + self.stats['misses']
+        return dict(
+            self.stats,
+            entries=len(self._entries),
+            hit_rate=self.stats['hits'] / lookups if lookups else 0.0
+        )
@@ -0,0 +1,141 @@
+"""
+Tests for ContextCache: DataFrame-based size estimate, LRU eviction by the
+byte budget and the entry limit, TTL expiry, the max_age reuse window, and
+HTF frames released with the context that owns them.
+
+Usage:
+    python signal_generation/shared/test_context_cache.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import gc
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.context import AnalysisContext
+from signal_generation.shared.context_cache import ContextCache
+
+
+def _make_context(symbol: str, rows: int = 100) -> AnalysisContext:
+    """Context with a float OHLCV frame of the given length."""
+    df = pd.DataFrame(
+        np.ones((rows, 5)),
+        columns=['open', 'high', 'low', 'close', 'volume'],
+        index=pd.date_range('2024-01-01', periods=rows, freq='1h')
+    )
+    return AnalysisContext(symbol, '1h', df)
+
+
+def test_size_estimate():
+    """Entry size is the frame's values plus index; contexts without a frame count as 0."""
+    context = _make_context('BTCUSDT', rows=100)
+    assert ContextCache.estimate_size(context) == 100 * 5 * 8 + 100 * 8
+    assert ContextCache.estimate_size(object()) == 0
+    print("  ✓ 100 rows x 5 columns = 4800 bytes")
+
+
+def test_byte_budget_eviction():
+    """Over max_bytes the least recently used contexts are evicted; oversized ones are not cached."""
+    size = ContextCache.estimate_size(_make_context('X'))
+    cache = ContextCache(max_entries=100, max_bytes=3 * size, ttl_seconds=60)
+
+    for symbol in ('A', 'B', 'C'):
+        cache.put(f'{symbol}:1h', _make_context(symbol))
+    assert cache.get('A:1h') is not None          # A becomes most recently used
+    cache.put('D:1h', _make_context('D'))
+
+    assert cache.get('B:1h') is None, "least recently used context kept"
+    assert all(cache.get(f'{s}:1h') is not None for s in 'ACD')
+    assert cache.bytes == 3 * size and cache.stats['evictions'] == 1
+
+    cache.put('BIG:1h', _make_context('BIG', rows=400))
+    assert cache.get('BIG:1h') is None and cache.stats['rejected'] == 1 and len(cache) == 3
+
+    stats = cache.get_stats()
+    assert stats['name'] == 'context_cache' and stats['entries'] == 3 and stats['bytes'] == 3 * size
+    print(f"  ✓ budget {3 * size} bytes: 1 eviction, 1 rejected")
+
+
+def test_entry_limit():
+    """max_entries bounds the cache independently of the byte budget."""
+    cache = ContextCache(max_entries=2, max_bytes=10 ** 9, ttl_seconds=60)
+    for symbol in ('A', 'B', 'C'):
+        cache.put(f'{symbol}:1h', _make_context(symbol))
+
+    assert len(cache) == 2 and 'A:1h' not in cache and cache.stats['evictions'] == 1
+    print("  ✓ oldest of 3 contexts evicted at max_entries=2")
+
+
+def test_ttl_and_max_age():
+    """Entries expire after ttl_seconds; max_age only hides older entries from that caller."""
+    cache = ContextCache(ttl_seconds=0.1)
+    context = _make_context('BTCUSDT')
+    cache.put('BTCUSDT:1h', context)
+
+    time.sleep(0.03)
+    assert cache.get('BTCUSDT:1h', max_age=0.01) is None, "max_age not applied"
+    assert cache.get('BTCUSDT:1h') is context, "max_age removed the entry"
+
+    time.sleep(0.08)
+    assert cache.get('BTCUSDT:1h') is None and len(cache) == 0 and cache.bytes == 0
+    assert cache.stats['stale'] == 1 and cache.stats['expirations'] == 1
+    print("  ✓ max_age window, TTL expiry releases the bytes")
+
+
+def test_htf_frames_released():
+    """Cached contexts do not pin the HTF frames of evicted contexts."""
+    cache = ContextCache(max_entries=1, max_bytes=10 ** 9, ttl_seconds=60)
+    context_1h = _make_context('BTCUSDT', rows=400)
+    context_5m = _make_context('BTCUSDT', rows=100)
+    htf_data = {'5m': context_5m.df, '1h': context_1h.df}
+    context_1h.metadata['htf_data'] = htf_data
+    context_5m.metadata['htf_data'] = htf_data
+
+    cache.put('BTCUSDT:1h', context_1h)
+    cache.put('BTCUSDT:5m', context_5m)          # evicts the 1h context
+    assert 'BTCUSDT:1h' not in cache and 'htf_data' not in context_5m.metadata
+    assert cache.bytes == ContextCache.estimate_size(context_5m)
+
+    frame_1h = weakref.ref(context_1h.df)
+    del context_1h, htf_data
+    gc.collect()
+    assert frame_1h() is None, "evicted 1h frame still referenced"
+    assert cache.get('BTCUSDT:5m') is context_5m
+    print(f"  ✓ 1h frame released on eviction, {cache.bytes} bytes = the 5m frame")
+
+
+def main():
+    """Run the ContextCache tests."""
+    tests = [
+        test_size_estimate,
+        test_byte_budget_eviction,
+        test_entry_limit,
+        test_ttl_and_max_age,
+        test_htf_frames_released,
+    ]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All context cache tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,145 @@
+"""
+Parity test for the batched indicator calculation (IndicatorCalculator.calculate_batch).
+
+Frames calculated as one (symbols x candles) panel must equal per-symbol
+calculate_all() on a calculator without batch results, for symbols with
+different lengths and with misaligned timestamps; calculate_all() reuses a
+batch result only for the same candles.
+
+Usage:
+    python signal_generation/shared/test_indicator_batch.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.context import AnalysisContext
+from signal_generation.shared.indicator_calculator import IndicatorCalculator
+
+CONFIG = {'indicator_calculator': {'store': {'enabled': False}}}
+
+
+def _make_ohlcv(n: int, seed: int, start: str = '2024-01-01') -> pd.DataFrame:
+    """Random-walk OHLCV data (hourly from start)."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_p = close + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        'open': open_p,
+        'high': np.maximum(open_p, close) + rng.random(n),
+        'low': np.minimum(open_p, close) - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 1000,
+    }, index=pd.date_range(start, periods=n, freq='1h'))
+
+
+def _frames() -> dict:
+    """Two aligned groups (300 and 120 candles) with shifted start times, plus a lone length."""
+    frames = {
+        'BTCUSDT': _make_ohlcv(300, 1),
+        'ETHUSDT': _make_ohlcv(300, 2, start='2024-01-01 05:00'),
+        'SOLUSDT': _make_ohlcv(300, 3, start='2023-12-20 13:00'),
+        'XRPUSDT': _make_ohlcv(120, 4),
+        'ADAUSDT': _make_ohlcv(120, 5, start='2024-02-01'),
+        'DOTUSDT': _make_ohlcv(75, 6),
+    }
+    # Integer volume in a float panel, missing closes inside the history
+    frames['SOLUSDT']['volume'] = (frames['SOLUSDT']['volume'] * 10).astype('int64')
+    frames['ETHUSDT'].iloc[50:53, frames['ETHUSDT'].columns.get_loc('close')] = np.nan
+    return frames
+
+
+def _calculate_all(calculator: IndicatorCalculator, symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+    context = AnalysisContext(symbol, '1h', df)
+    calculator.calculate_all(context)
+    return context.df
+
+
+def test_batch_matches_calculate_all():
+    """calculate_batch output equals per-symbol calculate_all (values, columns, order, dtypes, index)."""
+    frames = _frames()
+    batched = IndicatorCalculator(CONFIG)
+    single = IndicatorCalculator(CONFIG)
+
+    results = batched.calculate_batch(frames, '1h')
+    assert sorted(results) == sorted(frames)
+    assert batched.batch_stats['batches'] == 2 and batched.batch_stats['symbols_batched'] == 5, batched.batch_stats
+
+    for symbol, df in frames.items():
+        expected = _calculate_all(single, symbol, df.copy())
+        pd.testing.assert_frame_equal(results[symbol], expected, check_exact=True)
+        assert results[symbol].index.equals(df.index), symbol
+    print(f"  ✓ {len(frames)} symbols (lengths 300 / 120 / 75, shifted timestamps) match")
+
+
+def test_calculate_all_reuses_batch():
+    """calculate_all after calculate_batch takes the batch result for the same candles only."""
+    frames = _frames()
+    calculator = IndicatorCalculator(CONFIG)
+    reference = IndicatorCalculator(CONFIG)
+    calculator.calculate_batch(frames, '1h')
+
+    for symbol in ('BTCUSDT', 'XRPUSDT'):
+        actual = _calculate_all(calculator, symbol, frames[symbol])
+        pd.testing.assert_frame_equal(actual, _calculate_all(reference, symbol, frames[symbol]), check_exact=True)
+
+    # New candle for ETHUSDT: the batch result no longer matches and is recalculated
+    next_candle = _make_ohlcv(1, 9, start=frames['ETHUSDT'].index[-1] + pd.Timedelta('1h'))
+    eth = pd.concat([frames['ETHUSDT'].iloc[1:], next_candle])
+    actual = _calculate_all(calculator, 'ETHUSDT', eth)
+    pd.testing.assert_frame_equal(actual, _calculate_all(reference, 'ETHUSDT', eth), check_exact=True)
+
+    stats = calculator.batch_stats
+    assert stats['hits'] == 2 and stats['misses'] == 1, stats
+    print(f"  ✓ {stats['hits']} batch hits, {stats['misses']} miss recalculated")
+
+
+def test_required_columns():
+    """With a restricted plan, batch and per-symbol outputs have the same reduced columns."""
+    frames = _frames()
+    batched = IndicatorCalculator(CONFIG)
+    single = IndicatorCalculator(CONFIG)
+    for calculator in (batched, single):
+        calculator.set_required_columns(['rsi', 'atr', 'macd_hist'])
+
+    results = batched.calculate_batch(frames, '1h')
+    for symbol, df in frames.items():
+        expected = _calculate_all(single, symbol, df.copy())
+        pd.testing.assert_frame_equal(results[symbol], expected, check_exact=True)
+
+    columns = list(results['BTCUSDT'].columns)
+    assert 'rsi' in columns and 'sma_20' not in columns, columns
+    print(f"  ✓ {len(columns)} columns with the rsi / atr / macd_hist plan")
+
+
+def main():
+    """Run the batch indicator tests."""
+    logging.disable(logging.CRITICAL)
+
+    tests = [test_batch_matches_calculate_all, test_calculate_all_reuses_batch, test_required_columns]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All batch indicator tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,189 @@
+"""
+Tests for the shared IndicatorStore.
+
+Indicators published by IndicatorCalculator must be found by
+MarketRegimeDetector and EmergencyCircuitBreaker on the same candles (the
+keys match, also for numpy periods and int / float parameters) and give the
+same results as without a store; entries are evicted least recently used.
+
+Usage:
+    python signal_generation/shared/test_indicator_store.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.analyzers.indicators import kernels
+from signal_generation.context import AnalysisContext
+from signal_generation.shared.indicator_calculator import IndicatorCalculator
+from signal_generation.shared.indicator_store import IndicatorStore
+from signal_generation.systems.emergency_circuit_breaker import EmergencyCircuitBreaker
+from signal_generation.systems.market_regime_detector import MarketRegimeDetector
+
+SHARED = ('directional_movement', 'bbands', 'rsi', 'volume_sma')
+
+
+def _make_ohlcv(n: int = 300, seed: int = 42) -> pd.DataFrame:
+    """Random-walk OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_p = close + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        'open': open_p,
+        'high': np.maximum(open_p, close) + rng.random(n),
+        'low': np.minimum(open_p, close) - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 1000,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='1h'))
+
+
+def _calculate(config: dict, df: pd.DataFrame) -> IndicatorStore:
+    """Run IndicatorCalculator on df and return its store."""
+    calculator = IndicatorCalculator(config)
+    calculator.calculate_all(AnalysisContext('BTCUSDT', '1h', df.copy()))
+    assert calculator.indicator_store is not None
+    return calculator.indicator_store
+
+
+def _stats_delta(store: IndicatorStore, before: dict) -> dict:
+    return {key: store.stats[key] - before[key] for key in ('hits', 'misses', 'puts')}
+
+
+def test_regime_detector_hits():
+    """The regime detector reuses the calculator's indicators and detects the same regime."""
+    df = _make_ohlcv()
+    store = _calculate({}, df)
+
+    for name, params in (('directional_movement', {'period': 14}), ('bbands', {'period': 20, 'std': 2.0}),
+                         ('rsi', {'period': 14}), ('volume_sma', {'period': 20})):
+        assert store.get(store.make_key('BTCUSDT', '1h', df, name, params)) is not None, name
+
+    # Published values are the ones the detector would compute itself
+    stored = store.get(store.make_key('BTCUSDT', '1h', df, 'rsi', {'period': 14}))['rsi']
+    np.testing.assert_allclose(stored, kernels.rsi(df['close'].values, 14), equal_nan=True)
+
+    config = {'market_regime': {'enabled': True}}
+    before = dict(store.stats)
+    # Raw candles: nothing pre-calculated, every indicator is looked up
+    result = MarketRegimeDetector(config, indicator_store=store).detect_regime(df, 'BTCUSDT', '1h')
+    expected = MarketRegimeDetector(config).detect_regime(df, 'BTCUSDT', '1h')
+
+    delta = _stats_delta(store, before)
+    assert delta == {'hits': len(SHARED), 'misses': 1, 'puts': 1}, delta   # ATR(20) is not published
+    assert result['regime'] == expected['regime'], (result['regime'], expected['regime'])
+    assert np.isclose(result['confidence'], expected['confidence']), (result['confidence'], expected['confidence'])
+    print(f"  ✓ {delta['hits']} hits, regime {result['regime']} as without the store")
+
+
+def test_circuit_breaker_hits():
+    """Circuit breaker and regime detector share ATR(14) on the same candles."""
+    frames = {'BTCUSDT': _make_ohlcv(seed=1), 'ETHUSDT': _make_ohlcv(seed=2)}
+    store = IndicatorStore()
+
+    breaker = EmergencyCircuitBreaker({}, indicator_store=store)
+    result = breaker.is_market_volatile(frames, '1h')
+    assert store.stats['misses'] == 2 and store.stats['puts'] == 2, store.stats
+    assert result == EmergencyCircuitBreaker({}).is_market_volatile(frames, '1h')
+
+    assert breaker.is_market_volatile(frames, '1h') == result
+    assert store.stats['hits'] == 2, store.stats
+
+    # Regime detector with the same ATR period finds the breaker's entry
+    before = dict(store.stats)
+    detector = MarketRegimeDetector({'market_regime': {'volatility_period': 14}}, indicator_store=store)
+    detector.detect_regime(frames['BTCUSDT'], 'BTCUSDT', '1h')
+    delta = _stats_delta(store, before)
+    assert delta['puts'] == len(SHARED) and delta['misses'] == len(SHARED) and delta['hits'] == 1, delta
+
+    atr_key = store.make_key('BTCUSDT', '1h', frames['BTCUSDT'], 'atr', {'period': 14})
+    np.testing.assert_array_equal(
+        store.get(atr_key)['atr'],
+        breaker._get_atr('BTCUSDT', '1h', frames['BTCUSDT'], 14)
+    )
+    print("  ✓ ATR(14) computed once per symbol and reused")
+
+
+def test_param_types():
+    """Numpy periods and an int std in config publish under the consumers' keys."""
+    df = _make_ohlcv(seed=3)
+    config = {'indicator_calculator': {
+        'oscillators': {'rsi_period': np.int64(14)},
+        'moving_averages': {'adx_period': np.int32(14)},
+        'volatility': {'bb_period': np.int64(20), 'bb_std': 2},
+    }}
+    store = _calculate(config, df)
+
+    before = dict(store.stats)
+    MarketRegimeDetector({'market_regime': {}}, indicator_store=store).detect_regime(df, 'BTCUSDT', '1h')
+    delta = _stats_delta(store, before)
+    assert delta['hits'] == len(SHARED), delta
+
+    assert IndicatorStore.params_hash({'period': 14}) == IndicatorStore.params_hash({'period': np.float64(14.0)})
+    assert IndicatorStore.params_hash({'std': 2}) == IndicatorStore.params_hash({'std': 2.0})
+    assert IndicatorStore.params_hash({'std': 2.5}) != IndicatorStore.params_hash({'std': 2})
+    assert IndicatorStore.params_hash({'flag': True}) != IndicatorStore.params_hash({'flag': 1})
+    print(f"  ✓ {delta['hits']} hits with numpy periods, equal int / float parameters hash the same")
+
+
+def test_lru_eviction():
+    """Least recently used entries are evicted; get() refreshes an entry."""
+    store = IndicatorStore(max_entries=3)
+    frames = [_make_ohlcv(50, seed) for seed in range(5)]
+    keys = [store.make_key('BTCUSDT', '1h', df, 'rsi', {'period': 14}) for df in frames]
+    assert len(set(keys)) == len(keys)
+
+    for key in keys[:3]:
+        store.put(key, {'rsi': np.arange(3.0)})
+    assert store.get(keys[0]) is not None          # keys[1] is now least recently used
+    store.put(keys[3], {'rsi': np.arange(3.0)})
+
+    assert store.get(keys[1]) is None
+    assert all(store.get(key) is not None for key in (keys[0], keys[2], keys[3]))
+    store.put(keys[4], {'rsi': np.arange(3.0)})
+    assert store.get(keys[0]) is None
+
+    stats = store.get_stats()
+    assert stats['evictions'] == 2 and stats['entries'] == 3, stats
+
+    # Stored arrays are read-only
+    values = store.get(keys[4])['rsi']
+    try:
+        values[0] = 1.0
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("stored array is writeable")
+    print(f"  ✓ max_entries=3: {stats['evictions']} evictions, recently read entry kept")
+
+
+def main():
+    """Run the indicator store tests."""
+    logging.disable(logging.CRITICAL)
+
+    tests = [test_regime_detector_hits, test_circuit_breaker_hits, test_param_types, test_lru_eviction]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All indicator store tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -6,7 +6,6 @@ Emergency stop mechanism to prevent consecutive losses in abnormal market condit
 import logging
 import numpy as np
 import pandas as pd
-import talib
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 
@@ -14,15 +13,23 @@ logger = logging.getLogger(__name__)
 
 # Import TradeResult from adaptive_learning_system
 from signal_generation.systems.adaptive_learning_system import TradeResult
+from signal_generation.analyzers.indicators import kernels
 
 
 class EmergencyCircuitBreaker:
     """Emergency stop mechanism to prevent consecutive losses in abnormal market conditions."""
 
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize with configuration."""
+    def __init__(self, config: Dict[str, Any], indicator_store=None):
+        """
+        Initialize with configuration.
+
+        Args:
+            config: Circuit breaker configuration
+            indicator_store: Shared IndicatorStore (optional) for per-candle ATR reuse
+        """
         self.config = config.get('circuit_breaker', {})
         self.enabled = self.config.get('enabled', True)
+        self.indicator_store = indicator_store
         self.max_consecutive_losses = self.config.get('max_consecutive_losses', 3)
         self.max_daily_losses_r = self.config.get('max_daily_losses_r', 5.0)
         self.cool_down_period_minutes = self.config.get('cool_down_period_minutes', 60)
@@ -244,7 +251,11 @@ class EmergencyCircuitBreaker:
             logger.error(f"Error calculating market anomaly score: {e}", exc_info=True)
             return 0.0
 
-    def is_market_volatile(self, symbols_data: Dict[str, pd.DataFrame]) -> bool:
+    def is_market_volatile(
+        self,
+        symbols_data: Dict[str, pd.DataFrame],
+        timeframe: Optional[str] = None
+    ) -> bool:
         """
         Detect abnormal market volatility based on ATR.
 
@@ -253,6 +264,7 @@ class EmergencyCircuitBreaker:
 
         Args:
             symbols_data: Dictionary of {symbol: DataFrame}
+            timeframe: Timeframe of the frames (key for the shared IndicatorStore)
 
         Returns:
             True if market volatility has increased significantly
@@ -267,13 +279,8 @@ class EmergencyCircuitBreaker:
                 if df is None or len(df) < 30:
                     continue
 
-                # Calculate ATR
-                atr = talib.ATR(
-                    df['high'].values.astype(np.float64),
-                    df['low'].values.astype(np.float64),
-                    df['close'].values.astype(np.float64),
-                    timeperiod=14
-                )
+                # Calculate ATR (reused from the shared store for this candle)
+                atr = self._get_atr(symbol, timeframe, df, 14)
 
                 # Calculate ATR% relative to price
                 close_prices = df['close'].values[-len(atr):]
@@ -313,6 +320,15 @@ class EmergencyCircuitBreaker:
             logger.error(f"Error checking market volatility: {e}", exc_info=True)
             return False
 
+    def _get_atr(self, symbol: str, timeframe: Optional[str], df: pd.DataFrame, period: int) -> np.ndarray:
+        """ATR from the shared IndicatorStore, or computed with kernels.atr()."""
+        def compute():
+            return {'atr': kernels.atr(df['high'].values, df['low'].values, df['close'].values, period)}
+
+        if self.indicator_store is None:
+            return compute()['atr']
+        return self.indicator_store.get_or_compute(symbol, timeframe, df, 'atr', {'period': period}, compute)['atr']
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get circuit breaker statistics.
@@ -41,6 +41,7 @@ from dataclasses import dataclass
 
 # Import centralized Enums instead of defining locally
 from signal_generation.enums import Direction, VolatilityRegime, MarketRegime
+from signal_generation.analyzers.indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -91,10 +92,24 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
 class MarketRegimeDetector:
     """Detects market regime (trend, volatility) and adapts parameters."""
 
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize with configuration."""
+    # Pre-calculated indicator columns used when present (otherwise recalculated)
+    REQUIRED_INDICATORS = [
+        'adx', 'plus_di', 'minus_di', 'atr',
+        'bb_upper', 'bb_middle', 'bb_lower', 'rsi', 'volume_sma'
+    ]
+
+    def __init__(self, config: Dict[str, Any], indicator_store=None):
+        """
+        Initialize with configuration.
+
+        Args:
+            config: Regime detector configuration
+            indicator_store: Shared IndicatorStore (optional); indicators that are
+                             not pre-calculated are looked up there before computing
+        """
         self.config = config.get('market_regime', {})
         self.enabled = self.config.get('enabled', True)
+        self.indicator_store = indicator_store
 
         # Indicator parameters with validation
         self.adx_period = self._validate_period(
@@ -268,12 +283,33 @@ class MarketRegimeDetector:
             logger.error(f"Invalid {name}: {value}. Error: {e}")
             raise ValueError(f"Invalid {name}: {value}") from e
 
-    def detect_regime(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _shared_indicator(
+        self,
+        df: pd.DataFrame,
+        symbol: Optional[str],
+        timeframe: Optional[str],
+        name: str,
+        params: Dict[str, Any],
+        compute
+    ) -> Dict[str, np.ndarray]:
+        """Get indicator values from the shared IndicatorStore, or compute them."""
+        if self.indicator_store is None or symbol is None:
+            return compute()
+        return self.indicator_store.get_or_compute(symbol, timeframe, df, name, params, compute)
+
+    def detect_regime(
+        self,
+        df: pd.DataFrame,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Detect market regime based on ADX and ATR.
 
         Args:
             df: OHLCV DataFrame
+            symbol: Trading symbol (enables the shared IndicatorStore)
+            timeframe: Timeframe of df
 
         Returns:
             Dictionary with regime info
@@ -319,16 +355,23 @@ class MarketRegimeDetector:
                 minus_di = df_copy['minus_di'].values
             else:
                 logger.debug("ADX not pre-calculated, calculating...")
-                adx = talib.ADX(high_prices, low_prices, close_prices, timeperiod=self.adx_period)
-                plus_di = talib.PLUS_DI(high_prices, low_prices, close_prices, timeperiod=self.adx_period)
-                minus_di = talib.MINUS_DI(high_prices, low_prices, close_prices, timeperiod=self.adx_period)
+                dm = self._shared_indicator(
+                    df, symbol, timeframe, 'directional_movement', {'period': self.adx_period},
+                    lambda: kernels.directional_movement(high_prices, low_prices, close_prices, self.adx_period)
+                )
+                adx = dm['adx']
+                plus_di = dm['plus_di']
+                minus_di = dm['minus_di']
 
             # ATR
             if 'atr' in df_copy.columns:
                 atr = df_copy['atr'].values
             else:
                 logger.debug("ATR not pre-calculated, calculating...")
-                atr = talib.ATR(high_prices, low_prices, close_prices, timeperiod=self.volatility_period)
+                atr = self._shared_indicator(
+                    df, symbol, timeframe, 'atr', {'period': self.volatility_period},
+                    lambda: {'atr': kernels.atr(high_prices, low_prices, close_prices, self.volatility_period)}
+                )['atr']
 
             atr_percent = np.where(close_prices > 0, (atr / close_prices) * 100, 0)
 
@@ -339,12 +382,17 @@ class MarketRegimeDetector:
                 bb_lower = df_copy['bb_lower'].values
             else:
                 logger.debug("Bollinger Bands not pre-calculated, calculating...")
-                bb_upper, bb_middle, bb_lower = talib.BBANDS(
-                    close_prices,
-                    timeperiod=self.bollinger_period,
-                    nbdevup=self.bollinger_std,
-                    nbdevdn=self.bollinger_std
+                bands = self._shared_indicator(
+                    df, symbol, timeframe, 'bbands',
+                    {'period': self.bollinger_period, 'std': float(self.bollinger_std)},
+                    lambda: dict(zip(('bb_upper', 'bb_middle', 'bb_lower'), talib.BBANDS(
+                        close_prices,
+                        timeperiod=self.bollinger_period,
+                        nbdevup=self.bollinger_std,
+                        nbdevdn=self.bollinger_std
+                    )))
                 )
+                bb_upper, bb_middle, bb_lower = bands['bb_upper'], bands['bb_middle'], bands['bb_lower']
 
             bb_width = np.where(bb_middle > 0, (bb_upper - bb_lower) / bb_middle * 100, 0)
 
@@ -353,7 +401,10 @@ class MarketRegimeDetector:
                 rsi = df_copy['rsi'].values
             else:
                 logger.debug("RSI not pre-calculated, calculating...")
-                rsi = talib.RSI(close_prices, timeperiod=self.rsi_period)
+                rsi = self._shared_indicator(
+                    df, symbol, timeframe, 'rsi', {'period': self.rsi_period},
+                    lambda: {'rsi': kernels.rsi(close_prices, self.rsi_period)}
+                )['rsi']
 
             # Calculate Volume Analysis (if available)
             volume_ratio = None
@@ -367,7 +418,10 @@ class MarketRegimeDetector:
                         volume_sma = df_copy['volume_sma'].values
                     else:
                         logger.debug("Volume SMA not pre-calculated, calculating...")
-                        volume_sma = talib.SMA(volume_values, timeperiod=20)
+                        volume_sma = self._shared_indicator(
+                            df, symbol, timeframe, 'volume_sma', {'period': 20},
+                            lambda: {'volume_sma': talib.SMA(volume_values, timeperiod=20)}
+                        )['volume_sma']
 
                     volume_ratio = np.where(volume_sma > 0, volume_values / volume_sma, 1.0)
 
@@ -0,0 +1,198 @@
+"""
+Parity test for the dependency-aware analyzer scheduler.
+
+Analyzers run on a thread pool (analyzer_workers > 1) must produce the same
+results as one by one in dependency order (analyzer_workers = 1), no
+analyzer may start before the analyzers in its REQUIRED_RESULTS finished,
+and the event loop keeps running while the analyzer threads work.
+
+Usage:
+    python signal_generation/test_analyzer_scheduler.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.context import AnalysisContext
+from signal_generation.orchestrator import SignalOrchestrator
+from signal_generation.shared.indicator_calculator import IndicatorCalculator
+
+
+def _make_ohlcv(n: int = 500, seed: int = 42) -> pd.DataFrame:
+    """Random-walk OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_p = close + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        'open': open_p,
+        'high': np.maximum(open_p, close) + rng.random(n),
+        'low': np.minimum(open_p, close) - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 1000,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='1h'))
+
+
+def _make_orchestrator(analyzer_workers: int) -> SignalOrchestrator:
+    config = {'orchestrator': {'analyzer_workers': analyzer_workers, 'send_to_trade_manager': False}}
+    return SignalOrchestrator(
+        config,
+        market_data_fetcher=None,
+        indicator_calculator=IndicatorCalculator(config),
+        skip_validation=True
+    )
+
+
+def _comparable(result: dict) -> str:
+    """Result without cumulative per-process counters."""
+    return repr({k: v for k, v in result.items() if k != 'orchestrator_stats'})
+
+
+def _record_runs(orchestrator: SignalOrchestrator) -> list:
+    """Wrap every analyzer's analyze() to record (name, start, end, thread)."""
+    runs = []
+
+    for name, analyzer in orchestrator.analyzers.items():
+        def analyze(context, _name=name, _analyze=analyzer.analyze):
+            start = time.perf_counter()
+            try:
+                return _analyze(context)
+            finally:
+                runs.append((_name, start, time.perf_counter(), threading.current_thread().name))
+        analyzer.analyze = analyze
+
+    return runs
+
+
+def test_workers_match_sequential():
+    """analyzer_workers=4 gives the same context as analyzer_workers=1."""
+    sequential = _make_orchestrator(1)
+    concurrent = _make_orchestrator(4)
+    try:
+        assert sequential._analyzer_executor is None and concurrent._analyzer_executor is not None
+        assert list(sequential.analyzer_dependencies) == list(concurrent.analyzer_dependencies)
+
+        for seed in range(3):
+            df = _make_ohlcv(seed=seed)
+            expected = AnalysisContext('BTCUSDT', '1h', df.copy())
+            actual = AnalysisContext('BTCUSDT', '1h', df.copy())
+            assert sequential._analyze_context(expected) and concurrent._analyze_context(actual)
+
+            pd.testing.assert_frame_equal(actual.df, expected.df)
+            assert sorted(actual.results) == sorted(expected.results), "analyzer set differs"
+            for name in expected.results:
+                assert _comparable(actual.results[name]) == _comparable(expected.results[name]), \
+                    f"seed {seed}: {name} result differs"
+
+        runs = {name: stats['runs'] for name, stats in concurrent.stats.get_analyzer_timings().items()}
+        assert runs and set(runs.values()) == {3}, runs
+    finally:
+        sequential.shutdown()
+        concurrent.shutdown()
+
+    print(f"  ✓ {len(expected.results)} analyzer results match on 3 frames")
+
+
+def test_dependency_order():
+    """Every analyzer starts after its dependencies finished, on the analyzer threads."""
+    orchestrator = _make_orchestrator(4)
+    try:
+        runs = _record_runs(orchestrator)
+        context = AnalysisContext('ETHUSDT', '1h', _make_ohlcv(seed=7))
+        assert orchestrator._analyze_context(context)
+    finally:
+        orchestrator.shutdown()
+
+    by_name = {name: (start, end, thread) for name, start, end, thread in runs}
+    assert sorted(by_name) == sorted(orchestrator.analyzer_dependencies) and len(runs) == len(by_name)
+
+    for name, deps in orchestrator.analyzer_dependencies.items():
+        for dep in deps:
+            assert by_name[dep][1] <= by_name[name][0], f"{name} started before {dep} finished"
+
+    threads = {thread for _, _, thread in by_name.values()}
+    assert all(thread.startswith('analyzer') for thread in threads), threads
+    print(f"  ✓ dependency order kept, {len(threads)} analyzer thread(s) used")
+
+
+def test_loop_free_during_analyzers():
+    """_compute_context awaits the analyzer threads: the loop keeps ticking during a slow analyzer."""
+    sequential = _make_orchestrator(1)
+    orchestrator = _make_orchestrator(4)
+    try:
+        trend = orchestrator.analyzers['trend']
+        trend_analyze = trend.analyze
+
+        def slow_analyze(context):
+            time.sleep(0.2)
+            return trend_analyze(context)
+        trend.analyze = slow_analyze
+        runs = _record_runs(orchestrator)
+
+        async def run():
+            ticks = []
+            done = asyncio.Event()
+
+            async def probe():
+                while not done.is_set():
+                    await asyncio.sleep(0.005)
+                    ticks.append(time.perf_counter())
+
+            probe_task = asyncio.create_task(probe())
+            context = AnalysisContext('BTCUSDT', '1h', _make_ohlcv(seed=3))
+            assert await orchestrator._compute_context(context)
+            done.set()
+            await probe_task
+            return context, ticks
+
+        context, ticks = asyncio.run(run())
+
+        trend_start, trend_end, _ = next((start, end, thread) for name, start, end, thread in runs if name == 'trend')
+        during = [tick for tick in ticks if trend_start < tick < trend_end]
+        assert len(during) >= 10, f"loop ticked {len(during)} times during a 200 ms analyzer"
+
+        expected = AnalysisContext('BTCUSDT', '1h', _make_ohlcv(seed=3))
+        assert sequential._analyze_context(expected)
+        assert sorted(context.results) == sorted(expected.results)
+        for name in expected.results:
+            assert _comparable(context.results[name]) == _comparable(expected.results[name]), f"{name} differs"
+    finally:
+        sequential.shutdown()
+        orchestrator.shutdown()
+
+    print(f"  ✓ loop ticked {len(during)} times during the slow analyzer, results unchanged")
+
+
+def main():
+    """Run the scheduler tests."""
+    logging.disable(logging.CRITICAL)
+
+    tests = [test_workers_match_sequential, test_dependency_order, test_loop_free_during_analyzers]
+
+    failed = 0
+    for test in tests:
+        print(f"\n🧪 {test.__name__}")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ❌ {e}")
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All analyzer scheduler tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
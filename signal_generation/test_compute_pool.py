@@ -0,0 +1,245 @@
+"""
+Parity test and event-loop lag measurement for ComputePool.
+
+Checks that indicators and analyzer results computed in a worker process
+match the in-process pipeline, then measures how long the
+asyncio loop is blocked while several symbols are analyzed, with and
+without compute workers.
+
+Usage:
+    python signal_generation/test_compute_pool.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from signal_generation.compute_pool import pack_frame, unpack_frame
+from signal_generation.context import AnalysisContext
+from signal_generation.orchestrator import SignalOrchestrator
+from signal_generation.shared.indicator_calculator import IndicatorCalculator
+
+SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT', 'ADAUSDT', 'BNBUSDT']
+
+
+def _make_ohlcv(n: int = 500, seed: int = 42) -> pd.DataFrame:
+    """Random-walk OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_p = close + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        'open': open_p,
+        'high': np.maximum(open_p, close) + rng.random(n),
+        'low': np.minimum(open_p, close) - rng.random(n),
+        'close': close,
+        'volume': rng.random(n) * 1000,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='1h'))
+
+
+class _FakeFetcher:
+    """MarketDataFetcher stand-in returning fixed random frames."""
+
+    def __init__(self):
+        self.frames = {symbol: _make_ohlcv(seed=i) for i, symbol in enumerate(SYMBOLS)}
+
+    async def get_historical_data(self, symbol, timeframe, limit=500):
+        await asyncio.sleep(0)
+        return self.frames[symbol]
+
+
+def _make_orchestrator(compute_workers: int) -> SignalOrchestrator:
+    config = {'orchestrator': {'compute_workers': compute_workers, 'send_to_trade_manager': False}}
+    return SignalOrchestrator(
+        config,
+        market_data_fetcher=_FakeFetcher(),
+        indicator_calculator=IndicatorCalculator(config),
+        skip_validation=True
+    )
+
+
+def test_pack_frame_roundtrip():
+    """pack_frame / unpack_frame keep columns, order, dtypes and index."""
+    df = _make_ohlcv(50)
+    df.insert(0, 'timestamp', df.index)
+    df['trades'] = np.arange(len(df))
+
+    restored = unpack_frame(pack_frame(df))
+    pd.testing.assert_frame_equal(restored, df)
+    print("  ✓ roundtrip with datetime and int columns")
+
+
+def _comparable(result: dict) -> str:
+    """Result without cumulative per-process counters (differ between workers)."""
+    return repr({k: v for k, v in result.items() if k != 'orchestrator_stats'})
+
+
+async def _analyze_both(inline: SignalOrchestrator, pooled: SignalOrchestrator, df: pd.DataFrame):
+    local = AnalysisContext('BTCUSDT', '1h', df)
+    assert inline._analyze_context(local)
+
+    remote = AnalysisContext('BTCUSDT', '1h', df)
+    assert await pooled.compute_pool.analyze(remote, stats=pooled.stats)
+    return local, remote
+
+
+def check_worker_matches_inline(inline: SignalOrchestrator, pooled: SignalOrchestrator):
+    """Worker results equal the in-process pipeline."""
+    for seed in range(3):
+        local, remote = asyncio.run(_analyze_both(inline, pooled, _make_ohlcv(seed=seed)))
+
+        pd.testing.assert_frame_equal(remote.df, local.df)
+        assert sorted(remote.results) == sorted(local.results), "analyzer set differs"
+        for name in local.results:
+            assert _comparable(remote.results[name]) == _comparable(local.results[name]), \
+                f"{name} result differs"
+
+    assert pooled.stats.analyzer_runs, "worker analyzer times not recorded"
+    print(f"  ✓ {len(local.results)} analyzer results and indicators match")
+
+
+def test_worker_matches_inline():
+    """Worker results equal the in-process pipeline (own orchestrators, pool shut down afterwards)."""
+    inline = _make_orchestrator(0)
+    pooled = _make_orchestrator(2)
+    try:
+        check_worker_matches_inline(inline, pooled)
+    finally:
+        pooled.compute_pool.shutdown()
+
+
+def check_symbol_affinity(pooled: SignalOrchestrator):
+    """Each symbol is always sent to the same spawned worker (its incremental indicator state)."""
+    pool = pooled.compute_pool
+    assert pool.get_stats()['start_method'] == 'spawn'
+    assert all(pool.worker_for(symbol) == pool.worker_for(symbol) for symbol in SYMBOLS)
+    assert {pool.worker_for(symbol) for symbol in SYMBOLS} == set(range(pool.workers)), \
+        "symbols not spread over the workers"
+
+    async def analyze_repeatedly():
+        for _ in range(3):
+            context = AnalysisContext('BTCUSDT', '1h', _make_ohlcv(seed=1))
+            assert await pool.analyze(context)
+
+    before = list(pool.stats['tasks_per_worker'])
+    asyncio.run(analyze_repeatedly())
+    added = [after - prior for after, prior in zip(pool.stats['tasks_per_worker'], before)]
+    assert added[pool.worker_for('BTCUSDT')] == 3 and sum(added) == 3, added
+    print(f"  ✓ BTCUSDT -> worker {pool.worker_for('BTCUSDT')}, tasks per worker {pool.stats['tasks_per_worker']}")
+
+
+def test_symbol_affinity():
+    """Symbols are routed to a fixed worker (own orchestrator, pool shut down afterwards)."""
+    pooled = _make_orchestrator(2)
+    try:
+        check_symbol_affinity(pooled)
+    finally:
+        pooled.compute_pool.shutdown()
+
+
+def check_context_parity(inline: SignalOrchestrator, pooled: SignalOrchestrator):
+    """_compute_context detects the market regime with and without compute workers."""
+
+    async def compute(orchestrator: SignalOrchestrator) -> AnalysisContext:
+        context = AnalysisContext('ETHUSDT', '1h', _make_ohlcv(seed=7))
+        context.metadata['htf_data'] = {}
+        assert await orchestrator._compute_context(context)
+        return context
+
+    local = asyncio.run(compute(inline))
+    remote = asyncio.run(compute(pooled))
+
+    assert 'regime_info' in local.metadata, "regime not detected in-process"
+    assert remote.metadata.get('regime_info') == local.metadata['regime_info'], "regime differs"
+    assert remote.metadata['htf_data']['1h'] is remote.df, "indicator frame not shared as HTF data"
+    assert sorted(remote.results) == sorted(local.results)
+    print(f"  ✓ regime {local.metadata['regime_info'].get('regime')} on both paths")
+
+
+def test_context_parity():
+    """Regime and HTF sharing match between in-process and worker analysis."""
+    inline = _make_orchestrator(0)
+    pooled = _make_orchestrator(2)
+    try:
+        check_context_parity(inline, pooled)
+    finally:
+        pooled.compute_pool.shutdown()
+
+
+async def _measure_loop_lag(orchestrator: SignalOrchestrator) -> dict:
+    """Run all symbols concurrently and probe how late a 5 ms timer fires."""
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - start - 0.005)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(orchestrator.generate_signal_for_symbol(s, '1h') for s in SYMBOLS))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+
+    return {'max_lag': max(lags), 'p95_lag': float(np.percentile(lags, 95)), 'elapsed': elapsed}
+
+
+def benchmark_loop_lag(inline: SignalOrchestrator, pooled: SignalOrchestrator):
+    """Event-loop lag while analyzing all symbols, in-process vs compute workers."""
+    for name, orchestrator in (('in-process', inline), (f'{pooled.compute_workers} workers', pooled)):
+        # Fresh timeframe cache so every symbol is recalculated
+        orchestrator.tf_score_cache.clear_all()
+        result = asyncio.run(_measure_loop_lag(orchestrator))
+        print(
+            f"  {name:>12}: max lag {result['max_lag'] * 1000:7.1f} ms, "
+            f"p95 {result['p95_lag'] * 1000:7.1f} ms, "
+            f"{len(SYMBOLS)} symbols in {result['elapsed']:.2f}s"
+        )
+
+
+def main():
+    """Run parity tests and the loop-lag benchmark."""
+    logging.disable(logging.CRITICAL)
+
+    inline = _make_orchestrator(0)
+    pooled = _make_orchestrator(2)
+
+    failed = 0
+    try:
+        for test, args in (
+            (test_pack_frame_roundtrip, ()),
+            (check_worker_matches_inline, (inline, pooled)),
+            (check_symbol_affinity, (pooled,)),
+            (test_context_parity, ()),
+        ):
+            print(f"\n🧪 {test.__name__}")
+            try:
+                test(*args)
+            except AssertionError as e:
+                print(f"  ❌ {e}")
+                failed += 1
+
+        print("\n⏱️  Event-loop lag")
+        benchmark_loop_lag(inline, pooled)
+    finally:
+        pooled.compute_pool.shutdown()
+
+    if failed:
+        print(f"\n❌ {failed} test(s) failed")
+        return 1
+
+    print("\n✅ All compute pool tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
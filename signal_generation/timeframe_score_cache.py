@@ -448,9 +448,12 @@ class TimeframeScoreCache:
 
         if total_requests == 0:
             return {
-                'requests_saved': 0,
-                'percentage_saved': 0.0,
+                'total_requests': 0,
+                'cache_hits': 0,
+                'requests_saved_percentage': 0.0,
                 'estimated_time_saved_seconds': 0.0,
+                'estimated_time_saved_minutes': 0.0,
+                'estimated_time_saved_hours': 0.0,
             }
 
         # فرض: هر محاسبه امتیاز ~0.5 ثانیه طول می‌کشد
@@ -943,6 +943,10 @@ class SignalProcessor:
                 f"پردازش گروه {i // batch_size + 1}/{(len(symbols_sorted) + batch_size - 1) // batch_size}: {len(batch)} نماد"
             )
 
+            # محاسبه دسته‌ای اندیکاتورها برای کل گروه (یک پاس برداری برای هر تایم‌فریم)
+            if not force_refresh and not self.use_ensemble:
+                await self._precompute_batch_indicators(batch)
+
             # ایجاد تسک‌ها برای گروه فعلی
             tasks = []
             for symbol in batch:
@@ -988,6 +992,47 @@ class SignalProcessor:
 
         return valid_signals
 
+    async def _precompute_batch_indicators(self, symbols: List[str]) -> None:
+        """
+        محاسبه دسته‌ای اندیکاتورهای یک گروه از نمادها
+
+        داده‌های همه نمادها یکجا دریافت می‌شوند و IndicatorCalculator برای هر
+        تایم‌فریم همه نمادها را در یک پاس برداری (symbols × candles) محاسبه می‌کند.
+        پردازش بعدی هر نماد (process_symbol) از همین نتایج استفاده می‌کند.
+
+        Args:
+            symbols: لیست نمادهای گروه
+        """
+        indicator_calculator = getattr(self.orchestrator, 'indicator_calculator', None)
+        if indicator_calculator is None or not hasattr(indicator_calculator, 'calculate_batch'):
+            return
+        if len(symbols) < 2:
+            return
+
+        try:
+            results = await asyncio.gather(*[
+                self.market_data_fetcher.get_multi_timeframe_data(
+                    symbol, self.timeframes, False, limit_per_tf=self.ohlcv_limit_per_tf
+                )
+                for symbol in symbols
+            ], return_exceptions=True)
+
+            for timeframe in self.timeframes:
+                frames = {}
+                for symbol, timeframes_data in zip(symbols, results):
+                    if not isinstance(timeframes_data, dict):
+                        continue
+                    df = timeframes_data.get(timeframe)
+                    if df is not None and not df.empty:
+                        frames[symbol] = df
+
+                if len(frames) >= 2:
+                    indicator_calculator.calculate_batch(frames, timeframe)
+
+        except Exception as e:
+            # فقط بهینه‌سازی است - در صورت خطا هر نماد جداگانه محاسبه می‌شود
+            logger.debug(f"[پردازشگر] محاسبه دسته‌ای اندیکاتورها انجام نشد: {e}")
+
     def _prioritize_symbols(self, symbols: List[str]) -> List[str]:
         """
         اولویت‌بندی نمادها بر اساس معیارهای هوشمند
@@ -0,0 +1,201 @@
+"""
+Round-trip tests and benchmark for the SmartCache Redis value format (cache_codec).
+
+Compares the binary frame format with the previous JSON path
+(to_json(orient='split') / read_json, kept here as the reference) and runs
+SmartCache against an in-process Redis stand-in (reported as skipped when
+market_data_fetcher's dependencies are not installed).
+
+Usage:
+    python test_cache_codec.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import json
+import time
+import unittest
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+from cache_codec import encode_value, decode_value, CacheCodecError
+
+
+def _make_klines(n: int = 1000, seed: int = 0) -> pd.DataFrame:
+    """Frame shaped like ExchangeClient klines: UTC timestamp index, float OHLCV, string turnover."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_p = close + rng.normal(0, 0.5, n)
+    index = pd.date_range('2024-01-01', periods=n, freq='5min', tz='UTC', name='timestamp')
+    df = pd.DataFrame({
+        'open': open_p,
+        'close': close,
+        'high': np.maximum(open_p, close) + rng.random(n),
+        'low': np.minimum(open_p, close) - rng.random(n),
+        'volume': rng.random(n) * 1000,
+        'turnover': [f"{x:.4f}" for x in rng.random(n) * 1e5],
+    }, index=index)
+    return df
+
+
+def json_encode(df: pd.DataFrame) -> bytes:
+    """Previous SmartCache._store_in_redis encoding."""
+    return df.reset_index().to_json(orient='split', date_format='iso').encode('utf-8')
+
+
+def json_decode(raw: bytes) -> pd.DataFrame:
+    """Previous SmartCache._get_from_redis decoding."""
+    df = pd.read_json(StringIO(raw.decode('utf-8')), orient='split')
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', utc=True)
+        df = df.set_index('timestamp')
+    df.sort_index(inplace=True)
+    return df
+
+
+class InProcessRedis:
+    """Dictionary-backed stand-in for the redis.asyncio client methods used by SmartCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, seconds, value):
+        assert isinstance(value, bytes)
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def keys(self, pattern):
+        prefix = pattern.rstrip('*')
+        return [key for key in self.data if key.startswith(prefix)]
+
+
+def test_frame_roundtrip():
+    """Binary frames keep values, dtypes, index and timezone, with and without zlib."""
+    df = _make_klines()
+    mixed = df.copy()
+    mixed['trades'] = np.arange(len(df), dtype=np.int64)
+    mixed['is_closed'] = mixed['trades'] % 2 == 0
+    mixed['open_time'] = df.index.tz_localize(None)
+    mixed['local_time'] = df.index.tz_convert('Asia/Tehran')
+    mixed['nullable'] = pd.array([1, None] * (len(df) // 2), dtype='Int64')
+    mixed.iloc[5, 0] = np.nan
+
+    for frame in (df, mixed, df.reset_index(), df.iloc[:0], pd.DataFrame()):
+        for compress_min_bytes in (None, 0):
+            restored = decode_value(encode_value(frame, compress_min_bytes=compress_min_bytes))
+            pd.testing.assert_frame_equal(restored, frame)
+
+    restored = decode_value(encode_value(df))
+    restored.iloc[0, 0] = 1.0
+    assert df.iloc[0, 0] != 1.0, "decoded frame shares memory with the source"
+    print("  ✓ frames round-trip (dtypes, tz, NaN, nullable, empty; zlib on/off)")
+
+
+def test_json_values_and_tags():
+    """Non-frame values use the JSON tag; untagged (old JSON) values are rejected."""
+    value = {'symbol': 'BTCUSDT', 'levels': [1.5, 2.5], 'ok': True}
+    assert decode_value(encode_value(value)) == value
+
+    for raw in (json_encode(_make_klines(10)), b'', b'SCB\x01X\x00{}'):
+        try:
+            decode_value(raw)
+        except CacheCodecError:
+            continue
+        raise AssertionError(f"{raw[:20]!r} was not rejected")
+    print("  ✓ JSON values round-trip, unknown formats rejected")
+
+
+def test_smart_cache_with_redis_stand_in():
+    """SmartCache stores and reloads frames through the Redis tier."""
+    try:
+        from market_data_fetcher import SmartCache
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    async def run():
+        cache = SmartCache({'data_fetching': {'cache': {'use_redis': False, 'use_memory_cache': False}}})
+        cache.redis_client = InProcessRedis()
+        cache.use_redis_cache = True
+
+        df = _make_klines()
+        await cache.set('ohlcv:BTCUSDT:5m', df)
+        pd.testing.assert_frame_equal(await cache.get('ohlcv:BTCUSDT:5m'), df)
+
+        cache.redis_client.data['ohlcv:ETHUSDT:5m'] = json_encode(df)
+        assert await cache.get('ohlcv:ETHUSDT:5m') is None
+        assert 'ohlcv:ETHUSDT:5m' not in cache.redis_client.data, "invalid entry not deleted"
+
+    asyncio.run(run())
+    print("  ✓ SmartCache round-trip through the Redis stand-in")
+
+
+def benchmark():
+    """Encode/decode time and size: JSON path vs binary."""
+    for rows in (500, 1500):
+        df = _make_klines(rows)
+        variants = (
+            ('json', json_encode, json_decode),
+            ('binary', lambda d: encode_value(d, compress_min_bytes=None), decode_value),
+            ('binary+zlib', lambda d: encode_value(d, compress_min_bytes=0), decode_value),
+        )
+        for name, encode, decode in variants:
+            repeats = 20
+            start = time.perf_counter()
+            for _ in range(repeats):
+                raw = encode(df)
+            encode_time = (time.perf_counter() - start) / repeats
+            start = time.perf_counter()
+            for _ in range(repeats):
+                decode(raw)
+            decode_time = (time.perf_counter() - start) / repeats
+            print(
+                f"  {rows:>5} rows {name:<12} encode {encode_time * 1000:7.2f} ms, "
+                f"decode {decode_time * 1000:7.2f} ms, {len(raw) / 1024:7.1f} KB"
+            )
+
+    # JSON path loses the index frequency and converts the string column
+    restored = json_decode(json_encode(_make_klines(100)))
+    print(f"  json dtypes after round-trip: {json.dumps({c: str(t) for c, t in restored.dtypes.items()})}")
+
+
+def main():
+    print("\nSmartCache Redis value format")
+    print("-" * 60)
+
+    tests = [test_frame_roundtrip, test_json_values_and_tags, test_smart_cache_with_redis_stand_in]
+    failed = skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as e:
+            skipped += 1
+            print(f"  - {test.__name__} skipped ({e})")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("\nBenchmark")
+    print("-" * 60)
+    benchmark()
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed, {skipped} skipped")
+        return 1
+    print(f"✅ {len(tests) - skipped} tests passed, {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,279 @@
+"""
+Tests for the websocket kline ring buffer (candle_store) against a local fake
+KuCoin futures websocket server.
+
+The fake server (aiohttp) speaks the subset of the KuCoin protocol the bot
+uses: welcome, ping/pong, subscribe/ack and limitCandle messages. The
+ExchangeClient / MarketDataFetcher round trip is reported as skipped when
+their dependencies (redis, websockets) are not installed.
+
+Usage:
+    python test_candle_store.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import json
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+from aiohttp import web, ClientSession, WSMsgType
+
+from candle_store import CandleStore, CandleRingBuffer, parse_candle_message, CANDLE_COLUMNS
+
+TF_MS = 5 * 60 * 1000
+
+
+def _period_start(now_ms: int) -> int:
+    return now_ms // TF_MS * TF_MS
+
+
+def _candle(timestamp_ms: int, close: float) -> list:
+    """Candle as sent by KuCoin: [time (s), open, close, high, low, volume, turnover] as strings."""
+    return [str(timestamp_ms // 1000), str(close - 1), str(close), str(close + 2), str(close - 2), '10', '1000']
+
+
+def _rest_frame(start_ms: int, count: int) -> pd.DataFrame:
+    """Frame shaped like ExchangeClient._fetch_single_ohlcv output."""
+    timestamps = start_ms + np.arange(count) * TF_MS
+    close = 100.0 + np.arange(count)
+    index = pd.DatetimeIndex(pd.to_datetime(timestamps, unit='ms', utc=True), name='timestamp')
+    return pd.DataFrame({
+        'open': close - 1, 'close': close, 'high': close + 2, 'low': close - 2,
+        'volume': np.full(count, 10.0), 'turnover': [str(1000.0)] * count
+    }, index=index)
+
+
+def _message(topic: str, candle: list) -> str:
+    return json.dumps({
+        'type': 'message', 'topic': topic, 'subject': 'candle.stick',
+        'data': {'symbol': topic.split(':')[1].split('_')[0], 'candles': candle, 'time': int(time.time() * 1e9)}
+    })
+
+
+class FakeKucoinServer:
+    """Local websocket server pushing scripted candle messages after each subscribe."""
+
+    def __init__(self, candles_per_topic):
+        # candles_per_topic(topic) -> list of candles to push after the ack
+        self.candles_per_topic = candles_per_topic
+        self.subscriptions = []
+        self._runner = None
+        self.url = None
+
+    async def _handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_str(json.dumps({'id': 'welcome-1', 'type': 'welcome'}))
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            data = json.loads(msg.data)
+            if data.get('type') == 'ping':
+                await ws.send_str(json.dumps({'id': data['id'], 'type': 'pong'}))
+            elif data.get('type') == 'subscribe':
+                topic = data['topic']
+                self.subscriptions.append(topic)
+                await ws.send_str(json.dumps({'id': data['id'], 'type': 'ack'}))
+                for candle in self.candles_per_topic(topic):
+                    await ws.send_str(_message(topic, candle))
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/ws', self._handler)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/ws"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def test_ring_buffer():
+    """Updates replace the live candle, a newer candle finalizes it, old data wraps out."""
+    buffer = CandleRingBuffer(TF_MS, capacity=3)
+    t0 = _period_start(int(time.time() * 1000)) - 5 * TF_MS
+
+    assert not buffer.update(t0, [1, 2, 3, 0, 5, 6])
+    assert not buffer.update(t0, [1, 2.5, 3, 0, 6, 7])
+    assert buffer.update(t0 + TF_MS, [2.5, 3, 4, 2, 1, 1])
+    assert not buffer.update(t0, [9, 9, 9, 9, 9, 9]), "stale message changed the buffer"
+
+    frame = buffer.to_frame(10)
+    assert list(frame.columns) == list(CANDLE_COLUMNS)
+    assert frame['close'].tolist() == [2.5, 3.0]
+    assert frame.index[0].value // 1_000_000 == t0 and str(frame.index.tz) == 'UTC'
+
+    for i in range(2, 7):
+        buffer.update(t0 + i * TF_MS, [i] * 6)
+    frame = buffer.to_frame(10)
+    assert len(frame) == 4, "capacity 3 closed + 1 live"
+    assert (np.diff(frame.index.as_unit('ms').asi8) == TF_MS).all()
+    print("  ✓ ring buffer: live updates, finalize on next candle, wrap-around")
+
+
+def test_seed_gaps_and_warmth():
+    """REST history seeds the buffer; gaps or missing stream make it cold until filled."""
+    store = CandleStore(capacity=100, max_lag_seconds=5)
+    now_ms = int(time.time() * 1000)
+    current = _period_start(now_ms)
+
+    store.register('BTCUSDT', '5m', TF_MS)
+    store.seed('BTCUSDT', '5m', _rest_frame(current - 49 * TF_MS, 50), now_ms)
+    assert store.get_frame('BTCUSDT', '5m', 50, now_ms) is None, "REST snapshot served without a stream"
+
+    store.update('BTCUSDT', '5m', current, [1, 2, 3, 0, 5, 6])
+    frame = store.get_frame('BTCUSDT', '5m', 50, now_ms)
+    assert frame is not None and len(frame) == 50
+    assert frame['close'].iloc[-1] == 2 and frame['close'].iloc[-2] == 148.0
+    assert store.get_frame('BTCUSDT', '5m', 60, now_ms) is None, "not enough history"
+
+    # Stream skips a candle -> gap -> cold until REST fills it
+    store.update('BTCUSDT', '5m', current + 2 * TF_MS, [1] * 6)
+    later = now_ms + 2 * TF_MS
+    assert store.get_frame('BTCUSDT', '5m', 50, later) is None, "gap not detected"
+    store.seed('BTCUSDT', '5m', _rest_frame(current - 47 * TF_MS, 50), later)
+    frame = store.get_frame('BTCUSDT', '5m', 50, later)
+    assert frame is not None and frame['close'].iloc[-1] == 1
+
+    # Stream stopped -> live candle too old
+    assert store.get_frame('BTCUSDT', '5m', 50, later + 2 * TF_MS) is None
+    store.mark_stale()
+    assert store.get_frame('BTCUSDT', '5m', 50, later) is None
+    print("  ✓ REST seeding, gap detection, staleness")
+
+
+def test_fake_websocket_stream():
+    """Candle messages from the fake server are parsed into the store."""
+    now_ms = int(time.time() * 1000)
+    current = _period_start(now_ms)
+    topic = '/contractMarket/limitCandle:XBTUSDTM_5min'
+    script = [_candle(current - TF_MS, 150), _candle(current - TF_MS, 151), _candle(current, 152)]
+
+    async def run():
+        server = FakeKucoinServer(lambda t: script)
+        await server.start()
+        store = CandleStore()
+        store.register('BTCUSDT', '5m', TF_MS)
+        store.seed('BTCUSDT', '5m', _rest_frame(current - 50 * TF_MS, 49), now_ms)
+        try:
+            async with ClientSession() as session:
+                async with session.ws_connect(server.url) as ws:
+                    assert json.loads((await ws.receive()).data)['type'] == 'welcome'
+                    await ws.send_str(json.dumps({'id': f"sub:{topic}:1", 'type': 'subscribe', 'topic': topic}))
+                    received = 0
+                    while received < len(script):
+                        data = json.loads((await ws.receive(timeout=5)).data)
+                        if data['type'] == 'message':
+                            store.update('BTCUSDT', '5m', *parse_candle_message(data['data']))
+                            received += 1
+        finally:
+            await server.stop()
+        return store
+
+    store = asyncio.run(run())
+    frame = store.get_frame('BTCUSDT', '5m', 51, now_ms)
+    assert frame is not None, "stream did not warm the buffer"
+    assert frame['close'].iloc[-3:].tolist() == [148.0, 151.0, 152.0]
+    assert store.stats['finalized'] == 1
+    print("  ✓ fake websocket server -> parser -> ring buffer")
+
+
+def test_exchange_client_round_trip():
+    """ExchangeClient ingests candles from the fake server; MarketDataFetcher serves them without REST."""
+    try:
+        from exchange_client import ExchangeClient
+        from market_data_fetcher import MarketDataFetcher
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    now_ms = int(time.time() * 1000)
+    current = _period_start(now_ms)
+
+    async def run():
+        server = FakeKucoinServer(lambda t: [_candle(current - TF_MS, 151), _candle(current, 152)])
+        await server.start()
+
+        config = {
+            'exchange': {'websocket': {'enabled': True}},
+            'data_fetching': {
+                'cache': {'use_redis': False},
+                'websocket_candles': {'enabled': True}
+            }
+        }
+        client = ExchangeClient(config)
+
+        async def fake_token():
+            return {'token': 'test', 'instanceServers': [{'endpoint': server.url, 'pingInterval': 30000}]}
+        client._get_ws_token = fake_token
+
+        rest_calls = []
+
+        async def fake_fetch_ohlcv(symbol, timeframe, limit=200, **kwargs):
+            rest_calls.append((symbol, timeframe, limit))
+            return _rest_frame(current - (limit - 1) * TF_MS, limit)
+        client.fetch_ohlcv = fake_fetch_ohlcv
+
+        fetcher = MarketDataFetcher(config, client)
+        try:
+            assert await client.start_websocket()
+
+            first = await fetcher.get_historical_data('BTCUSDT', '5m', limit=50)
+            assert len(first) == 50 and len(rest_calls) == 1
+
+            for _ in range(50):
+                if client.candle_store.stats['finalized']:
+                    break
+                await asyncio.sleep(0.05)
+
+            for _ in range(5):
+                df = await fetcher.get_historical_data('BTCUSDT', '5m', limit=50)
+                assert df['close'].iloc[-1] == 152.0
+            assert len(rest_calls) == 1, f"REST used while the stream is warm: {rest_calls}"
+            assert fetcher._stats['ws_candle_hits'] == 5
+        finally:
+            await fetcher.shutdown()
+            await client.close()
+            await server.stop()
+
+    asyncio.run(run())
+    print("  ✓ ExchangeClient + MarketDataFetcher served from the websocket store")
+
+
+def main():
+    print("\nWebsocket candle store")
+    print("-" * 60)
+
+    tests = [test_ring_buffer, test_seed_gaps_and_warmth, test_fake_websocket_stream,
+             test_exchange_client_round_trip]
+    failed = skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as e:
+            skipped += 1
+            print(f"  - {test.__name__} skipped ({e})")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed, {skipped} skipped")
+        return 1
+    print(f"✅ {len(tests) - skipped} tests passed, {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,148 @@
+"""
+Tests for coalescing concurrent MarketDataFetcher.get_historical_data calls
+(one REST fetch per cache key), including cancellation of the caller that
+runs the shared fetch.
+
+REST is replaced by a slow fake ExchangeClient.fetch_ohlcv. The tests are
+reported as skipped when the fetcher's dependencies (redis, websockets) are
+not installed.
+
+Usage:
+    python test_fetch_coalescing.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+TF_MS = 5 * 60 * 1000
+
+
+def _rest_frame(end_ms: int, count: int) -> pd.DataFrame:
+    """Frame shaped like ExchangeClient._fetch_single_ohlcv output, ending at end_ms."""
+    timestamps = end_ms - np.arange(count)[::-1] * TF_MS
+    close = 100.0 + np.arange(count)
+    index = pd.DatetimeIndex(pd.to_datetime(timestamps, unit='ms', utc=True), name='timestamp')
+    return pd.DataFrame({
+        'open': close - 1, 'close': close, 'high': close + 2, 'low': close - 2,
+        'volume': np.full(count, 10.0), 'turnover': [str(1000.0)] * count
+    }, index=index)
+
+
+async def _make_fetcher(delay: float = 0.05):
+    """MarketDataFetcher on an ExchangeClient whose fetch_ohlcv is a slow fake; returns (fetcher, client, calls)."""
+    try:
+        from exchange_client import ExchangeClient
+        from market_data_fetcher import MarketDataFetcher
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    config = {'data_fetching': {'cache': {'use_redis': False}, 'delta_updates': {'enabled': False}}}
+    client = ExchangeClient(config)
+    calls = []
+
+    async def fake_fetch_ohlcv(symbol, timeframe, limit=200, **kwargs):
+        calls.append((symbol, timeframe, limit))
+        await asyncio.sleep(delay)
+        return _rest_frame(int(time.time() * 1000) // TF_MS * TF_MS, limit)
+    client.fetch_ohlcv = fake_fetch_ohlcv
+
+    return MarketDataFetcher(config, client), client, calls
+
+
+async def _close(fetcher, client):
+    await fetcher.shutdown()
+    await client.close()
+
+
+def test_concurrent_calls_share_one_fetch():
+    """Callers asking for the same or fewer candles wait for the running fetch."""
+
+    async def run():
+        fetcher, client, calls = await _make_fetcher()
+        try:
+            frames = await asyncio.gather(
+                fetcher.get_historical_data('BTCUSDT', '5m', limit=100),
+                *(fetcher.get_historical_data('BTCUSDT', '5m', limit=50) for _ in range(4))
+            )
+            assert len(calls) == 1, calls
+            assert len(frames[0]) == 100 and all(len(df) == 50 for df in frames[1:])
+            assert frames[1].index[-1] == frames[0].index[-1]
+            assert fetcher._stats['coalesced_requests'] == 4
+            assert not fetcher._inflight_fetches
+        finally:
+            await _close(fetcher, client)
+
+    asyncio.run(run())
+    print("  ✓ 5 concurrent callers, 1 REST fetch")
+
+
+def test_cancelled_leader():
+    """Cancelling the caller that runs the fetch does not cancel the callers waiting on it."""
+
+    async def run():
+        fetcher, client, calls = await _make_fetcher()
+        try:
+            leader = asyncio.create_task(fetcher.get_historical_data('BTCUSDT', '5m', limit=50))
+            await asyncio.sleep(0.01)
+            followers = [asyncio.create_task(fetcher.get_historical_data('BTCUSDT', '5m', limit=50))
+                         for _ in range(3)]
+            await asyncio.sleep(0.01)
+            assert fetcher._stats['coalesced_requests'] == 3
+
+            leader.cancel()
+            frames = await asyncio.gather(*followers, return_exceptions=True)
+
+            assert leader.cancelled()
+            assert all(isinstance(df, pd.DataFrame) and len(df) == 50 for df in frames), frames
+            assert len(calls) == 2, f"followers did not share one retried fetch: {calls}"
+            assert not fetcher._inflight_fetches
+
+            # A cancelled waiter does not cancel the shared fetch
+            leader = asyncio.create_task(fetcher.get_historical_data('ETHUSDT', '5m', limit=50))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(fetcher.get_historical_data('ETHUSDT', '5m', limit=50))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            df = await leader
+            assert waiter.cancelled() and len(df) == 50
+        finally:
+            await _close(fetcher, client)
+
+    asyncio.run(run())
+    print("  ✓ leader cancelled: waiters refetch once; waiter cancelled: leader unaffected")
+
+
+def main():
+    print("\nget_historical_data coalescing")
+    print("-" * 60)
+
+    tests = [test_concurrent_calls_share_one_fetch, test_cancelled_leader]
+    failed = skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as e:
+            skipped += 1
+            print(f"  - {test.__name__} skipped ({e})")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed, {skipped} skipped")
+        return 1
+    print(f"✅ {len(tests) - skipped} tests passed, {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
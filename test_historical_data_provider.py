@@ -0,0 +1,224 @@
+"""
+Parity tests for the backtest HistoricalDataProvider: fetch_ohlcv,
+get_historical_data, fetch_ohlcv_multi_timeframe, get_ticker_price and
+get_candle_at_time (searchsorted windows over the cached arrays) give the
+same results as the former full-frame mask / iterrows logic - before the
+first candle, on and between candle boundaries and after the last one, with
+limit and since. Modifying a returned frame never changes the provider.
+
+The data are synthetic CSV files in a temporary directory. The tests are
+reported as skipped when the backtest package's dependencies (tqdm) are
+not installed.
+
+Usage:
+    python test_historical_data_provider.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import logging
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+SYMBOL = 'BTC-USDT'
+START = datetime(2024, 1, 1)
+CANDLES = {'5m': (timedelta(minutes=5), 600), '1h': (timedelta(hours=1), 60)}
+
+
+def _write_csv(data_path: str) -> None:
+    """Synthetic 5m and 1h CSV files starting at START."""
+    os.makedirs(os.path.join(data_path, SYMBOL))
+    rng = np.random.default_rng(7)
+    for timeframe, (step, count) in CANDLES.items():
+        close = 100 + np.cumsum(rng.normal(0, 1, count))
+        open_p = close + rng.normal(0, 0.5, count)
+        df = pd.DataFrame({
+            'timestamp': [(START + i * step).strftime('%Y-%m-%d %H:%M:%S') for i in range(count)],
+            'open': open_p,
+            'high': np.maximum(open_p, close) + rng.random(count),
+            'low': np.minimum(open_p, close) - rng.random(count),
+            'close': close,
+            'volume': rng.integers(1, 10000, count),
+        })
+        filename = {'5m': '5min.csv', '1h': '1hour.csv'}[timeframe]
+        df.to_csv(os.path.join(data_path, SYMBOL, filename), index=False)
+
+
+def _make_provider(data_path: str):
+    """HistoricalDataProvider (and its fetcher) over the CSV files in data_path."""
+    try:
+        from backtest.historical_data_provider_v2 import HistoricalDataProvider, BacktestMarketDataFetcher
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    config = {
+        'backtest': {'symbols': [SYMBOL], 'data_path': data_path},
+        'data_fetching': {'timeframes': list(CANDLES)},
+    }
+    provider = HistoricalDataProvider(config)
+    return provider, BacktestMarketDataFetcher(provider)
+
+
+# Former provider logic: mask the full CSV frame on every call
+
+def _old_fetch_ohlcv(provider, timeframe, limit=500, since=None):
+    df = provider.csv_loader.load_symbol_data(SYMBOL, timeframe)
+    if provider.current_time:
+        df = df[df['timestamp'] <= provider.current_time]
+    if since:
+        df = df[df['timestamp'] >= datetime.fromtimestamp(since / 1000)]
+    if len(df) > limit:
+        df = df.tail(limit)
+    if df.empty:
+        return []
+    return [
+        [int(row['timestamp'].timestamp() * 1000), float(row['open']), float(row['high']),
+         float(row['low']), float(row['close']), float(row['volume'])]
+        for _, row in df.iterrows()
+    ]
+
+
+def _old_frame(ohlcv_list):
+    df = pd.DataFrame(ohlcv_list, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df
+
+
+def _old_ticker_price(provider):
+    df = provider.csv_loader.load_symbol_data(SYMBOL, '5m')
+    df = df[df['timestamp'] <= provider.current_time]
+    return None if df.empty else float(df['close'].iloc[-1])
+
+
+def _old_candle_at_time(provider, timeframe, target_time):
+    df = provider.csv_loader.load_symbol_data(SYMBOL, timeframe)
+    df = df[df['timestamp'] <= target_time]
+    if df.empty:
+        return None
+    row = df.iloc[-1]
+    candle = {'timestamp': row['timestamp']}
+    candle.update((col, float(row[col])) for col in ('open', 'high', 'low', 'close', 'volume'))
+    return candle
+
+
+def _times():
+    """Before the data, on and between candle boundaries, after the last candle."""
+    return [START - timedelta(hours=1), START, START + timedelta(minutes=7),
+            START + timedelta(hours=13), START + timedelta(hours=20, minutes=59, seconds=59),
+            START + timedelta(days=1), START + timedelta(days=5)]
+
+
+def _assert_frame_matches(actual, expected, case):
+    """Same columns, RangeIndex and values (timestamps compared in ms, any datetime64 unit)."""
+    assert list(actual.columns) == list(expected.columns), case
+    assert actual.index.equals(pd.RangeIndex(len(expected))), case
+    assert (actual['timestamp'].values.astype('datetime64[ms]') ==
+            expected['timestamp'].values.astype('datetime64[ms]')).all(), case
+    np.testing.assert_array_equal(actual.iloc[:, 1:].to_numpy(float), expected.iloc[:, 1:].to_numpy(float), str(case))
+
+
+def test_fetch_ohlcv():
+    """fetch_ohlcv, get_historical_data and fetch_ohlcv_multi_timeframe match the former logic."""
+    with tempfile.TemporaryDirectory() as data_path:
+        _write_csv(data_path)
+        provider, fetcher = _make_provider(data_path)
+
+        async def run():
+            checked = 0
+            for current_time in _times():
+                provider.set_current_time(current_time)
+                for timeframe in CANDLES:
+                    for limit in (1, 50, 500, 1000):
+                        for since in (None, int((START + timedelta(hours=3)).timestamp() * 1000)):
+                            case = (current_time, timeframe, limit, since)
+                            expected = _old_fetch_ohlcv(provider, timeframe, limit, since)
+                            assert await provider.fetch_ohlcv(SYMBOL, timeframe, limit, since) == expected, case
+
+                        expected = _old_fetch_ohlcv(provider, timeframe, limit)
+                        df = await fetcher.get_historical_data(SYMBOL, timeframe, limit=limit)
+                        if not expected:
+                            assert df is None, case
+                        else:
+                            _assert_frame_matches(df, _old_frame(expected), case)
+                        checked += 1
+
+                frames = await fetcher.fetch_ohlcv_multi_timeframe(SYMBOL, list(CANDLES), limit=100)
+                for timeframe, df in frames.items():
+                    expected = _old_fetch_ohlcv(provider, timeframe, 100)
+                    if not expected:
+                        assert df.empty, (current_time, timeframe)
+                    else:
+                        _assert_frame_matches(df, _old_frame(expected), (current_time, timeframe))
+            return checked
+
+        checked = asyncio.run(run())
+    print(f"  ✓ fetch_ohlcv / get_historical_data match on {checked} windows")
+
+
+def test_price_and_candle():
+    """get_ticker_price and get_candle_at_time match the former logic."""
+    with tempfile.TemporaryDirectory() as data_path:
+        _write_csv(data_path)
+        provider, _ = _make_provider(data_path)
+
+        for current_time in _times():
+            provider.set_current_time(current_time)
+            assert asyncio.run(provider.get_ticker_price(SYMBOL)) == _old_ticker_price(provider), current_time
+            for timeframe in CANDLES:
+                assert provider.get_candle_at_time(SYMBOL, timeframe, current_time) == \
+                    _old_candle_at_time(provider, timeframe, current_time), (current_time, timeframe)
+    print(f"  ✓ price and candle match at {len(_times())} times")
+
+
+def test_frame_is_independent():
+    """Modifying a returned frame does not change the provider's data."""
+    with tempfile.TemporaryDirectory() as data_path:
+        _write_csv(data_path)
+        provider, fetcher = _make_provider(data_path)
+        provider.set_current_time(START + timedelta(hours=10))
+
+        df = asyncio.run(fetcher.get_historical_data(SYMBOL, '1h', limit=5))
+        expected = asyncio.run(provider.fetch_ohlcv(SYMBOL, '1h', limit=5))
+        df.loc[:, 'close'] = 0.0
+        df['rsi'] = 50.0
+
+        assert asyncio.run(provider.fetch_ohlcv(SYMBOL, '1h', limit=5)) == expected
+        assert 'rsi' not in provider.get_ohlcv_frame(SYMBOL, '1h', limit=5).columns
+    print("  ✓ modified frame is a separate copy")
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+
+    print("\nHistoricalDataProvider parity")
+    print("-" * 60)
+
+    tests = [test_fetch_ohlcv, test_price_and_candle, test_frame_is_independent]
+    failed = skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as e:
+            skipped += 1
+            print(f"  - {test.__name__} skipped ({e})")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed, {skipped} skipped")
+        return 1
+    print(f"✅ {len(tests) - skipped} tests passed, {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,303 @@
+"""
+Tests for the HTTP connection-pool metrics and per-endpoint latency tracing
+(http_tracing) against a local aiohttp test server.
+
+The ExchangeClient round trips (stats, pool settings changed by
+update_config) are reported as skipped when its dependencies (redis,
+websockets) are not installed.
+
+Usage:
+    python test_http_tracing.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import unittest
+
+import aiohttp
+from aiohttp import web
+
+from http_tracing import HttpTracer, endpoint_label
+
+
+class LocalServer:
+    """Local HTTP server with a fast JSON endpoint and a slow one counting concurrent requests."""
+
+    def __init__(self, slow_delay: float = 0.05):
+        self.slow_delay = slow_delay
+        self.active = 0
+        self.max_active = 0
+        self.peers = set()
+        self._runner = None
+        self.port = None
+
+    async def _contract(self, request):
+        self.peers.add(request.transport.get_extra_info('peername'))
+        return web.json_response({'code': '200000', 'data': {'symbol': request.match_info['symbol']}})
+
+    async def _slow(self, request):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.slow_delay)
+        finally:
+            self.active -= 1
+        return web.json_response({'code': '200000', 'data': []})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/api/v1/contracts/{symbol}', self._contract)
+        app.router.add_get('/api/v1/kline/query', self._slow)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def test_endpoint_labels():
+    """Symbols and ids in the path are replaced so labels stay bounded."""
+    assert endpoint_label('get', '/api/v1/contracts/XBTUSDTM') == 'GET /api/v1/contracts/{param}'
+    assert endpoint_label('DELETE', '/api/v1/orders/5bd6e9286d99522a52e458de') == 'DELETE /api/v1/orders/{param}'
+    assert endpoint_label('GET', '/api/v1/kline/query?symbol=XBTUSDTM') == 'GET /api/v1/kline/query'
+    assert endpoint_label('GET', '/api/v1/contracts/active') == 'GET /api/v1/contracts/active'
+    print("  ✓ endpoint labels")
+
+
+def test_connection_reuse():
+    """Sequential keep-alive requests reuse one connection."""
+
+    async def run():
+        server = LocalServer()
+        await server.start()
+        tracer = HttpTracer()
+        connector = aiohttp.TCPConnector(limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=30)
+        try:
+            async with aiohttp.ClientSession(connector=connector, trace_configs=[tracer.trace_config]) as session:
+                for symbol in ('XBTUSDTM', 'ETHUSDTM') * 5:
+                    async with session.get(f"http://localhost:{server.port}/api/v1/contracts/{symbol}") as response:
+                        assert response.status == 200
+                        await response.json()
+                stats = tracer.get_stats(session.connector)
+        finally:
+            await server.stop()
+        return server, stats
+
+    server, stats = asyncio.run(run())
+    assert stats['requests'] == 10 and stats['errors'] == 0
+    assert stats['connections_created'] == 1 and stats['connections_reused'] == 9, stats
+    assert stats['connection_reuse_ratio'] == 0.9
+    assert len(server.peers) == 1, "server saw more than one client connection"
+    assert stats['dns_cache_misses'] == 1 and stats['dns_time']['count'] == 1, stats
+    assert stats['pool'] == {'limit': 100, 'limit_per_host': 4, 'closed': False}
+
+    endpoint = stats['endpoints']['GET /api/v1/contracts/{param}']
+    assert endpoint['requests'] == 10 and endpoint['new_connections'] == 1
+    assert endpoint['latency']['count'] == 10 and 0 < endpoint['latency']['p50'] <= endpoint['latency']['max']
+    print(f"  ✓ keep-alive reuse {stats['connection_reuse_ratio']:.0%}, "
+          f"p50 {endpoint['latency']['p50'] * 1000:.2f} ms")
+
+
+def test_dns_cache_without_keep_alive():
+    """Without keep-alive every request connects again; the DNS cache serves the repeat lookups."""
+
+    async def run():
+        server = LocalServer()
+        await server.start()
+        tracer = HttpTracer()
+        connector = aiohttp.TCPConnector(force_close=True, ttl_dns_cache=300)
+        try:
+            async with aiohttp.ClientSession(connector=connector, trace_configs=[tracer.trace_config]) as session:
+                for _ in range(3):
+                    async with session.get(f"http://localhost:{server.port}/api/v1/contracts/XBTUSDTM") as response:
+                        await response.read()
+                stats = tracer.get_stats()
+        finally:
+            await server.stop()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats['connections_created'] == 3 and stats['connection_reuse_ratio'] == 0.0, stats
+    assert stats['dns_cache_misses'] == 1 and stats['dns_cache_hits'] == 2, stats
+    print(f"  ✓ force_close: {stats['connections_created']} connections, DNS cache hits {stats['dns_cache_hits']}")
+
+
+def test_limit_per_host_queueing():
+    """Concurrent requests above limit_per_host wait in the pool queue."""
+
+    async def run():
+        server = LocalServer(slow_delay=0.05)
+        await server.start()
+        tracer = HttpTracer()
+        connector = aiohttp.TCPConnector(limit_per_host=2)
+        url = f"http://127.0.0.1:{server.port}/api/v1/kline/query"
+        try:
+            async with aiohttp.ClientSession(connector=connector, trace_configs=[tracer.trace_config]) as session:
+
+                async def fetch():
+                    async with session.get(url, params={'symbol': 'XBTUSDTM'}) as response:
+                        return await response.json()
+
+                await asyncio.gather(*(fetch() for _ in range(6)))
+
+                # Failed request: closed port
+                try:
+                    async with session.get("http://127.0.0.1:1/api/v1/kline/query"):
+                        pass
+                except aiohttp.ClientError:
+                    pass
+                stats = tracer.get_stats()
+        finally:
+            await server.stop()
+        return server, stats
+
+    server, stats = asyncio.run(run())
+    assert server.max_active == 2, f"{server.max_active} concurrent requests reached the server"
+    assert stats['connections_created'] == 2 and stats['connections_reused'] == 4, stats
+    assert stats['queued'] >= 4 and stats['pool_wait']['max'] >= 0.04, stats['pool_wait']
+    assert stats['errors'] == 1
+    endpoint = stats['endpoints']['GET /api/v1/kline/query']
+    assert endpoint['requests'] == 6 and endpoint['errors'] == 1
+    print(f"  ✓ limit_per_host=2: {stats['queued']} queued, max pool wait {stats['pool_wait']['max'] * 1000:.0f} ms")
+
+
+def test_exchange_client_stats():
+    """ExchangeClient applies exchange.http and reports the traces in get_stats()."""
+    try:
+        from exchange_client import ExchangeClient
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    async def run():
+        server = LocalServer()
+        await server.start()
+        client = ExchangeClient({'exchange': {
+            'base_url': f"http://localhost:{server.port}",
+            'http': {'limit_per_host': 3, 'dns_cache_ttl': 60, 'keepalive_timeout': 15}
+        }})
+        try:
+            for symbol in ('XBTUSDTM', 'ETHUSDTM', 'SOLUSDTM'):
+                data = await client._make_request('GET', f"/api/v1/contracts/{symbol}", rate_limit_key='public')
+                assert data == {'symbol': symbol}
+            stats = client.get_stats()['http_stats']
+        finally:
+            await client.close()
+            await server.stop()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats['pool']['limit_per_host'] == 3
+    assert stats['connections_created'] == 1 and stats['connections_reused'] == 2, stats
+    assert stats['endpoints']['GET /api/v1/contracts/{param}']['requests'] == 3
+    print("  ✓ ExchangeClient.get_stats()['http_stats']")
+
+
+def test_exchange_client_pool_update():
+    """update_config() outside the event loop marks the session; the next request rebuilds it."""
+    try:
+        from exchange_client import ExchangeClient
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    server = LocalServer()
+    config = {'exchange': {'base_url': "http://localhost:0", 'http': {'limit_per_host': 3}}}
+    client = ExchangeClient(config)
+
+    async def run():
+        await server.start()
+        # Synchronous call with no running loop (config reload thread)
+        config['exchange']['base_url'] = f"http://localhost:{server.port}"
+        await asyncio.to_thread(client.update_config, config)
+        try:
+            await client._make_request('GET', "/api/v1/contracts/XBTUSDTM", rate_limit_key='public')
+            first_session = client._session
+            assert client._http_tracer.get_stats(first_session.connector)['pool']['limit_per_host'] == 3
+
+            config['exchange']['http'] = {'limit_per_host': 5}
+            await asyncio.to_thread(client.update_config, config)
+            await client._make_request('GET', "/api/v1/contracts/ETHUSDTM", rate_limit_key='public')
+            stats = client.get_stats()['http_stats']
+            return first_session, stats
+        finally:
+            await client.close()
+            await server.stop()
+
+    first_session, stats = asyncio.run(run())
+    assert client._client_health_status['last_error'] is None, client._client_health_status['last_error']
+    assert first_session.closed and not client._session_dirty
+    assert stats['pool']['limit_per_host'] == 5, stats['pool']
+    print("  ✓ session rebuilt with limit_per_host=5 on the next request")
+
+
+def test_exchange_client_reset_drains_requests():
+    """A request in flight when the session is rebuilt finishes on the old session, which is then closed."""
+    try:
+        from exchange_client import ExchangeClient
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    async def run():
+        server = LocalServer(slow_delay=0.2)
+        await server.start()
+        config = {'exchange': {'base_url': f"http://localhost:{server.port}", 'http': {'limit_per_host': 3}}}
+        client = ExchangeClient(config)
+        try:
+            await client._make_request('GET', "/api/v1/contracts/XBTUSDTM", rate_limit_key='public')
+            old_session = client._session
+
+            slow = asyncio.create_task(client._make_request(
+                'GET', "/api/v1/kline/query", params={'symbol': 'XBTUSDTM'}, rate_limit_key='public'))
+            while server.active == 0:
+                await asyncio.sleep(0.005)
+
+            config['exchange']['http'] = {'limit_per_host': 5}
+            client.update_config(config)
+            data = await client._make_request('GET', "/api/v1/contracts/ETHUSDTM", rate_limit_key='public')
+            assert data == {'symbol': 'ETHUSDTM'} and client._session is not old_session
+            assert not old_session.closed, "old session closed with a request in flight"
+
+            assert await slow == [], "in-flight request failed during the reset"
+            await asyncio.sleep(0.01)
+            assert old_session.closed and not client._retired_sessions and not client._session_requests
+        finally:
+            await client.close()
+            await server.stop()
+
+    asyncio.run(run())
+    print("  ✓ in-flight request finished on the old session, then it was closed")
+
+
+def main():
+    print("\nHTTP connection pool and latency tracing")
+    print("-" * 60)
+
+    tests = [test_endpoint_labels, test_connection_reuse, test_dns_cache_without_keep_alive,
+             test_limit_per_host_queueing, test_exchange_client_stats, test_exchange_client_pool_update,
+             test_exchange_client_reset_drains_requests]
+    failed = skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as e:
+            skipped += 1
+            print(f"  - {test.__name__} skipped ({e})")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed, {skipped} skipped")
+        return 1
+    print(f"✅ {len(tests) - skipped} tests passed, {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,129 @@
+"""
+Tests for the paginated ExchangeClient.fetch_ohlcv on a symbol with a short
+history: pages before the first candle come back as empty lists and end the
+pagination without errors.
+
+REST is replaced by a fake _fetch_with_cache serving hourly klines from a
+fixed listing time. The tests are reported as skipped when the client's
+dependencies (redis, websockets) are not installed.
+
+Usage:
+    python test_kline_pagination.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import logging
+import unittest
+
+import pandas as pd
+
+HOUR_MS = 60 * 60 * 1000
+END_MS = 1_700_000_000_000 // HOUR_MS * HOUR_MS
+
+
+class _LogRecorder(logging.Handler):
+    """Collects warnings and errors of the exchange_client logger."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _make_client(history_candles: int):
+    """ExchangeClient whose kline endpoint only has history_candles hourly candles up to END_MS; returns (client, requests)."""
+    try:
+        from exchange_client import ExchangeClient
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    client = ExchangeClient({'data_fetching': {'cache': {'use_redis': False}}})
+    listed_ms = END_MS - (history_candles - 1) * HOUR_MS
+    requests = []
+
+    async def fake_fetch_with_cache(method, endpoint, rate_limit_key, params=None, **kwargs):
+        requests.append((params.get('from'), params['to']))
+        first = max(params.get('from', 0), listed_ms)
+        first = -(-first // HOUR_MS) * HOUR_MS
+        return [
+            [ts, 100.0, 101.0, 102.0, 99.0, 5.0, '500']
+            for ts in range(first, min(params['to'], END_MS) + 1, HOUR_MS)
+        ]
+    client._fetch_with_cache = fake_fetch_with_cache
+
+    return client, requests
+
+
+def _fetch(history_candles: int, limit: int):
+    """fetch_ohlcv up to END_MS; returns (frame, requests, warnings/errors logged by the fetch)."""
+    recorder = _LogRecorder()
+    logger = logging.getLogger('exchange_client')
+
+    async def run():
+        client, requests = _make_client(history_candles)
+        logger.addHandler(recorder)
+        try:
+            df = await client.fetch_ohlcv('BTC/USDT', '1h', limit=limit, end_time_s=END_MS / 1000)
+        finally:
+            logger.removeHandler(recorder)
+            await client.close()
+        return df, requests
+
+    df, requests = asyncio.run(run())
+    return df, requests, recorder.records
+
+
+def test_short_history():
+    """Older pages before the listing are empty: the available candles are returned without warnings."""
+    df, requests, records = _fetch(history_candles=250, limit=1000)
+
+    assert len(requests) == 5, requests
+    assert df is not None and len(df) == 250, None if df is None else len(df)
+    assert df.index.is_monotonic_increasing and not df.index.has_duplicates
+    assert df.index[-1] == pd.Timestamp(END_MS, unit='ms', tz='UTC')
+    assert not records, [record.getMessage() for record in records]
+    print(f"  ✓ 250 of 1000 candles from {len(requests)} pages, no warnings")
+
+
+def test_no_history():
+    """An empty newest page gives an empty frame instead of None."""
+    for limit in (1000, 100):
+        df, requests, records = _fetch(history_candles=0, limit=limit)
+        assert df is not None and df.empty, (limit, df)
+        assert not [record for record in records if record.levelno >= logging.ERROR], \
+            [record.getMessage() for record in records]
+    print("  ✓ paginated and single-page fetches return an empty frame")
+
+
+def main():
+    print("\nKline pagination")
+    print("-" * 60)
+
+    tests = [test_short_history, test_no_history]
+    failed = skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as e:
+            skipped += 1
+            print(f"  - {test.__name__} skipped ({e})")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed, {skipped} skipped")
+        return 1
+    print(f"✅ {len(tests) - skipped} tests passed, {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,113 @@
+"""
+Tests for the fixed-bucket latency histogram (common.latency_histogram):
+percentiles interpolated inside a bucket, accuracy to the bucket
+resolution, the overflow bucket, merging and the summary.
+
+Usage:
+    python test_latency_histogram.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bisect import bisect_left
+
+import numpy as np
+
+from common.latency_histogram import DEFAULT_BUCKETS, LatencyHistogram
+
+
+def test_uniform_percentiles():
+    """Uniform latencies: interpolation inside the bucket gives the exact percentiles."""
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1000)
+
+    for q, expected in ((50, 0.5), (95, 0.95), (99, 0.99), (100, 1.0)):
+        assert abs(histogram.percentile(q) - expected) < 1e-9, (q, histogram.percentile(q))
+    assert LatencyHistogram().percentile(99) == 0.0
+    print("  ✓ p50/p95/p99 of 1 ms .. 1 s")
+
+
+def test_bucket_resolution():
+    """On skewed latencies each percentile falls in the bucket of the true value."""
+    rng = np.random.default_rng(3)
+    samples = rng.lognormal(mean=np.log(0.02), sigma=1.0, size=5000)
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(float(value))
+
+    for q in (50, 90, 95, 99):
+        true_value = float(np.percentile(samples, q))
+        i = bisect_left(DEFAULT_BUCKETS, true_value)
+        lower = DEFAULT_BUCKETS[i - 1] if i > 0 else 0.0
+        upper = DEFAULT_BUCKETS[i] if i < len(DEFAULT_BUCKETS) else histogram.max
+        assert lower <= histogram.percentile(q) <= upper, (q, true_value, histogram.percentile(q))
+
+    assert abs(histogram.summary()['avg'] - samples.mean()) < 1e-12
+    print(f"  ✓ p99 {histogram.percentile(99) * 1000:.1f} ms vs {np.percentile(samples, 99) * 1000:.1f} ms")
+
+
+def test_overflow_and_max():
+    """Values above the last bound land in the overflow bucket; percentiles there return max."""
+    histogram = LatencyHistogram(bounds=(0.01, 0.1))
+    for value in (0.005, 0.05, 0.5, 2.0):
+        histogram.record(value)
+
+    assert histogram.counts == [1, 1, 2]
+    assert histogram.percentile(99) == 2.0 and histogram.max == 2.0
+    # The top bucket is capped at the observed maximum
+    capped = LatencyHistogram(bounds=(0.01, 0.1))
+    capped.record(0.02)
+    assert capped.percentile(100) == 0.02
+    print("  ✓ overflow bucket, max cap")
+
+
+def test_merge_and_summary():
+    """Merging equals recording everything in one histogram; different buckets are refused."""
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i, value in enumerate(np.linspace(0.001, 3.0, 200)):
+        (first if i % 2 else second).record(float(value))
+        combined.record(float(value))
+
+    first.merge(second)
+    assert first.counts == combined.counts and first.max == combined.max
+    merged, expected = first.summary(), combined.summary()
+    assert set(merged) == {'count', 'avg', 'p50', 'p95', 'p99', 'max'}
+    # Totals are summed in a different order
+    assert all(abs(merged[key] - expected[key]) < 1e-12 for key in expected), (merged, expected)
+
+    try:
+        first.merge(LatencyHistogram(bounds=(1.0,)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("merged histograms with different buckets")
+    print("  ✓ merge equals combined recording")
+
+
+def main():
+    print("\nLatency histogram")
+    print("-" * 60)
+
+    tests = [test_uniform_percentiles, test_bucket_resolution, test_overflow_and_max,
+             test_merge_and_summary]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed")
+        return 1
+    print(f"✅ all {len(tests)} tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
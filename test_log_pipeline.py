@@ -0,0 +1,191 @@
+"""
+Tests for the queue-based logging pipeline (log_pipeline): handlers and
+formatting in the listener thread, args merged only for records that pass
+the filters (and with their contents at call time), per-logger rate limits
+and sampling (warnings always pass), and dropping instead of blocking on a
+full queue.
+
+Usage:
+    python test_log_pipeline.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+import threading
+
+from log_pipeline import LogPipeline, RateLimitFilter
+
+
+class ListHandler(logging.Handler):
+    """Collects formatted messages and the thread that formatted them."""
+
+    def __init__(self, gate: threading.Event = None):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+        self.gate = gate
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+
+class FormatProbe:
+    """Log argument that records which thread converted it to text."""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return 'probe'
+
+
+def _logger(name: str) -> logging.Logger:
+    test_logger = logging.getLogger(name)
+    test_logger.setLevel(logging.DEBUG)
+    return test_logger
+
+
+def _remove_root_handlers() -> list:
+    """As in the bot, the pipeline is the only root handler (pytest adds its own)."""
+    root = logging.getLogger()
+    other_handlers = root.handlers[:]
+    for other in other_handlers:
+        root.removeHandler(other)
+    return other_handlers
+
+
+def _restore_root_handlers(other_handlers: list) -> None:
+    for other in other_handlers:
+        logging.getLogger().addHandler(other)
+
+
+def test_formatting_after_filter():
+    """Args are merged once per record that passes the filters; handlers run in the listener thread."""
+    handler = ListHandler()
+    pipeline = LogPipeline([handler], rate_limits={'test_log_pipeline.format.noisy': {'rate': 0.001, 'burst': 5}})
+    probe = FormatProbe()
+    noisy_probe = FormatProbe()
+
+    other_handlers = _remove_root_handlers()
+    pipeline.start()
+    try:
+        test_logger = _logger('test_log_pipeline.format')
+        noisy_logger = _logger('test_log_pipeline.format.noisy')
+        for i in range(200):
+            test_logger.info("message %d %s", i, probe)
+            noisy_logger.info("noisy %s", noisy_probe)
+    finally:
+        pipeline.stop()
+        _restore_root_handlers(other_handlers)
+
+    caller = threading.current_thread().name
+    assert len(handler.messages) == 205 and handler.messages[-1] == 'message 199 probe'
+    assert len(probe.threads) == 200, len(probe.threads)
+    assert len(noisy_probe.threads) == 5, "rate-limited records were formatted"
+    assert handler.threads and caller not in handler.threads
+    assert pipeline.handler not in logging.getLogger().handlers
+    print("  ✓ 205 records handled in the listener thread, 195 dropped unformatted, flushed on stop")
+
+
+def test_mutable_args():
+    """Mutable args are logged with their contents at the time of the call."""
+    gate = threading.Event()
+    handler = ListHandler(gate)
+    pipeline = LogPipeline([handler])
+
+    other_handlers = _remove_root_handlers()
+    pipeline.start()
+    try:
+        test_logger = _logger('test_log_pipeline.mutable')
+        position = {'price': 1.0}
+        levels = [1]
+        test_logger.info("position %s", position)
+        test_logger.info("levels %s, price %.1f", levels, position['price'])
+        test_logger.info("price %(price)s", position)
+
+        # Changed while the records wait in the queue (writer stalled)
+        position['price'] = 2.0
+        levels.append(2)
+    finally:
+        gate.set()
+        pipeline.stop()
+        _restore_root_handlers(other_handlers)
+
+    assert handler.messages == ["position {'price': 1.0}", "levels [1], price 1.0", "price 1.0"], handler.messages
+    print("  ✓ dict / list / mapping args logged as they were at the call")
+
+
+def test_rate_limit_and_sampling():
+    """Longest-prefix rules: token bucket per prefix, deterministic sampling, warnings never dropped."""
+    rate_filter = RateLimitFilter({
+        'app.noisy': {'rate': 0.001, 'burst': 5},
+        'app.noisy.patterns': {'sample': 0.1},
+    })
+
+    def passed(name, level=logging.INFO, count=100):
+        record = lambda: logging.LogRecord(name, level, __file__, 0, "msg", None, None)
+        return sum(rate_filter.filter(record()) for _ in range(count))
+
+    assert passed('app.noisy') == 5
+    assert passed('app.noisy.sub') == 0, "child logger does not share the prefix bucket"
+    assert passed('app.noisy.patterns') == 10
+    assert passed('app.noisy', logging.WARNING) == 100
+    assert passed('app.noisier') == 100 and passed('other') == 100
+
+    assert rate_filter.dropped == {'app.noisy': 195, 'app.noisy.patterns': 90}, rate_filter.dropped
+    print(f"  ✓ dropped {rate_filter.dropped}")
+
+
+def test_full_queue_drops_without_blocking():
+    """With the writer stalled, records beyond queue_size are counted as dropped, not waited on."""
+    gate = threading.Event()
+    handler = ListHandler(gate)
+    pipeline = LogPipeline([handler], queue_size=10)
+
+    pipeline.start()
+    try:
+        test_logger = _logger('test_log_pipeline.full')
+        for i in range(100):
+            test_logger.info("message %d", i)
+        stats = pipeline.get_stats()
+    finally:
+        gate.set()
+        pipeline.stop()
+
+    # The listener may hold one record outside the queue while it is stalled
+    assert stats['queued'] == 10 and 89 <= stats['dropped_queue_full'] <= 90, stats
+    assert len(handler.messages) == 100 - stats['dropped_queue_full']
+    print(f"  ✓ {stats['dropped_queue_full']} records dropped, {len(handler.messages)} written")
+
+
+def main():
+    print("\nLog pipeline")
+    print("-" * 60)
+
+    tests = [test_formatting_after_filter, test_mutable_args, test_rate_limit_and_sampling,
+             test_full_queue_drops_without_blocking]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed")
+        return 1
+    print(f"✅ all {len(tests)} tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,237 @@
+"""
+Tests for the append-only on-disk candle store (ohlcv_store): append,
+overwriting the forming candle, merging older and gap-filling data,
+refusing non-adjacent ranges, recovery from a torn last record and
+compaction to max_candles.
+
+The MarketDataFetcher read-through (warm restart from disk) is reported as
+skipped when its dependencies (redis, websockets) are not installed.
+
+Usage:
+    python test_ohlcv_store.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from candle_store import CANDLE_COLUMNS
+from ohlcv_store import OHLCVDiskStore, RECORD_DTYPE
+
+TF_MS = 5 * 60 * 1000
+T0 = 1_700_000_000_000 // TF_MS * TF_MS
+SYMBOL = 'BTC/USDT'
+
+
+def _rest_frame(start_ms: int, count: int, base: float = 100.0) -> pd.DataFrame:
+    """Frame shaped like ExchangeClient._fetch_single_ohlcv output; close = base, base + 1, ..."""
+    timestamps = start_ms + np.arange(count) * TF_MS
+    close = base + np.arange(count)
+    index = pd.DatetimeIndex(pd.to_datetime(timestamps, unit='ms', utc=True), name='timestamp')
+    return pd.DataFrame({
+        'open': close - 1, 'close': close, 'high': close + 2, 'low': close - 2,
+        'volume': np.full(count, 10.0), 'turnover': [str(1000.0)] * count
+    }, index=index)
+
+
+def _timestamps(df: pd.DataFrame) -> np.ndarray:
+    return df.index.as_unit('ms').asi8
+
+
+def _with_store(test):
+    """Run test(store) on a store in a temporary directory."""
+    def run():
+        base_dir = tempfile.mkdtemp()
+        try:
+            test(OHLCVDiskStore(base_dir, max_candles=100))
+        finally:
+            shutil.rmtree(base_dir)
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+
+@_with_store
+def test_append_and_read(store):
+    """Written candles read back as a UTC-indexed frame; newer candles are appended in place."""
+    assert store.read(SYMBOL, '5m') is None and store.last_timestamp(SYMBOL, '5m') is None
+
+    store.write(SYMBOL, '5m', _rest_frame(T0, 50))
+    df = store.read(SYMBOL, '5m', limit=20)
+    assert len(df) == 20 and df['close'].iloc[-1] == 149 and str(df.index.tz) == 'UTC'
+    assert tuple(df.columns) == CANDLE_COLUMNS and df['turnover'].iloc[0] == 1000.0
+
+    store.write(SYMBOL, '5m', _rest_frame(T0 + 50 * TF_MS, 5, base=150))
+    df = store.read(SYMBOL, '5m')
+    assert len(df) == 55 and (np.diff(_timestamps(df)) == TF_MS).all()
+    assert store.stats['rewrites'] == 1 and store.stats['appended'] == 5
+    print("  ✓ write, read(limit), append without rewrite")
+
+
+@_with_store
+def test_forming_candle_overwrite(store):
+    """Data overlapping the end of the file replaces those candles (the forming candle keeps changing)."""
+    store.write(SYMBOL, '5m', _rest_frame(T0, 50))
+    store.write(SYMBOL, '5m', _rest_frame(T0 + 49 * TF_MS, 3, base=500))
+
+    df = store.read(SYMBOL, '5m')
+    assert len(df) == 52 and df['close'].iloc[-4] == 148 and df['close'].iloc[-3] == 500
+    assert store.stats['rewrites'] == 1, "tail overwrite rewrote the file"
+    print("  ✓ last candle replaced, new candles appended")
+
+
+@_with_store
+def test_merge_older_and_middle(store):
+    """Older adjacent data and candles inside the stored range are merged by an atomic rewrite."""
+    store.write(SYMBOL, '5m', _rest_frame(T0, 50))
+
+    store.write(SYMBOL, '5m', _rest_frame(T0 + 10 * TF_MS, 2, base=900))
+    df = store.read(SYMBOL, '5m')
+    assert len(df) == 50 and df['close'].iloc[10] == 900 and df['close'].iloc[12] == 112
+
+    store.write(SYMBOL, '5m', _rest_frame(T0 - 5 * TF_MS, 5))
+    df = store.read(SYMBOL, '5m')
+    assert len(df) == 55 and _timestamps(df)[0] == T0 - 5 * TF_MS
+    assert (np.diff(_timestamps(df)) == TF_MS).all()
+    assert not any(name.endswith('.tmp') for name in os.listdir(store.base_dir))
+    print("  ✓ middle overwrite, adjacent older data prepended")
+
+
+@_with_store
+def test_non_adjacent_ranges(store):
+    """Ranges separated by a gap are never joined: older data is skipped, newer data replaces the file."""
+    store.write(SYMBOL, '5m', _rest_frame(T0, 50))
+
+    assert store.write(SYMBOL, '5m', _rest_frame(T0 - 100 * TF_MS, 10)) == 0
+    assert store.count(SYMBOL, '5m') == 50 and store.stats['skipped'] == 1
+
+    store.write(SYMBOL, '5m', _rest_frame(T0 + 80 * TF_MS, 20, base=300))
+    df = store.read(SYMBOL, '5m')
+    assert len(df) == 20 and _timestamps(df)[0] == T0 + 80 * TF_MS
+    assert (np.diff(_timestamps(df)) == TF_MS).all() and store.stats['replaced'] == 1
+    print("  ✓ older gap skipped, newer gap replaces the file")
+
+
+@_with_store
+def test_torn_record_recovery(store):
+    """A partial record at the end of the file is ignored on read and dropped on the next write."""
+    store.write(SYMBOL, '5m', _rest_frame(T0, 50))
+    path = store._path(SYMBOL, '5m')
+    with open(path, 'ab') as f:
+        f.write(b'\x01' * (RECORD_DTYPE.itemsize // 2))
+
+    df = store.read(SYMBOL, '5m')
+    assert len(df) == 50 and df['close'].iloc[-1] == 149
+    assert store.last_timestamp(SYMBOL, '5m') == T0 + 49 * TF_MS
+
+    store.write(SYMBOL, '5m', _rest_frame(T0 + 50 * TF_MS, 3, base=150))
+    assert os.path.getsize(path) == 53 * RECORD_DTYPE.itemsize
+    assert (np.diff(_timestamps(store.read(SYMBOL, '5m'))) == TF_MS).all()
+    print("  ✓ torn record ignored, then truncated")
+
+
+@_with_store
+def test_compaction(store):
+    """Appends grow the file up to 2 * max_candles, then it is compacted to the last max_candles."""
+    store.write(SYMBOL, '5m', _rest_frame(T0, 100))
+    store.write(SYMBOL, '5m', _rest_frame(T0 + 100 * TF_MS, 90, base=200))
+    assert store.count(SYMBOL, '5m') == 190, "compacted before reaching 2 * max_candles"
+
+    store.write(SYMBOL, '5m', _rest_frame(T0 + 190 * TF_MS, 20, base=290))
+    df = store.read(SYMBOL, '5m')
+    assert len(df) == 100 and store.last_timestamp(SYMBOL, '5m') == T0 + 209 * TF_MS
+    assert df['close'].iloc[-1] == 309 and (np.diff(_timestamps(df)) == TF_MS).all()
+
+    stats = store.get_stats()
+    assert stats['files'] == 1 and stats['candles'] == 100
+    print("  ✓ compacted to max_candles")
+
+
+def test_fetcher_read_through():
+    """After a restart the fetcher serves contiguous disk candles plus a delta fetch; gapped data is refetched."""
+    try:
+        from exchange_client import ExchangeClient
+        from market_data_fetcher import MarketDataFetcher
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    async def run(base_dir, disk_df):
+        store = OHLCVDiskStore(base_dir)
+        store.delete('BTCUSDT', '5m')
+        store.write('BTCUSDT', '5m', disk_df)
+
+        config = {'data_fetching': {'cache': {'use_redis': False},
+                                    'disk_store': {'enabled': True, 'path': base_dir}}}
+        client = ExchangeClient(config)
+        now = int(time.time() * 1000) // TF_MS * TF_MS
+        calls = []
+
+        async def fake_fetch_ohlcv(symbol, timeframe, limit=200, start_time_s=None, **kwargs):
+            calls.append(start_time_s)
+            start = now - (limit - 1) * TF_MS if start_time_s is None else int(start_time_s * 1000) // TF_MS * TF_MS
+            return _rest_frame(start, min(limit, (now - start) // TF_MS + 1))
+        client.fetch_ohlcv = fake_fetch_ohlcv
+
+        fetcher = MarketDataFetcher(config, client)
+        try:
+            df = await fetcher.get_historical_data('BTCUSDT', '5m', limit=50)
+            return df, calls, fetcher.get_stats()['fetcher_stats']['disk_store_hits']
+        finally:
+            await fetcher.shutdown()
+            await client.close()
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        # Disk ends 3 candles ago: served from disk, only the new candles are fetched
+        start = int(time.time() * 1000) // TF_MS * TF_MS - 52 * TF_MS
+        df, calls, hits = asyncio.run(run(base_dir, _rest_frame(start, 50)))
+        assert hits == 1 and len(calls) == 1 and calls[0] is not None, calls
+        assert len(df) == 50 and (np.diff(_timestamps(df)) == TF_MS).all()
+
+        # A gap inside the disk window: full fetch instead of serving it
+        gapped = pd.concat([_rest_frame(start - 10 * TF_MS, 20), _rest_frame(start + 20 * TF_MS, 30)])
+        df, calls, hits = asyncio.run(run(base_dir, gapped))
+        assert hits == 0 and calls == [None], calls
+        assert len(df) == 50 and (np.diff(_timestamps(df)) == TF_MS).all()
+    finally:
+        shutil.rmtree(base_dir)
+    print("  ✓ contiguous disk data served, gapped disk data refetched")
+
+
+def main():
+    print("\nOHLCV disk store")
+    print("-" * 60)
+
+    tests = [test_append_and_read, test_forming_candle_overwrite, test_merge_older_and_middle,
+             test_non_adjacent_ranges, test_torn_record_recovery, test_compaction,
+             test_fetcher_read_through]
+    failed = skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as e:
+            skipped += 1
+            print(f"  - {test.__name__} skipped ({e})")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed, {skipped} skipped")
+        return 1
+    print(f"✅ {len(tests) - skipped} tests passed, {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,226 @@
+"""
+Tests for the weighted token-bucket rate limiter (rate_limiter): FIFO and
+priority ordering of weighted waiters, penalty debt after a 429, returning
+tokens of cancelled waiters, throttle/recover of a pool's rate and
+reconfiguring from a thread without an event loop.
+
+Usage:
+    python test_rate_limiter.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import threading
+import time
+
+from rate_limiter import TokenBucket, RateLimiter, PRIORITY_HIGH, PRIORITY_LOW
+
+
+async def _acquire_all(bucket: TokenBucket, requests) -> list:
+    """Queue (label, tokens, priority) requests in order on an empty bucket; return labels in grant order."""
+    order = []
+
+    async def request(label, tokens, priority):
+        await bucket.acquire(tokens, priority)
+        order.append(label)
+
+    tasks = []
+    for label, tokens, priority in requests:
+        tasks.append(asyncio.create_task(request(label, tokens, priority)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_weighted_fifo():
+    """Without priority a heavy waiter at the head is not overtaken by lighter ones behind it."""
+
+    async def run():
+        bucket = TokenBucket(rate=200, capacity=10)
+        assert bucket.try_acquire(10) and not bucket.try_acquire(1)
+
+        order = await _acquire_all(bucket, [('heavy', 8, PRIORITY_LOW), ('light', 1, PRIORITY_HIGH),
+                                            ('light2', 1, PRIORITY_HIGH)])
+        assert order == ['heavy', 'light', 'light2'], order
+        assert bucket.stats['tokens'] == 20 and bucket.stats['waited'] == 3
+
+    asyncio.run(run())
+    print("  ✓ grant order follows arrival, weights consumed")
+
+
+def test_priority_order():
+    """With priority ordering a high-priority waiter is served before earlier low-priority ones."""
+
+    async def run():
+        limiter = RateLimiter(pools={'public': {'quota': 60, 'window_seconds': 1}}, order='priority')
+        bucket = limiter._buckets['public']
+        assert bucket.try_acquire(bucket.capacity)
+
+        order = []
+
+        async def request(label, priority):
+            await limiter.acquire('kline', priority=priority)
+            order.append(label)
+
+        tasks = []
+        for label, priority in [('low1', PRIORITY_LOW), ('low2', PRIORITY_LOW), ('high', PRIORITY_HIGH)]:
+            tasks.append(asyncio.create_task(request(label, priority)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert order == ['high', 'low1', 'low2'], order
+        stats = limiter.get_stats()['endpoints']['kline']
+        assert stats['requests'] == 3 and stats['weight'] == 3 and stats['wait_time']['count'] == 3
+
+    asyncio.run(run())
+    print("  ✓ high priority first, FIFO within a priority")
+
+
+def test_penalize_debt():
+    """penalize() puts the bucket in debt: nothing is granted until it has been repaid."""
+
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.penalize(0.1)
+        assert -11 < bucket.available < -9, bucket.available
+        assert not bucket.try_acquire(1)
+
+        start = time.monotonic()
+        await bucket.acquire(1)
+        waited = time.monotonic() - start
+        assert 0.1 <= waited < 0.3, f"waited {waited:.3f}s"
+
+        # wait_ready() waits out the debt without taking tokens
+        bucket.penalize(0.05)
+        start = time.monotonic()
+        await bucket.wait_ready()
+        assert time.monotonic() - start >= 0.04 and bucket.stats['requests'] == 1
+        assert bucket.stats['penalties'] == 2
+
+    asyncio.run(run())
+    print("  ✓ debt blocks grants for retry_after")
+
+
+def test_cancelled_waiter_returns_tokens():
+    """A cancelled waiter takes no tokens; one granted but cancelled before resuming gives them back."""
+
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=5)
+        assert bucket.try_acquire(5)
+
+        # Cancelled while queued: the next waiter is served as if it were not there
+        queued = asyncio.create_task(bucket.acquire(5))
+        await asyncio.sleep(0)
+        queued.cancel()
+        start = time.monotonic()
+        await bucket.acquire(1)
+        assert time.monotonic() - start < 0.06 and bucket.waiting == 0
+        assert queued.cancelled()
+
+        # Granted (tokens taken) but cancelled before the task resumed: tokens are returned
+        granted = asyncio.create_task(bucket.acquire(5))
+        await asyncio.sleep(0)
+        time.sleep(0.12)          # refill without running the loop's wake-up timer
+        bucket._reschedule()      # grants the waiter
+        assert bucket.available < 1
+        granted.cancel()
+        try:
+            await granted
+        except asyncio.CancelledError:
+            pass
+        assert granted.cancelled() and bucket.available >= 4.9, bucket.available
+
+    asyncio.run(run())
+    print("  ✓ queued cancel skipped, granted cancel refunded")
+
+
+def test_throttle_and_recover():
+    """Each 429 lowers the pool rate by 20% down to min_throttle; successes restore it gradually."""
+    limiter = RateLimiter(pools={'public': {'quota': 100, 'window_seconds': 10}}, min_throttle=0.25)
+    bucket = limiter._buckets['public']
+    private_rate = limiter._buckets['private'].rate
+    assert abs(bucket.rate - 9.0) < 1e-9 and bucket.capacity == 10
+
+    assert abs(limiter.penalize('kline', retry_after=1) - 0.8) < 1e-9
+    assert abs(bucket.rate - 7.2) < 1e-9 and bucket.available < -7
+
+    for _ in range(10):
+        throttle = limiter.penalize('ticker')
+    assert throttle == 0.25 and abs(bucket.rate - 2.25) < 1e-9
+    assert limiter._buckets['private'].rate == private_rate, "other pools throttled"
+
+    recoveries = 0
+    while limiter._throttle['public'] < 1.0:
+        limiter.recover('kline')
+        recoveries += 1
+    assert abs(bucket.rate - 9.0) < 1e-9 and 25 < recoveries < 35, recoveries
+
+    stats = limiter.get_stats()
+    assert stats['endpoints']['kline']['violations'] == 1 and stats['endpoints']['ticker']['violations'] == 10
+    print(f"  ✓ throttled to 0.25, recovered in {recoveries} successes")
+
+
+def test_configure_from_thread():
+    """configure() from a thread without an event loop reaches the queued waiters on their loop."""
+
+    async def run():
+        limiter = RateLimiter(pools={'public': {'quota': 30, 'window_seconds': 30}})
+        bucket = limiter._buckets['public']
+        assert bucket.try_acquire(bucket.capacity)
+
+        tasks = []
+        for _ in range(3):
+            tasks.append(asyncio.create_task(limiter.acquire('kline')))
+            await asyncio.sleep(0)
+        assert bucket.waiting == 3
+
+        # As ExchangeClient.update_config from the config reload thread
+        errors = []
+
+        def reconfigure():
+            try:
+                limiter.configure(pools={'public': {'quota': 3000, 'window_seconds': 1}})
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=reconfigure)
+        thread.start()
+        thread.join()
+        assert not errors, errors
+
+        start = time.monotonic()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=2)
+        assert time.monotonic() - start < 0.5 and bucket.waiting == 0
+        assert abs(bucket.rate - 2700.0) < 1e-9 and bucket._timer is None
+
+    asyncio.run(run())
+    print("  ✓ new rate applied on the loop, 3 queued requests served")
+
+
+def main():
+    print("\nRate limiter")
+    print("-" * 60)
+
+    tests = [test_weighted_fifo, test_priority_order, test_penalize_debt,
+             test_cancelled_waiter_returns_tokens, test_throttle_and_recover, test_configure_from_thread]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed")
+        return 1
+    print(f"✅ all {len(tests)} tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
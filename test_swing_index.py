@@ -0,0 +1,211 @@
+"""
+Parity tests for the shared swing-point index (common.swing_index): every
+consumer gets the same pivots and peaks from SwingIndex as from the loops
+and find_peaks calls it replaced - SRAnalyzer levels and their fallback,
+HarmonicAnalyzer swing points, Head & Shoulders and Double Top/Bottom
+peaks, and the DynamicStopManager stop pivots.
+
+Prices are rounded so that equal highs/lows (ties) occur. The
+DynamicStopManager round trip is reported as skipped when trade_extensions
+cannot be imported.
+
+Usage:
+    python test_swing_index.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+
+from common.swing_index import SwingIndex
+
+LENGTHS = (3, 11, 60, 150, 400)
+
+
+def _make_ohlc(n: int, seed: int) -> pd.DataFrame:
+    """Random-walk OHLC rounded to 0.5 (many equal highs/lows) with a flat stretch."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    close[n // 3:n // 3 + 6] = close[n // 3]
+    high = np.round((close + rng.random(n) * 2) * 2) / 2
+    low = np.round((close - rng.random(n) * 2) * 2) / 2
+    return pd.DataFrame({
+        'open': close, 'high': high, 'low': low, 'close': close, 'volume': np.ones(n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='1h'))
+
+
+def _frames():
+    for seed in range(4):
+        for n in LENGTHS:
+            yield _make_ohlc(n, seed)
+
+
+def _find_local_extrema(data: np.ndarray, extrema_type: str = 'max', window: int = 5) -> list:
+    """Former SRAnalyzer._find_local_extrema (also the HarmonicAnalyzer swing loop)."""
+    extrema = []
+    for i in range(window, len(data) - window):
+        window_data = data[i - window:i + window + 1]
+        if extrema_type == 'max':
+            if data[i] == max(window_data):
+                extrema.append(i)
+        else:
+            if data[i] == min(window_data):
+                extrema.append(i)
+    return extrema
+
+
+def _strict_pivots(df: pd.DataFrame, window_size: int = 2):
+    """Former DynamicStopManager._detect_pivots loop."""
+    highs, lows = [], []
+    for i in range(window_size, len(df) - window_size):
+        is_peak = True
+        for j in range(1, window_size + 1):
+            if df['high'].iloc[i] <= df['high'].iloc[i - j] or df['high'].iloc[i] <= df['high'].iloc[i + j]:
+                is_peak = False
+                break
+        if is_peak:
+            highs.append(i)
+
+        is_valley = True
+        for j in range(1, window_size + 1):
+            if df['low'].iloc[i] >= df['low'].iloc[i - j] or df['low'].iloc[i] >= df['low'].iloc[i + j]:
+                is_valley = False
+                break
+        if is_valley:
+            lows.append(i)
+    return highs, lows
+
+
+def _old_peaks(values: np.ndarray, kind: str, distance: int, prominence_factor: float) -> list:
+    """Former find_peaks call of SR and the chart patterns."""
+    signal = values if kind == 'high' else -values
+    peaks, _ = find_peaks(signal, distance=distance, prominence=np.std(values) * prominence_factor)
+    return peaks.tolist()
+
+
+def test_sr_levels():
+    """SRAnalyzer level peaks and the window fallback on df.tail(lookback)."""
+    from signal_generation.analyzers.sr_analyzer import SRAnalyzer
+
+    sr = SRAnalyzer({})
+    checked = 0
+    for df in _frames():
+        swings = SwingIndex(df)
+        lookback = min(sr.lookback, len(df))
+        recent = df.tail(lookback)
+        for kind, extrema_type in (('high', 'max'), ('low', 'min')):
+            values = recent[kind].values
+            expected = _old_peaks(values, kind, 5, sr.prominence_factor)
+            actual = swings.peaks(kind, distance=5, prominence_factor=sr.prominence_factor, lookback=lookback)
+            assert actual.tolist() == expected, (len(df), kind, actual, expected)
+
+            pivots = swings.pivots(5, lookback=lookback)[0 if kind == 'high' else 1]
+            assert pivots.tolist() == _find_local_extrema(values, extrema_type), (len(df), kind)
+            checked += 1
+    print(f"  ✓ SR peaks and fallback pivots match on {checked} series")
+
+
+def test_harmonic_swings():
+    """HarmonicAnalyzer swing highs/lows on df.tail(lookback) for several windows."""
+    from signal_generation.analyzers.harmonic_analyzer import HarmonicAnalyzer
+
+    harmonic = HarmonicAnalyzer({})
+    for df in _frames():
+        swings = SwingIndex(df)
+        for window in (harmonic.swing_window, 2, 3, 8):
+            for lookback in (harmonic.lookback, 50, len(df) + 10):
+                lookback = min(lookback, len(df))
+                recent = df.tail(lookback)
+                highs, lows = swings.pivots(window, lookback=lookback)
+                assert highs.tolist() == _find_local_extrema(recent['high'].values, 'max', window), \
+                    (len(df), window, lookback)
+                assert lows.tolist() == _find_local_extrema(recent['low'].values, 'min', window), \
+                    (len(df), window, lookback)
+    print(f"  ✓ swing points match (swing_window={harmonic.swing_window}, lookback={harmonic.lookback})")
+
+
+def test_chart_pattern_peaks():
+    """Head & Shoulders and Double Top/Bottom peaks, with the shared index and without."""
+    from signal_generation.analyzers.patterns.chart.head_shoulders import HeadShouldersPattern
+    from signal_generation.analyzers.patterns.chart.double_top_bottom import DoubleTopBottomPattern
+
+    patterns = [HeadShouldersPattern({'hs_min_distance': 4}), DoubleTopBottomPattern(),
+                HeadShouldersPattern(), DoubleTopBottomPattern({'double_pattern_min_distance': 8})]
+    for df in _frames():
+        shared = SwingIndex(df)
+        for pattern in patterns:
+            for kind in ('high', 'low'):
+                expected = _old_peaks(df[kind].values, kind, pattern.min_distance, 0.5)
+                for swings in (shared, None, SwingIndex(df.copy())):
+                    pattern.swings = swings
+                    actual = pattern._swing_peaks(df, kind, pattern.min_distance)
+                    assert actual.tolist() == expected, (pattern.name, len(df), kind)
+    print(f"  ✓ peaks of {len(patterns)} detectors match find_peaks")
+
+
+def test_stop_pivots():
+    """Strict 2-bar pivots equal the former stop-pivot loop (ties are not pivots)."""
+    ties = 0
+    for df in _frames():
+        highs, lows = SwingIndex(df).pivots(2, strict=True)
+        expected_highs, expected_lows = _strict_pivots(df)
+        assert highs.tolist() == expected_highs and lows.tolist() == expected_lows, len(df)
+        ties += len(SwingIndex(df).pivots(2)[0]) - len(highs)
+    assert ties > 0, "no equal highs in the test data"
+    print(f"  ✓ strict pivots match, {ties} tied highs rejected")
+
+
+def test_detect_pivots():
+    """DynamicStopManager._detect_pivots returns the former pivots with their index and value."""
+    try:
+        from trade_extensions import DynamicStopManager
+    except ImportError as e:
+        raise unittest.SkipTest(str(e))
+
+    manager = DynamicStopManager({})
+    for df in _frames():
+        result = manager._detect_pivots(df)
+        if len(df) < 5:
+            assert result == {'highs': [], 'lows': []}
+            continue
+        expected_highs, expected_lows = _strict_pivots(df)
+        for key, column, expected in (('highs', 'high', expected_highs), ('lows', 'low', expected_lows)):
+            assert [p['position'] for p in result[key]] == expected, (len(df), key)
+            assert all(p['index'] == df.index[p['position']] and p['value'] == df[column].iloc[p['position']]
+                       for p in result[key])
+    print("  ✓ stop pivots match")
+
+
+def main():
+    print("\nShared swing index parity")
+    print("-" * 60)
+
+    tests = [test_sr_levels, test_harmonic_swings, test_chart_pattern_peaks, test_stop_pivots,
+             test_detect_pivots]
+    failed = skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as e:
+            skipped += 1
+            print(f"  - {test.__name__} skipped ({e})")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed, {skipped} skipped")
+        return 1
+    print(f"✅ {len(tests) - skipped} tests passed, {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,167 @@
+"""
+Tests for the generic TTL/LRU cache (common.ttl_cache): per-key TTL,
+max_age, LRU eviction, the byte budget and async single-flight loading,
+including cancellation of the loading caller.
+
+Usage:
+    python test_ttl_cache.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import time
+
+from common.ttl_cache import TTLCache
+
+
+def test_ttl_expiry():
+    """Entries expire after their TTL; max_age hides older entries without removing them."""
+    cache = TTLCache(default_ttl=0.05)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=10)
+    assert cache.get('a') == 1 and 'a' in cache
+
+    time.sleep(0.06)
+    assert cache.get('a') is None and 'a' not in cache
+    assert cache.get('b') == 2
+    assert cache.get('b', max_age=0.01) is None, "max_age not applied"
+    assert cache.get('b') == 2, "max_age removed the entry"
+    assert cache.stats['expirations'] == 1 and cache.stats['stale'] == 1
+
+    # purge_expired removes entries nobody reads again
+    cache.set('c', 3, ttl=0.01)
+    time.sleep(0.02)
+    assert len(cache) == 2 and cache.purge_expired() == 1 and len(cache) == 1
+    print("  ✓ per-key TTL, max_age, purge")
+
+
+def test_lru_eviction():
+    """Over max_entries the least recently used entry is evicted; get() refreshes recency."""
+    cache = TTLCache(max_entries=3)
+    for key in 'abc':
+        cache.set(key, key)
+    assert cache.get('a') == 'a'
+    cache.set('d', 'd')
+
+    assert 'b' not in cache, "least recently used entry kept"
+    assert all(key in cache for key in 'acd')
+    assert cache.stats['evictions'] == 1
+
+    cache.resize(max_entries=1)
+    assert len(cache) == 1 and 'd' in cache
+    print("  ✓ LRU order, resize")
+
+
+def test_byte_budget():
+    """max_bytes evicts old entries by size and rejects values larger than the budget."""
+    cache = TTLCache(max_entries=None, max_bytes=100, size_of=len)
+    cache.set('a', 'x' * 40)
+    cache.set('b', 'x' * 40)
+    assert cache.bytes == 80
+
+    cache.set('c', 'x' * 40)
+    assert 'a' not in cache and cache.bytes == 80
+
+    # Replacing an entry releases its old size
+    cache.set('b', 'x' * 10)
+    assert cache.bytes == 50
+
+    assert not cache.set('big', 'x' * 101)
+    assert 'big' not in cache and cache.stats['rejected'] == 1 and cache.bytes == 50
+    print("  ✓ byte accounting, eviction, rejection")
+
+
+def test_single_flight():
+    """Concurrent get_or_load calls share one loader call; errors reach all callers and are not cached."""
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return 'value'
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        raise ValueError('boom')
+
+    async def run():
+        cache = TTLCache()
+        results = await asyncio.gather(*(cache.get_or_load('k', loader) for _ in range(5)))
+        assert results == ['value'] * 5 and len(calls) == 1
+        assert await cache.get_or_load('k', loader) == 'value' and len(calls) == 1
+        assert cache.stats['coalesced'] == 4 and cache.stats['loads'] == 1
+
+        calls.clear()
+        errors = await asyncio.gather(*(cache.get_or_load('e', failing) for _ in range(3)),
+                                      return_exceptions=True)
+        assert len(calls) == 1 and all(isinstance(e, ValueError) for e in errors)
+        assert 'e' not in cache and not cache._inflight
+
+    asyncio.run(run())
+    print("  ✓ one loader call, shared result and errors")
+
+
+def test_cancelled_loader():
+    """Cancelling the loading caller does not cancel waiting callers; one of them loads again."""
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        cache = TTLCache()
+        leader = asyncio.create_task(cache.get_or_load('k', loader))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.create_task(cache.get_or_load('k', loader)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        assert leader.cancelled()
+        assert results == [2, 2, 2], results
+        assert len(calls) == 2, "followers did not share the retried load"
+
+        # A cancelled waiter does not affect the loading caller
+        cache.delete('k')
+        loading = asyncio.create_task(cache.get_or_load('k', loader))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_load('k', loader))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        assert await loading == 3 and waiter.cancelled()
+        assert not cache._inflight
+
+    asyncio.run(run())
+    print("  ✓ leader cancellation retried by waiters, waiter cancellation isolated")
+
+
+def main():
+    print("\nTTL/LRU cache")
+    print("-" * 60)
+
+    tests = [test_ttl_expiry, test_lru_eviction, test_byte_budget, test_single_flight,
+             test_cancelled_loader]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print("-" * 60)
+    if failed:
+        print(f"❌ {failed}/{len(tests)} tests failed")
+        return 1
+    print(f"✅ all {len(tests)} tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
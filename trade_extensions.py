@@ -15,6 +15,8 @@ from multi_tp_trade import Trade
 import os
 import sqlite3
 from signal_generator import SignalInfo
+from common.swing_index import SwingIndex
+from common.ttl_cache import TTLCache
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import warnings
@@ -23,33 +25,48 @@ import warnings
 logger = logging.getLogger(__name__)
 
 # تعریف دکوراتورها و توابع کمکی
-def cache_result(timeout_seconds: int = 3600):
+def _cache_key_part(value: Any) -> Any:
     """
-    دکوراتور برای کش کردن نتایج توابع با زمان انقضا
+    بخش قابل هش کلید کش برای یک آرگومان
+
+    DataFrame و Series با هش محتوا شناسایی می‌شوند (repr آن‌ها خلاصه شده است و
+    دیتافریم‌های متفاوت می‌توانند کلید یکسان بگیرند).
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        content_hash = int(pd.util.hash_pandas_object(value, index=True).sum())
+        return type(value).__name__, value.shape, content_hash
+    if isinstance(value, (tuple, list)):
+        return tuple(_cache_key_part(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _cache_key_part(item)) for key, item in sorted(value.items()))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def cache_result(timeout_seconds: int = 3600, max_entries: int = 1024):
+    """
+    دکوراتور برای کش کردن نتایج توابع async با زمان انقضا
+
+    کش به max_entries نتیجه محدود است (حذف LRU) و فراخوانی‌های همزمان با
+    آرگومان‌های یکسان فقط یک بار تابع را اجرا می‌کنند.
 
     Args:
         timeout_seconds: مدت زمان اعتبار کش به ثانیه
+        max_entries: حداکثر تعداد نتایج کش شده
     """
     def decorator(func):
-        cache = {}
+        cache = TTLCache(max_entries=max_entries, default_ttl=timeout_seconds, name=func.__qualname__)
 
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             # ساخت کلید منحصر به فرد برای کش
-            key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-            current_time = datetime.now()
+            key = (_cache_key_part(args), _cache_key_part(kwargs))
+            return await cache.get_or_load(key, lambda: func(*args, **kwargs), cache_none=True)
 
-            # بررسی کش و زمان انقضا
-            if key in cache:
-                result, timestamp = cache[key]
-                if (current_time - timestamp).total_seconds() < timeout_seconds:
-                    return result
-
-            # محاسبه نتیجه جدید
-            result = await func(*args, **kwargs)
-            cache[key] = (result, current_time)
-
-            return result
+        wrapper.cache = cache
         return wrapper
     return decorator
 
@@ -1337,8 +1354,8 @@ class BTCCorrelationAnalyzer:
         self.btc_high_volume_threshold = self.btc_correlation_config.get('btc_high_volume_threshold', 1.5)
 
         # کش نتایج
-        self._correlation_cache = {}  # {symbol_pair: (correlation, timestamp)}
-        self._lag_correlation_cache = {}  # {symbol_pair_lag: (correlation, timestamp)}
+        self._correlation_cache = TTLCache(max_entries=1000, name='btc_correlation')  # {symbol_pair: correlation}
+        self._lag_correlation_cache = TTLCache(max_entries=1000, name='btc_lag_correlation')  # {symbol_pair_lag: correlation}
         self._btc_trend_cache = {
             'trend': None,
             'strength': 0.0,
@@ -1417,8 +1434,8 @@ class BTCCorrelationAnalyzer:
             old_lag_analysis != self.lag_correlation_analysis_enabled or
             set(old_timeframes) != set(self.correlation_timeframes)):
             with self._cache_lock:
-                self._correlation_cache = {}
-                self._lag_correlation_cache = {}
+                self._correlation_cache.clear()
+                self._lag_correlation_cache.clear()
                 self._btc_trend_cache = {
                     'trend': None,
                     'strength': 0.0,
@@ -1457,12 +1474,9 @@ class BTCCorrelationAnalyzer:
         # کش کردن کلید برای بررسی
         cache_key = f"multi_tf_corr_{symbol}_{self.btc_symbol}"
 
-        with self._cache_lock:
-            if cache_key in self._correlation_cache:
-                cached_corr, timestamp = self._correlation_cache[cache_key]
-                age = (datetime.now() - timestamp).total_seconds()
-                if age < self.cache_expiry_seconds:
-                    return cached_corr
+        cached_corr = self._correlation_cache.get(cache_key, max_age=self.cache_expiry_seconds)
+        if cached_corr is not None:
+            return cached_corr
 
         # محاسبه همبستگی در هر تایم‌فریم
         correlations = {}
@@ -1532,8 +1546,7 @@ class BTCCorrelationAnalyzer:
                 correlations[tf] = 0.0
 
         # ذخیره در کش
-        with self._cache_lock:
-            self._correlation_cache[cache_key] = (correlations, datetime.now())
+        self._correlation_cache.set(cache_key, correlations, ttl=self.cache_expiry_seconds)
 
         return correlations
 
@@ -1589,12 +1602,9 @@ class BTCCorrelationAnalyzer:
         # کش کردن کلید برای بررسی
         cache_key = f"lag_corr_{symbol}_{self.btc_symbol}_{tf}"
 
-        with self._cache_lock:
-            if cache_key in self._lag_correlation_cache:
-                cached_corr, timestamp = self._lag_correlation_cache[cache_key]
-                age = (datetime.now() - timestamp).total_seconds()
-                if age < self.cache_expiry_seconds:
-                    return cached_corr
+        cached_corr = self._lag_correlation_cache.get(cache_key, max_age=self.cache_expiry_seconds)
+        if cached_corr is not None:
+            return cached_corr
 
         try:
             # دریافت داده‌های تاریخی با تعداد بیشتر برای محاسبه تاخیر
@@ -1642,8 +1652,7 @@ class BTCCorrelationAnalyzer:
                     lag_correlations[lag] = 0.0
 
             # ذخیره در کش
-            with self._cache_lock:
-                self._lag_correlation_cache[cache_key] = (lag_correlations, datetime.now())
+            self._lag_correlation_cache.set(cache_key, lag_correlations, ttl=self.cache_expiry_seconds)
 
             return lag_correlations
 
@@ -2538,37 +2547,25 @@ class DynamicStopManager:
             return result
 
         try:
-            # استفاده از الگوریتم پنجره متحرک برای تشخیص نقاط چرخش
+            # استفاده از شاخص مشترک نقاط چرخش (پنجره متحرک برداری)
             window_size = 2  # تعداد نقاط در هر طرف
+            peaks, valleys = SwingIndex(df).pivots(window_size, strict=True)
+
+            # قله‌ها: بالاتر از همه کندل‌های پنجره
+            for i in peaks:
+                result['highs'].append({
+                    'index': df.index[i],
+                    'position': int(i),
+                    'value': df['high'].iloc[i]
+                })
 
-            for i in range(window_size, len(df) - window_size):
-                # بررسی قله‌ها
-                is_peak = True
-                for j in range(1, window_size + 1):
-                    if df['high'].iloc[i] <= df['high'].iloc[i - j] or df['high'].iloc[i] <= df['high'].iloc[i + j]:
-                        is_peak = False
-                        break
-
-                if is_peak:
-                    result['highs'].append({
-                        'index': df.index[i],
-                        'position': i,
-                        'value': df['high'].iloc[i]
-                    })
-
-                # بررسی دره‌ها
-                is_valley = True
-                for j in range(1, window_size + 1):
-                    if df['low'].iloc[i] >= df['low'].iloc[i - j] or df['low'].iloc[i] >= df['low'].iloc[i + j]:
-                        is_valley = False
-                        break
-
-                if is_valley:
-                    result['lows'].append({
-                        'index': df.index[i],
-                        'position': i,
-                        'value': df['low'].iloc[i]
-                    })
+            # دره‌ها: پایین‌تر از همه کندل‌های پنجره
+            for i in valleys:
+                result['lows'].append({
+                    'index': df.index[i],
+                    'position': int(i),
+                    'value': df['low'].iloc[i]
+                })
 
             return result
 